@@ -0,0 +1,200 @@
+// Code generated by go-swagger; DO NOT EDIT.
+
+package metrics
+
+// This file was generated by the swagger tool.
+// Editing this file might prove futile when you re-run the swagger generate command
+
+import (
+	"context"
+	"encoding/json"
+	"net/http"
+	"time"
+
+	"github.com/go-openapi/errors"
+	"github.com/go-openapi/runtime"
+	cr "github.com/go-openapi/runtime/client"
+
+	lswagger "github.infra.cloudera.com/CAI/AmpRagMonitoring/pkg/swagger"
+
+	strfmt "github.com/go-openapi/strfmt"
+)
+
+// NewGetResponsesContextsParams creates a new GetResponsesContextsParams object
+// with the default values initialized.
+func NewGetResponsesContextsParams() *GetResponsesContextsParams {
+	var ()
+	return &GetResponsesContextsParams{
+
+		timeout: cr.DefaultTimeout,
+	}
+}
+
+// NewGetResponsesContextsParamsWithTimeout creates a new GetResponsesContextsParams object
+// with the default values initialized, and the ability to set a timeout on a request
+func NewGetResponsesContextsParamsWithTimeout(timeout time.Duration) *GetResponsesContextsParams {
+	var ()
+	return &GetResponsesContextsParams{
+
+		timeout: timeout,
+	}
+}
+
+// NewGetResponsesContextsParamsWithContext creates a new GetResponsesContextsParams object
+// with the default values initialized, and the ability to set a context for a request
+func NewGetResponsesContextsParamsWithContext(ctx context.Context) *GetResponsesContextsParams {
+	var ()
+	return &GetResponsesContextsParams{
+
+		Context: ctx,
+	}
+}
+
+// NewGetResponsesContextsParamsWithHTTPClient creates a new GetResponsesContextsParams object
+// with the default values initialized, and the ability to set a custom HTTPClient for a request
+func NewGetResponsesContextsParamsWithHTTPClient(client *http.Client) *GetResponsesContextsParams {
+	var ()
+	return &GetResponsesContextsParams{
+		HTTPClient: client,
+	}
+}
+
+/*
+GetResponsesContextsParams contains all the parameters to send to the API endpoint
+for the get responses contexts operation typically these are written to a http.Request
+*/
+type GetResponsesContextsParams struct {
+
+	/*ExperimentID
+	  The ID of the experiment
+
+	*/
+	ExperimentID *string
+	/*ResponseID
+	  The ID of the response
+
+	*/
+	ResponseID *string
+
+	timeout    time.Duration
+	Context    context.Context
+	HTTPClient *http.Client
+}
+
+var _ lswagger.SwaggerParams = &GetResponsesContextsParams{}
+
+func (o *GetResponsesContextsParams) GetSerializedParams() ([]byte, error) {
+	var params = struct {
+		ExperimentID *string
+
+		ResponseID *string
+	}{
+
+		ExperimentID: o.ExperimentID,
+
+		ResponseID: o.ResponseID,
+	}
+
+	return json.Marshal(&params)
+}
+
+// WithTimeout adds the timeout to the get responses contexts params
+func (o *GetResponsesContextsParams) WithTimeout(timeout time.Duration) *GetResponsesContextsParams {
+	o.SetTimeout(timeout)
+	return o
+}
+
+// SetTimeout adds the timeout to the get responses contexts params
+func (o *GetResponsesContextsParams) SetTimeout(timeout time.Duration) {
+	o.timeout = timeout
+}
+
+// WithContext adds the context to the get responses contexts params
+func (o *GetResponsesContextsParams) WithContext(ctx context.Context) *GetResponsesContextsParams {
+	o.SetContext(ctx)
+	return o
+}
+
+// SetContext adds the context to the get responses contexts params
+func (o *GetResponsesContextsParams) SetContext(ctx context.Context) {
+	o.Context = ctx
+}
+
+// WithHTTPClient adds the HTTPClient to the get responses contexts params
+func (o *GetResponsesContextsParams) WithHTTPClient(client *http.Client) *GetResponsesContextsParams {
+	o.SetHTTPClient(client)
+	return o
+}
+
+// SetHTTPClient adds the HTTPClient to the get responses contexts params
+func (o *GetResponsesContextsParams) SetHTTPClient(client *http.Client) {
+	o.HTTPClient = client
+}
+
+// WithExperimentID adds the experimentID to the get responses contexts params
+func (o *GetResponsesContextsParams) WithExperimentID(experimentID *string) *GetResponsesContextsParams {
+	o.SetExperimentID(experimentID)
+	return o
+}
+
+// SetExperimentID adds the experimentId to the get responses contexts params
+func (o *GetResponsesContextsParams) SetExperimentID(experimentID *string) {
+	o.ExperimentID = experimentID
+}
+
+// WithResponseID adds the responseID to the get responses contexts params
+func (o *GetResponsesContextsParams) WithResponseID(responseID *string) *GetResponsesContextsParams {
+	o.SetResponseID(responseID)
+	return o
+}
+
+// SetResponseID adds the responseId to the get responses contexts params
+func (o *GetResponsesContextsParams) SetResponseID(responseID *string) {
+	o.ResponseID = responseID
+}
+
+// WriteToRequest writes these params to a swagger request
+func (o *GetResponsesContextsParams) WriteToRequest(r runtime.ClientRequest, reg strfmt.Registry) error {
+
+	if err := r.SetTimeout(o.timeout); err != nil {
+		return err
+	}
+	var res []error
+
+	if o.ExperimentID != nil {
+
+		// query param experiment_id
+		var qrExperimentID string
+		if o.ExperimentID != nil {
+			qrExperimentID = *o.ExperimentID
+		}
+		qExperimentID := qrExperimentID
+		if qExperimentID != "" {
+			if err := r.SetQueryParam("experiment_id", qExperimentID); err != nil {
+				return err
+			}
+		}
+
+	}
+
+	if o.ResponseID != nil {
+
+		// query param response_id
+		var qrResponseID string
+		if o.ResponseID != nil {
+			qrResponseID = *o.ResponseID
+		}
+		qResponseID := qrResponseID
+		if qResponseID != "" {
+			if err := r.SetQueryParam("response_id", qResponseID); err != nil {
+				return err
+			}
+		}
+
+	}
+
+	if len(res) > 0 {
+		return errors.CompositeValidationError(res...)
+	}
+	return nil
+}
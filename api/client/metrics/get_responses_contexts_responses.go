@@ -0,0 +1,161 @@
+// Code generated by go-swagger; DO NOT EDIT.
+
+package metrics
+
+// This file was generated by the swagger tool.
+// Editing this file might prove futile when you re-run the swagger generate command
+
+import (
+	"encoding/json"
+	"fmt"
+	"io"
+
+	"github.com/go-openapi/runtime"
+
+	lswagger "github.infra.cloudera.com/CAI/AmpRagMonitoring/pkg/swagger"
+
+	strfmt "github.com/go-openapi/strfmt"
+
+	"github.infra.cloudera.com/CAI/AmpRagMonitoring/models"
+)
+
+// GetResponsesContextsReader is a Reader for the GetResponsesContexts structure.
+type GetResponsesContextsReader struct {
+	formats strfmt.Registry
+}
+
+// ReadResponse reads a server response into the received o.
+func (o *GetResponsesContextsReader) ReadResponse(response runtime.ClientResponse, consumer runtime.Consumer) (interface{}, error) {
+	switch response.Code() {
+	case 200:
+		result := NewGetResponsesContextsOK()
+		if err := result.readResponse(response, consumer, o.formats); err != nil {
+			return nil, err
+		}
+		return result, nil
+	case 400:
+		result := NewGetResponsesContextsBadRequest()
+		if err := result.readResponse(response, consumer, o.formats); err != nil {
+			return nil, err
+		}
+		return nil, result
+	case 500:
+		result := NewGetResponsesContextsInternalServerError()
+		if err := result.readResponse(response, consumer, o.formats); err != nil {
+			return nil, err
+		}
+		return nil, result
+
+	default:
+		return nil, runtime.NewAPIError("unknown error", response, response.Code())
+	}
+}
+
+// NewGetResponsesContextsOK creates a GetResponsesContextsOK with default headers values
+func NewGetResponsesContextsOK() *GetResponsesContextsOK {
+	return &GetResponsesContextsOK{}
+}
+
+/*
+GetResponsesContextsOK handles this case with default header values.
+
+success
+*/
+type GetResponsesContextsOK struct {
+	Payload []*models.ResponseContext
+}
+
+// Code gets the status code for the get responses contexts o k response
+func (o *GetResponsesContextsOK) Code() int {
+	return 200
+}
+
+func (o *GetResponsesContextsOK) Error() string {
+	return fmt.Sprintf("[GET /responses/contexts][%d] getResponsesContextsOK  %+v", 200, o.Payload)
+}
+
+func (o *GetResponsesContextsOK) GetPayload() []*models.ResponseContext {
+	return o.Payload
+}
+
+func (o *GetResponsesContextsOK) GetSerializedPayload() ([]byte, error) {
+	return json.Marshal(o.Payload)
+}
+
+var _ lswagger.SwaggerResponse = &GetResponsesContextsOK{}
+
+func (o *GetResponsesContextsOK) readResponse(response runtime.ClientResponse, consumer runtime.Consumer, formats strfmt.Registry) error {
+
+	// response payload
+	if err := consumer.Consume(response.Body(), &o.Payload); err != nil && err != io.EOF {
+		return err
+	}
+
+	return nil
+}
+
+// NewGetResponsesContextsBadRequest creates a GetResponsesContextsBadRequest with default headers values
+func NewGetResponsesContextsBadRequest() *GetResponsesContextsBadRequest {
+	return &GetResponsesContextsBadRequest{}
+}
+
+/*
+GetResponsesContextsBadRequest handles this case with default header values.
+
+bad request
+*/
+type GetResponsesContextsBadRequest struct {
+}
+
+// Code gets the status code for the get responses contexts bad request response
+func (o *GetResponsesContextsBadRequest) Code() int {
+	return 400
+}
+
+func (o *GetResponsesContextsBadRequest) Error() string {
+	return fmt.Sprintf("[GET /responses/contexts][%d] getResponsesContextsBadRequest ", 400)
+}
+
+func (o *GetResponsesContextsBadRequest) GetSerializedPayload() ([]byte, error) {
+	return nil, nil
+}
+
+var _ lswagger.SwaggerResponse = &GetResponsesContextsBadRequest{}
+
+func (o *GetResponsesContextsBadRequest) readResponse(response runtime.ClientResponse, consumer runtime.Consumer, formats strfmt.Registry) error {
+
+	return nil
+}
+
+// NewGetResponsesContextsInternalServerError creates a GetResponsesContextsInternalServerError with default headers values
+func NewGetResponsesContextsInternalServerError() *GetResponsesContextsInternalServerError {
+	return &GetResponsesContextsInternalServerError{}
+}
+
+/*
+GetResponsesContextsInternalServerError handles this case with default header values.
+
+internal service error
+*/
+type GetResponsesContextsInternalServerError struct {
+}
+
+// Code gets the status code for the get responses contexts internal server error response
+func (o *GetResponsesContextsInternalServerError) Code() int {
+	return 500
+}
+
+func (o *GetResponsesContextsInternalServerError) Error() string {
+	return fmt.Sprintf("[GET /responses/contexts][%d] getResponsesContextsInternalServerError ", 500)
+}
+
+func (o *GetResponsesContextsInternalServerError) GetSerializedPayload() ([]byte, error) {
+	return nil, nil
+}
+
+var _ lswagger.SwaggerResponse = &GetResponsesContextsInternalServerError{}
+
+func (o *GetResponsesContextsInternalServerError) readResponse(response runtime.ClientResponse, consumer runtime.Consumer, formats strfmt.Registry) error {
+
+	return nil
+}
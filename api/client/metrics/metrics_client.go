@@ -19,6 +19,11 @@ import (
 
 // API is the interface of the metrics client
 type API interface {
+	/*
+	   GetResponsesContexts gets the contexts of a response
+	   Get the contexts retrieved for a response logged to a monitored experiment run
+	*/
+	GetResponsesContexts(ctx context.Context, params *GetResponsesContextsParams) (*GetResponsesContextsOK, error)
 	/*
 	   PostMetrics creates metrics
 	   Create monitoring metrics
@@ -29,6 +34,11 @@ type API interface {
 	   List monitoring metrics
 	*/
 	PostMetricsList(ctx context.Context, params *PostMetricsListParams) (*PostMetricsListOK, error)
+	/*
+	   PostResponsesList lists responses
+	   List the responses logged to monitored experiment runs
+	*/
+	PostResponsesList(ctx context.Context, params *PostResponsesListParams) (*PostResponsesListOK, error)
 }
 
 // New creates a new metrics API client.
@@ -49,6 +59,39 @@ type Client struct {
 	authInfo  runtime.ClientAuthInfoWriter
 }
 
+/*
+GetResponsesContexts gets the contexts of a response
+
+Get the contexts retrieved for a response logged to a monitored experiment run
+*/
+func (a *Client) GetResponsesContexts(ctx context.Context, params *GetResponsesContextsParams) (*GetResponsesContextsOK, error) {
+
+	operation := &runtime.ClientOperation{
+		ID:                 "GetResponsesContexts",
+		Method:             "GET",
+		PathPattern:        "/responses/contexts",
+		ProducesMediaTypes: []string{"application/json"},
+		ConsumesMediaTypes: []string{"application/json"},
+		Schemes:            []string{"http"},
+		Params:             params,
+		Reader:             &GetResponsesContextsReader{formats: a.formats},
+		Context:            ctx,
+		Client:             params.HTTPClient,
+	}
+	result, err := a.transport.Submit(operation)
+	if err != nil {
+		// Make sure to convert back to an error type so that nil comparisons work as expected
+		var richError error
+		richError, err = lswagger.NewRichError(operation, err)
+		if err == nil {
+			err = richError
+		}
+		return nil, err
+	}
+	return result.(*GetResponsesContextsOK), nil
+
+}
+
 /*
 PostMetrics creates metrics
 
@@ -114,3 +157,36 @@ func (a *Client) PostMetricsList(ctx context.Context, params *PostMetricsListPar
 	return result.(*PostMetricsListOK), nil
 
 }
+
+/*
+PostResponsesList lists responses
+
+List the responses logged to monitored experiment runs
+*/
+func (a *Client) PostResponsesList(ctx context.Context, params *PostResponsesListParams) (*PostResponsesListOK, error) {
+
+	operation := &runtime.ClientOperation{
+		ID:                 "PostResponsesList",
+		Method:             "POST",
+		PathPattern:        "/responses/list",
+		ProducesMediaTypes: []string{"application/json"},
+		ConsumesMediaTypes: []string{"application/json"},
+		Schemes:            []string{"http"},
+		Params:             params,
+		Reader:             &PostResponsesListReader{formats: a.formats},
+		Context:            ctx,
+		Client:             params.HTTPClient,
+	}
+	result, err := a.transport.Submit(operation)
+	if err != nil {
+		// Make sure to convert back to an error type so that nil comparisons work as expected
+		var richError error
+		richError, err = lswagger.NewRichError(operation, err)
+		if err == nil {
+			err = richError
+		}
+		return nil, err
+	}
+	return result.(*PostResponsesListOK), nil
+
+}
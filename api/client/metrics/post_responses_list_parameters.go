@@ -0,0 +1,153 @@
+// Code generated by go-swagger; DO NOT EDIT.
+
+package metrics
+
+// This file was generated by the swagger tool.
+// Editing this file might prove futile when you re-run the swagger generate command
+
+import (
+	"context"
+	"encoding/json"
+	"net/http"
+	"time"
+
+	"github.com/go-openapi/errors"
+	"github.com/go-openapi/runtime"
+	cr "github.com/go-openapi/runtime/client"
+
+	lswagger "github.infra.cloudera.com/CAI/AmpRagMonitoring/pkg/swagger"
+
+	strfmt "github.com/go-openapi/strfmt"
+
+	"github.infra.cloudera.com/CAI/AmpRagMonitoring/models"
+)
+
+// NewPostResponsesListParams creates a new PostResponsesListParams object
+// with the default values initialized.
+func NewPostResponsesListParams() *PostResponsesListParams {
+	var ()
+	return &PostResponsesListParams{
+
+		timeout: cr.DefaultTimeout,
+	}
+}
+
+// NewPostResponsesListParamsWithTimeout creates a new PostResponsesListParams object
+// with the default values initialized, and the ability to set a timeout on a request
+func NewPostResponsesListParamsWithTimeout(timeout time.Duration) *PostResponsesListParams {
+	var ()
+	return &PostResponsesListParams{
+
+		timeout: timeout,
+	}
+}
+
+// NewPostResponsesListParamsWithContext creates a new PostResponsesListParams object
+// with the default values initialized, and the ability to set a context for a request
+func NewPostResponsesListParamsWithContext(ctx context.Context) *PostResponsesListParams {
+	var ()
+	return &PostResponsesListParams{
+
+		Context: ctx,
+	}
+}
+
+// NewPostResponsesListParamsWithHTTPClient creates a new PostResponsesListParams object
+// with the default values initialized, and the ability to set a custom HTTPClient for a request
+func NewPostResponsesListParamsWithHTTPClient(client *http.Client) *PostResponsesListParams {
+	var ()
+	return &PostResponsesListParams{
+		HTTPClient: client,
+	}
+}
+
+/*
+PostResponsesListParams contains all the parameters to send to the API endpoint
+for the post responses list operation typically these are written to a http.Request
+*/
+type PostResponsesListParams struct {
+
+	/*Body*/
+	Body *models.ResponseListFilter
+
+	timeout    time.Duration
+	Context    context.Context
+	HTTPClient *http.Client
+}
+
+var _ lswagger.SwaggerParams = &PostResponsesListParams{}
+
+func (o *PostResponsesListParams) GetSerializedParams() ([]byte, error) {
+	var params = struct {
+		Body *models.ResponseListFilter
+	}{
+
+		Body: o.Body,
+	}
+
+	return json.Marshal(&params)
+}
+
+// WithTimeout adds the timeout to the post responses list params
+func (o *PostResponsesListParams) WithTimeout(timeout time.Duration) *PostResponsesListParams {
+	o.SetTimeout(timeout)
+	return o
+}
+
+// SetTimeout adds the timeout to the post responses list params
+func (o *PostResponsesListParams) SetTimeout(timeout time.Duration) {
+	o.timeout = timeout
+}
+
+// WithContext adds the context to the post responses list params
+func (o *PostResponsesListParams) WithContext(ctx context.Context) *PostResponsesListParams {
+	o.SetContext(ctx)
+	return o
+}
+
+// SetContext adds the context to the post responses list params
+func (o *PostResponsesListParams) SetContext(ctx context.Context) {
+	o.Context = ctx
+}
+
+// WithHTTPClient adds the HTTPClient to the post responses list params
+func (o *PostResponsesListParams) WithHTTPClient(client *http.Client) *PostResponsesListParams {
+	o.SetHTTPClient(client)
+	return o
+}
+
+// SetHTTPClient adds the HTTPClient to the post responses list params
+func (o *PostResponsesListParams) SetHTTPClient(client *http.Client) {
+	o.HTTPClient = client
+}
+
+// WithBody adds the body to the post responses list params
+func (o *PostResponsesListParams) WithBody(body *models.ResponseListFilter) *PostResponsesListParams {
+	o.SetBody(body)
+	return o
+}
+
+// SetBody adds the body to the post responses list params
+func (o *PostResponsesListParams) SetBody(body *models.ResponseListFilter) {
+	o.Body = body
+}
+
+// WriteToRequest writes these params to a swagger request
+func (o *PostResponsesListParams) WriteToRequest(r runtime.ClientRequest, reg strfmt.Registry) error {
+
+	if err := r.SetTimeout(o.timeout); err != nil {
+		return err
+	}
+	var res []error
+
+	if o.Body != nil {
+		if err := r.SetBodyParam(o.Body); err != nil {
+			return err
+		}
+	}
+
+	if len(res) > 0 {
+		return errors.CompositeValidationError(res...)
+	}
+	return nil
+}
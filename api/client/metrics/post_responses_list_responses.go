@@ -0,0 +1,163 @@
+// Code generated by go-swagger; DO NOT EDIT.
+
+package metrics
+
+// This file was generated by the swagger tool.
+// Editing this file might prove futile when you re-run the swagger generate command
+
+import (
+	"encoding/json"
+	"fmt"
+	"io"
+
+	"github.com/go-openapi/runtime"
+
+	lswagger "github.infra.cloudera.com/CAI/AmpRagMonitoring/pkg/swagger"
+
+	strfmt "github.com/go-openapi/strfmt"
+
+	"github.infra.cloudera.com/CAI/AmpRagMonitoring/models"
+)
+
+// PostResponsesListReader is a Reader for the PostResponsesList structure.
+type PostResponsesListReader struct {
+	formats strfmt.Registry
+}
+
+// ReadResponse reads a server response into the received o.
+func (o *PostResponsesListReader) ReadResponse(response runtime.ClientResponse, consumer runtime.Consumer) (interface{}, error) {
+	switch response.Code() {
+	case 200:
+		result := NewPostResponsesListOK()
+		if err := result.readResponse(response, consumer, o.formats); err != nil {
+			return nil, err
+		}
+		return result, nil
+	case 400:
+		result := NewPostResponsesListBadRequest()
+		if err := result.readResponse(response, consumer, o.formats); err != nil {
+			return nil, err
+		}
+		return nil, result
+	case 500:
+		result := NewPostResponsesListInternalServerError()
+		if err := result.readResponse(response, consumer, o.formats); err != nil {
+			return nil, err
+		}
+		return nil, result
+
+	default:
+		return nil, runtime.NewAPIError("unknown error", response, response.Code())
+	}
+}
+
+// NewPostResponsesListOK creates a PostResponsesListOK with default headers values
+func NewPostResponsesListOK() *PostResponsesListOK {
+	return &PostResponsesListOK{}
+}
+
+/*
+PostResponsesListOK handles this case with default header values.
+
+success
+*/
+type PostResponsesListOK struct {
+	Payload *models.Responses
+}
+
+// Code gets the status code for the post responses list o k response
+func (o *PostResponsesListOK) Code() int {
+	return 200
+}
+
+func (o *PostResponsesListOK) Error() string {
+	return fmt.Sprintf("[POST /responses/list][%d] postResponsesListOK  %+v", 200, o.Payload)
+}
+
+func (o *PostResponsesListOK) GetPayload() *models.Responses {
+	return o.Payload
+}
+
+func (o *PostResponsesListOK) GetSerializedPayload() ([]byte, error) {
+	return json.Marshal(o.Payload)
+}
+
+var _ lswagger.SwaggerResponse = &PostResponsesListOK{}
+
+func (o *PostResponsesListOK) readResponse(response runtime.ClientResponse, consumer runtime.Consumer, formats strfmt.Registry) error {
+
+	o.Payload = new(models.Responses)
+
+	// response payload
+	if err := consumer.Consume(response.Body(), o.Payload); err != nil && err != io.EOF {
+		return err
+	}
+
+	return nil
+}
+
+// NewPostResponsesListBadRequest creates a PostResponsesListBadRequest with default headers values
+func NewPostResponsesListBadRequest() *PostResponsesListBadRequest {
+	return &PostResponsesListBadRequest{}
+}
+
+/*
+PostResponsesListBadRequest handles this case with default header values.
+
+bad request
+*/
+type PostResponsesListBadRequest struct {
+}
+
+// Code gets the status code for the post responses list bad request response
+func (o *PostResponsesListBadRequest) Code() int {
+	return 400
+}
+
+func (o *PostResponsesListBadRequest) Error() string {
+	return fmt.Sprintf("[POST /responses/list][%d] postResponsesListBadRequest ", 400)
+}
+
+func (o *PostResponsesListBadRequest) GetSerializedPayload() ([]byte, error) {
+	return nil, nil
+}
+
+var _ lswagger.SwaggerResponse = &PostResponsesListBadRequest{}
+
+func (o *PostResponsesListBadRequest) readResponse(response runtime.ClientResponse, consumer runtime.Consumer, formats strfmt.Registry) error {
+
+	return nil
+}
+
+// NewPostResponsesListInternalServerError creates a PostResponsesListInternalServerError with default headers values
+func NewPostResponsesListInternalServerError() *PostResponsesListInternalServerError {
+	return &PostResponsesListInternalServerError{}
+}
+
+/*
+PostResponsesListInternalServerError handles this case with default header values.
+
+internal service error
+*/
+type PostResponsesListInternalServerError struct {
+}
+
+// Code gets the status code for the post responses list internal server error response
+func (o *PostResponsesListInternalServerError) Code() int {
+	return 500
+}
+
+func (o *PostResponsesListInternalServerError) Error() string {
+	return fmt.Sprintf("[POST /responses/list][%d] postResponsesListInternalServerError ", 500)
+}
+
+func (o *PostResponsesListInternalServerError) GetSerializedPayload() ([]byte, error) {
+	return nil, nil
+}
+
+var _ lswagger.SwaggerResponse = &PostResponsesListInternalServerError{}
+
+func (o *PostResponsesListInternalServerError) readResponse(response runtime.ClientResponse, consumer runtime.Consumer, formats strfmt.Registry) error {
+
+	return nil
+}
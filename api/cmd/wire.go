@@ -25,7 +25,7 @@ func InitializeDependencies() (*dependencies, error) {
 		sbhttpserver.NewConfigFromEnv, sbhttpserver.NewInstance,
 		server.NewSwaggerConfig, server.NewHandler, server.NewHttpServers,
 		lsql.NewConfigFromEnv, sqlite.NewInstance, sqlite.NewExperiments, sqlite.NewExperimentRuns,
-		sqlite.NewMetrics, sqlite.NewDatabase, NewMigration,
+		sqlite.NewMetrics, sqlite.NewResponses, sqlite.NewDatabase, NewMigration,
 		restapi.NewMetricsAPI, restapi.NewExperimentRunsAPI, restapi.NewExperimentAPI,
 		server.NewSwaggerApiServer,
 		datasource.NewConfigFromEnv, datasource.NewMLFlow,
@@ -54,7 +54,8 @@ func InitializeDependencies() (*dependencies, error) {
 	experimentService := sqlite.NewExperiments(lsqlInstance)
 	experimentRunService := sqlite.NewExperimentRuns(lsqlInstance)
 	metricsService := sqlite.NewMetrics(lsqlInstance)
-	database := sqlite.NewDatabase(experimentService, experimentRunService, metricsService)
+	responsesService := sqlite.NewResponses(lsqlInstance)
+	database := sqlite.NewDatabase(experimentService, experimentRunService, metricsService, responsesService)
 	metricsAPI := restapi.NewMetricsAPI(database)
 	experimentRunsAPI := restapi.NewExperimentRunsAPI(database)
 	experimentAPI := restapi.NewExperimentAPI(database)
@@ -21,3 +21,17 @@ func (m MlFlowMock) Metrics(_ context.Context, runId string) ([]Metric, error) {
 	}
 	return nil, nil
 }
+
+func (m MlFlowMock) MetricHistory(_ context.Context, runId string, key string) ([]Metric, error) {
+	if runId == "" {
+		return nil, fmt.Errorf("runId is required")
+	}
+
+	history := make([]Metric, 0)
+	for _, metric := range m.MetricsByRunId[runId] {
+		if metric.Key == key {
+			history = append(history, metric)
+		}
+	}
+	return history, nil
+}
@@ -8,6 +8,7 @@ import (
 	"github.infra.cloudera.com/CAI/AmpRagMonitoring/pkg/clientbase"
 	cbhttp "github.infra.cloudera.com/CAI/AmpRagMonitoring/pkg/clientbase/http"
 	"io"
+	neturl "net/url"
 )
 
 type RunData struct {
@@ -22,6 +23,11 @@ type RunResponse struct {
 	Run Run `json:"run"`
 }
 
+type MetricHistoryResponse struct {
+	Metrics       []Metric `json:"metrics"`
+	NextPageToken string   `json:"next_page_token"`
+}
+
 type ArtifactsResponse struct {
 	RootUri       string     `json:"root_uri"`
 	Files         []Artifact `json:"files"`
@@ -75,6 +81,47 @@ func (m *MLFlow) Metrics(ctx context.Context, runId string) ([]Metric, error) {
 	return runResponse.Run.Data.Metrics, nil
 }
 
+// MetricHistory returns every logged step of a metric, where Metrics only returns
+// the latest one
+func (m *MLFlow) MetricHistory(ctx context.Context, runId string, key string) ([]Metric, error) {
+	if runId == "" {
+		return nil, fmt.Errorf("runId is required")
+	}
+	history := make([]Metric, 0)
+	pageToken := ""
+	for {
+		url := fmt.Sprintf("%s/api/2.0/mlflow/metrics/get-history?run_id=%s&metric_key=%s", m.baseUrl, runId, neturl.QueryEscape(key))
+		if pageToken != "" {
+			url = fmt.Sprintf("%s&page_token=%s", url, neturl.QueryEscape(pageToken))
+		}
+		req := cbhttp.NewRequest(ctx, "GET", url)
+		resp, err := m.connections.HttpClient.Do(req)
+		if err != nil {
+			log.Printf("failed to fetch metric history %s for run %s: %s", key, runId, err)
+			return nil, err
+		}
+		if resp.StatusCode == 404 {
+			return history, nil
+		}
+		body, ioerr := io.ReadAll(resp.Body)
+		resp.Body.Close()
+		if ioerr != nil {
+			return nil, ioerr
+		}
+
+		var historyResponse MetricHistoryResponse
+		jerr := json.Unmarshal(body, &historyResponse)
+		if jerr != nil {
+			return nil, jerr
+		}
+		history = append(history, historyResponse.Metrics...)
+		if historyResponse.NextPageToken == "" {
+			return history, nil
+		}
+		pageToken = historyResponse.NextPageToken
+	}
+}
+
 func (m *MLFlow) Artifacts(ctx context.Context, runId string, path *string) ([]Artifact, error) {
 	if runId == "" {
 		return nil, fmt.Errorf("runId is required")
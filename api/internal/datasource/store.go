@@ -4,6 +4,7 @@ import "context"
 
 type MetricStore interface {
 	Metrics(ctx context.Context, runId string) ([]Metric, error)
+	MetricHistory(ctx context.Context, runId string, key string) ([]Metric, error)
 }
 
 type ArtifactStore interface {
@@ -8,4 +8,5 @@ type Database interface {
 	Experiments() ExperimentService
 	ExperimentRuns() ExperimentRunService
 	Metrics() MetricsService
+	Responses() ResponsesService
 }
@@ -63,6 +63,10 @@ func (e *ExperimentRunsMock) UpdateExperimentRunTimestamp(_ context.Context, id
 	return fmt.Errorf("run id %d not found", id)
 }
 
+func (e *ExperimentRunsMock) MarkExperimentRunPushed(_ context.Context, experimentId string, runId string) error {
+	return nil
+}
+
 func (e *ExperimentRunsMock) DeleteExperimentRun(_ context.Context, experimentId string, runId string) error {
 	// Delete the matching experiment run
 	for i, run := range e.ExperimentRuns {
@@ -106,7 +110,7 @@ func (mm *MetricsMock) GetMetric(ctx context.Context, id int64) (*Metric, error)
 	return nil, fmt.Errorf("metric id %d not found", id)
 }
 
-func (mm *MetricsMock) ListMetrics(_ context.Context, experimentId *string, runIds []string, metricNames []string) ([]*Metric, error) {
+func (mm *MetricsMock) ListMetrics(_ context.Context, experimentId *string, runIds []string, metricNames []string, startTs *time.Time) ([]*Metric, error) {
 	var matches []*Metric
 	for _, metric := range mm.CreatedMetrics {
 		if experimentId != nil && metric.ExperimentId != *experimentId {
@@ -136,6 +140,9 @@ func (mm *MetricsMock) ListMetrics(_ context.Context, experimentId *string, runI
 				continue
 			}
 		}
+		if startTs != nil && (metric.Timestamp == nil || metric.Timestamp.Before(*startTs)) {
+			continue
+		}
 		matches = append(matches, metric)
 	}
 	return matches, nil
@@ -143,6 +150,62 @@ func (mm *MetricsMock) ListMetrics(_ context.Context, experimentId *string, runI
 
 var _ MetricsService = &MetricsMock{}
 
+type ResponsesMock struct {
+	CreatedResponses []*Response
+	CreatedNodes     []*Node
+}
+
+func (rm *ResponsesMock) CreateResponses(_ context.Context, responses []*Response) error {
+	rm.CreatedResponses = append(rm.CreatedResponses, responses...)
+	return nil
+}
+
+func (rm *ResponsesMock) ListResponses(_ context.Context, filter *ResponseFilter) ([]*Response, int64, error) {
+	var matches []*Response
+	for _, response := range rm.CreatedResponses {
+		if filter.ExperimentId != "" && response.ExperimentId != filter.ExperimentId {
+			continue
+		}
+		matches = append(matches, response)
+	}
+	total := int64(len(matches))
+	if filter.Offset >= total {
+		return []*Response{}, total, nil
+	}
+	matches = matches[filter.Offset:]
+	if filter.Limit > 0 && filter.Limit < int64(len(matches)) {
+		matches = matches[:filter.Limit]
+	}
+	return matches, total, nil
+}
+
+func (rm *ResponsesMock) CreateNodes(_ context.Context, nodes []*Node) error {
+	rm.CreatedNodes = append(rm.CreatedNodes, nodes...)
+	return nil
+}
+
+func (rm *ResponsesMock) ListResponseContexts(_ context.Context, experimentId string, responseId string) ([]*ResponseContext, error) {
+	for _, response := range rm.CreatedResponses {
+		if response.ExperimentId != experimentId || response.ResponseId != responseId {
+			continue
+		}
+		contexts := make([]*ResponseContext, 0, len(response.Contexts))
+		for _, node := range response.Contexts {
+			responseContext := *node
+			for _, stored := range rm.CreatedNodes {
+				if stored.ExperimentId == experimentId && stored.RunId == response.RunId && stored.NodeId == node.NodeId {
+					responseContext.Content = stored.Content
+				}
+			}
+			contexts = append(contexts, &responseContext)
+		}
+		return contexts, nil
+	}
+	return []*ResponseContext{}, nil
+}
+
+var _ ResponsesService = &ResponsesMock{}
+
 var nextExperimentId int64 = 0
 var nextExperimentRunId int64 = 0
 
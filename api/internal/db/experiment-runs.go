@@ -12,6 +12,7 @@ type ExperimentRunService interface {
 	ListExperimentRuns(ctx context.Context, experimentId string) ([]*ExperimentRun, error)
 	ListExperimentRunIdsForReconciliation(ctx context.Context, maxItems int64) ([]int64, error)
 	UpdateExperimentRunTimestamp(ctx context.Context, id int64) error
+	MarkExperimentRunPushed(ctx context.Context, experimentId string, runId string) error
 	DeleteExperimentRun(ctx context.Context, experimentId string, runId string) error
 }
 
@@ -27,5 +27,7 @@ type Metric struct {
 type MetricsService interface {
 	CreateMetric(ctx context.Context, m *Metric) (*Metric, error)
 	GetMetric(ctx context.Context, id int64) (*Metric, error)
-	ListMetrics(ctx context.Context, experimentId *string, runIds []string, metricNames []string) ([]*Metric, error)
+	// ListMetrics returns the metrics matching the filters, those logged at or after
+	// startTs only when it is set
+	ListMetrics(ctx context.Context, experimentId *string, runIds []string, metricNames []string, startTs *time.Time) ([]*Metric, error)
 }
@@ -0,0 +1,256 @@
+package db
+
+import (
+	"context"
+	"encoding/json"
+	"fmt"
+	"time"
+)
+
+const (
+	// LiveResponsesTable has a row per response, referencing its source nodes by id
+	LiveResponsesTable = "live_responses.json"
+	// LiveNodesTable has a row per source node retrieved in a run, with its text
+	LiveNodesTable = "live_nodes.json"
+	// LiveResultsTable has a row per source node of a response, logged by older clients
+	LiveResultsTable = "live_results.json"
+)
+
+type Response struct {
+	Id           int64
+	ExperimentId string
+	RunId        string
+	ResponseId   string
+	Step         int64
+	Input        string
+	Output       string
+	InputLength  int64
+	OutputLength int64
+	TopScore     *float64
+	Timestamp    time.Time
+	// the source nodes of the response, whose text is stored once per run as a Node
+	Contexts []*ResponseContext
+}
+
+type ResponseContext struct {
+	NodeId         string
+	SourceFileName string
+	Score          *float64
+	Content        string
+}
+
+type Node struct {
+	ExperimentId string
+	RunId        string
+	NodeId       string
+	Content      string
+}
+
+type ResponseFilter struct {
+	ExperimentId string
+	RunIds       []string
+	StartTs      *time.Time
+	EndTs        *time.Time
+	Search       string
+	Limit        int64 // all the responses when 0
+	Offset       int64
+}
+
+type ResponsesService interface {
+	// CreateResponses inserts the responses, replacing those already stored
+	CreateResponses(ctx context.Context, responses []*Response) error
+	// ListResponses returns a page of the responses matching the filter, newest
+	// first, and the number of responses matching it
+	ListResponses(ctx context.Context, filter *ResponseFilter) ([]*Response, int64, error)
+	// CreateNodes inserts the source nodes, replacing those already stored
+	CreateNodes(ctx context.Context, nodes []*Node) error
+	// ListResponseContexts returns the source nodes of a response, with their text
+	ListResponseContexts(ctx context.Context, experimentId string, responseId string) ([]*ResponseContext, error)
+}
+
+// IsResponsesTable tells whether a text metric is a table of responses or of their
+// source nodes
+func IsResponsesTable(name string) bool {
+	return name == LiveResponsesTable || name == LiveNodesTable || name == LiveResultsTable
+}
+
+type table struct {
+	Columns []string        `json:"columns"`
+	Data    [][]interface{} `json:"data"`
+}
+
+// tableRows reads the rows of a table logged as a text metric
+func tableRows(m *Metric) ([]map[string]interface{}, error) {
+	if m.ValueText == nil {
+		return nil, nil
+	}
+	var t table
+	if err := json.Unmarshal([]byte(*m.ValueText), &t); err != nil {
+		return nil, fmt.Errorf("failed to parse table %s of run %s: %w", m.Name, m.RunId, err)
+	}
+	rows := make([]map[string]interface{}, 0, len(t.Data))
+	for _, data := range t.Data {
+		row := make(map[string]interface{}, len(t.Columns))
+		for i, column := range t.Columns {
+			if i < len(data) {
+				row[column] = data[i]
+			}
+		}
+		rows = append(rows, row)
+	}
+	return rows, nil
+}
+
+// ResponsesFromTable parses the responses of a table logged as a text metric. The
+// rows of a live_results.json table, one per source node, are grouped by response.
+func ResponsesFromTable(m *Metric) ([]*Response, error) {
+	if m.Name == LiveNodesTable {
+		return nil, nil
+	}
+	rows, err := tableRows(m)
+	if err != nil {
+		return nil, err
+	}
+	responses := make([]*Response, 0)
+	byId := make(map[string]*Response)
+	for _, row := range rows {
+		responseId, ok := row["response_id"].(string)
+		if !ok {
+			continue
+		}
+		output, ok := row["output"].(string)
+		if !ok {
+			continue
+		}
+		response, ok := byId[responseId]
+		if !ok {
+			response = &Response{
+				ExperimentId: m.ExperimentId,
+				RunId:        m.RunId,
+				ResponseId:   responseId,
+				Output:       output,
+			}
+			response.Input, _ = row["input"].(string)
+			// older tables, of runs with a single response, have no step
+			response.Step = int64(numberOr(row["step"], 0))
+			response.InputLength = int64(numberOr(row["input_length"], 0))
+			response.OutputLength = int64(numberOr(row["output_length"], 0))
+			if m.Timestamp != nil {
+				response.Timestamp = *m.Timestamp
+			}
+			if value, ok := row["timestamp"].(string); ok {
+				if ts, err := time.Parse(time.RFC3339Nano, value); err == nil {
+					response.Timestamp = ts
+				}
+			}
+			byId[responseId] = response
+			responses = append(responses, response)
+		}
+		for _, node := range sourceNodes(row["source_nodes"]) {
+			response.Contexts = append(response.Contexts, &ResponseContext{
+				NodeId:         node.NodeId,
+				SourceFileName: node.SourceFileName,
+				Score:          node.Score,
+			})
+			if node.Score != nil && (response.TopScore == nil || *node.Score > *response.TopScore) {
+				response.TopScore = node.Score
+			}
+		}
+	}
+	return responses, nil
+}
+
+// NodesFromTable parses the source nodes of a table logged as a text metric, from
+// the rows of a live_nodes.json table or the source nodes of a live_results.json one
+func NodesFromTable(m *Metric) ([]*Node, error) {
+	if m.Name == LiveResponsesTable {
+		return nil, nil
+	}
+	rows, err := tableRows(m)
+	if err != nil {
+		return nil, err
+	}
+	nodes := make([]*Node, 0, len(rows))
+	for _, row := range rows {
+		var nodeId, content string
+		if m.Name == LiveResultsTable {
+			for _, node := range sourceNodes(row["source_nodes"]) {
+				nodeId, content = node.NodeId, node.Content
+			}
+		} else {
+			nodeId, _ = row["node_id"].(string)
+			content, _ = row["content"].(string)
+		}
+		if nodeId == "" {
+			continue
+		}
+		nodes = append(nodes, &Node{
+			ExperimentId: m.ExperimentId,
+			RunId:        m.RunId,
+			NodeId:       nodeId,
+			Content:      content,
+		})
+	}
+	return nodes, nil
+}
+
+func numberOr(value interface{}, fallback float64) float64 {
+	if number, ok := value.(float64); ok {
+		return number
+	}
+	return fallback
+}
+
+// sourceNodes reads the source nodes of a row, a list of nodes in a
+// live_responses.json table and a single node, with its text, in a
+// live_results.json table
+func sourceNodes(value interface{}) []*ResponseContext {
+	nodes, ok := value.([]interface{})
+	if !ok {
+		nodes = []interface{}{value}
+	}
+	contexts := make([]*ResponseContext, 0, len(nodes))
+	for _, node := range nodes {
+		fields, ok := node.(map[string]interface{})
+		if !ok {
+			continue
+		}
+		responseContext := &ResponseContext{}
+		if responseContext.NodeId, ok = fields["node_id"].(string); !ok {
+			continue
+		}
+		responseContext.SourceFileName, _ = fields["source_file_name"].(string)
+		responseContext.Content, _ = fields["content"].(string)
+		if score, ok := fields["score"].(float64); ok {
+			responseContext.Score = &score
+		}
+		contexts = append(contexts, responseContext)
+	}
+	return contexts
+}
+
+// IndexResponses stores the responses and source nodes of a table logged as a text
+// metric in the responses tables, so that they can be queried without parsing the
+// table again
+func IndexResponses(ctx context.Context, database Database, m *Metric) error {
+	if !IsResponsesTable(m.Name) {
+		return nil
+	}
+	responses, err := ResponsesFromTable(m)
+	if err != nil {
+		return err
+	}
+	if len(responses) != 0 {
+		if err := database.Responses().CreateResponses(ctx, responses); err != nil {
+			return err
+		}
+	}
+	nodes, err := NodesFromTable(m)
+	if err != nil {
+		return err
+	}
+	if len(nodes) == 0 {
+		return nil
+	}
+	return database.Responses().CreateNodes(ctx, nodes)
+}
@@ -0,0 +1,55 @@
+package db
+
+import (
+	"github.com/stretchr/testify/assert"
+	"testing"
+	"time"
+)
+
+func TestResponsesFromTable(t *testing.T) {
+	ts := time.Date(2024, 10, 1, 0, 0, 0, 0, time.UTC)
+	responses := `{"columns": ["response_id", "step", "timestamp", "input", "input_length", "output", "output_length", "source_nodes"],
+		"data": [["a", 3, "2024-10-02T10:00:00.000+00:00", "question", 1, "an answer", 2,
+			[{"node_id": "1", "source_file_name": "doc.pdf", "score": 0.4}, {"node_id": "2", "source_file_name": "doc.pdf", "score": 0.7}]]]}`
+	results := `{"columns": ["response_id", "input", "input_length", "output", "output_length", "source_nodes"],
+		"data": [["b", "question", 1, "an answer", 2, {"node_id": "1", "score": 0.2, "content": "context"}],
+			["b", "question", 1, "an answer", 2, {"node_id": "2", "score": 0.9, "content": "context"}]]}`
+
+	parsed, err := ResponsesFromTable(&Metric{ExperimentId: "1", RunId: "run", Name: LiveResponsesTable, ValueText: &responses, Timestamp: &ts})
+	assert.NoError(t, err)
+	assert.Len(t, parsed, 1)
+	assert.Equal(t, "a", parsed[0].ResponseId)
+	assert.Equal(t, int64(3), parsed[0].Step)
+	assert.Equal(t, int64(2), parsed[0].OutputLength)
+	assert.Equal(t, 0.7, *parsed[0].TopScore)
+	assert.Equal(t, time.Date(2024, 10, 2, 10, 0, 0, 0, time.UTC), parsed[0].Timestamp.UTC())
+	assert.Len(t, parsed[0].Contexts, 2)
+	assert.Equal(t, "doc.pdf", parsed[0].Contexts[1].SourceFileName)
+
+	parsed, err = ResponsesFromTable(&Metric{ExperimentId: "1", RunId: "run", Name: LiveResultsTable, ValueText: &results, Timestamp: &ts})
+	assert.NoError(t, err)
+	assert.Len(t, parsed, 1)
+	assert.Equal(t, "b", parsed[0].ResponseId)
+	assert.Equal(t, int64(0), parsed[0].Step)
+	assert.Equal(t, 0.9, *parsed[0].TopScore)
+	assert.Equal(t, ts, parsed[0].Timestamp)
+	assert.Len(t, parsed[0].Contexts, 2)
+
+	nodes, err := NodesFromTable(&Metric{ExperimentId: "1", RunId: "run", Name: LiveResultsTable, ValueText: &results, Timestamp: &ts})
+	assert.NoError(t, err)
+	assert.Len(t, nodes, 2)
+	assert.Equal(t, "context", nodes[1].Content)
+}
+
+func TestNodesFromTable(t *testing.T) {
+	nodes := `{"columns": ["node_id", "doc_id", "content"], "data": [["1", "doc", "context"], [null, "doc", "context"]]}`
+
+	parsed, err := NodesFromTable(&Metric{ExperimentId: "1", RunId: "run", Name: LiveNodesTable, ValueText: &nodes})
+	assert.NoError(t, err)
+	assert.Len(t, parsed, 1)
+	assert.Equal(t, &Node{ExperimentId: "1", RunId: "run", NodeId: "1", Content: "context"}, parsed[0])
+
+	responses, err := ResponsesFromTable(&Metric{ExperimentId: "1", RunId: "run", Name: LiveNodesTable, ValueText: &nodes})
+	assert.NoError(t, err)
+	assert.Empty(t, responses)
+}
@@ -10,6 +10,7 @@ type Database struct {
 	experiments    db.ExperimentService
 	experimentRuns db.ExperimentRunService
 	metrics        db.MetricsService
+	responses      db.ResponsesService
 }
 
 var _ db.Database = &Database{}
@@ -25,11 +26,13 @@ func NewInstance(cfg *lsql.Config) *lsql.Instance {
 	return instance
 }
 
-func NewDatabase(experiments db.ExperimentService, runs db.ExperimentRunService, metrics db.MetricsService) db.Database {
+func NewDatabase(experiments db.ExperimentService, runs db.ExperimentRunService, metrics db.MetricsService,
+	responses db.ResponsesService) db.Database {
 	return &Database{
 		experiments:    experiments,
 		experimentRuns: runs,
 		metrics:        metrics,
+		responses:      responses,
 	}
 }
 
@@ -44,3 +47,7 @@ func (db *Database) ExperimentRuns() db.ExperimentRunService {
 func (db *Database) Metrics() db.MetricsService {
 	return db.metrics
 }
+
+func (db *Database) Responses() db.ResponsesService {
+	return db.responses
+}
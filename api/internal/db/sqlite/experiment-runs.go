@@ -94,7 +94,11 @@ func (e *ExperimentRuns) ListExperimentRunIdsForReconciliation(ctx context.Conte
 	query := `
 	SELECT id
 	FROM experiment_runs
-	WHERE deleted = 0 AND updated_ts < datetime('now', '-1 minutes')
+	WHERE deleted = 0 AND (
+		(pushed = 0 AND updated_ts < datetime('now', '-1 minutes')) OR
+		-- pushed runs are still reconciled, less often, for any metric whose push was lost
+		(pushed = 1 AND updated_ts < datetime('now', '-10 minutes'))
+	)
 	LIMIT ?
 	`
 
@@ -135,6 +139,17 @@ func (e *ExperimentRuns) UpdateExperimentRunTimestamp(ctx context.Context, id in
 	return nil
 }
 
+func (e *ExperimentRuns) MarkExperimentRunPushed(ctx context.Context, experimentId string, runId string) error {
+	query := `
+	UPDATE experiment_runs
+	SET pushed = 1
+	WHERE experiment_id = ? AND run_id = ? AND pushed = 0
+	`
+	args := []interface{}{experimentId, runId}
+	_, err := e.db.ExecContext(ctx, query, args...)
+	return err
+}
+
 func (e *ExperimentRuns) DeleteExperimentRun(ctx context.Context, experimentId string, runId string) error {
 	query := `
 	DELETE FROM experiment_runs
@@ -24,37 +24,31 @@ func NewMetrics(instance *lsql.Instance) db.MetricsService {
 }
 
 func (r *Metrics) CreateMetric(ctx context.Context, m *db.Metric) (*db.Metric, error) {
-	existingMetrics, err := r.ListMetrics(ctx, &m.ExperimentId, []string{m.RunId}, []string{m.Name})
+	existingMetrics, err := r.ListMetrics(ctx, &m.ExperimentId, []string{m.RunId}, []string{m.Name}, nil)
 	if err != nil {
 		return nil, err
 	}
-	if len(existingMetrics) > 0 {
-		for _, existingMetric := range existingMetrics {
-			tags := existingMetric.Tags
-			if len(tags) != len(m.Tags) {
-				continue
-			}
-			tagsMatch := false
-			for k, v := range m.Tags {
-				if tags[k] == v {
-					tagsMatch = true
-					break
-				}
-			}
-			if tagsMatch {
-				log.Printf("Metric %s already exists for experiment %s and run %s : %d", m.Name, m.ExperimentId, m.RunId, existingMetric.Id)
-				return existingMetric, nil
-			}
+	for _, existingMetric := range existingMetrics {
+		if !tagsEqual(existingMetric.Tags, m.Tags) {
+			continue
 		}
+		if metricValueEqual(existingMetric, m) {
+			log.Printf("Metric %s already exists for experiment %s and run %s : %d", m.Name, m.ExperimentId, m.RunId, existingMetric.Id)
+			return existingMetric, nil
+		}
+		// runs that roll many predictions into steps keep appending to their
+		// metrics and tables, so a metric with the same tags takes the new value
+		return r.updateMetric(ctx, existingMetric.Id, m)
 	}
 
 	query := `
 	INSERT INTO metrics (experiment_id, run_id, name, value_numeric, value_text, tags, ts)
 	VALUES (?, ?, ?, ?, ?, ?, ?)
 	`
-	ts := time.Now()
+	// timestamps are stored in UTC, so that they compare as strings
+	ts := time.Now().UTC()
 	if m.Timestamp != nil {
-		ts = *m.Timestamp
+		ts = m.Timestamp.UTC()
 	}
 
 	tags, err := json.Marshal(m.Tags)
@@ -78,6 +72,57 @@ func (r *Metrics) CreateMetric(ctx context.Context, m *db.Metric) (*db.Metric, e
 	}, nil
 }
 
+func (r *Metrics) updateMetric(ctx context.Context, id int64, m *db.Metric) (*db.Metric, error) {
+	query := `
+	UPDATE metrics
+	SET value_numeric = ?, value_text = ?, ts = ?
+	WHERE id = ?
+	`
+	// timestamps are stored in UTC, so that they compare as strings
+	ts := time.Now().UTC()
+	if m.Timestamp != nil {
+		ts = m.Timestamp.UTC()
+	}
+	args := []interface{}{m.ValueNumeric, m.ValueText, ts, id}
+	_, err := r.db.ExecContext(ctx, query, args...)
+	if err != nil {
+		return nil, err
+	}
+	log.Printf("Updated metric %s for experiment %s and run %s : %d", m.Name, m.ExperimentId, m.RunId, id)
+	return &db.Metric{
+		Id:           id,
+		ExperimentId: m.ExperimentId,
+		RunId:        m.RunId,
+		Name:         m.Name,
+		ValueNumeric: m.ValueNumeric,
+		ValueText:    m.ValueText,
+		Tags:         m.Tags,
+		Timestamp:    &ts,
+	}, nil
+}
+
+func tagsEqual(a map[string]string, b map[string]string) bool {
+	if len(a) != len(b) {
+		return false
+	}
+	for k, v := range b {
+		if existing, ok := a[k]; !ok || existing != v {
+			return false
+		}
+	}
+	return true
+}
+
+func metricValueEqual(a *db.Metric, b *db.Metric) bool {
+	if (a.ValueNumeric == nil) != (b.ValueNumeric == nil) || (a.ValueText == nil) != (b.ValueText == nil) {
+		return false
+	}
+	if a.ValueNumeric != nil && *a.ValueNumeric != *b.ValueNumeric {
+		return false
+	}
+	return a.ValueText == nil || *a.ValueText == *b.ValueText
+}
+
 func (r *Metrics) GetMetric(ctx context.Context, id int64) (*db.Metric, error) {
 	query := `
 	SELECT id, experiment_id, run_id, name, value_numeric, value_text, tags, ts
@@ -93,7 +138,7 @@ func (r *Metrics) GetMetric(ctx context.Context, id int64) (*db.Metric, error) {
 	}
 }
 
-func (r *Metrics) ListMetrics(ctx context.Context, experimentId *string, runIds []string, metricNames []string) ([]*db.Metric, error) {
+func (r *Metrics) ListMetrics(ctx context.Context, experimentId *string, runIds []string, metricNames []string, startTs *time.Time) ([]*db.Metric, error) {
 	query := `
 	SELECT id, experiment_id, run_id, name, value_numeric, value_text, tags, ts
 	FROM metrics
@@ -112,6 +157,10 @@ func (r *Metrics) ListMetrics(ctx context.Context, experimentId *string, runIds
 		conditions = append(conditions, "name IN (?)")
 		parameters = append(parameters, metricNames)
 	}
+	if startTs != nil {
+		conditions = append(conditions, "ts >= ?")
+		parameters = append(parameters, startTs.UTC())
+	}
 	if len(conditions) > 0 {
 		query = query + " WHERE " + strings.Join(conditions, " AND ")
 	}
@@ -0,0 +1,197 @@
+package sqlite
+
+import (
+	"context"
+	"database/sql"
+	"github.infra.cloudera.com/CAI/AmpRagMonitoring/internal/db"
+	lsql "github.infra.cloudera.com/CAI/AmpRagMonitoring/pkg/sql"
+	"strings"
+)
+
+type Responses struct {
+	db *lsql.Instance
+}
+
+var _ db.ResponsesService = &Responses{}
+
+func NewResponses(instance *lsql.Instance) db.ResponsesService {
+	return &Responses{
+		db: instance,
+	}
+}
+
+func (r *Responses) CreateResponses(ctx context.Context, responses []*db.Response) error {
+	query := `
+	INSERT INTO responses (experiment_id, run_id, response_id, step, input, output, input_length, output_length, top_score, ts)
+	VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+	ON CONFLICT (experiment_id, response_id) DO UPDATE SET
+		run_id = excluded.run_id,
+		step = excluded.step,
+		input = excluded.input,
+		output = excluded.output,
+		input_length = excluded.input_length,
+		output_length = excluded.output_length,
+		top_score = excluded.top_score,
+		ts = excluded.ts
+	`
+	deleteNodes := `DELETE FROM response_nodes WHERE experiment_id = ? AND response_id = ?`
+	insertNode := `
+	INSERT INTO response_nodes (experiment_id, response_id, position, node_id, source_file_name, score)
+	VALUES (?, ?, ?, ?, ?, ?)
+	`
+	return r.db.Transaction(ctx, func(ctx context.Context, tx *lsql.Tx) error {
+		for _, response := range responses {
+			// timestamps are stored in UTC, so that they compare as strings
+			args := []interface{}{response.ExperimentId, response.RunId, response.ResponseId, response.Step,
+				response.Input, response.Output, response.InputLength, response.OutputLength, response.TopScore,
+				response.Timestamp.UTC()}
+			if _, err := tx.ExecContext(ctx, query, args...); err != nil {
+				return err
+			}
+			if _, err := tx.ExecContext(ctx, deleteNodes, response.ExperimentId, response.ResponseId); err != nil {
+				return err
+			}
+			for position, node := range response.Contexts {
+				args := []interface{}{response.ExperimentId, response.ResponseId, position, node.NodeId,
+					node.SourceFileName, node.Score}
+				if _, err := tx.ExecContext(ctx, insertNode, args...); err != nil {
+					return err
+				}
+			}
+		}
+		return nil
+	})
+}
+
+func (r *Responses) CreateNodes(ctx context.Context, nodes []*db.Node) error {
+	query := `
+	INSERT INTO nodes (experiment_id, run_id, node_id, content)
+	VALUES (?, ?, ?, ?)
+	ON CONFLICT (experiment_id, run_id, node_id) DO UPDATE SET
+		content = excluded.content
+	`
+	return r.db.Transaction(ctx, func(ctx context.Context, tx *lsql.Tx) error {
+		for _, node := range nodes {
+			if _, err := tx.ExecContext(ctx, query, node.ExperimentId, node.RunId, node.NodeId, node.Content); err != nil {
+				return err
+			}
+		}
+		return nil
+	})
+}
+
+func (r *Responses) ListResponseContexts(ctx context.Context, experimentId string, responseId string) ([]*db.ResponseContext, error) {
+	// the text of a node is looked up in the nodes of the run of the response
+	query := `
+	SELECT response_nodes.node_id, response_nodes.source_file_name, response_nodes.score, COALESCE(nodes.content, '')
+	FROM response_nodes
+	JOIN responses ON responses.experiment_id = response_nodes.experiment_id
+		AND responses.response_id = response_nodes.response_id
+	LEFT JOIN nodes ON nodes.experiment_id = response_nodes.experiment_id
+		AND nodes.run_id = responses.run_id
+		AND nodes.node_id = response_nodes.node_id
+	WHERE response_nodes.experiment_id = ? AND response_nodes.response_id = ?
+	ORDER BY response_nodes.position
+	`
+	rows, err := r.db.QueryContext(ctx, query, experimentId, responseId)
+	if err != nil {
+		return nil, err
+	}
+	defer rows.Close()
+	contexts := make([]*db.ResponseContext, 0)
+	for rows.Next() {
+		if item, err := ResponseContextInstance(rows); err != nil {
+			return nil, err
+		} else {
+			contexts = append(contexts, item)
+		}
+	}
+	return contexts, rows.Err()
+}
+
+func (r *Responses) ListResponses(ctx context.Context, filter *db.ResponseFilter) ([]*db.Response, int64, error) {
+	conditions := []string{}
+	parameters := []interface{}{}
+	if filter.ExperimentId != "" {
+		conditions = append(conditions, "experiment_id = ?")
+		parameters = append(parameters, filter.ExperimentId)
+	}
+	if len(filter.RunIds) != 0 {
+		conditions = append(conditions, "run_id IN (?)")
+		parameters = append(parameters, filter.RunIds)
+	}
+	if filter.StartTs != nil {
+		conditions = append(conditions, "ts >= ?")
+		parameters = append(parameters, filter.StartTs.UTC())
+	}
+	if filter.EndTs != nil {
+		conditions = append(conditions, "ts < ?")
+		parameters = append(parameters, filter.EndTs.UTC())
+	}
+	if filter.Search != "" {
+		conditions = append(conditions, `(input LIKE ? ESCAPE '\' OR output LIKE ? ESCAPE '\')`)
+		pattern := "%" + likeEscaper.Replace(filter.Search) + "%"
+		parameters = append(parameters, pattern, pattern)
+	}
+	where := ""
+	if len(conditions) > 0 {
+		where = " WHERE " + strings.Join(conditions, " AND ")
+	}
+
+	var total int64
+	if err := r.db.QueryRowContext(ctx, "SELECT COUNT(*) FROM responses"+where, parameters...).Scan(&total); err != nil {
+		return nil, 0, err
+	}
+
+	query := `
+	SELECT id, experiment_id, run_id, response_id, step, input, output, input_length, output_length, top_score, ts
+	FROM responses
+	` + where + " ORDER BY ts DESC, id DESC"
+	if filter.Limit > 0 {
+		query = query + " LIMIT ? OFFSET ?"
+		parameters = append(parameters, filter.Limit, filter.Offset)
+	}
+	rows, err := r.db.QueryContext(ctx, query, parameters...)
+	if err != nil {
+		return nil, 0, err
+	}
+	defer rows.Close()
+	response := make([]*db.Response, 0)
+	for rows.Next() {
+		if item, err := ResponseInstance(rows); err != nil {
+			return nil, 0, err
+		} else {
+			response = append(response, item)
+		}
+	}
+	return response, total, rows.Err()
+}
+
+var likeEscaper = strings.NewReplacer(`\`, `\\`, `%`, `\%`, `_`, `\_`)
+
+func ResponseInstance(scanner lsql.RowScanner) (*db.Response, error) {
+	response := &db.Response{}
+	topScore := sql.NullFloat64{}
+	err := scanner.Scan(&response.Id, &response.ExperimentId, &response.RunId, &response.ResponseId, &response.Step,
+		&response.Input, &response.Output, &response.InputLength, &response.OutputLength, &topScore, &response.Timestamp)
+	if err != nil {
+		return nil, err
+	}
+	if topScore.Valid {
+		response.TopScore = &topScore.Float64
+	}
+	return response, nil
+}
+
+func ResponseContextInstance(scanner lsql.RowScanner) (*db.ResponseContext, error) {
+	responseContext := &db.ResponseContext{}
+	score := sql.NullFloat64{}
+	err := scanner.Scan(&responseContext.NodeId, &responseContext.SourceFileName, &score, &responseContext.Content)
+	if err != nil {
+		return nil, err
+	}
+	if score.Valid {
+		responseContext.Score = &score.Float64
+	}
+	return responseContext, nil
+}
@@ -0,0 +1 @@
+ALTER TABLE `experiment_runs` DROP COLUMN `pushed`;
@@ -0,0 +1 @@
+ALTER TABLE `experiment_runs` ADD COLUMN `pushed` BOOLEAN NOT NULL DEFAULT False; -- metrics are pushed to the store, so the reconciler need not fetch them from MLflow
@@ -0,0 +1,16 @@
+CREATE TABLE IF NOT EXISTS `responses` (
+    `id` INTEGER PRIMARY KEY,
+    `experiment_id` VARCHAR(100) NOT NULL,
+    `run_id` VARCHAR(100) NOT NULL,
+    `response_id` VARCHAR(100) NOT NULL,
+    `step` INTEGER NOT NULL DEFAULT 0,
+    `input` TEXT NOT NULL,
+    `output` TEXT NOT NULL,
+    `input_length` INTEGER NOT NULL DEFAULT 0,
+    `output_length` INTEGER NOT NULL DEFAULT 0,
+    `top_score` REAL,
+    `ts` DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    UNIQUE(`experiment_id`, `response_id`)
+);
+CREATE INDEX IF NOT EXISTS `responses_experiment_ts` ON `responses` (`experiment_id`, `ts`);
+CREATE INDEX IF NOT EXISTS `responses_experiment_run` ON `responses` (`experiment_id`, `run_id`);
@@ -0,0 +1,18 @@
+CREATE TABLE IF NOT EXISTS `response_nodes` (
+    `id` INTEGER PRIMARY KEY,
+    `experiment_id` VARCHAR(100) NOT NULL,
+    `response_id` VARCHAR(100) NOT NULL,
+    `position` INTEGER NOT NULL,
+    `node_id` VARCHAR(100) NOT NULL,
+    `source_file_name` TEXT NOT NULL DEFAULT '',
+    `score` REAL,
+    UNIQUE(`experiment_id`, `response_id`, `position`)
+);
+CREATE TABLE IF NOT EXISTS `nodes` (
+    `id` INTEGER PRIMARY KEY,
+    `experiment_id` VARCHAR(100) NOT NULL,
+    `run_id` VARCHAR(100) NOT NULL,
+    `node_id` VARCHAR(100) NOT NULL,
+    `content` TEXT NOT NULL,
+    UNIQUE(`experiment_id`, `run_id`, `node_id`)
+);
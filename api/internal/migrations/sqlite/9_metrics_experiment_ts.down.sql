@@ -0,0 +1 @@
+DROP INDEX IF EXISTS `metrics_experiment_ts`;
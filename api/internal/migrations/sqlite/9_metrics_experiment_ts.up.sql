@@ -0,0 +1 @@
+CREATE INDEX IF NOT EXISTS `metrics_experiment_ts` ON `metrics` (`experiment_id`, `ts`);
@@ -115,6 +115,78 @@ func _5_metrics_value_numeric_nullable_up_sql() ([]byte, error) {
 	)
 }
 
+var __6_experiment_runs_pushed_down_sql = []byte("\x1f\x8b\x08\x00\x00\x00\x00\x00\x00\xff\x73\xf4\x09\x71\x0d\x52\x08\x71\x74\xf2\x71\x55\x48\x48\xad\x28\x48\x2d\xca\xcc\x4d\xcd\x2b\x89\x2f\x2a\xcd\x2b\x4e\x50\x70\x09\xf2\x0f\x50\x70\xf6\xf7\x09\xf5\xf5\x53\x48\x28\x28\x2d\xce\x48\x4d\x49\xb0\xe6\x02\x00\xfd\xf8\x79\x5a\x34\x00\x00\x00")
+
+func _6_experiment_runs_pushed_down_sql() ([]byte, error) {
+	return bindata_read(
+		__6_experiment_runs_pushed_down_sql,
+		"6_experiment_runs_pushed.down.sql",
+	)
+}
+
+var __6_experiment_runs_pushed_up_sql = []byte("\x1f\x8b\x08\x00\x00\x00\x00\x00\x00\xff\x25\x8b\x41\x0e\x82\x30\x14\x05\xf7\x9e\xe2\x1d\x40\x4e\xe0\xaa\x48\x59\x7d\xda\xc4\x94\xb5\x25\xf5\x13\x48\x68\x4b\x7e\x4b\xf4\xf8\x6a\x58\x4e\x66\x46\x91\xd3\x0f\x38\xd5\x92\x86\xe7\xcf\xce\xb2\x46\x4e\xf5\x29\x47\x2a\x1e\xaa\xeb\x70\xb7\x34\x0e\x06\x7e\x3f\xca\xc2\x2f\x8f\xd6\x5a\xd2\xca\xc0\x58\x07\x33\x12\xa1\xd3\xbd\x1a\xc9\xa1\x9f\xb6\xc2\x37\x34\x0d\x22\x57\x59\x43\xc1\x24\x8c\x73\x43\xcd\xa8\x0b\xa3\xd4\x2c\x7c\x45\x39\x49\x38\xe4\x14\xd6\x8d\x05\x89\x7f\x51\xca\x15\x33\xd7\xb0\xfc\x6d\xc4\x2c\x39\x62\xa0\x79\xcb\xef\xcb\x17\xb8\x7e\x33\x73\xa8\x00\x00\x00")
+
+func _6_experiment_runs_pushed_up_sql() ([]byte, error) {
+	return bindata_read(
+		__6_experiment_runs_pushed_up_sql,
+		"6_experiment_runs_pushed.up.sql",
+	)
+}
+
+var __7_responses_down_sql = []byte("\x1f\x8b\x08\x00\x00\x00\x00\x00\x00\xff\x73\x09\xf2\x0f\x50\x08\x71\x74\xf2\x71\x55\xf0\x74\x53\x70\x8d\xf0\x0c\x0e\x09\x56\x48\x28\x4a\x2d\x2e\xc8\xcf\x2b\x4e\x2d\x4e\xb0\xe6\x02\x00\xa6\x82\x13\x1e\x22\x00\x00\x00")
+
+func _7_responses_down_sql() ([]byte, error) {
+	return bindata_read(
+		__7_responses_down_sql,
+		"7_responses.down.sql",
+	)
+}
+
+var __7_responses_up_sql = []byte("\x1f\x8b\x08\x00\x00\x00\x00\x00\x00\xff\x9d\x92\xc1\x6e\x83\x30\x10\x44\xef\x7c\xc5\x1e\x41\xca\x81\x9e\x7b\x72\x61\xd3\x5a\x05\x27\x35\x4b\x45\x4e\x58\x6a\xad\x16\xa9\x05\x0b\x1b\xa9\x9f\x5f\x13\x88\xda\x24\x8a\x82\xe2\xeb\xbc\x9d\xb1\x76\x36\x91\xc8\x08\x81\xd8\x43\x86\xc0\xd7\x20\x36\x04\x58\xf1\x82\x0a\x50\xbd\xb6\xa6\x6b\xad\xb6\x0a\xc2\x00\xfc\x53\xcd\xbb\x02\x2e\x08\x1f\x51\xc2\x56\xf2\x9c\xc9\x1d\x3c\xe3\x6e\x35\xa9\xfa\xc7\xe8\xbe\xf9\xd6\xad\xab\x47\xf0\x95\xc9\xe4\x89\xc9\xf0\x2e\x8e\xa3\xbd\xaf\x28\xb3\x6c\x46\xfb\xa1\xbd\xce\xcc\xf1\x57\x41\xeb\xb4\xf9\xfb\xd7\x41\x84\x14\xd7\xac\xcc\x08\xe2\x19\x6b\x5a\x33\x38\x05\x84\x15\x9d\x3a\x74\x83\xbb\xa8\xed\xc7\xea\x2f\xdd\x7e\xb8\xcf\x05\x29\x93\xd5\x72\xde\x75\xa6\xb6\x6f\x5d\xaf\x15\xf8\x2a\x0e\xa1\xce\xef\x3c\xf5\xc5\x10\xcf\xf1\x7c\x36\x29\xa5\x44\x41\xf5\xa8\x16\xc4\xf2\xed\x34\x55\x0a\xfe\x52\x62\x78\xd2\xc3\xea\x78\x93\x51\x10\xdd\x07\xc9\xd4\x3a\x17\x29\x56\x17\x5b\xaf\xff\xf9\x8c\xff\xd9\x88\xe3\x93\x38\xcf\xf1\xd4\x2d\xe6\xfe\x18\x96\xb8\xcf\x37\xe3\x13\x7e\x01\x17\x22\xaf\x7d\xb5\x02\x00\x00")
+
+func _7_responses_up_sql() ([]byte, error) {
+	return bindata_read(
+		__7_responses_up_sql,
+		"7_responses.up.sql",
+	)
+}
+
+var __8_response_nodes_down_sql = []byte("\x1f\x8b\x08\x00\x00\x00\x00\x00\x00\xff\x73\x09\xf2\x0f\x50\x08\x71\x74\xf2\x71\x55\xf0\x74\x53\x70\x8d\xf0\x0c\x0e\x09\x56\x48\xc8\xcb\x4f\x49\x2d\x4e\xb0\xe6\x72\xc1\x2a\x5b\x94\x5a\x5c\x90\x9f\x57\x9c\x1a\x0f\x53\x06\x00\x5b\xe8\x97\x8b\x45\x00\x00\x00")
+
+func _8_response_nodes_down_sql() ([]byte, error) {
+	return bindata_read(
+		__8_response_nodes_down_sql,
+		"8_response_nodes.down.sql",
+	)
+}
+
+var __8_response_nodes_up_sql = []byte("\x1f\x8b\x08\x00\x00\x00\x00\x00\x00\xff\xb5\x90\x3d\x0f\x82\x30\x10\x86\x77\x7e\xc5\x6d\x42\xc2\xa0\xb3\x53\xc5\x53\x1b\x11\xb5\x16\xa3\x13\x35\x58\x93\x26\xda\x12\x8a\x89\x3f\xdf\xfa\xad\x0c\xe2\x62\xd7\x3e\xf7\xbe\x77\x4f\xc4\x90\x70\x04\x4e\x7a\x31\x02\x1d\x40\x32\xe5\x80\x2b\xba\xe0\x0b\x10\xa5\xb4\x85\xd1\x56\x66\xda\x6c\xa5\x15\xe0\x7b\xe0\x9e\x50\x5b\x01\x34\xe1\x38\x44\x06\x33\x46\x27\x84\xad\x61\x8c\xeb\xf0\xf6\x2b\x4f\x85\x2c\xd5\x41\xea\x2a\xbb\x80\x4b\xc2\xa2\x11\x61\x7e\xa7\xdd\x0e\xae\xe1\x49\x1a\xc7\x77\xf4\x99\xdf\x04\x16\xc6\xaa\x4a\x19\xfd\xea\xad\x01\x97\x05\x1b\x53\xac\x39\x96\xb9\xcc\x76\x6a\xef\x2e\xda\x1c\xa4\x00\x8e\x2b\xfe\xa4\xa0\x8f\x03\x92\xc6\x1c\x5a\xad\xc7\x40\x6e\x4a\x47\x39\x43\xf7\x88\x34\xa1\xf3\x14\xfd\xda\x8d\xe1\xe7\x25\xe1\xdb\xbe\x81\x17\x74\xbd\xe8\x8b\xe2\x7f\x99\x3d\xea\x46\xe6\x27\x67\xb9\xd1\x95\x2b\xac\xa9\x6a\xb2\x71\x6b\x0f\x5f\x1d\x57\x0f\x67\x2f\xf2\x9b\x98\x6b\x02\x00\x00")
+
+func _8_response_nodes_up_sql() ([]byte, error) {
+	return bindata_read(
+		__8_response_nodes_up_sql,
+		"8_response_nodes.up.sql",
+	)
+}
+
+var __9_metrics_experiment_ts_down_sql = []byte("\x1f\x8b\x08\x00\x00\x00\x00\x00\x00\xff\x73\x09\xf2\x0f\x50\xf0\xf4\x73\x71\x8d\x50\xf0\x74\x53\x70\x8d\xf0\x0c\x0e\x09\x56\x48\xc8\x4d\x2d\x29\xca\x4c\x2e\x8e\x4f\xad\x28\x48\x2d\xca\xcc\x4d\xcd\x2b\x89\x2f\x29\x4e\xb0\xe6\x02\x00\x57\x09\xea\xd8\x2e\x00\x00\x00")
+
+func _9_metrics_experiment_ts_down_sql() ([]byte, error) {
+	return bindata_read(
+		__9_metrics_experiment_ts_down_sql,
+		"9_metrics_experiment_ts.down.sql",
+	)
+}
+
+var __9_metrics_experiment_ts_up_sql = []byte("\x1f\x8b\x08\x00\x00\x00\x00\x00\x00\xff\x73\x0e\x72\x75\x0c\x71\x55\xf0\xf4\x73\x71\x8d\x50\xf0\x74\x53\xf0\xf3\x0f\x51\x70\x8d\xf0\x0c\x0e\x09\x56\x48\xc8\x4d\x2d\x29\xca\x4c\x2e\x8e\x4f\xad\x28\x48\x2d\xca\xcc\x4d\xcd\x2b\x89\x2f\x29\x4e\x50\xf0\xf7\x83\x4b\x25\x28\x68\x24\x20\xc9\x66\xa6\x24\xe8\x28\x24\x00\xd5\x68\x5a\x73\x01\x00\xc9\x00\xeb\x55\x59\x00\x00\x00")
+
+func _9_metrics_experiment_ts_up_sql() ([]byte, error) {
+	return bindata_read(
+		__9_metrics_experiment_ts_up_sql,
+		"9_metrics_experiment_ts.up.sql",
+	)
+}
+
 // Asset loads and returns the asset for the given name.
 // It returns an error if the asset could not be found or
 // could not be loaded.
@@ -147,6 +219,14 @@ var _bindata = map[string]func() ([]byte, error){
 	"4_metrics_value.up.sql":                    _4_metrics_value_up_sql,
 	"5_metrics_value_numeric_nullable.down.sql": _5_metrics_value_numeric_nullable_down_sql,
 	"5_metrics_value_numeric_nullable.up.sql":   _5_metrics_value_numeric_nullable_up_sql,
+	"6_experiment_runs_pushed.down.sql":         _6_experiment_runs_pushed_down_sql,
+	"6_experiment_runs_pushed.up.sql":           _6_experiment_runs_pushed_up_sql,
+	"7_responses.down.sql":                      _7_responses_down_sql,
+	"7_responses.up.sql":                        _7_responses_up_sql,
+	"8_response_nodes.down.sql":                 _8_response_nodes_down_sql,
+	"8_response_nodes.up.sql":                   _8_response_nodes_up_sql,
+	"9_metrics_experiment_ts.down.sql":          _9_metrics_experiment_ts_down_sql,
+	"9_metrics_experiment_ts.up.sql":            _9_metrics_experiment_ts_up_sql,
 }
 
 // AssetDir returns the file names below a certain
@@ -202,4 +282,12 @@ var _bintree = &_bintree_t{nil, map[string]*_bintree_t{
 	"4_metrics_value.up.sql":                    &_bintree_t{_4_metrics_value_up_sql, map[string]*_bintree_t{}},
 	"5_metrics_value_numeric_nullable.down.sql": &_bintree_t{_5_metrics_value_numeric_nullable_down_sql, map[string]*_bintree_t{}},
 	"5_metrics_value_numeric_nullable.up.sql":   &_bintree_t{_5_metrics_value_numeric_nullable_up_sql, map[string]*_bintree_t{}},
+	"6_experiment_runs_pushed.down.sql":         &_bintree_t{_6_experiment_runs_pushed_down_sql, map[string]*_bintree_t{}},
+	"6_experiment_runs_pushed.up.sql":           &_bintree_t{_6_experiment_runs_pushed_up_sql, map[string]*_bintree_t{}},
+	"7_responses.down.sql":                      &_bintree_t{_7_responses_down_sql, map[string]*_bintree_t{}},
+	"7_responses.up.sql":                        &_bintree_t{_7_responses_up_sql, map[string]*_bintree_t{}},
+	"8_response_nodes.down.sql":                 &_bintree_t{_8_response_nodes_down_sql, map[string]*_bintree_t{}},
+	"8_response_nodes.up.sql":                   &_bintree_t{_8_response_nodes_up_sql, map[string]*_bintree_t{}},
+	"9_metrics_experiment_ts.down.sql":          &_bintree_t{_9_metrics_experiment_ts_down_sql, map[string]*_bintree_t{}},
+	"9_metrics_experiment_ts.up.sql":            &_bintree_t{_9_metrics_experiment_ts_up_sql, map[string]*_bintree_t{}},
 }}
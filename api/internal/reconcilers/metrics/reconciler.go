@@ -10,18 +10,42 @@ import (
 	"github.infra.cloudera.com/CAI/AmpRagMonitoring/pkg/reconciler"
 	"strconv"
 	"strings"
+	"sync"
 	"time"
 )
 
+// Reconciler backfills the metrics of experiment runs from MLflow. Runs whose
+// metrics are pushed to the store are marked as such and reconciled less often,
+// only to backfill the metrics whose pushes never arrived; the metrics already
+// stored are not created again.
 type Reconciler struct {
-	config *Config
-	db     db.Database
-	mlFlow datasource.DataStore
+	config      *Config
+	db          db.Database
+	mlFlow      datasource.DataStore
+	indexStored sync.Once
 }
 
 func (r *Reconciler) Reboot(_ context.Context) {}
 
+// indexStoredResponses indexes the stored response tables once per start, so that
+// the tables stored before the responses tables were added are queryable too. Later
+// tables are indexed as they are pushed or reconciled, and indexing is idempotent.
+func (r *Reconciler) indexStoredResponses(ctx context.Context) {
+	tables, err := r.db.Metrics().ListMetrics(ctx, nil, nil, []string{db.LiveResponsesTable, db.LiveNodesTable, db.LiveResultsTable}, nil)
+	if err != nil {
+		log.Printf("failed to query the stored response tables: %s", err)
+		return
+	}
+	for _, table := range tables {
+		if err := db.IndexResponses(ctx, r.db, table); err != nil {
+			log.Printf("failed to index the responses of metric %d: %s", table.Id, err)
+		}
+	}
+	log.Printf("indexed the responses of %d stored tables", len(tables))
+}
+
 func (r *Reconciler) Resync(ctx context.Context, queue *reconciler.ReconcileQueue[int64]) {
+	r.indexStored.Do(func() { r.indexStoredResponses(ctx) })
 	if !r.config.Enabled {
 		return
 	}
@@ -56,6 +80,7 @@ func (r *Reconciler) Reconcile(ctx context.Context, items []reconciler.Reconcile
 			log.Printf("failed to fetch metrics for experiment run %d: %s", item.ID, err)
 			continue
 		}
+		mlFlowMetrics = r.metricHistories(ctx, run.RunId, mlFlowMetrics)
 		for _, metric := range mlFlowMetrics {
 			ts := time.Unix(0, metric.Timestamp*int64(time.Millisecond))
 			m, err := r.db.Metrics().CreateMetric(ctx, &db.Metric{
@@ -98,6 +123,26 @@ func (r *Reconciler) Reconcile(ctx context.Context, items []reconciler.Reconcile
 	}
 }
 
+// metricHistories expands the metrics logged at more than one step, which runs/get
+// only returns the latest step of, into their full history
+func (r *Reconciler) metricHistories(ctx context.Context, runId string, latest []datasource.Metric) []datasource.Metric {
+	result := make([]datasource.Metric, 0, len(latest))
+	for _, metric := range latest {
+		if metric.Step <= 1 {
+			result = append(result, metric)
+			continue
+		}
+		history, err := r.mlFlow.MetricHistory(ctx, runId, metric.Key)
+		if err != nil || len(history) == 0 {
+			log.Printf("failed to fetch the history of metric %s for run %s: %v", metric.Key, runId, err)
+			result = append(result, metric)
+			continue
+		}
+		result = append(result, history...)
+	}
+	return result
+}
+
 func (r *Reconciler) fetchArtifacts(ctx context.Context, experimentId string, runId string, artifact datasource.Artifact) ([]db.Metric, error) {
 	if artifact.IsDir {
 		artifacts, err := r.mlFlow.Artifacts(ctx, runId, &artifact.Path)
@@ -131,6 +176,9 @@ func (r *Reconciler) fetchArtifacts(ctx context.Context, experimentId string, ru
 			log.Printf("failed to insert text metric %s for experiment run %s: %s", artifact.Path, runId, err)
 		} else {
 			log.Printf("inserted text metric %s(%d) for experiment run %s", m.Name, m.Id, runId)
+			if err := db.IndexResponses(ctx, r.db, m); err != nil {
+				log.Printf("failed to index the responses of text metric %s for experiment run %s: %s", m.Name, runId, err)
+			}
 		}
 		return []db.Metric{*m}, nil
 	}
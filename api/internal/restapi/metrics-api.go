@@ -9,6 +9,7 @@ import (
 	lhttp "github.infra.cloudera.com/CAI/AmpRagMonitoring/pkg/http"
 	"github.infra.cloudera.com/CAI/AmpRagMonitoring/restapi"
 	"github.infra.cloudera.com/CAI/AmpRagMonitoring/restapi/operations/metrics"
+	"time"
 )
 
 var _ restapi.MetricsAPI = &MetricsAPI{}
@@ -30,6 +31,7 @@ func (m MetricsAPI) PostMetrics(ctx context.Context, params metrics.PostMetricsP
 	if params.Body.Metrics == nil || len(params.Body.Metrics) == 0 {
 		return nil, lhttp.NewBadRequest("body.metrics is required")
 	}
+	pushedRuns := make(map[[2]string]bool)
 	for _, metric := range params.Body.Metrics {
 		if metric.ExperimentID == "" {
 			return nil, lhttp.NewBadRequest("experiment_id is required")
@@ -50,6 +52,9 @@ func (m MetricsAPI) PostMetrics(ctx context.Context, params metrics.PostMetricsP
 			Name:         metric.Name,
 			Tags:         tags,
 		}
+		if ts := time.Time(metric.Ts); !ts.IsZero() {
+			newMetric.Timestamp = &ts
+		}
 		if metric.Value == nil {
 			log.Printf("Metric %s has no value", metric.Name)
 			continue
@@ -67,6 +72,18 @@ func (m MetricsAPI) PostMetrics(ctx context.Context, params metrics.PostMetricsP
 			return nil, lhttp.NewInternalError(err.Error())
 		}
 		log.Printf("Created metric: %d", result.Id)
+		if err := db.IndexResponses(ctx, m.db, result); err != nil {
+			log.Printf("failed to index the responses of metric %s for experiment run %s: %s", metric.Name, metric.ExperimentRunID, err)
+		}
+		pushedRuns[[2]string{metric.ExperimentID, metric.ExperimentRunID}] = true
+	}
+	// the metrics of these runs are pushed, so the reconciler fetches them less often
+	for run := range pushedRuns {
+		err := m.db.ExperimentRuns().MarkExperimentRunPushed(ctx, run[0], run[1])
+		if err != nil {
+			// the metrics are stored, the run is only reconciled as often as before
+			log.Printf("failed to mark experiment run %s as pushed: %s", run[1], err)
+		}
 	}
 
 	return &metrics.PostMetricsOK{}, nil
@@ -76,7 +93,11 @@ func (m MetricsAPI) PostMetricsList(ctx context.Context, params metrics.PostMetr
 	if params.Body == nil {
 		return nil, lhttp.NewBadRequest("body is required")
 	}
-	results, err := m.db.Metrics().ListMetrics(ctx, &params.Body.ExperimentID, params.Body.RunIds, params.Body.MetricNames)
+	var startTs *time.Time
+	if ts := time.Time(params.Body.StartTs); !ts.IsZero() {
+		startTs = &ts
+	}
+	results, err := m.db.Metrics().ListMetrics(ctx, &params.Body.ExperimentID, params.Body.RunIds, params.Body.MetricNames, startTs)
 	if err != nil {
 		return nil, lhttp.NewInternalError(err.Error())
 	}
@@ -116,6 +137,85 @@ func (m MetricsAPI) PostMetricsList(ctx context.Context, params metrics.PostMetr
 	}, nil
 }
 
+func (m MetricsAPI) PostResponsesList(ctx context.Context, params metrics.PostResponsesListParams) (*metrics.PostResponsesListOK, *lhttp.HttpError) {
+	if params.Body == nil {
+		return nil, lhttp.NewBadRequest("body is required")
+	}
+	if params.Body.Limit < 0 || params.Body.Offset < 0 {
+		return nil, lhttp.NewBadRequest("limit and offset must not be negative")
+	}
+	filter := &db.ResponseFilter{
+		ExperimentId: params.Body.ExperimentID,
+		RunIds:       params.Body.RunIds,
+		Search:       params.Body.Search,
+		Limit:        params.Body.Limit,
+		Offset:       params.Body.Offset,
+	}
+	if ts := time.Time(params.Body.StartTs); !ts.IsZero() {
+		filter.StartTs = &ts
+	}
+	if ts := time.Time(params.Body.EndTs); !ts.IsZero() {
+		filter.EndTs = &ts
+	}
+	results, total, err := m.db.Responses().ListResponses(ctx, filter)
+	if err != nil {
+		return nil, lhttp.NewInternalError(err.Error())
+	}
+	payload := make([]*models.Response, 0, len(results))
+	for _, response := range results {
+		result := &models.Response{
+			ExperimentID:    response.ExperimentId,
+			ExperimentRunID: response.RunId,
+			ID:              response.Id,
+			Input:           response.Input,
+			InputLength:     response.InputLength,
+			Output:          response.Output,
+			OutputLength:    response.OutputLength,
+			ResponseID:      response.ResponseId,
+			Step:            response.Step,
+			Ts:              strfmt.DateTime(response.Timestamp),
+		}
+		if response.TopScore != nil {
+			result.TopScore = *response.TopScore
+		}
+		payload = append(payload, result)
+	}
+	return &metrics.PostResponsesListOK{
+		Payload: &models.Responses{
+			Responses: payload,
+			Total:     total,
+		},
+	}, nil
+}
+
+func (m MetricsAPI) GetResponsesContexts(ctx context.Context, params metrics.GetResponsesContextsParams) (*metrics.GetResponsesContextsOK, *lhttp.HttpError) {
+	if params.ExperimentID == nil {
+		return nil, lhttp.NewBadRequest("experiment_id is required")
+	}
+	if params.ResponseID == nil {
+		return nil, lhttp.NewBadRequest("response_id is required")
+	}
+	contexts, err := m.db.Responses().ListResponseContexts(ctx, *params.ExperimentID, *params.ResponseID)
+	if err != nil {
+		return nil, lhttp.NewInternalError(err.Error())
+	}
+	payload := make([]*models.ResponseContext, 0, len(contexts))
+	for _, responseContext := range contexts {
+		result := &models.ResponseContext{
+			Content:        responseContext.Content,
+			NodeID:         responseContext.NodeId,
+			SourceFileName: responseContext.SourceFileName,
+		}
+		if responseContext.Score != nil {
+			result.Score = *responseContext.Score
+		}
+		payload = append(payload, result)
+	}
+	return &metrics.GetResponsesContextsOK{
+		Payload: payload,
+	}, nil
+}
+
 func (m MetricsAPI) Shutdown() error {
 	return nil
 }
@@ -8,8 +8,10 @@ package models
 import (
 	"context"
 
+	"github.com/go-openapi/errors"
 	"github.com/go-openapi/strfmt"
 	"github.com/go-openapi/swag"
+	"github.com/go-openapi/validate"
 )
 
 // MetricListFilter metric list filter
@@ -25,10 +27,35 @@ type MetricListFilter struct {
 
 	// The Experiment Run IDs to filter on
 	RunIds []string `json:"run_ids"`
+
+	// The earliest timestamp of the metrics
+	// Format: date-time
+	StartTs strfmt.DateTime `json:"start_ts,omitempty"`
 }
 
 // Validate validates this metric list filter
 func (m *MetricListFilter) Validate(formats strfmt.Registry) error {
+	var res []error
+
+	if err := m.validateStartTs(formats); err != nil {
+		res = append(res, err)
+	}
+
+	if len(res) > 0 {
+		return errors.CompositeValidationError(res...)
+	}
+	return nil
+}
+
+func (m *MetricListFilter) validateStartTs(formats strfmt.Registry) error {
+	if swag.IsZero(m.StartTs) { // not required
+		return nil
+	}
+
+	if err := validate.FormatOf("start_ts", "body", "date-time", m.StartTs.String(), formats); err != nil {
+		return err
+	}
+
 	return nil
 }
 
@@ -0,0 +1,104 @@
+// Code generated by go-swagger; DO NOT EDIT.
+
+package models
+
+// This file was generated by the swagger tool.
+// Editing this file might prove futile when you re-run the swagger generate command
+
+import (
+	"context"
+
+	"github.com/go-openapi/errors"
+	"github.com/go-openapi/strfmt"
+	"github.com/go-openapi/swag"
+	"github.com/go-openapi/validate"
+)
+
+// Response response
+//
+// swagger:model Response
+type Response struct {
+
+	// The Experiment ID
+	ExperimentID string `json:"experiment_id,omitempty"`
+
+	// The Experiment Run ID
+	ExperimentRunID string `json:"experiment_run_id,omitempty"`
+
+	// The ID
+	ID int64 `json:"id,omitempty"`
+
+	// The query
+	Input string `json:"input,omitempty"`
+
+	// The number of words of the query
+	InputLength int64 `json:"input_length,omitempty"`
+
+	// The response
+	Output string `json:"output,omitempty"`
+
+	// The number of words of the response
+	OutputLength int64 `json:"output_length,omitempty"`
+
+	// The ID of the response
+	ResponseID string `json:"response_id,omitempty"`
+
+	// The step of the run the response was logged at, 0 when logged without one
+	Step int64 `json:"step,omitempty"`
+
+	// The highest retrieval score of the source nodes of the response
+	TopScore float64 `json:"top_score,omitempty"`
+
+	// The timestamp of the response
+	// Format: date-time
+	Ts strfmt.DateTime `json:"ts,omitempty"`
+}
+
+// Validate validates this response
+func (m *Response) Validate(formats strfmt.Registry) error {
+	var res []error
+
+	if err := m.validateTs(formats); err != nil {
+		res = append(res, err)
+	}
+
+	if len(res) > 0 {
+		return errors.CompositeValidationError(res...)
+	}
+	return nil
+}
+
+func (m *Response) validateTs(formats strfmt.Registry) error {
+	if swag.IsZero(m.Ts) { // not required
+		return nil
+	}
+
+	if err := validate.FormatOf("ts", "body", "date-time", m.Ts.String(), formats); err != nil {
+		return err
+	}
+
+	return nil
+}
+
+// ContextValidate validates this response based on context it is used
+func (m *Response) ContextValidate(ctx context.Context, formats strfmt.Registry) error {
+	return nil
+}
+
+// MarshalBinary interface implementation
+func (m *Response) MarshalBinary() ([]byte, error) {
+	if m == nil {
+		return nil, nil
+	}
+	return swag.WriteJSON(m)
+}
+
+// UnmarshalBinary interface implementation
+func (m *Response) UnmarshalBinary(b []byte) error {
+	var res Response
+	if err := swag.ReadJSON(b, &res); err != nil {
+		return err
+	}
+	*m = res
+	return nil
+}
@@ -0,0 +1,59 @@
+// Code generated by go-swagger; DO NOT EDIT.
+
+package models
+
+// This file was generated by the swagger tool.
+// Editing this file might prove futile when you re-run the swagger generate command
+
+import (
+	"context"
+
+	"github.com/go-openapi/strfmt"
+	"github.com/go-openapi/swag"
+)
+
+// ResponseContext response context
+//
+// swagger:model ResponseContext
+type ResponseContext struct {
+
+	// The text of the source node
+	Content string `json:"content,omitempty"`
+
+	// The ID of the source node
+	NodeID string `json:"node_id,omitempty"`
+
+	// The retrieval score of the source node
+	Score float64 `json:"score,omitempty"`
+
+	// The name of the file the source node is from
+	SourceFileName string `json:"source_file_name,omitempty"`
+}
+
+// Validate validates this response context
+func (m *ResponseContext) Validate(formats strfmt.Registry) error {
+	return nil
+}
+
+// ContextValidate validates this response context based on context it is used
+func (m *ResponseContext) ContextValidate(ctx context.Context, formats strfmt.Registry) error {
+	return nil
+}
+
+// MarshalBinary interface implementation
+func (m *ResponseContext) MarshalBinary() ([]byte, error) {
+	if m == nil {
+		return nil, nil
+	}
+	return swag.WriteJSON(m)
+}
+
+// UnmarshalBinary interface implementation
+func (m *ResponseContext) UnmarshalBinary(b []byte) error {
+	var res ResponseContext
+	if err := swag.ReadJSON(b, &res); err != nil {
+		return err
+	}
+	*m = res
+	return nil
+}
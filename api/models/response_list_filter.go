@@ -0,0 +1,109 @@
+// Code generated by go-swagger; DO NOT EDIT.
+
+package models
+
+// This file was generated by the swagger tool.
+// Editing this file might prove futile when you re-run the swagger generate command
+
+import (
+	"context"
+
+	"github.com/go-openapi/errors"
+	"github.com/go-openapi/strfmt"
+	"github.com/go-openapi/swag"
+	"github.com/go-openapi/validate"
+)
+
+// ResponseListFilter response list filter
+//
+// swagger:model ResponseListFilter
+type ResponseListFilter struct {
+
+	// The timestamp the responses are before
+	// Format: date-time
+	EndTs strfmt.DateTime `json:"end_ts,omitempty"`
+
+	// The Experiment ID to filter on
+	ExperimentID string `json:"experiment_id,omitempty"`
+
+	// The maximum number of responses, all when unset
+	Limit int64 `json:"limit,omitempty"`
+
+	// The number of responses to skip
+	Offset int64 `json:"offset,omitempty"`
+
+	// The Experiment Run IDs to filter on
+	RunIds []string `json:"run_ids"`
+
+	// Text the query or the response contains
+	Search string `json:"search,omitempty"`
+
+	// The earliest timestamp of the responses
+	// Format: date-time
+	StartTs strfmt.DateTime `json:"start_ts,omitempty"`
+}
+
+// Validate validates this response list filter
+func (m *ResponseListFilter) Validate(formats strfmt.Registry) error {
+	var res []error
+
+	if err := m.validateEndTs(formats); err != nil {
+		res = append(res, err)
+	}
+
+	if err := m.validateStartTs(formats); err != nil {
+		res = append(res, err)
+	}
+
+	if len(res) > 0 {
+		return errors.CompositeValidationError(res...)
+	}
+	return nil
+}
+
+func (m *ResponseListFilter) validateEndTs(formats strfmt.Registry) error {
+	if swag.IsZero(m.EndTs) { // not required
+		return nil
+	}
+
+	if err := validate.FormatOf("end_ts", "body", "date-time", m.EndTs.String(), formats); err != nil {
+		return err
+	}
+
+	return nil
+}
+
+func (m *ResponseListFilter) validateStartTs(formats strfmt.Registry) error {
+	if swag.IsZero(m.StartTs) { // not required
+		return nil
+	}
+
+	if err := validate.FormatOf("start_ts", "body", "date-time", m.StartTs.String(), formats); err != nil {
+		return err
+	}
+
+	return nil
+}
+
+// ContextValidate validates this response list filter based on context it is used
+func (m *ResponseListFilter) ContextValidate(ctx context.Context, formats strfmt.Registry) error {
+	return nil
+}
+
+// MarshalBinary interface implementation
+func (m *ResponseListFilter) MarshalBinary() ([]byte, error) {
+	if m == nil {
+		return nil, nil
+	}
+	return swag.WriteJSON(m)
+}
+
+// UnmarshalBinary interface implementation
+func (m *ResponseListFilter) UnmarshalBinary(b []byte) error {
+	var res ResponseListFilter
+	if err := swag.ReadJSON(b, &res); err != nil {
+		return err
+	}
+	*m = res
+	return nil
+}
@@ -0,0 +1,119 @@
+// Code generated by go-swagger; DO NOT EDIT.
+
+package models
+
+// This file was generated by the swagger tool.
+// Editing this file might prove futile when you re-run the swagger generate command
+
+import (
+	"context"
+	"strconv"
+
+	"github.com/go-openapi/errors"
+	"github.com/go-openapi/strfmt"
+	"github.com/go-openapi/swag"
+)
+
+// Responses responses
+//
+// swagger:model Responses
+type Responses struct {
+
+	// The responses, newest first
+	Responses []*Response `json:"responses"`
+
+	// The number of responses matching the filter
+	Total int64 `json:"total,omitempty"`
+}
+
+// Validate validates this responses
+func (m *Responses) Validate(formats strfmt.Registry) error {
+	var res []error
+
+	if err := m.validateResponses(formats); err != nil {
+		res = append(res, err)
+	}
+
+	if len(res) > 0 {
+		return errors.CompositeValidationError(res...)
+	}
+	return nil
+}
+
+func (m *Responses) validateResponses(formats strfmt.Registry) error {
+	if swag.IsZero(m.Responses) { // not required
+		return nil
+	}
+
+	for i := 0; i < len(m.Responses); i++ {
+		if swag.IsZero(m.Responses[i]) { // not required
+			continue
+		}
+
+		if m.Responses[i] != nil {
+			if err := m.Responses[i].Validate(formats); err != nil {
+				if ve, ok := err.(*errors.Validation); ok {
+					return ve.ValidateName("responses" + "." + strconv.Itoa(i))
+				} else if ce, ok := err.(*errors.CompositeError); ok {
+					return ce.ValidateName("responses" + "." + strconv.Itoa(i))
+				}
+				return err
+			}
+		}
+
+	}
+
+	return nil
+}
+
+// ContextValidate validate this responses based on the context it is used
+func (m *Responses) ContextValidate(ctx context.Context, formats strfmt.Registry) error {
+	var res []error
+
+	if err := m.contextValidateResponses(ctx, formats); err != nil {
+		res = append(res, err)
+	}
+
+	if len(res) > 0 {
+		return errors.CompositeValidationError(res...)
+	}
+	return nil
+}
+
+func (m *Responses) contextValidateResponses(ctx context.Context, formats strfmt.Registry) error {
+
+	for i := 0; i < len(m.Responses); i++ {
+
+		if m.Responses[i] != nil {
+			if err := m.Responses[i].ContextValidate(ctx, formats); err != nil {
+				if ve, ok := err.(*errors.Validation); ok {
+					return ve.ValidateName("responses" + "." + strconv.Itoa(i))
+				} else if ce, ok := err.(*errors.CompositeError); ok {
+					return ce.ValidateName("responses" + "." + strconv.Itoa(i))
+				}
+				return err
+			}
+		}
+
+	}
+
+	return nil
+}
+
+// MarshalBinary interface implementation
+func (m *Responses) MarshalBinary() ([]byte, error) {
+	if m == nil {
+		return nil, nil
+	}
+	return swag.WriteJSON(m)
+}
+
+// UnmarshalBinary interface implementation
+func (m *Responses) UnmarshalBinary(b []byte) error {
+	var res Responses
+	if err := swag.ReadJSON(b, &res); err != nil {
+		return err
+	}
+	*m = res
+	return nil
+}
@@ -41,10 +41,14 @@ type ExperimentsAPI interface {
 
 // MetricsAPI
 type MetricsAPI interface {
+	// GetResponsesContexts is Get the contexts retrieved for a response logged to a monitored experiment run
+	GetResponsesContexts(ctx context.Context, params metrics.GetResponsesContextsParams) (*metrics.GetResponsesContextsOK, *lhttp.HttpError)
 	// PostMetrics is Create monitoring metrics
 	PostMetrics(ctx context.Context, params metrics.PostMetricsParams) (*metrics.PostMetricsOK, *lhttp.HttpError)
 	// PostMetricsList is List monitoring metrics
 	PostMetricsList(ctx context.Context, params metrics.PostMetricsListParams) (*metrics.PostMetricsListOK, *lhttp.HttpError)
+	// PostResponsesList is List the responses logged to monitored experiment runs
+	PostResponsesList(ctx context.Context, params metrics.PostResponsesListParams) (*metrics.PostResponsesListOK, *lhttp.HttpError)
 	Shutdown() error
 }
 
@@ -148,6 +152,34 @@ func Handler(c Config) (http.Handler, error) {
 		})
 	}
 
+	{
+		info := &swaggerinterceptors.UnaryServerInfo{
+			FullMethod: "Metrics/GetResponsesContexts", // TODO: add full package
+		}
+
+		baseHandler := func(ctx context.Context, header http.Header, req interface{}) (interface{}, *lhttp.HttpError) {
+			typedParams := req.(metrics.GetResponsesContextsParams)
+			resp, herr := c.MetricsAPI.GetResponsesContexts(ctx, typedParams)
+			return resp, herr
+		}
+
+		for i := len(c.Interceptors) - 1; i >= 0; i-- {
+			interceptor := c.Interceptors[i]
+			currentHandler := baseHandler
+			baseHandler = func(ctx context.Context, header http.Header, req interface{}) (interface{}, *lhttp.HttpError) {
+				return interceptor(ctx, header, req, info, currentHandler)
+			}
+		}
+
+		api.MetricsGetResponsesContextsHandler = metrics.GetResponsesContextsHandlerFunc(func(params metrics.GetResponsesContextsParams) middleware.Responder {
+			resp, herr := baseHandler(params.HTTPRequest.Context(), params.HTTPRequest.Header, params)
+			if herr != nil {
+				return herr
+			}
+			return resp.(middleware.Responder)
+		})
+	}
+
 	{
 		info := &swaggerinterceptors.UnaryServerInfo{
 			FullMethod: "Metrics/PostMetrics", // TODO: add full package
@@ -204,6 +236,34 @@ func Handler(c Config) (http.Handler, error) {
 		})
 	}
 
+	{
+		info := &swaggerinterceptors.UnaryServerInfo{
+			FullMethod: "Metrics/PostResponsesList", // TODO: add full package
+		}
+
+		baseHandler := func(ctx context.Context, header http.Header, req interface{}) (interface{}, *lhttp.HttpError) {
+			typedParams := req.(metrics.PostResponsesListParams)
+			resp, herr := c.MetricsAPI.PostResponsesList(ctx, typedParams)
+			return resp, herr
+		}
+
+		for i := len(c.Interceptors) - 1; i >= 0; i-- {
+			interceptor := c.Interceptors[i]
+			currentHandler := baseHandler
+			baseHandler = func(ctx context.Context, header http.Header, req interface{}) (interface{}, *lhttp.HttpError) {
+				return interceptor(ctx, header, req, info, currentHandler)
+			}
+		}
+
+		api.MetricsPostResponsesListHandler = metrics.PostResponsesListHandlerFunc(func(params metrics.PostResponsesListParams) middleware.Responder {
+			resp, herr := baseHandler(params.HTTPRequest.Context(), params.HTTPRequest.Header, params)
+			if herr != nil {
+				return herr
+			}
+			return resp.(middleware.Responder)
+		})
+	}
+
 	{
 		info := &swaggerinterceptors.UnaryServerInfo{
 			FullMethod: "Runs/PostRuns", // TODO: add full package
@@ -275,6 +335,10 @@ var (
 	MetricTagQueryParse               = query.MustNewBuilder(&query.Config{Model: models.MetricTag{}}).ParseRequest
 	MetricValueQueryParse             = query.MustNewBuilder(&query.Config{Model: models.MetricValue{}}).ParseRequest
 	MetricsQueryParse                 = query.MustNewBuilder(&query.Config{Model: models.Metrics{}}).ParseRequest
+	ResponseQueryParse                = query.MustNewBuilder(&query.Config{Model: models.Response{}}).ParseRequest
+	ResponseContextQueryParse         = query.MustNewBuilder(&query.Config{Model: models.ResponseContext{}}).ParseRequest
+	ResponseListFilterQueryParse      = query.MustNewBuilder(&query.Config{Model: models.ResponseListFilter{}}).ParseRequest
+	ResponsesQueryParse               = query.MustNewBuilder(&query.Config{Model: models.Responses{}}).ParseRequest
 )
 
 // swaggerCopy copies the swagger json to prevent data races in runtime
@@ -126,6 +126,78 @@ func init() {
         }
       }
     },
+    "/responses/contexts": {
+      "get": {
+        "description": "Get the contexts retrieved for a response logged to a monitored experiment run",
+        "tags": [
+          "metrics"
+        ],
+        "summary": "Get the contexts of a response.",
+        "parameters": [
+          {
+            "type": "string",
+            "description": "The ID of the experiment",
+            "name": "experiment_id",
+            "in": "query"
+          },
+          {
+            "type": "string",
+            "description": "The ID of the response",
+            "name": "response_id",
+            "in": "query"
+          }
+        ],
+        "responses": {
+          "200": {
+            "description": "success",
+            "schema": {
+              "type": "array",
+              "items": {
+                "$ref": "#/definitions/ResponseContext"
+              }
+            }
+          },
+          "400": {
+            "description": "bad request"
+          },
+          "500": {
+            "description": "internal service error"
+          }
+        }
+      }
+    },
+    "/responses/list": {
+      "post": {
+        "description": "List the responses logged to monitored experiment runs",
+        "tags": [
+          "metrics"
+        ],
+        "summary": "List responses.",
+        "parameters": [
+          {
+            "name": "body",
+            "in": "body",
+            "schema": {
+              "$ref": "#/definitions/ResponseListFilter"
+            }
+          }
+        ],
+        "responses": {
+          "200": {
+            "description": "success",
+            "schema": {
+              "$ref": "#/definitions/Responses"
+            }
+          },
+          "400": {
+            "description": "bad request"
+          },
+          "500": {
+            "description": "internal service error"
+          }
+        }
+      }
+    },
     "/runs": {
       "post": {
         "description": "Register an experiment run for monitoring",
@@ -324,6 +396,11 @@ func init() {
           "items": {
             "type": "string"
           }
+        },
+        "start_ts": {
+          "description": "The earliest timestamp of the metrics",
+          "type": "string",
+          "format": "date-time"
         }
       }
     },
@@ -365,6 +442,131 @@ func init() {
           }
         }
       }
+    },
+    "Response": {
+      "type": "object",
+      "properties": {
+        "experiment_id": {
+          "description": "The Experiment ID",
+          "type": "string"
+        },
+        "experiment_run_id": {
+          "description": "The Experiment Run ID",
+          "type": "string"
+        },
+        "id": {
+          "description": "The ID",
+          "type": "integer"
+        },
+        "input": {
+          "description": "The query",
+          "type": "string"
+        },
+        "input_length": {
+          "description": "The number of words of the query",
+          "type": "integer"
+        },
+        "output": {
+          "description": "The response",
+          "type": "string"
+        },
+        "output_length": {
+          "description": "The number of words of the response",
+          "type": "integer"
+        },
+        "response_id": {
+          "description": "The ID of the response",
+          "type": "string"
+        },
+        "step": {
+          "description": "The step of the run the response was logged at, 0 when logged without one",
+          "type": "integer"
+        },
+        "top_score": {
+          "description": "The highest retrieval score of the source nodes of the response",
+          "type": "number"
+        },
+        "ts": {
+          "description": "The timestamp of the response",
+          "type": "string",
+          "format": "date-time"
+        }
+      }
+    },
+    "ResponseContext": {
+      "type": "object",
+      "properties": {
+        "content": {
+          "description": "The text of the source node",
+          "type": "string"
+        },
+        "node_id": {
+          "description": "The ID of the source node",
+          "type": "string"
+        },
+        "score": {
+          "description": "The retrieval score of the source node",
+          "type": "number"
+        },
+        "source_file_name": {
+          "description": "The name of the file the source node is from",
+          "type": "string"
+        }
+      }
+    },
+    "ResponseListFilter": {
+      "type": "object",
+      "properties": {
+        "end_ts": {
+          "description": "The timestamp the responses are before",
+          "type": "string",
+          "format": "date-time"
+        },
+        "experiment_id": {
+          "description": "The Experiment ID to filter on",
+          "type": "string"
+        },
+        "limit": {
+          "description": "The maximum number of responses, all when unset",
+          "type": "integer"
+        },
+        "offset": {
+          "description": "The number of responses to skip",
+          "type": "integer"
+        },
+        "run_ids": {
+          "description": "The Experiment Run IDs to filter on",
+          "type": "array",
+          "items": {
+            "type": "string"
+          }
+        },
+        "search": {
+          "description": "Text the query or the response contains",
+          "type": "string"
+        },
+        "start_ts": {
+          "description": "The earliest timestamp of the responses",
+          "type": "string",
+          "format": "date-time"
+        }
+      }
+    },
+    "Responses": {
+      "type": "object",
+      "properties": {
+        "responses": {
+          "description": "The responses, newest first",
+          "type": "array",
+          "items": {
+            "$ref": "#/definitions/Response"
+          }
+        },
+        "total": {
+          "description": "The number of responses matching the filter",
+          "type": "integer"
+        }
+      }
     }
   },
   "tags": [
@@ -487,6 +689,78 @@ func init() {
         }
       }
     },
+    "/responses/contexts": {
+      "get": {
+        "description": "Get the contexts retrieved for a response logged to a monitored experiment run",
+        "tags": [
+          "metrics"
+        ],
+        "summary": "Get the contexts of a response.",
+        "parameters": [
+          {
+            "type": "string",
+            "description": "The ID of the experiment",
+            "name": "experiment_id",
+            "in": "query"
+          },
+          {
+            "type": "string",
+            "description": "The ID of the response",
+            "name": "response_id",
+            "in": "query"
+          }
+        ],
+        "responses": {
+          "200": {
+            "description": "success",
+            "schema": {
+              "type": "array",
+              "items": {
+                "$ref": "#/definitions/ResponseContext"
+              }
+            }
+          },
+          "400": {
+            "description": "bad request"
+          },
+          "500": {
+            "description": "internal service error"
+          }
+        }
+      }
+    },
+    "/responses/list": {
+      "post": {
+        "description": "List the responses logged to monitored experiment runs",
+        "tags": [
+          "metrics"
+        ],
+        "summary": "List responses.",
+        "parameters": [
+          {
+            "name": "body",
+            "in": "body",
+            "schema": {
+              "$ref": "#/definitions/ResponseListFilter"
+            }
+          }
+        ],
+        "responses": {
+          "200": {
+            "description": "success",
+            "schema": {
+              "$ref": "#/definitions/Responses"
+            }
+          },
+          "400": {
+            "description": "bad request"
+          },
+          "500": {
+            "description": "internal service error"
+          }
+        }
+      }
+    },
     "/runs": {
       "post": {
         "description": "Register an experiment run for monitoring",
@@ -685,6 +959,11 @@ func init() {
           "items": {
             "type": "string"
           }
+        },
+        "start_ts": {
+          "description": "The earliest timestamp of the metrics",
+          "type": "string",
+          "format": "date-time"
         }
       }
     },
@@ -726,6 +1005,131 @@ func init() {
           }
         }
       }
+    },
+    "Response": {
+      "type": "object",
+      "properties": {
+        "experiment_id": {
+          "description": "The Experiment ID",
+          "type": "string"
+        },
+        "experiment_run_id": {
+          "description": "The Experiment Run ID",
+          "type": "string"
+        },
+        "id": {
+          "description": "The ID",
+          "type": "integer"
+        },
+        "input": {
+          "description": "The query",
+          "type": "string"
+        },
+        "input_length": {
+          "description": "The number of words of the query",
+          "type": "integer"
+        },
+        "output": {
+          "description": "The response",
+          "type": "string"
+        },
+        "output_length": {
+          "description": "The number of words of the response",
+          "type": "integer"
+        },
+        "response_id": {
+          "description": "The ID of the response",
+          "type": "string"
+        },
+        "step": {
+          "description": "The step of the run the response was logged at, 0 when logged without one",
+          "type": "integer"
+        },
+        "top_score": {
+          "description": "The highest retrieval score of the source nodes of the response",
+          "type": "number"
+        },
+        "ts": {
+          "description": "The timestamp of the response",
+          "type": "string",
+          "format": "date-time"
+        }
+      }
+    },
+    "ResponseContext": {
+      "type": "object",
+      "properties": {
+        "content": {
+          "description": "The text of the source node",
+          "type": "string"
+        },
+        "node_id": {
+          "description": "The ID of the source node",
+          "type": "string"
+        },
+        "score": {
+          "description": "The retrieval score of the source node",
+          "type": "number"
+        },
+        "source_file_name": {
+          "description": "The name of the file the source node is from",
+          "type": "string"
+        }
+      }
+    },
+    "ResponseListFilter": {
+      "type": "object",
+      "properties": {
+        "end_ts": {
+          "description": "The timestamp the responses are before",
+          "type": "string",
+          "format": "date-time"
+        },
+        "experiment_id": {
+          "description": "The Experiment ID to filter on",
+          "type": "string"
+        },
+        "limit": {
+          "description": "The maximum number of responses, all when unset",
+          "type": "integer"
+        },
+        "offset": {
+          "description": "The number of responses to skip",
+          "type": "integer"
+        },
+        "run_ids": {
+          "description": "The Experiment Run IDs to filter on",
+          "type": "array",
+          "items": {
+            "type": "string"
+          }
+        },
+        "search": {
+          "description": "Text the query or the response contains",
+          "type": "string"
+        },
+        "start_ts": {
+          "description": "The earliest timestamp of the responses",
+          "type": "string",
+          "format": "date-time"
+        }
+      }
+    },
+    "Responses": {
+      "type": "object",
+      "properties": {
+        "responses": {
+          "description": "The responses, newest first",
+          "type": "array",
+          "items": {
+            "$ref": "#/definitions/Response"
+          }
+        },
+        "total": {
+          "description": "The number of responses matching the filter",
+          "type": "integer"
+        }
+      }
     }
   },
   "tags": [
@@ -0,0 +1,58 @@
+// Code generated by go-swagger; DO NOT EDIT.
+
+package metrics
+
+// This file was generated by the swagger tool.
+// Editing this file might prove futile when you re-run the generate command
+
+import (
+	"net/http"
+
+	"github.com/go-openapi/runtime/middleware"
+)
+
+// GetResponsesContextsHandlerFunc turns a function with the right signature into a get responses contexts handler
+type GetResponsesContextsHandlerFunc func(GetResponsesContextsParams) middleware.Responder
+
+// Handle executing the request and returning a response
+func (fn GetResponsesContextsHandlerFunc) Handle(params GetResponsesContextsParams) middleware.Responder {
+	return fn(params)
+}
+
+// GetResponsesContextsHandler interface for that can handle valid get responses contexts params
+type GetResponsesContextsHandler interface {
+	Handle(GetResponsesContextsParams) middleware.Responder
+}
+
+// NewGetResponsesContexts creates a new http.Handler for the get responses contexts operation
+func NewGetResponsesContexts(ctx *middleware.Context, handler GetResponsesContextsHandler) *GetResponsesContexts {
+	return &GetResponsesContexts{Context: ctx, Handler: handler}
+}
+
+/*
+	GetResponsesContexts swagger:route GET /responses/contexts metrics getResponsesContexts
+
+Get the contexts of a response.
+
+Get the contexts retrieved for a response logged to a monitored experiment run
+*/
+type GetResponsesContexts struct {
+	Context *middleware.Context
+	Handler GetResponsesContextsHandler
+}
+
+func (o *GetResponsesContexts) ServeHTTP(rw http.ResponseWriter, r *http.Request) {
+	route, rCtx, _ := o.Context.RouteInfo(r)
+	if rCtx != nil {
+		*r = *rCtx
+	}
+	var Params = NewGetResponsesContextsParams()
+	if err := o.Context.BindValidRequest(r, route, &Params); err != nil { // bind params
+		o.Context.Respond(rw, r, route.Produces, route, err)
+		return
+	}
+
+	res := o.Handler.Handle(Params) // actually handle the request
+	o.Context.Respond(rw, r, route.Produces, route, res)
+
+}
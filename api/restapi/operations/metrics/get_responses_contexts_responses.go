@@ -0,0 +1,119 @@
+// Code generated by go-swagger; DO NOT EDIT.
+
+package metrics
+
+// This file was generated by the swagger tool.
+// Editing this file might prove futile when you re-run the swagger generate command
+
+import (
+	"net/http"
+
+	"github.com/go-openapi/runtime"
+
+	lhttp "github.infra.cloudera.com/CAI/AmpRagMonitoring/pkg/http"
+
+	"github.infra.cloudera.com/CAI/AmpRagMonitoring/models"
+)
+
+// GetResponsesContextsOKCode is the HTTP code returned for type GetResponsesContextsOK
+const GetResponsesContextsOKCode int = 200
+
+/*
+GetResponsesContextsOK success
+
+swagger:response getResponsesContextsOK
+*/
+type GetResponsesContextsOK struct {
+
+	/*
+	  In: Body
+	*/
+	Payload []*models.ResponseContext `json:"body,omitempty"`
+}
+
+// NewGetResponsesContextsOK creates GetResponsesContextsOK with default headers values
+
+func NewGetResponsesContextsOK() *GetResponsesContextsOK {
+
+	return &GetResponsesContextsOK{}
+}
+
+// WithPayload adds the payload to the get responses contexts o k response
+func (o *GetResponsesContextsOK) WithPayload(payload []*models.ResponseContext) *GetResponsesContextsOK {
+	o.Payload = payload
+	return o
+}
+
+// SetPayload sets the payload to the get responses contexts o k response
+func (o *GetResponsesContextsOK) SetPayload(payload []*models.ResponseContext) {
+	o.Payload = payload
+}
+
+// WriteResponse to the client
+func (o *GetResponsesContextsOK) WriteResponse(rw http.ResponseWriter, producer runtime.Producer) {
+
+	rw.WriteHeader(200)
+	payload := o.Payload
+	if payload == nil {
+		// return empty array
+		payload = make([]*models.ResponseContext, 0, 50)
+	}
+
+	if err := producer.Produce(rw, payload); err != nil {
+		panic(err) // let the recovery middleware deal with this
+	}
+}
+
+// GetResponsesContextsBadRequestCode is the HTTP code returned for type GetResponsesContextsBadRequest
+const GetResponsesContextsBadRequestCode int = 400
+
+/*
+GetResponsesContextsBadRequest bad request
+
+swagger:response getResponsesContextsBadRequest
+*/
+type GetResponsesContextsBadRequest struct {
+}
+
+// NewGetResponsesContextsBadRequest creates GetResponsesContextsBadRequest with default headers values
+
+func NewGetResponsesContextsBadRequest() *lhttp.HttpError {
+	return &lhttp.HttpError{
+		Code: 400,
+	}
+}
+
+// WriteResponse to the client
+func (o *GetResponsesContextsBadRequest) WriteResponse(rw http.ResponseWriter, producer runtime.Producer) {
+
+	rw.Header().Del(runtime.HeaderContentType) //Remove Content-Type on empty responses
+
+	rw.WriteHeader(400)
+}
+
+// GetResponsesContextsInternalServerErrorCode is the HTTP code returned for type GetResponsesContextsInternalServerError
+const GetResponsesContextsInternalServerErrorCode int = 500
+
+/*
+GetResponsesContextsInternalServerError internal service error
+
+swagger:response getResponsesContextsInternalServerError
+*/
+type GetResponsesContextsInternalServerError struct {
+}
+
+// NewGetResponsesContextsInternalServerError creates GetResponsesContextsInternalServerError with default headers values
+
+func NewGetResponsesContextsInternalServerError() *lhttp.HttpError {
+	return &lhttp.HttpError{
+		Code: 500,
+	}
+}
+
+// WriteResponse to the client
+func (o *GetResponsesContextsInternalServerError) WriteResponse(rw http.ResponseWriter, producer runtime.Producer) {
+
+	rw.Header().Del(runtime.HeaderContentType) //Remove Content-Type on empty responses
+
+	rw.WriteHeader(500)
+}
@@ -0,0 +1,112 @@
+// Code generated by go-swagger; DO NOT EDIT.
+
+package metrics
+
+// This file was generated by the swagger tool.
+// Editing this file might prove futile when you re-run the generate command
+
+import (
+	"errors"
+	"net/url"
+	golangswaggerpaths "path"
+)
+
+// GetResponsesContextsURL generates an URL for the get responses contexts operation
+type GetResponsesContextsURL struct {
+	ExperimentID *string
+	ResponseID   *string
+
+	_basePath string
+	// avoid unkeyed usage
+	_ struct{}
+}
+
+// WithBasePath sets the base path for this url builder, only required when it's different from the
+// base path specified in the swagger spec.
+// When the value of the base path is an empty string
+func (o *GetResponsesContextsURL) WithBasePath(bp string) *GetResponsesContextsURL {
+	o.SetBasePath(bp)
+	return o
+}
+
+// SetBasePath sets the base path for this url builder, only required when it's different from the
+// base path specified in the swagger spec.
+// When the value of the base path is an empty string
+func (o *GetResponsesContextsURL) SetBasePath(bp string) {
+	o._basePath = bp
+}
+
+// Build a url path and query string
+func (o *GetResponsesContextsURL) Build() (*url.URL, error) {
+	var _result url.URL
+
+	var _path = "/responses/contexts"
+
+	_basePath := o._basePath
+	if _basePath == "" {
+		_basePath = "/"
+	}
+	_result.Path = golangswaggerpaths.Join(_basePath, _path)
+
+	qs := make(url.Values)
+
+	var experimentIDQ string
+	if o.ExperimentID != nil {
+		experimentIDQ = *o.ExperimentID
+	}
+	if experimentIDQ != "" {
+		qs.Set("experiment_id", experimentIDQ)
+	}
+
+	var responseIDQ string
+	if o.ResponseID != nil {
+		responseIDQ = *o.ResponseID
+	}
+	if responseIDQ != "" {
+		qs.Set("response_id", responseIDQ)
+	}
+
+	_result.RawQuery = qs.Encode()
+
+	return &_result, nil
+}
+
+// Must is a helper function to panic when the url builder returns an error
+func (o *GetResponsesContextsURL) Must(u *url.URL, err error) *url.URL {
+	if err != nil {
+		panic(err)
+	}
+	if u == nil {
+		panic("url can't be nil")
+	}
+	return u
+}
+
+// String returns the string representation of the path with query string
+func (o *GetResponsesContextsURL) String() string {
+	return o.Must(o.Build()).String()
+}
+
+// BuildFull builds a full url with scheme, host, path and query string
+func (o *GetResponsesContextsURL) BuildFull(scheme, host string) (*url.URL, error) {
+	if scheme == "" {
+		return nil, errors.New("scheme is required for a full url on GetResponsesContextsURL")
+	}
+	if host == "" {
+		return nil, errors.New("host is required for a full url on GetResponsesContextsURL")
+	}
+
+	base, err := o.Build()
+	if err != nil {
+		return nil, err
+	}
+
+	base.Scheme = scheme
+	base.Host = host
+	return base, nil
+}
+
+// StringFull returns the string representation of a complete url
+func (o *GetResponsesContextsURL) StringFull(scheme, host string) string {
+	return o.Must(o.BuildFull(scheme, host)).String()
+}
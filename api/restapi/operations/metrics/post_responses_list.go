@@ -0,0 +1,58 @@
+// Code generated by go-swagger; DO NOT EDIT.
+
+package metrics
+
+// This file was generated by the swagger tool.
+// Editing this file might prove futile when you re-run the generate command
+
+import (
+	"net/http"
+
+	"github.com/go-openapi/runtime/middleware"
+)
+
+// PostResponsesListHandlerFunc turns a function with the right signature into a post responses list handler
+type PostResponsesListHandlerFunc func(PostResponsesListParams) middleware.Responder
+
+// Handle executing the request and returning a response
+func (fn PostResponsesListHandlerFunc) Handle(params PostResponsesListParams) middleware.Responder {
+	return fn(params)
+}
+
+// PostResponsesListHandler interface for that can handle valid post responses list params
+type PostResponsesListHandler interface {
+	Handle(PostResponsesListParams) middleware.Responder
+}
+
+// NewPostResponsesList creates a new http.Handler for the post responses list operation
+func NewPostResponsesList(ctx *middleware.Context, handler PostResponsesListHandler) *PostResponsesList {
+	return &PostResponsesList{Context: ctx, Handler: handler}
+}
+
+/*
+	PostResponsesList swagger:route POST /responses/list metrics postResponsesList
+
+List responses.
+
+List the responses logged to monitored experiment runs
+*/
+type PostResponsesList struct {
+	Context *middleware.Context
+	Handler PostResponsesListHandler
+}
+
+func (o *PostResponsesList) ServeHTTP(rw http.ResponseWriter, r *http.Request) {
+	route, rCtx, _ := o.Context.RouteInfo(r)
+	if rCtx != nil {
+		*r = *rCtx
+	}
+	var Params = NewPostResponsesListParams()
+	if err := o.Context.BindValidRequest(r, route, &Params); err != nil { // bind params
+		o.Context.Respond(rw, r, route.Produces, route, err)
+		return
+	}
+
+	res := o.Handler.Handle(Params) // actually handle the request
+	o.Context.Respond(rw, r, route.Produces, route, res)
+
+}
@@ -0,0 +1,116 @@
+// Code generated by go-swagger; DO NOT EDIT.
+
+package metrics
+
+// This file was generated by the swagger tool.
+// Editing this file might prove futile when you re-run the swagger generate command
+
+import (
+	"net/http"
+
+	"github.com/go-openapi/runtime"
+
+	lhttp "github.infra.cloudera.com/CAI/AmpRagMonitoring/pkg/http"
+
+	"github.infra.cloudera.com/CAI/AmpRagMonitoring/models"
+)
+
+// PostResponsesListOKCode is the HTTP code returned for type PostResponsesListOK
+const PostResponsesListOKCode int = 200
+
+/*
+PostResponsesListOK success
+
+swagger:response postResponsesListOK
+*/
+type PostResponsesListOK struct {
+
+	/*
+	  In: Body
+	*/
+	Payload *models.Responses `json:"body,omitempty"`
+}
+
+// NewPostResponsesListOK creates PostResponsesListOK with default headers values
+
+func NewPostResponsesListOK() *PostResponsesListOK {
+
+	return &PostResponsesListOK{}
+}
+
+// WithPayload adds the payload to the post responses list o k response
+func (o *PostResponsesListOK) WithPayload(payload *models.Responses) *PostResponsesListOK {
+	o.Payload = payload
+	return o
+}
+
+// SetPayload sets the payload to the post responses list o k response
+func (o *PostResponsesListOK) SetPayload(payload *models.Responses) {
+	o.Payload = payload
+}
+
+// WriteResponse to the client
+func (o *PostResponsesListOK) WriteResponse(rw http.ResponseWriter, producer runtime.Producer) {
+
+	rw.WriteHeader(200)
+	if o.Payload != nil {
+		payload := o.Payload
+		if err := producer.Produce(rw, payload); err != nil {
+			panic(err) // let the recovery middleware deal with this
+		}
+	}
+}
+
+// PostResponsesListBadRequestCode is the HTTP code returned for type PostResponsesListBadRequest
+const PostResponsesListBadRequestCode int = 400
+
+/*
+PostResponsesListBadRequest bad request
+
+swagger:response postResponsesListBadRequest
+*/
+type PostResponsesListBadRequest struct {
+}
+
+// NewPostResponsesListBadRequest creates PostResponsesListBadRequest with default headers values
+
+func NewPostResponsesListBadRequest() *lhttp.HttpError {
+	return &lhttp.HttpError{
+		Code: 400,
+	}
+}
+
+// WriteResponse to the client
+func (o *PostResponsesListBadRequest) WriteResponse(rw http.ResponseWriter, producer runtime.Producer) {
+
+	rw.Header().Del(runtime.HeaderContentType) //Remove Content-Type on empty responses
+
+	rw.WriteHeader(400)
+}
+
+// PostResponsesListInternalServerErrorCode is the HTTP code returned for type PostResponsesListInternalServerError
+const PostResponsesListInternalServerErrorCode int = 500
+
+/*
+PostResponsesListInternalServerError internal service error
+
+swagger:response postResponsesListInternalServerError
+*/
+type PostResponsesListInternalServerError struct {
+}
+
+// NewPostResponsesListInternalServerError creates PostResponsesListInternalServerError with default headers values
+
+func NewPostResponsesListInternalServerError() *lhttp.HttpError {
+	return &lhttp.HttpError{
+		Code: 500,
+	}
+}
+
+// WriteResponse to the client
+func (o *PostResponsesListInternalServerError) WriteResponse(rw http.ResponseWriter, producer runtime.Producer) {
+
+	rw.Header().Del(runtime.HeaderContentType) //Remove Content-Type on empty responses
+
+	rw.WriteHeader(500)
+}
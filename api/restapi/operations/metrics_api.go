@@ -52,12 +52,18 @@ func NewMetricsAPI(spec *loads.Document) *MetricsAPI {
 		ExperimentsGetExperimentsHandler: experiments.GetExperimentsHandlerFunc(func(params experiments.GetExperimentsParams) middleware.Responder {
 			return middleware.NotImplemented("operation experiments.GetExperiments has not yet been implemented")
 		}),
+		MetricsGetResponsesContextsHandler: metrics.GetResponsesContextsHandlerFunc(func(params metrics.GetResponsesContextsParams) middleware.Responder {
+			return middleware.NotImplemented("operation metrics.GetResponsesContexts has not yet been implemented")
+		}),
 		MetricsPostMetricsHandler: metrics.PostMetricsHandlerFunc(func(params metrics.PostMetricsParams) middleware.Responder {
 			return middleware.NotImplemented("operation metrics.PostMetrics has not yet been implemented")
 		}),
 		MetricsPostMetricsListHandler: metrics.PostMetricsListHandlerFunc(func(params metrics.PostMetricsListParams) middleware.Responder {
 			return middleware.NotImplemented("operation metrics.PostMetricsList has not yet been implemented")
 		}),
+		MetricsPostResponsesListHandler: metrics.PostResponsesListHandlerFunc(func(params metrics.PostResponsesListParams) middleware.Responder {
+			return middleware.NotImplemented("operation metrics.PostResponsesList has not yet been implemented")
+		}),
 		RunsPostRunsHandler: runs.PostRunsHandlerFunc(func(params runs.PostRunsParams) middleware.Responder {
 			return middleware.NotImplemented("operation runs.PostRuns has not yet been implemented")
 		}),
@@ -104,10 +110,14 @@ type MetricsAPI struct {
 	RunsDeleteRunsHandler runs.DeleteRunsHandler
 	// ExperimentsGetExperimentsHandler sets the operation handler for the get experiments operation
 	ExperimentsGetExperimentsHandler experiments.GetExperimentsHandler
+	// MetricsGetResponsesContextsHandler sets the operation handler for the get responses contexts operation
+	MetricsGetResponsesContextsHandler metrics.GetResponsesContextsHandler
 	// MetricsPostMetricsHandler sets the operation handler for the post metrics operation
 	MetricsPostMetricsHandler metrics.PostMetricsHandler
 	// MetricsPostMetricsListHandler sets the operation handler for the post metrics list operation
 	MetricsPostMetricsListHandler metrics.PostMetricsListHandler
+	// MetricsPostResponsesListHandler sets the operation handler for the post responses list operation
+	MetricsPostResponsesListHandler metrics.PostResponsesListHandler
 	// RunsPostRunsHandler sets the operation handler for the post runs operation
 	RunsPostRunsHandler runs.PostRunsHandler
 	// RunsPostRunsListHandler sets the operation handler for the post runs list operation
@@ -195,12 +205,18 @@ func (o *MetricsAPI) Validate() error {
 	if o.ExperimentsGetExperimentsHandler == nil {
 		unregistered = append(unregistered, "experiments.GetExperimentsHandler")
 	}
+	if o.MetricsGetResponsesContextsHandler == nil {
+		unregistered = append(unregistered, "metrics.GetResponsesContextsHandler")
+	}
 	if o.MetricsPostMetricsHandler == nil {
 		unregistered = append(unregistered, "metrics.PostMetricsHandler")
 	}
 	if o.MetricsPostMetricsListHandler == nil {
 		unregistered = append(unregistered, "metrics.PostMetricsListHandler")
 	}
+	if o.MetricsPostResponsesListHandler == nil {
+		unregistered = append(unregistered, "metrics.PostResponsesListHandler")
+	}
 	if o.RunsPostRunsHandler == nil {
 		unregistered = append(unregistered, "runs.PostRunsHandler")
 	}
@@ -303,6 +319,10 @@ func (o *MetricsAPI) initHandlerCache() {
 		o.handlers["GET"] = make(map[string]http.Handler)
 	}
 	o.handlers["GET"]["/experiments"] = experiments.NewGetExperiments(o.context, o.ExperimentsGetExperimentsHandler)
+	if o.handlers["GET"] == nil {
+		o.handlers["GET"] = make(map[string]http.Handler)
+	}
+	o.handlers["GET"]["/responses/contexts"] = metrics.NewGetResponsesContexts(o.context, o.MetricsGetResponsesContextsHandler)
 	if o.handlers["POST"] == nil {
 		o.handlers["POST"] = make(map[string]http.Handler)
 	}
@@ -314,6 +334,10 @@ func (o *MetricsAPI) initHandlerCache() {
 	if o.handlers["POST"] == nil {
 		o.handlers["POST"] = make(map[string]http.Handler)
 	}
+	o.handlers["POST"]["/responses/list"] = metrics.NewPostResponsesList(o.context, o.MetricsPostResponsesListHandler)
+	if o.handlers["POST"] == nil {
+		o.handlers["POST"] = make(map[string]http.Handler)
+	}
 	o.handlers["POST"]["/runs"] = runs.NewPostRuns(o.context, o.RunsPostRunsHandler)
 	if o.handlers["POST"] == nil {
 		o.handlers["POST"] = make(map[string]http.Handler)
@@ -0,0 +1,116 @@
+# ###########################################################################
+#
+#  CLOUDERA APPLIED MACHINE LEARNING PROTOTYPE (AMP)
+#  (C) Cloudera, Inc. 2021
+#  All rights reserved.
+#
+#  Applicable Open Source License: Apache 2.0
+#
+#  NOTE: Cloudera open source products are modular software products
+#  made up of hundreds of individual components, each of which was
+#  individually copyrighted.  Each Cloudera open source product is a
+#  collective work under U.S. Copyright Law. Your license to use the
+#  collective work is as provided in your written agreement with
+#  Cloudera.  Used apart from the collective work, this file is
+#  licensed for your use pursuant to the open source license
+#  identified above.
+#
+#  This code is provided to you pursuant a written agreement with
+#  (i) Cloudera, Inc. or (ii) a third-party authorized to distribute
+#  this code. If you do not have a written agreement with Cloudera nor
+#  with an authorized and properly licensed third party, you do not
+#  have any rights to access nor to use this code.
+#
+#  Absent a written agreement with Cloudera, Inc. (“Cloudera”) to the
+#  contrary, A) CLOUDERA PROVIDES THIS CODE TO YOU WITHOUT WARRANTIES OF ANY
+#  KIND; (B) CLOUDERA DISCLAIMS ANY AND ALL EXPRESS AND IMPLIED
+#  WARRANTIES WITH RESPECT TO THIS CODE, INCLUDING BUT NOT LIMITED TO
+#  IMPLIED WARRANTIES OF TITLE, NON-INFRINGEMENT, MERCHANTABILITY AND
+#  FITNESS FOR A PARTICULAR PURPOSE; (C) CLOUDERA IS NOT LIABLE TO YOU,
+#  AND WILL NOT DEFEND, INDEMNIFY, NOR HOLD YOU HARMLESS FOR ANY CLAIMS
+#  ARISING FROM OR RELATED TO THE CODE; AND (D)WITH RESPECT TO YOUR EXERCISE
+#  OF ANY RIGHTS GRANTED TO YOU FOR THE CODE, CLOUDERA IS NOT LIABLE FOR ANY
+#  DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, PUNITIVE OR
+#  CONSEQUENTIAL DAMAGES INCLUDING, BUT NOT LIMITED TO, DAMAGES
+#  RELATED TO LOST REVENUE, LOST PROFITS, LOSS OF INCOME, LOSS OF
+#  BUSINESS ADVANTAGE OR UNAVAILABILITY, OR LOSS OR CORRUPTION OF
+#  DATA.
+#
+# ###########################################################################
+
+"""
+Compare benchmark results against a baseline and flag regressions.
+
+Both files are ``pytest --benchmark-json`` outputs. A benchmark regresses when the
+chosen statistic grew by more than ``--threshold`` percent; the command then exits
+with status 1, so it can gate a release.
+
+    python -m benchmarks.compare benchmarks/baselines/main.json results.json
+    python -m benchmarks.compare old.json new.json --stat mean --threshold 20
+
+"""
+
+import argparse
+import json
+import sys
+from typing import Dict
+
+
+def load_stats(path: str, stat: str) -> Dict[str, float]:
+    """The chosen statistic, in seconds, of each benchmark in a results file"""
+    with open(path, encoding="utf-8") as f:
+        results = json.load(f)
+    return {
+        benchmark["fullname"]: benchmark["stats"][stat]
+        for benchmark in results["benchmarks"]
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[1])
+    parser.add_argument("baseline")
+    parser.add_argument("current")
+    parser.add_argument(
+        "--stat", default="median", choices=["min", "max", "mean", "median"]
+    )
+    parser.add_argument(
+        "--threshold", type=float, default=10.0, help="allowed slowdown, in percent"
+    )
+    args = parser.parse_args()
+
+    baseline = load_stats(args.baseline, args.stat)
+    current = load_stats(args.current, args.stat)
+
+    regressions = 0
+    width = max(map(len, baseline.keys() | current.keys()), default=9)
+    print(
+        f"{'benchmark':<{width}} {'baseline ms':>12} {'current ms':>11} {'change':>8}"
+    )
+    for name in sorted(baseline.keys() | current.keys()):
+        if name not in current or name not in baseline:
+            status = "removed" if name not in current else "new"
+            before = f"{baseline[name] * 1000:.4f}" if name in baseline else "-"
+            after = f"{current[name] * 1000:.4f}" if name in current else "-"
+            print(f"{name:<{width}} {before:>12} {after:>11} {status:>8}")
+            continue
+        change = (current[name] / baseline[name] - 1) * 100
+        flag = ""
+        if change > args.threshold:
+            flag = "  REGRESSION"
+            regressions += 1
+        print(
+            f"{name:<{width}} {baseline[name] * 1000:>12.4f} "
+            f"{current[name] * 1000:>11.4f} {change:>+7.1f}%{flag}"
+        )
+
+    if regressions:
+        print(
+            f"\n{regressions} benchmark(s) regressed by more than {args.threshold}% "
+            f"in {args.stat}"
+        )
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,251 @@
+# ###########################################################################
+#
+#  CLOUDERA APPLIED MACHINE LEARNING PROTOTYPE (AMP)
+#  (C) Cloudera, Inc. 2021
+#  All rights reserved.
+#
+#  Applicable Open Source License: Apache 2.0
+#
+#  NOTE: Cloudera open source products are modular software products
+#  made up of hundreds of individual components, each of which was
+#  individually copyrighted.  Each Cloudera open source product is a
+#  collective work under U.S. Copyright Law. Your license to use the
+#  collective work is as provided in your written agreement with
+#  Cloudera.  Used apart from the collective work, this file is
+#  licensed for your use pursuant to the open source license
+#  identified above.
+#
+#  This code is provided to you pursuant a written agreement with
+#  (i) Cloudera, Inc. or (ii) a third-party authorized to distribute
+#  this code. If you do not have a written agreement with Cloudera nor
+#  with an authorized and properly licensed third party, you do not
+#  have any rights to access nor to use this code.
+#
+#  Absent a written agreement with Cloudera, Inc. (“Cloudera”) to the
+#  contrary, A) CLOUDERA PROVIDES THIS CODE TO YOU WITHOUT WARRANTIES OF ANY
+#  KIND; (B) CLOUDERA DISCLAIMS ANY AND ALL EXPRESS AND IMPLIED
+#  WARRANTIES WITH RESPECT TO THIS CODE, INCLUDING BUT NOT LIMITED TO
+#  IMPLIED WARRANTIES OF TITLE, NON-INFRINGEMENT, MERCHANTABILITY AND
+#  FITNESS FOR A PARTICULAR PURPOSE; (C) CLOUDERA IS NOT LIABLE TO YOU,
+#  AND WILL NOT DEFEND, INDEMNIFY, NOR HOLD YOU HARMLESS FOR ANY CLAIMS
+#  ARISING FROM OR RELATED TO THE CODE; AND (D)WITH RESPECT TO YOUR EXERCISE
+#  OF ANY RIGHTS GRANTED TO YOU FOR THE CODE, CLOUDERA IS NOT LIABLE FOR ANY
+#  DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, PUNITIVE OR
+#  CONSEQUENTIAL DAMAGES INCLUDING, BUT NOT LIMITED TO, DAMAGES
+#  RELATED TO LOST REVENUE, LOST PROFITS, LOSS OF INCOME, LOSS OF
+#  BUSINESS ADVANTAGE OR UNAVAILABILITY, OR LOSS OR CORRUPTION OF
+#  DATA.
+#
+# ###########################################################################
+
+"""
+Shared setup of the benchmark suite.
+
+The service is configured, before it is first imported, to run fully offline: the
+fake LLM and embedding models with no simulated latency and no rate limits,
+in-process Qdrant, and a local MLflow tracking directory. The benchmarks thus measure the service's own
+overhead, reproducibly, on any machine.
+
+Run from the repository root, saving the results as a baseline:
+
+    pip install -r benchmarks/requirements.txt
+    pytest benchmarks --benchmark-json=benchmarks/baselines/<name>.json
+
+and compare a later run against it with :mod:`benchmarks.compare`.
+
+"""
+
+import json
+import os
+import random
+import shutil
+import tempfile
+import uuid
+from typing import Optional
+
+_MLRUNS = tempfile.mkdtemp(prefix="benchmark-mlruns-")
+
+for name, value in {
+    "BACKEND_LLM": "fake",
+    "BACKEND_EMBEDDING": "fake",
+    "BACKEND_QDRANT_LOCATION": ":memory:",
+    "BACKEND_FAKE_LLM_LATENCY": "0",
+    "BACKEND_FAKE_LLM_JITTER": "0",
+    "BACKEND_FAKE_LLM_TOKENS_PER_SECOND": "1e9",
+    "BACKEND_FAKE_EMBED_LATENCY": "0",
+    # measure the pipeline rather than the governor's rate limits
+    "BEDROCK_REQUESTS_PER_SECOND": "1e6",
+    "BEDROCK_TOKENS_PER_MINUTE": "1000000000",
+    "TRACKING_URI": f"file://{_MLRUNS}",
+    # nothing listens there, so registering runs fails fast
+    "MLFLOW_STORE_URI": "http://127.0.0.1:9",
+}.items():
+    os.environ.setdefault(name, value)
+
+import pytest  # noqa: E402
+
+SAMPLE_DATA_DIR = os.path.join(os.path.dirname(__file__), "..", "sample_data")
+
+
+@pytest.fixture(scope="session")
+def sample_data_dir():
+    """A copy of the sample documents, as uploaded from a temporary directory"""
+    directory = tempfile.mkdtemp(prefix="benchmark-data-")
+    for filename in os.listdir(SAMPLE_DATA_DIR):
+        shutil.copy(os.path.join(SAMPLE_DATA_DIR, filename), directory)
+    yield directory
+    shutil.rmtree(directory, ignore_errors=True)
+
+
+@pytest.fixture(scope="session")
+def data_source_id(sample_data_dir):
+    """A data source with the sample documents indexed"""
+    from service.routers.index import qdrant
+
+    qdrant.upload(sample_data_dir, 1, qdrant.RagIndexDocumentConfiguration())
+    return 1
+
+
+def make_live_results(runs: int, nodes: int = 5, seed: int = 0):
+    """Metric store ``live_results.json`` metrics for ``runs`` single-response runs"""
+    rng = random.Random(seed)
+    columns = [
+        "response_id",
+        "input",
+        "input_length",
+        "output",
+        "output_length",
+        "source_nodes",
+    ]
+    results = []
+    for run in range(runs):
+        response_id = str(uuid.UUID(int=rng.getrandbits(128)))
+        data = [
+            [
+                response_id,
+                f"question {run}",
+                2,
+                "an answer " * 40,
+                80,
+                {
+                    "node_id": str(node),
+                    "doc_id": "doc",
+                    "source_file_name": "Cloudera Machine Learning Overview.pdf",
+                    "score": rng.random(),
+                    "content": "retrieved context " * 100,
+                },
+            ]
+            for node in range(nodes)
+        ]
+        results.append(
+            {
+                "experiment_run_id": f"run-{run}",
+                "name": "live_results.json",
+                "ts": f"2024-10-{run % 28 + 1:02d}T{run % 24:02d}:00:00.000Z",
+                "value": {
+                    "metricType": "text",
+                    "stringValue": json.dumps({"columns": columns, "data": data}),
+                },
+            }
+        )
+    return results
+
+
+def make_live_responses(runs: int, nodes: int = 5, seed: int = 0):
+    """
+    Metric store ``live_responses.json`` and ``live_nodes.json`` metrics for ``runs``
+    single-response runs
+    """
+    rng = random.Random(seed)
+    results = []
+    for run in range(runs):
+        ts = f"2024-10-{run % 28 + 1:02d}T{run % 24:02d}:00:00.000Z"
+        response = [
+            str(uuid.UUID(int=rng.getrandbits(128))),
+            1,
+            ts,
+            f"question {run}",
+            2,
+            "an answer " * 40,
+            80,
+            [
+                {
+                    "node_id": str(node),
+                    "source_file_name": "Cloudera Machine Learning Overview.pdf",
+                    "score": rng.random(),
+                }
+                for node in range(nodes)
+            ],
+        ]
+        tables = {
+            "live_responses.json": {
+                "columns": [
+                    "response_id",
+                    "step",
+                    "timestamp",
+                    "input",
+                    "input_length",
+                    "output",
+                    "output_length",
+                    "source_nodes",
+                ],
+                "data": [response],
+            },
+            "live_nodes.json": {
+                "columns": ["node_id", "doc_id", "content"],
+                "data": [
+                    [str(node), "doc", "retrieved context " * 100]
+                    for node in range(nodes)
+                ],
+            },
+        }
+        for name, table in tables.items():
+            results.append(
+                {
+                    "experiment_run_id": f"run-{run}",
+                    "name": name,
+                    "ts": ts,
+                    "value": {
+                        "metricType": "text",
+                        "stringValue": json.dumps(table),
+                    },
+                }
+            )
+    return results
+
+
+def make_responses(runs: int, seed: int = 0):
+    """Metric store indexed responses, one per single-response run, newest first"""
+    rng = random.Random(seed)
+    responses = [
+        {
+            "id": run + 1,
+            "response_id": str(uuid.UUID(int=rng.getrandbits(128))),
+            "experiment_id": "1",
+            "experiment_run_id": f"run-{run}",
+            "step": 1,
+            "input": f"question {run}",
+            "output": "an answer " * 40,
+            "input_length": 2,
+            "output_length": 80,
+            "top_score": rng.random(),
+            "ts": f"2024-10-{run % 28 + 1:02d}T{run % 24:02d}:00:00.000Z",
+        }
+        for run in range(runs)
+    ]
+    return responses[::-1]
+
+
+def make_metric(name: str, runs: int, seed: int = 0, step: Optional[int] = None):
+    """Metric store numeric metrics, one per run, tagged with ``step`` if given"""
+    rng = random.Random(seed)
+    tags = [] if step is None else [{"key": "step", "value": str(step)}]
+    return [
+        {
+            "experiment_run_id": f"run-{run}",
+            "name": name,
+            "tags": tags,
+            "value": {"metricType": "numeric", "numericValue": rng.random()},
+        }
+        for run in range(runs)
+    ]
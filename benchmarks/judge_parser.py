@@ -0,0 +1,132 @@
+# ###########################################################################
+#
+#  CLOUDERA APPLIED MACHINE LEARNING PROTOTYPE (AMP)
+#  (C) Cloudera, Inc. 2021
+#  All rights reserved.
+#
+#  Applicable Open Source License: Apache 2.0
+#
+#  NOTE: Cloudera open source products are modular software products
+#  made up of hundreds of individual components, each of which was
+#  individually copyrighted.  Each Cloudera open source product is a
+#  collective work under U.S. Copyright Law. Your license to use the
+#  collective work is as provided in your written agreement with
+#  Cloudera.  Used apart from the collective work, this file is
+#  licensed for your use pursuant to the open source license
+#  identified above.
+#
+#  This code is provided to you pursuant a written agreement with
+#  (i) Cloudera, Inc. or (ii) a third-party authorized to distribute
+#  this code. If you do not have a written agreement with Cloudera nor
+#  with an authorized and properly licensed third party, you do not
+#  have any rights to access nor to use this code.
+#
+#  Absent a written agreement with Cloudera, Inc. (“Cloudera”) to the
+#  contrary, A) CLOUDERA PROVIDES THIS CODE TO YOU WITHOUT WARRANTIES OF ANY
+#  KIND; (B) CLOUDERA DISCLAIMS ANY AND ALL EXPRESS AND IMPLIED
+#  WARRANTIES WITH RESPECT TO THIS CODE, INCLUDING BUT NOT LIMITED TO
+#  IMPLIED WARRANTIES OF TITLE, NON-INFRINGEMENT, MERCHANTABILITY AND
+#  FITNESS FOR A PARTICULAR PURPOSE; (C) CLOUDERA IS NOT LIABLE TO YOU,
+#  AND WILL NOT DEFEND, INDEMNIFY, NOR HOLD YOU HARMLESS FOR ANY CLAIMS
+#  ARISING FROM OR RELATED TO THE CODE; AND (D)WITH RESPECT TO YOUR EXERCISE
+#  OF ANY RIGHTS GRANTED TO YOU FOR THE CODE, CLOUDERA IS NOT LIABLE FOR ANY
+#  DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, PUNITIVE OR
+#  CONSEQUENTIAL DAMAGES INCLUDING, BUT NOT LIMITED TO, DAMAGES
+#  RELATED TO LOST REVENUE, LOST PROFITS, LOSS OF INCOME, LOSS OF
+#  BUSINESS ADVANTAGE OR UNAVAILABILITY, OR LOSS OR CORRUPTION OF
+#  DATA.
+#
+# ###########################################################################
+
+"""
+Micro-benchmark of the judge output parsers.
+
+Compares the original regex parser with the linear scanner used by
+``CustomEvaluator`` on judge outputs of increasing length, both for outputs that end
+in a ``[RESULT] n`` marker and for outputs that never produce one (the regex's worst
+case), and shows how much text the streaming scanner consumes before it stops.
+
+Run from the repository root:
+
+    python -m benchmarks.judge_parser
+
+"""
+
+import argparse
+import re
+import timeit
+
+from service.routers.index.judge import ResultScanner, _default_parser_function
+
+_REGEX = re.compile(r"([\s\S]+)(?:\[RESULT\]\s*)(\d)")
+
+
+def regex_parser(output_str: str):
+    result = _REGEX.search(output_str)
+    if result:
+        feedback, score = result.groups()
+        return float(score), feedback.strip()
+    return None, None
+
+
+def make_output(length: int, with_result: bool) -> str:
+    line = "1. The response is relevant to the query. I assign a score of 1 [see 2].\n"
+    body = (line * (length // len(line) + 1))[:length]
+    if with_result:
+        return body + "Final result: [RESULT] 2\n" + line * 20
+    return body
+
+
+def stream_chunks(text: str, chunk_size: int = 16):
+    return [text[i : i + chunk_size] for i in range(0, len(text), chunk_size)]
+
+
+def scan_stream(chunks) -> int:
+    scanner = ResultScanner()
+    for chunk in chunks:
+        if scanner.feed(chunk):
+            break
+    return len(scanner.text)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "--lengths", type=int, nargs="+", default=[1_000, 4_000, 16_000]
+    )
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'chars':>8} {'result':>6} {'regex ms':>10} {'scanner ms':>11}")
+    for length in args.lengths:
+        for with_result in (True, False):
+            text = make_output(length, with_result)
+            assert regex_parser(text) == _default_parser_function(text)
+            number = max(1, 10_000 // length)
+            timings = []
+            for parse in (regex_parser, _default_parser_function):
+                best = min(
+                    timeit.repeat(
+                        lambda: parse(text), number=number, repeat=args.repeat
+                    )
+                )
+                timings.append(best / number * 1000)
+            print(
+                f"{length:>8} {str(with_result):>6} {timings[0]:>10.3f} {timings[1]:>11.3f}"
+            )
+
+    print()
+    print(f"{'chars':>8} {'consumed':>9} {'stream ms':>10}")
+    for length in args.lengths:
+        chunks = stream_chunks(make_output(length, True))
+        number = max(1, 10_000 // length)
+        best = min(
+            timeit.repeat(
+                lambda: scan_stream(chunks), number=number, repeat=args.repeat
+            )
+        )
+        print(f"{length:>8} {scan_stream(chunks):>9} {best / number * 1000:>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+# ###########################################################################
+#
+#  CLOUDERA APPLIED MACHINE LEARNING PROTOTYPE (AMP)
+#  (C) Cloudera, Inc. 2021
+#  All rights reserved.
+#
+#  Applicable Open Source License: Apache 2.0
+#
+#  NOTE: Cloudera open source products are modular software products
+#  made up of hundreds of individual components, each of which was
+#  individually copyrighted.  Each Cloudera open source product is a
+#  collective work under U.S. Copyright Law. Your license to use the
+#  collective work is as provided in your written agreement with
+#  Cloudera.  Used apart from the collective work, this file is
+#  licensed for your use pursuant to the open source license
+#  identified above.
+#
+#  This code is provided to you pursuant a written agreement with
+#  (i) Cloudera, Inc. or (ii) a third-party authorized to distribute
+#  this code. If you do not have a written agreement with Cloudera nor
+#  with an authorized and properly licensed third party, you do not
+#  have any rights to access nor to use this code.
+#
+#  Absent a written agreement with Cloudera, Inc. (“Cloudera”) to the
+#  contrary, A) CLOUDERA PROVIDES THIS CODE TO YOU WITHOUT WARRANTIES OF ANY
+#  KIND; (B) CLOUDERA DISCLAIMS ANY AND ALL EXPRESS AND IMPLIED
+#  WARRANTIES WITH RESPECT TO THIS CODE, INCLUDING BUT NOT LIMITED TO
+#  IMPLIED WARRANTIES OF TITLE, NON-INFRINGEMENT, MERCHANTABILITY AND
+#  FITNESS FOR A PARTICULAR PURPOSE; (C) CLOUDERA IS NOT LIABLE TO YOU,
+#  AND WILL NOT DEFEND, INDEMNIFY, NOR HOLD YOU HARMLESS FOR ANY CLAIMS
+#  ARISING FROM OR RELATED TO THE CODE; AND (D)WITH RESPECT TO YOUR EXERCISE
+#  OF ANY RIGHTS GRANTED TO YOU FOR THE CODE, CLOUDERA IS NOT LIABLE FOR ANY
+#  DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, PUNITIVE OR
+#  CONSEQUENTIAL DAMAGES INCLUDING, BUT NOT LIMITED TO, DAMAGES
+#  RELATED TO LOST REVENUE, LOST PROFITS, LOSS OF INCOME, LOSS OF
+#  BUSINESS ADVANTAGE OR UNAVAILABILITY, OR LOSS OR CORRUPTION OF
+#  DATA.
+#
+# ###########################################################################
+
+"""Tests of the backfill's paging through the responses still to be scored."""
+
+import asyncio
+import json
+
+from service.routers.index import backfill
+
+
+def _responses_table(run_id, steps):
+    rows = [[f"{run_id}-{step}", step, f"question {step}", "answer"] for step in steps]
+    table = {"columns": ["response_id", "step", "input", "output"], "data": rows}
+    return {
+        "experiment_run_id": run_id,
+        "name": backfill.LIVE_RESPONSES,
+        "value": {"metricType": "text", "stringValue": json.dumps(table)},
+    }
+
+
+def _score(run_id, name, step=None):
+    return {
+        "experiment_run_id": run_id,
+        "name": name,
+        "tags": [] if step is None else [{"key": "step", "value": str(step)}],
+        "value": {"metricType": "numeric", "numericValue": 1.0},
+    }
+
+
+def _pages(monkeypatch, metrics, metric_names):
+    monkeypatch.setattr(backfill, "_post_to_store", lambda path, payload: metrics)
+
+    async def collect():
+        return [
+            page
+            async for page in backfill.iter_run_pages(
+                "1", ["run-1", "run-2"], metric_names, page_size=10
+            )
+        ]
+
+    return asyncio.run(collect())
+
+
+def test_only_the_unscored_steps_of_a_shared_run_are_left_to_score(monkeypatch):
+    metrics = [
+        _responses_table("run-1", [1, 2]),
+        _score("run-1", "tone_score", step=1),
+        _responses_table("run-2", [1]),
+        _score("run-2", "tone_score", step=1),
+    ]
+
+    ((page, responses, scored),) = _pages(monkeypatch, metrics, ["tone_score"])
+
+    assert [response.step for response in responses["run-1"]] == [2]
+    assert responses["run-2"] == []
+    assert scored == {"run-2"}
+
+
+def test_a_score_logged_without_a_step_covers_an_older_run(monkeypatch):
+    metrics = [
+        _responses_table("run-1", [1]),
+        _score("run-1", "tone_score"),
+        _responses_table("run-2", [1]),
+    ]
+
+    ((page, responses, scored),) = _pages(monkeypatch, metrics, ["tone_score"])
+
+    assert scored == {"run-1"}
+    assert [response.step for response in responses["run-2"]] == [1]
+
+
+def test_every_response_is_left_to_score_when_overwriting(monkeypatch):
+    metrics = [
+        _responses_table("run-1", [1, 2]),
+        _score("run-1", "tone_score", step=1),
+        _score("run-1", "tone_score", step=2),
+    ]
+
+    ((page, responses, scored),) = _pages(monkeypatch, metrics, [])
+
+    assert [response.step for response in responses["run-1"]] == [1, 2]
+    assert scored == {"run-2"}
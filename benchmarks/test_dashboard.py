@@ -0,0 +1,242 @@
+# ###########################################################################
+#
+#  CLOUDERA APPLIED MACHINE LEARNING PROTOTYPE (AMP)
+#  (C) Cloudera, Inc. 2021
+#  All rights reserved.
+#
+#  Applicable Open Source License: Apache 2.0
+#
+#  NOTE: Cloudera open source products are modular software products
+#  made up of hundreds of individual components, each of which was
+#  individually copyrighted.  Each Cloudera open source product is a
+#  collective work under U.S. Copyright Law. Your license to use the
+#  collective work is as provided in your written agreement with
+#  Cloudera.  Used apart from the collective work, this file is
+#  licensed for your use pursuant to the open source license
+#  identified above.
+#
+#  This code is provided to you pursuant a written agreement with
+#  (i) Cloudera, Inc. or (ii) a third-party authorized to distribute
+#  this code. If you do not have a written agreement with Cloudera nor
+#  with an authorized and properly licensed third party, you do not
+#  have any rights to access nor to use this code.
+#
+#  Absent a written agreement with Cloudera, Inc. (“Cloudera”) to the
+#  contrary, A) CLOUDERA PROVIDES THIS CODE TO YOU WITHOUT WARRANTIES OF ANY
+#  KIND; (B) CLOUDERA DISCLAIMS ANY AND ALL EXPRESS AND IMPLIED
+#  WARRANTIES WITH RESPECT TO THIS CODE, INCLUDING BUT NOT LIMITED TO
+#  IMPLIED WARRANTIES OF TITLE, NON-INFRINGEMENT, MERCHANTABILITY AND
+#  FITNESS FOR A PARTICULAR PURPOSE; (C) CLOUDERA IS NOT LIABLE TO YOU,
+#  AND WILL NOT DEFEND, INDEMNIFY, NOR HOLD YOU HARMLESS FOR ANY CLAIMS
+#  ARISING FROM OR RELATED TO THE CODE; AND (D)WITH RESPECT TO YOUR EXERCISE
+#  OF ANY RIGHTS GRANTED TO YOU FOR THE CODE, CLOUDERA IS NOT LIABLE FOR ANY
+#  DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, PUNITIVE OR
+#  CONSEQUENTIAL DAMAGES INCLUDING, BUT NOT LIMITED TO, DAMAGES
+#  RELATED TO LOST REVENUE, LOST PROFITS, LOSS OF INCOME, LOSS OF
+#  BUSINESS ADVANTAGE OR UNAVAILABILITY, OR LOSS OR CORRUPTION OF
+#  DATA.
+#
+# ###########################################################################
+
+"""Benchmarks of the monitoring dashboard's DataFrame building."""
+
+import json
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from st_app.metrics_frames import (
+    LiveResults,
+    join_metrics,
+    metrics_frame,
+    parse_live_results,
+    responses_frame,
+)
+
+from .conftest import (
+    make_live_responses,
+    make_live_results,
+    make_metric,
+    make_responses,
+)
+
+METRICS = [
+    "thumbs_up",
+    "faithfulness_score",
+    "relevance_score",
+    "context_relevancy_score",
+    "maliciousness_score",
+    "toxicity_score",
+    "comprehensiveness_score",
+    "query_context_similarity",
+    "context_coverage",
+    "answer_context_similarity",
+    "answer_grounding",
+]
+
+
+@pytest.mark.parametrize("runs", [100, 1_000])
+def test_parse_live_results(benchmark, runs):
+    results = make_live_results(runs)
+    live_results_df = benchmark(parse_live_results, results)
+    assert len(live_results_df) == runs
+
+
+@pytest.mark.parametrize("runs", [100, 1_000])
+def test_parse_live_responses(benchmark, runs):
+    results = make_live_responses(runs)
+    live_results_df = benchmark(parse_live_results, results)
+    assert len(live_results_df) == runs
+    assert live_results_df["contexts"].str.contains("retrieved context").all()
+
+
+@pytest.mark.parametrize("runs", [1_000, 10_000])
+def test_responses_frame(benchmark, runs):
+    responses = make_responses(runs)
+    live_results_df = benchmark(responses_frame, responses)
+    assert len(live_results_df) == runs
+    assert live_results_df["timestamp"].is_monotonic_increasing
+
+
+@pytest.mark.parametrize("stepped", [True, False])
+@pytest.mark.parametrize("runs", [1_000, 10_000])
+def test_merge_metrics(benchmark, runs, stepped):
+    if stepped:
+        live_results_df = responses_frame(make_responses(runs))
+    else:
+        live_results_df = parse_live_results(make_live_results(runs, nodes=1))
+    metrics_response = [
+        metric
+        for seed, name in enumerate(METRICS)
+        for metric in make_metric(name, runs, seed, step=1 if stepped else None)
+    ]
+    columns = {name: name for name in METRICS}
+
+    def merge_all():
+        return join_metrics(live_results_df, metrics_frame(metrics_response, columns))
+
+    merged_df = benchmark(merge_all)
+    assert merged_df.shape == (runs, len(live_results_df.columns) + len(METRICS))
+    assert merged_df[METRICS].notna().all().all()
+
+
+@pytest.mark.parametrize("runs", [1_000, 10_000])
+def test_live_results_refresh(benchmark, runs):
+    """A live refresh finding nothing new, what an idle dashboard costs per interval"""
+    responses = make_responses(runs)
+    metrics_response = [
+        metric
+        for seed, name in enumerate(METRICS)
+        for metric in make_metric(name, runs, seed, step=1)
+    ]
+    start_timestamps = []
+
+    def fetch(items):
+        def fetch_since(start_ts):
+            start_timestamps.append(start_ts)
+            return items if start_ts is None else []
+
+        return fetch_since
+
+    live_results = LiveResults(
+        fetch(responses),
+        fetch(metrics_response),
+        {name: name for name in METRICS},
+        interval=0,
+    )
+    assert live_results.refresh()
+    version = live_results.version
+
+    assert not benchmark(live_results.refresh)
+    assert live_results.version == version
+    assert len(live_results.frame) == runs
+    assert start_timestamps[:2] == [None, None] and all(start_timestamps[2:])
+
+
+class _StubStore(BaseHTTPRequestHandler):
+    """The metric store endpoints the dashboard reads, over the responses given"""
+
+    runs = ["run-0"]
+    responses = []
+
+    def _send(self, body):
+        payload = json.dumps(body).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_GET(self):
+        self._send(["1"] if self.path == "/experiments" else [])
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        if self.path == "/runs/list":
+            return self._send(
+                [{"experiment_id": "1", "experiment_run_id": r} for r in self.runs]
+            )
+        if self.path == "/responses/list":
+            responses = [
+                response
+                for response in self.responses
+                if not body.get("run_ids")
+                or response["experiment_run_id"] in body["run_ids"]
+            ]
+            return self._send({"responses": responses, "total": len(responses)})
+        self._send([])
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def stub_store():
+    """The stub store, where the dashboard expects the metric store"""
+    try:
+        server = ThreadingHTTPServer(("127.0.0.1", 3000), _StubStore)
+    except OSError:
+        pytest.skip("port 3000 is in use")
+    _StubStore.responses = make_responses(1)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield _StubStore
+    server.shutdown()
+    server.server_close()
+
+
+def test_live_dashboard_shows_the_runs_opened_after_it_loaded(stub_store, monkeypatch):
+    """A live panel reruns alone, without listing the runs of the experiment again"""
+    testing = pytest.importorskip("streamlit.testing.v1")
+    st_app_dir = os.path.join(os.path.dirname(__file__), "..", "st_app")
+    collections_json = os.path.join(st_app_dir, "collections.json")
+
+    class Collections:
+        collections = [1]
+
+    monkeypatch.setattr(
+        "qdrant_client.QdrantClient.get_collections", lambda self: Collections
+    )
+    monkeypatch.syspath_prepend(st_app_dir)
+    with open(collections_json, "w") as f:
+        json.dump([{"id": 1, "name": "data source"}], f)
+    try:
+        app = testing.AppTest.from_file(
+            os.path.join(st_app_dir, "pages", "4_Monitoring_Dashboard.py"),
+            default_timeout=60,
+        )
+        app.run()
+        app.toggle[0].set_value(True).run()
+        assert len(app.dataframe[-1].value) == 1
+
+        # the run list is the page's, so only the responses store has the new run
+        stub_store.responses = make_responses(2)
+        app.button[0].click().run()
+        assert not app.exception
+        assert app.dataframe[-1].value["input"].to_list() == [
+            "question 1",
+            "question 0",
+        ]
+    finally:
+        os.remove(collections_json)
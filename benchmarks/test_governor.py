@@ -0,0 +1,138 @@
+# ###########################################################################
+#
+#  CLOUDERA APPLIED MACHINE LEARNING PROTOTYPE (AMP)
+#  (C) Cloudera, Inc. 2021
+#  All rights reserved.
+#
+#  Applicable Open Source License: Apache 2.0
+#
+#  NOTE: Cloudera open source products are modular software products
+#  made up of hundreds of individual components, each of which was
+#  individually copyrighted.  Each Cloudera open source product is a
+#  collective work under U.S. Copyright Law. Your license to use the
+#  collective work is as provided in your written agreement with
+#  Cloudera.  Used apart from the collective work, this file is
+#  licensed for your use pursuant to the open source license
+#  identified above.
+#
+#  This code is provided to you pursuant a written agreement with
+#  (i) Cloudera, Inc. or (ii) a third-party authorized to distribute
+#  this code. If you do not have a written agreement with Cloudera nor
+#  with an authorized and properly licensed third party, you do not
+#  have any rights to access nor to use this code.
+#
+#  Absent a written agreement with Cloudera, Inc. (“Cloudera”) to the
+#  contrary, A) CLOUDERA PROVIDES THIS CODE TO YOU WITHOUT WARRANTIES OF ANY
+#  KIND; (B) CLOUDERA DISCLAIMS ANY AND ALL EXPRESS AND IMPLIED
+#  WARRANTIES WITH RESPECT TO THIS CODE, INCLUDING BUT NOT LIMITED TO
+#  IMPLIED WARRANTIES OF TITLE, NON-INFRINGEMENT, MERCHANTABILITY AND
+#  FITNESS FOR A PARTICULAR PURPOSE; (C) CLOUDERA IS NOT LIABLE TO YOU,
+#  AND WILL NOT DEFEND, INDEMNIFY, NOR HOLD YOU HARMLESS FOR ANY CLAIMS
+#  ARISING FROM OR RELATED TO THE CODE; AND (D)WITH RESPECT TO YOUR EXERCISE
+#  OF ANY RIGHTS GRANTED TO YOU FOR THE CODE, CLOUDERA IS NOT LIABLE FOR ANY
+#  DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, PUNITIVE OR
+#  CONSEQUENTIAL DAMAGES INCLUDING, BUT NOT LIMITED TO, DAMAGES
+#  RELATED TO LOST REVENUE, LOST PROFITS, LOSS OF INCOME, LOSS OF
+#  BUSINESS ADVANTAGE OR UNAVAILABILITY, OR LOSS OR CORRUPTION OF
+#  DATA.
+#
+# ###########################################################################
+
+"""Tests of the Bedrock governor's token buckets, priority queue and back-off."""
+
+import threading
+import time
+
+import pytest
+
+from service.routers.index import governor as governor_module
+from service.routers.index.governor import ModelGovernor, Priority, _TokenBucket
+
+
+@pytest.fixture(autouse=True)
+def no_jitter(monkeypatch):
+    monkeypatch.setattr(governor_module.random, "uniform", lambda a, b: b)
+
+
+def make_governor(**limits) -> ModelGovernor:
+    return ModelGovernor(
+        model="test",
+        **{
+            "max_concurrency": 1,
+            "requests_per_second": 1000.0,
+            "tokens_per_minute": 6_000_000,
+            **limits,
+        },
+    )
+
+
+def test_token_bucket_refills_at_the_scaled_rate_up_to_its_capacity():
+    bucket = _TokenBucket(rate_per_second=10.0, capacity=20.0)
+    bucket.consume(20.0)
+    assert bucket.delay_for(5.0, rate_factor=1.0) == pytest.approx(0.5)
+    assert bucket.delay_for(5.0, rate_factor=0.5) == pytest.approx(1.0)
+    # amounts above the capacity wait for a full bucket only
+    assert bucket.delay_for(100.0, rate_factor=1.0) == pytest.approx(2.0)
+
+    bucket.refill(bucket._updated + 1.0, rate_factor=1.0)
+    assert bucket.level == pytest.approx(10.0)
+    bucket.refill(bucket._updated + 60.0, rate_factor=1.0)
+    assert bucket.level == pytest.approx(20.0)
+    bucket.refund(5.0)
+    assert bucket.level == pytest.approx(20.0)
+
+
+def test_waiters_are_admitted_by_priority():
+    governor = make_governor()
+    lease = governor.acquire(Priority.INTERACTIVE, 1)
+    admitted = []
+
+    def call(priority):
+        governor.acquire(priority, 1).release(1)
+        admitted.append(priority)
+
+    threads = []
+    for priority in [Priority.BACKFILL, Priority.EVALUATION, Priority.INTERACTIVE]:
+        threads.append(threading.Thread(target=call, args=(priority,)))
+        threads[-1].start()
+        while governor.snapshot()["queued"] < len(threads):
+            time.sleep(0.001)
+    lease.release(1)
+    for thread in threads:
+        thread.join(timeout=5)
+
+    assert admitted == [Priority.INTERACTIVE, Priority.EVALUATION, Priority.BACKFILL]
+    assert governor.snapshot()["in_flight"] == 0
+
+
+def test_throttles_shrink_the_rate_and_successes_grow_it_back():
+    governor = make_governor()
+    for rate_factor in [0.5, 0.25, 0.125, 0.1, 0.1]:
+        governor.acquire(Priority.INTERACTIVE, 1).release(throttled=True)
+        assert governor.snapshot()["rate_factor"] == pytest.approx(rate_factor)
+    # the back-off doubles with each consecutive throttle
+    assert governor._consecutive_throttles == 5
+    backoff = governor._cooldown_until - time.monotonic()
+    assert 4.0 < backoff <= 8.0
+
+    governor._cooldown_until = 0.0
+    governor.acquire(Priority.INTERACTIVE, 1).release(1)
+    snapshot = governor.snapshot()
+    assert snapshot["rate_factor"] == pytest.approx(0.15)
+    assert snapshot["throttle_count"] == 5
+    assert governor._consecutive_throttles == 0
+
+
+def test_a_throttled_release_backs_off_before_waking_the_next_waiter():
+    governor = make_governor()
+    lease = governor.acquire(Priority.INTERACTIVE, 1)
+    waiter = governor_module._Waiter()
+    cooldowns_when_woken = []
+    waiter.wake = lambda: cooldowns_when_woken.append(governor._cooldown_until)
+    governor._enqueue(Priority.INTERACTIVE, waiter)
+
+    lease.release(throttled=True)
+
+    assert cooldowns_when_woken and cooldowns_when_woken[0] > time.monotonic()
+    delay = governor._admit_or_delay(waiter, 1)
+    assert delay == pytest.approx(governor_module._BASE_BACKOFF_SECONDS, abs=0.05)
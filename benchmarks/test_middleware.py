@@ -0,0 +1,150 @@
+# ###########################################################################
+#
+#  CLOUDERA APPLIED MACHINE LEARNING PROTOTYPE (AMP)
+#  (C) Cloudera, Inc. 2021
+#  All rights reserved.
+#
+#  Applicable Open Source License: Apache 2.0
+#
+#  NOTE: Cloudera open source products are modular software products
+#  made up of hundreds of individual components, each of which was
+#  individually copyrighted.  Each Cloudera open source product is a
+#  collective work under U.S. Copyright Law. Your license to use the
+#  collective work is as provided in your written agreement with
+#  Cloudera.  Used apart from the collective work, this file is
+#  licensed for your use pursuant to the open source license
+#  identified above.
+#
+#  This code is provided to you pursuant a written agreement with
+#  (i) Cloudera, Inc. or (ii) a third-party authorized to distribute
+#  this code. If you do not have a written agreement with Cloudera nor
+#  with an authorized and properly licensed third party, you do not
+#  have any rights to access nor to use this code.
+#
+#  Absent a written agreement with Cloudera, Inc. (“Cloudera”) to the
+#  contrary, A) CLOUDERA PROVIDES THIS CODE TO YOU WITHOUT WARRANTIES OF ANY
+#  KIND; (B) CLOUDERA DISCLAIMS ANY AND ALL EXPRESS AND IMPLIED
+#  WARRANTIES WITH RESPECT TO THIS CODE, INCLUDING BUT NOT LIMITED TO
+#  IMPLIED WARRANTIES OF TITLE, NON-INFRINGEMENT, MERCHANTABILITY AND
+#  FITNESS FOR A PARTICULAR PURPOSE; (C) CLOUDERA IS NOT LIABLE TO YOU,
+#  AND WILL NOT DEFEND, INDEMNIFY, NOR HOLD YOU HARMLESS FOR ANY CLAIMS
+#  ARISING FROM OR RELATED TO THE CODE; AND (D)WITH RESPECT TO YOUR EXERCISE
+#  OF ANY RIGHTS GRANTED TO YOU FOR THE CODE, CLOUDERA IS NOT LIABLE FOR ANY
+#  DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, PUNITIVE OR
+#  CONSEQUENTIAL DAMAGES INCLUDING, BUT NOT LIMITED TO, DAMAGES
+#  RELATED TO LOST REVENUE, LOST PROFITS, LOSS OF INCOME, LOSS OF
+#  BUSINESS ADVANTAGE OR UNAVAILABILITY, OR LOSS OR CORRUPTION OF
+#  DATA.
+#
+# ###########################################################################
+
+"""
+Throughput of the request timing middleware against the ``@app.middleware("http")``
+functions it replaced, which Starlette wraps in ``BaseHTTPMiddleware``.
+
+Each round sends a batch of requests straight to the ASGI app, without a server or
+test client, so the middleware dominates; the requests per second are reported in
+the benchmark's extra info.
+
+"""
+
+import asyncio
+import time
+
+import pytest
+from fastapi import FastAPI, Request
+
+REQUESTS_PER_ROUND = 500
+
+
+def _base_http_app() -> FastAPI:
+    """The app with the request logging and metrics middleware as they were"""
+    from service import metrics
+    from service.main import _request_received_logger
+
+    app = FastAPI()
+
+    @app.middleware("http")
+    async def log_request_received(request: Request, call_next):
+        _request_received_logger.info(
+            'received request "%s %s"', request.method, request.url.path
+        )
+        return await call_next(request)
+
+    @app.middleware("http")
+    async def record_request_metrics(request: Request, call_next):
+        started = time.perf_counter()
+        status = 500
+        try:
+            with metrics.REQUESTS_IN_FLIGHT.track_in_progress(request.method):
+                response = await call_next(request)
+            status = response.status_code
+            return response
+        finally:
+            route = request.scope.get("route")
+            metrics.REQUEST_SECONDS.labels(
+                request.method, route.path if route else "unmatched", str(status)
+            ).observe(time.perf_counter() - started)
+
+    return app
+
+
+def _pure_asgi_app() -> FastAPI:
+    from service.main import RequestTimingMiddleware
+
+    app = FastAPI()
+    app.add_middleware(RequestTimingMiddleware)
+    return app
+
+
+async def _send_requests(app: FastAPI, count: int) -> None:
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": "/ping",
+        "raw_path": b"/ping",
+        "query_string": b"",
+        "headers": [(b"host", b"benchmark")],
+        "client": ("127.0.0.1", 50000),
+        "server": ("benchmark", 80),
+    }
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        pass
+
+    for _ in range(count):
+        await app(dict(scope), receive, send)
+
+
+@pytest.mark.parametrize(
+    "build_app", [_base_http_app, _pure_asgi_app], ids=["base_http", "pure_asgi"]
+)
+def test_request_middleware(benchmark, build_app):
+    app = build_app()
+
+    @app.get("/ping")
+    def ping():
+        return {"status": "ok"}
+
+    loop = asyncio.new_event_loop()
+    try:
+        # the first request builds the middleware stack
+        loop.run_until_complete(_send_requests(app, 1))
+        benchmark.pedantic(
+            loop.run_until_complete,
+            setup=lambda: ((_send_requests(app, REQUESTS_PER_ROUND),), {}),
+            rounds=10,
+        )
+    finally:
+        loop.close()
+    # no timings are kept with --benchmark-disable
+    if benchmark.stats is not None:
+        benchmark.extra_info["requests_per_second"] = (
+            REQUESTS_PER_ROUND / benchmark.stats.stats.mean
+        )
@@ -0,0 +1,172 @@
+# ###########################################################################
+#
+#  CLOUDERA APPLIED MACHINE LEARNING PROTOTYPE (AMP)
+#  (C) Cloudera, Inc. 2021
+#  All rights reserved.
+#
+#  Applicable Open Source License: Apache 2.0
+#
+#  NOTE: Cloudera open source products are modular software products
+#  made up of hundreds of individual components, each of which was
+#  individually copyrighted.  Each Cloudera open source product is a
+#  collective work under U.S. Copyright Law. Your license to use the
+#  collective work is as provided in your written agreement with
+#  Cloudera.  Used apart from the collective work, this file is
+#  licensed for your use pursuant to the open source license
+#  identified above.
+#
+#  This code is provided to you pursuant a written agreement with
+#  (i) Cloudera, Inc. or (ii) a third-party authorized to distribute
+#  this code. If you do not have a written agreement with Cloudera nor
+#  with an authorized and properly licensed third party, you do not
+#  have any rights to access nor to use this code.
+#
+#  Absent a written agreement with Cloudera, Inc. (“Cloudera”) to the
+#  contrary, A) CLOUDERA PROVIDES THIS CODE TO YOU WITHOUT WARRANTIES OF ANY
+#  KIND; (B) CLOUDERA DISCLAIMS ANY AND ALL EXPRESS AND IMPLIED
+#  WARRANTIES WITH RESPECT TO THIS CODE, INCLUDING BUT NOT LIMITED TO
+#  IMPLIED WARRANTIES OF TITLE, NON-INFRINGEMENT, MERCHANTABILITY AND
+#  FITNESS FOR A PARTICULAR PURPOSE; (C) CLOUDERA IS NOT LIABLE TO YOU,
+#  AND WILL NOT DEFEND, INDEMNIFY, NOR HOLD YOU HARMLESS FOR ANY CLAIMS
+#  ARISING FROM OR RELATED TO THE CODE; AND (D)WITH RESPECT TO YOUR EXERCISE
+#  OF ANY RIGHTS GRANTED TO YOU FOR THE CODE, CLOUDERA IS NOT LIABLE FOR ANY
+#  DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, PUNITIVE OR
+#  CONSEQUENTIAL DAMAGES INCLUDING, BUT NOT LIMITED TO, DAMAGES
+#  RELATED TO LOST REVENUE, LOST PROFITS, LOSS OF INCOME, LOSS OF
+#  BUSINESS ADVANTAGE OR UNAVAILABILITY, OR LOSS OR CORRUPTION OF
+#  DATA.
+#
+# ###########################################################################
+
+"""End-to-end benchmarks of ingestion, prediction and evaluation with fake models."""
+
+import asyncio
+import itertools
+
+import pytest
+from fastapi.testclient import TestClient
+
+# data source ids for the ingestion rounds, clear of the shared data source
+_upload_ids = itertools.count(1000)
+
+
+@pytest.fixture(scope="module")
+def client():
+    from service.main import app
+
+    return TestClient(app)
+
+
+def test_upload(benchmark, sample_data_dir):
+    from service.routers.index import qdrant
+
+    configuration = qdrant.RagIndexDocumentConfiguration()
+    benchmark.pedantic(
+        lambda: qdrant.upload(sample_data_dir, next(_upload_ids), configuration),
+        rounds=5,
+        warmup_rounds=1,
+    )
+
+
+@pytest.mark.parametrize("do_evaluate", [False, True], ids=["plain", "evaluated"])
+def test_predict(benchmark, client, data_source_id, do_evaluate):
+    request = {
+        "data_source_id": data_source_id,
+        "chat_history": [],
+        "query": "How does Cloudera Machine Learning work?",
+        "do_evaluate": do_evaluate,
+    }
+    response = benchmark.pedantic(
+        client.post,
+        args=("/index/predict",),
+        kwargs={"json": request},
+        rounds=10,
+        warmup_rounds=1,
+    )
+    assert response.status_code == 200
+
+
+def test_evaluate_response(benchmark, data_source_id):
+    from service.routers.index import qdrant
+
+    configuration = qdrant.RagPredictConfiguration()
+    result = asyncio.run(
+        qdrant.query(
+            data_source_id,
+            "How does Cloudera Machine Learning work?",
+            configuration,
+            [],
+        )
+    )
+
+    def evaluate():
+        return asyncio.run(
+            qdrant.evaluate_response(
+                "How does Cloudera Machine Learning work?", result.chat_response
+            )
+        )
+
+    evaluation = benchmark.pedantic(evaluate, rounds=10, warmup_rounds=1)
+    assert evaluation[0].score is not None
+
+
+@pytest.mark.parametrize("failing", ["cheap_evaluate_contexts", "evaluate_contexts"])
+def test_a_failing_context_evaluation_keeps_the_response_judges(
+    monkeypatch, data_source_id, failing
+):
+    from service.config import settings
+    from service.routers.index import qdrant
+
+    monkeypatch.setattr(settings.evaluation, "judge_escalation", False)
+    evaluate = getattr(qdrant, failing)
+    calls = []
+
+    def fail_once(*args, **kwargs):
+        calls.append(args)
+        if len(calls) == 1:
+            raise RuntimeError(f"{failing} failed")
+        return evaluate(*args, **kwargs)
+
+    monkeypatch.setattr(qdrant, failing, fail_once)
+    result = asyncio.run(
+        qdrant.query(
+            data_source_id,
+            "How does Cloudera Machine Learning work?",
+            qdrant.RagPredictConfiguration(),
+            [],
+            evaluate=True,
+        )
+    )
+
+    assert result.evaluation is not None
+    # relevance, faithfulness and context relevancy, scored by the response judges
+    assert all(evaluation.score is not None for evaluation in result.evaluation[:3])
+    assert "answer_context_similarity" in result.cheap_scores
+
+
+def test_predict_stream_logs_generation_latency_and_tokens(
+    monkeypatch, client, data_source_id
+):
+    from service.routers import index
+
+    logged = []
+    log_prediction = index.log_prediction
+
+    def record(client, window, request, run_metrics, *args):
+        logged.append(run_metrics)
+        return log_prediction(client, window, request, run_metrics, *args)
+
+    monkeypatch.setattr(index, "log_prediction", record)
+    request = {
+        "data_source_id": data_source_id,
+        "chat_history": [],
+        "query": "How does Cloudera Machine Learning work?",
+    }
+    response = client.post("/index/predict_stream", json=request)
+
+    assert response.status_code == 200
+    assert "event: response" in response.text
+    (run_metrics,) = logged
+    assert run_metrics["generation_latency"] > 0
+    assert run_metrics["prompt_tokens"] > 0
+    assert run_metrics["completion_tokens"] > 0
@@ -0,0 +1,119 @@
+# ###########################################################################
+#
+#  CLOUDERA APPLIED MACHINE LEARNING PROTOTYPE (AMP)
+#  (C) Cloudera, Inc. 2021
+#  All rights reserved.
+#
+#  Applicable Open Source License: Apache 2.0
+#
+#  NOTE: Cloudera open source products are modular software products
+#  made up of hundreds of individual components, each of which was
+#  individually copyrighted.  Each Cloudera open source product is a
+#  collective work under U.S. Copyright Law. Your license to use the
+#  collective work is as provided in your written agreement with
+#  Cloudera.  Used apart from the collective work, this file is
+#  licensed for your use pursuant to the open source license
+#  identified above.
+#
+#  This code is provided to you pursuant a written agreement with
+#  (i) Cloudera, Inc. or (ii) a third-party authorized to distribute
+#  this code. If you do not have a written agreement with Cloudera nor
+#  with an authorized and properly licensed third party, you do not
+#  have any rights to access nor to use this code.
+#
+#  Absent a written agreement with Cloudera, Inc. (“Cloudera”) to the
+#  contrary, A) CLOUDERA PROVIDES THIS CODE TO YOU WITHOUT WARRANTIES OF ANY
+#  KIND; (B) CLOUDERA DISCLAIMS ANY AND ALL EXPRESS AND IMPLIED
+#  WARRANTIES WITH RESPECT TO THIS CODE, INCLUDING BUT NOT LIMITED TO
+#  IMPLIED WARRANTIES OF TITLE, NON-INFRINGEMENT, MERCHANTABILITY AND
+#  FITNESS FOR A PARTICULAR PURPOSE; (C) CLOUDERA IS NOT LIABLE TO YOU,
+#  AND WILL NOT DEFEND, INDEMNIFY, NOR HOLD YOU HARMLESS FOR ANY CLAIMS
+#  ARISING FROM OR RELATED TO THE CODE; AND (D)WITH RESPECT TO YOUR EXERCISE
+#  OF ANY RIGHTS GRANTED TO YOU FOR THE CODE, CLOUDERA IS NOT LIABLE FOR ANY
+#  DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, PUNITIVE OR
+#  CONSEQUENTIAL DAMAGES INCLUDING, BUT NOT LIMITED TO, DAMAGES
+#  RELATED TO LOST REVENUE, LOST PROFITS, LOSS OF INCOME, LOSS OF
+#  BUSINESS ADVANTAGE OR UNAVAILABILITY, OR LOSS OR CORRUPTION OF
+#  DATA.
+#
+# ###########################################################################
+
+"""
+Import time of the service, which ``uvicorn`` pays on every start and reload.
+
+Each round imports ``service.main`` in a fresh interpreter under
+``python -X importtime``; the cumulative import time of the module is checked
+against a budget of ``STARTUP_IMPORT_BUDGET_SECONDS`` (5 by default) and reported
+in the benchmark's extra info. The query pipeline, with the Bedrock and Qdrant
+clients, must be left to the first request or the ``lifespan`` hook.
+
+"""
+
+import json
+import os
+import subprocess
+import sys
+from typing import Dict, List
+
+# the import takes about 3-3.5s with the pipeline deferred, and over 7s without
+DEFAULT_BUDGET_SECONDS = 5.0
+
+DEFERRED_MODULES = [
+    "service.routers.index.qdrant",
+    "qdrant_client",
+    "llama_index.vector_stores.qdrant",
+    "llama_index.llms.bedrock_converse",
+    "llama_index.embeddings.bedrock",
+]
+
+_IMPORT_SCRIPT = f"""
+import json, sys
+import service.main
+print(json.dumps([name for name in {DEFERRED_MODULES!r} if name in sys.modules]))
+"""
+
+ROOT_DIR = os.path.join(os.path.dirname(__file__), "..")
+
+
+def import_service() -> Dict:
+    """
+    Import the service in a fresh interpreter.
+
+    Returns the cumulative import time of ``service.main``, in seconds, and the
+    deferred modules that were imported all the same.
+
+    """
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", _IMPORT_SCRIPT],
+        cwd=ROOT_DIR,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    # lines read "import time: <self us> | <cumulative us> | <indented module>"
+    seconds = None
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        _, cumulative, module = line.split("|")
+        if module.strip() == "service.main":
+            seconds = int(cumulative) / 1e6
+    assert seconds is not None, "service.main was not imported"
+    imported: List[str] = json.loads(completed.stdout.strip().splitlines()[-1])
+    return {"seconds": seconds, "deferred_modules_imported": imported}
+
+
+def test_startup_import_time(benchmark):
+    budget = float(
+        os.environ.get("STARTUP_IMPORT_BUDGET_SECONDS", DEFAULT_BUDGET_SECONDS)
+    )
+    imports = []
+    benchmark.pedantic(lambda: imports.append(import_service()), rounds=3)
+
+    assert imports[-1]["deferred_modules_imported"] == []
+    seconds = min(result["seconds"] for result in imports)
+    benchmark.extra_info["import_seconds"] = seconds
+    benchmark.extra_info["budget_seconds"] = budget
+    assert (
+        seconds <= budget
+    ), f"importing service.main took {seconds:.2f}s, over the {budget:.2f}s budget"
@@ -0,0 +1,317 @@
+"""
+Replay a question corpus against the RAG service and report its latency.
+
+Each request asks ``/index/predict`` a question and then, for a fraction of the
+responses, posts ``/index/feedback`` for it. The load is either closed-loop, with a
+fixed number of concurrent clients, or open-loop at a target rate of queries per
+second. The run is split into a phase with evaluation and a phase without, as the
+LLM judges dominate the cost of a prediction.
+
+The JSON report holds, per phase and endpoint, the request and error counts, the
+throughput and the p50/p95/p99 latencies in milliseconds. Its keys are sorted so
+reports of two releases can be diffed directly.
+
+    python scripts/load_test_qa.py --data-source-id 1 --concurrency 8 --requests 200
+    python scripts/load_test_qa.py --data-source-id 1 --qps 2 --duration 300 \\
+        --questions questions.txt --report load_report.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import httpx
+import numpy as np
+
+# Add the st_app directory to the sys.path
+file_path = Path(os.path.realpath(__file__))
+main_dir = file_path.parents[1]
+st_app_dir = os.path.join(main_dir, "st_app")
+sys.path.append(st_app_dir)
+
+from data_types import (
+    RagFeedbackRequest,
+    RagPredictRequest,
+    RagPredictResponse,
+)
+
+# the questions asked by populate_and_simulate_qa.py
+DEFAULT_QUESTIONS = [
+    "How does Cloudera Machine Learning work?",
+    "What is the difference between Cloudera Machine Learning and Cloudera Data Science Workbench?",
+    "How can I train models?",
+    "Does CML support GPUs?",
+    "does auto-scaling of endpoints work in CML?",
+]
+
+PHASES = {"evaluation": True, "no_evaluation": False}
+
+
+@dataclass
+class PhaseRecorder:
+    """Latencies and errors of the requests made during one phase"""
+
+    latencies: Dict[str, List[float]] = field(default_factory=dict)
+    errors: Dict[str, Dict[str, int]] = field(default_factory=dict)
+    started: float = 0.0
+    finished: float = 0.0
+
+    def record(self, endpoint: str, latency: float, error: Optional[str]) -> None:
+        self.latencies.setdefault(endpoint, [])
+        self.errors.setdefault(endpoint, {})
+        if error is None:
+            self.latencies[endpoint].append(latency)
+        else:
+            self.errors[endpoint][error] = self.errors[endpoint].get(error, 0) + 1
+
+    def summary(self) -> Dict:
+        duration = self.finished - self.started
+        endpoints = {}
+        for endpoint, latencies in self.latencies.items():
+            errors = sum(self.errors[endpoint].values())
+            total = len(latencies) + errors
+            latencies_ms = np.asarray(latencies) * 1000
+            endpoints[endpoint] = {
+                "requests": total,
+                "errors": errors,
+                "error_rate": errors / total if total else 0.0,
+                "error_kinds": self.errors[endpoint],
+                "throughput_rps": len(latencies) / duration if duration else 0.0,
+                "latency_ms": (
+                    {
+                        "mean": float(latencies_ms.mean()),
+                        "p50": float(np.percentile(latencies_ms, 50)),
+                        "p95": float(np.percentile(latencies_ms, 95)),
+                        "p99": float(np.percentile(latencies_ms, 99)),
+                        "max": float(latencies_ms.max()),
+                    }
+                    if latencies
+                    else {}
+                ),
+            }
+        return {"duration_s": duration, "endpoints": endpoints}
+
+
+async def timed_post(
+    client: httpx.AsyncClient,
+    recorder: PhaseRecorder,
+    endpoint: str,
+    payload: str,
+) -> Optional[httpx.Response]:
+    """POST ``payload`` and record the latency, or the kind of error"""
+    started = time.perf_counter()
+    try:
+        response = await client.post(
+            endpoint,
+            content=payload,
+            headers={
+                "Content-Type": "application/json",
+                "Accept": "application/json",
+            },
+        )
+    except httpx.HTTPError as e:
+        recorder.record(endpoint, time.perf_counter() - started, type(e).__name__)
+        return None
+    latency = time.perf_counter() - started
+    if response.status_code != 200:
+        recorder.record(endpoint, latency, f"HTTP {response.status_code}")
+        return None
+    recorder.record(endpoint, latency, None)
+    return response
+
+
+async def ask(
+    client: httpx.AsyncClient,
+    recorder: PhaseRecorder,
+    args: argparse.Namespace,
+    question: str,
+    do_evaluate: bool,
+) -> None:
+    """Ask one question, then post feedback for a fraction of the responses"""
+    request = RagPredictRequest(
+        data_source_id=args.data_source_id,
+        query=question,
+        chat_history=[],
+        do_evaluate=do_evaluate,
+    )
+    response = await timed_post(client, recorder, "/index/predict", request.json())
+    if response is None or random.random() >= args.feedback_rate:
+        return
+    rag_response = RagPredictResponse(**response.json())
+    feedback = RagFeedbackRequest(
+        experiment_id=rag_response.mlflow_experiment_id,
+        experiment_run_id=rag_response.mlflow_run_id,
+        step=rag_response.mlflow_step,
+        response_id=rag_response.id,
+        feedback=random.randint(0, 1),
+    )
+    await timed_post(client, recorder, "/index/feedback", feedback.json())
+
+
+async def run_phase(
+    args: argparse.Namespace,
+    questions: List[str],
+    do_evaluate: bool,
+) -> Dict:
+    """
+    Run one phase of the load test.
+
+    With ``--qps`` the questions are sent open-loop, each at its scheduled time
+    whether or not earlier ones have been answered, capped by ``--concurrency`` if
+    given. Otherwise ``--concurrency`` clients each send their next question as
+    soon as the previous one is answered. A phase ends after ``--requests``
+    questions or ``--duration`` seconds, whichever comes first.
+
+    """
+    recorder = PhaseRecorder()
+    limits = httpx.Limits(max_connections=None, max_keepalive_connections=None)
+    async with httpx.AsyncClient(
+        base_url=args.base_url, timeout=args.timeout, limits=limits
+    ) as client:
+        recorder.started = time.perf_counter()
+        deadline = recorder.started + args.duration if args.duration else None
+        sent = 0
+
+        def next_question() -> Optional[str]:
+            nonlocal sent
+            if args.requests and sent >= args.requests:
+                return None
+            if deadline is not None and time.perf_counter() >= deadline:
+                return None
+            sent += 1
+            return questions[(sent - 1) % len(questions)]
+
+        if args.qps:
+            semaphore = (
+                asyncio.Semaphore(args.concurrency) if args.concurrency else None
+            )
+
+            async def send(question: str) -> None:
+                if semaphore is None:
+                    await ask(client, recorder, args, question, do_evaluate)
+                    return
+                async with semaphore:
+                    await ask(client, recorder, args, question, do_evaluate)
+
+            tasks = []
+            while (question := next_question()) is not None:
+                tasks.append(asyncio.create_task(send(question)))
+                scheduled = recorder.started + sent / args.qps
+                await asyncio.sleep(max(0.0, scheduled - time.perf_counter()))
+            await asyncio.gather(*tasks)
+        else:
+
+            async def worker() -> None:
+                while (question := next_question()) is not None:
+                    await ask(client, recorder, args, question, do_evaluate)
+
+            await asyncio.gather(*[worker() for _ in range(args.concurrency or 1)])
+        recorder.finished = time.perf_counter()
+    return recorder.summary()
+
+
+def load_questions(path: Optional[str]) -> List[str]:
+    """Read a question corpus: a JSON list of strings, or one question per line"""
+    if path is None:
+        return DEFAULT_QUESTIONS
+    text = Path(path).read_text(encoding="utf-8")
+    if path.endswith(".json"):
+        return json.loads(text)
+    return [line.strip() for line in text.splitlines() if line.strip()]
+
+
+def print_summary(phases: Dict[str, Dict]) -> None:
+    print(
+        f"{'phase':<14} {'endpoint':<16} {'requests':>8} {'errors':>7} "
+        f"{'rps':>7} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}"
+    )
+    for phase, summary in phases.items():
+        for endpoint, stats in summary["endpoints"].items():
+            latency = stats["latency_ms"]
+            print(
+                f"{phase:<14} {endpoint:<16} {stats['requests']:>8} "
+                f"{stats['errors']:>7} {stats['throughput_rps']:>7.2f} "
+                f"{latency.get('p50', float('nan')):>9.1f} "
+                f"{latency.get('p95', float('nan')):>9.1f} "
+                f"{latency.get('p99', float('nan')):>9.1f}"
+            )
+
+
+async def main(args: argparse.Namespace) -> None:
+    random.seed(args.seed)
+    questions = load_questions(args.questions)
+    report = {
+        "started_at": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "config": {
+            "base_url": args.base_url,
+            "data_source_id": args.data_source_id,
+            "questions": len(questions),
+            "qps": args.qps,
+            "concurrency": args.concurrency,
+            "requests": args.requests,
+            "duration": args.duration,
+            "feedback_rate": args.feedback_rate,
+        },
+        "phases": {},
+    }
+    for phase in args.phases:
+        print(f"Running the {phase} phase...")
+        report["phases"][phase] = await run_phase(args, questions, PHASES[phase])
+
+    print_summary(report["phases"])
+    with open(args.report, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2, sort_keys=True)
+    print(f"Wrote the report to {args.report}.")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Load test /index/predict and /index/feedback."
+    )
+    parser.add_argument("--data-source-id", type=int, required=True)
+    parser.add_argument(
+        "--base-url",
+        default=f"http://localhost:{os.environ.get('FASTAPI_PORT', 8000)}",
+    )
+    parser.add_argument(
+        "--questions",
+        help="question corpus: a JSON list, or a text file with one question per line",
+    )
+    parser.add_argument(
+        "--qps", type=float, help="open-loop arrival rate, in queries per second"
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        help="number of concurrent clients, or the in-flight cap with --qps",
+    )
+    parser.add_argument(
+        "--requests", type=int, help="questions asked per phase (default: 50)"
+    )
+    parser.add_argument("--duration", type=float, help="seconds per phase")
+    parser.add_argument(
+        "--phases",
+        nargs="+",
+        choices=list(PHASES),
+        default=list(PHASES),
+    )
+    parser.add_argument(
+        "--feedback-rate",
+        type=float,
+        default=1.0,
+        help="fraction of responses that feedback is posted for",
+    )
+    parser.add_argument("--timeout", type=float, default=120.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--report", default="load_report.json")
+    arguments = parser.parse_args()
+    if arguments.requests is None and arguments.duration is None:
+        arguments.requests = 50
+    asyncio.run(main(arguments))
@@ -1,9 +1,10 @@
+import argparse
 import json
 import os
 import shutil
 import sys
 from pathlib import Path
-from typing import List
+from typing import Iterator, List, Tuple
 from tqdm import tqdm
 
 import pandas as pd
@@ -29,7 +30,7 @@ sys.path.append(st_app_dir)
 from data_types import (
     RagFeedbackRequest,
     RagIndexConfiguration,
-    RagPredictRequest,
+    RagPredictBatchRequest,
     RagPredictResponse,
 )
 
@@ -51,26 +52,34 @@ def table_name_from(data_source_id: int):
     return f"index_{data_source_id}"
 
 
-def get_response(request: RagPredictRequest) -> RagPredictResponse:
-    """Get a response from the RAG model."""
+def get_responses(
+    request: RagPredictBatchRequest,
+) -> Iterator[Tuple[int, RagPredictResponse]]:
+    """Get responses from the RAG model for a batch of questions, as they finish."""
     fastapi_port = os.environ["FASTAPI_PORT"]
     if fastapi_port is None:
         fastapi_port = 8000
 
-    response = requests.post(
-        url=f"http://localhost:{fastapi_port}/index/predict",
+    with requests.post(
+        url=f"http://localhost:{fastapi_port}/index/predict_batch",
         data=request.json(),
         headers={
             "Content-Type": "application/json",
-            "Accept": "application/json",
+            "Accept": "application/x-ndjson",
         },
-        timeout=60,
-    )
-
-    if response.status_code != 200:
-        raise ValueError(f"Failed to get response: {response.text}")
+        stream=True,
+        timeout=300,
+    ) as response:
+        if response.status_code != 200:
+            raise ValueError(f"Failed to get responses: {response.text}")
 
-    return RagPredictResponse(**response.json())
+        for line in response.iter_lines():
+            if not line:
+                continue
+            result = json.loads(line)
+            if "response" not in result:
+                raise ValueError(f"Failed to get response: {result.get('error')}")
+            yield result["index"], RagPredictResponse(**result["response"])
 
 
 # Function to log feedback
@@ -106,7 +115,7 @@ def copy_files(src_dir, dest_dir):
             shutil.copy2(src_file, dest_file)
 
 
-def main():
+def main(concurrency: int):
     # Create a collections.json file and write an empty list to it
     if not os.path.exists(COLLECTIONS_JSON):
         with open(COLLECTIONS_JSON, "w+") as f:
@@ -211,17 +220,19 @@ def main():
         "Does CML support GPUs?",
         "does auto-scaling of endpoints work in CML?",
     ]
-    for i, question in tqdm(enumerate(questions)):
-        response = get_response(
-            RagPredictRequest(
-                data_source_id=index_config.id,
-                query=question,
-                chat_history=[],  # chat history is not needed for this simulation
-            )
+    responses = get_responses(
+        RagPredictBatchRequest(
+            data_source_id=index_config.id,
+            queries=questions,
+            max_concurrency=concurrency,
         )
+    )
+    for i, response in tqdm(responses, total=len(questions)):
         feedback_request = RagFeedbackRequest(
             experiment_id=response.mlflow_experiment_id,
             experiment_run_id=response.mlflow_run_id,
+            step=response.mlflow_step,
+            response_id=response.id,
             feedback=i % 2,
         )
         log_feedback(feedback_request)
@@ -229,4 +240,13 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(
+        description="Populate a sample index and simulate question answering."
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=4,
+        help="number of questions answered concurrently",
+    )
+    main(parser.parse_args().concurrency)
@@ -7,8 +7,9 @@ simply the field name in all capital letters.
 """
 
 import logging
-from typing import Optional
+from typing import Dict, Literal, Optional
 
+from pydantic import BaseModel
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -29,9 +30,41 @@ class OTelSettings(BaseSettings, str_strip_whitespace=True):
 
 
 class MLFlowSettings(BaseSettings, str_strip_whitespace=True):
-    """MLFlow configuration."""
+    """
+    MLFlow configuration.
+
+    ``llama_index_autolog`` enables MLflow's LlamaIndex autologging when the service
+    starts.
+
+    """
 
     tracking_uri: str = "http://localhost:5000"
+    llama_index_autolog: bool = True
+
+
+class MLFlowTracingSettings(BaseSettings, str_strip_whitespace=True):
+    """
+    Sampling of the MLflow traces of llama-index calls.
+
+    When ``sampling`` is enabled, the traces of a request are written only if it
+    failed, took at least ``slow_request_seconds``, or was sampled: a
+    ``sample_ratio`` fraction of the requests are, which can be set per data source
+    with JSON, e.g. ``MLFLOW_TRACING_DATA_SOURCE_SAMPLE_RATIOS='{"1": 1.0}'``. The
+    traces kept are written in batches of ``batch_size``, at most ``flush_interval``
+    seconds after they were recorded; beyond ``queue_size`` waiting traces, further
+    traces are dropped. When disabled, every trace is written as MLflow does.
+
+    """
+
+    model_config = SettingsConfigDict(env_prefix="mlflow_tracing_")
+
+    sampling: bool = True
+    sample_ratio: float = 0.1
+    data_source_sample_ratios: Dict[int, float] = {}
+    slow_request_seconds: float = 10.0
+    batch_size: int = 50
+    flush_interval: float = 5.0
+    queue_size: int = 1000
 
 
 class MLFlowStoreSettings(BaseSettings, str_strip_whitespace=True):
@@ -40,12 +73,237 @@ class MLFlowStoreSettings(BaseSettings, str_strip_whitespace=True):
     uri: str = "http://localhost:3000"
 
 
+class MetricPushSettings(BaseSettings, str_strip_whitespace=True):
+    """
+    Pushing metrics to the metric store.
+
+    When ``enabled``, the scores, lengths and live results logged to MLflow are
+    also posted to the metric store's ``/metrics`` endpoint by a background thread,
+    in batches of up to ``batch_size`` metrics at most ``flush_interval`` seconds
+    apart. When ``queue_size`` metrics are already waiting, further metrics are
+    dropped; the store's reconciler still backfills runs that were never pushed.
+
+    """
+
+    model_config = SettingsConfigDict(env_prefix="metric_push_")
+
+    enabled: bool = True
+    batch_size: int = 200
+    flush_interval: float = 1.0
+    queue_size: int = 10000
+    timeout: float = 10.0
+
+
+class BackendSettings(BaseSettings, str_strip_whitespace=True):
+    """
+    Model and vector store backends.
+
+    ``llm`` and ``embedding`` select Bedrock or deterministic offline fakes. The fake
+    LLM waits ``fake_llm_latency`` seconds (varied by up to ``fake_llm_jitter`` of
+    it) before its first token and then generates ``fake_llm_tokens_per_second``;
+    it answers with ``fake_llm_output_tokens`` words taken from the prompt, and
+    judge prompts with a verdict. A ``fake_llm_throttle_rate`` fraction of its calls,
+    and any call beyond ``fake_llm_max_concurrency`` in flight, fail with a
+    throttling error, like Bedrock's. The fake embedding hashes words into
+    ``fake_embed_dim`` dimensions, so texts sharing words have similar embeddings.
+
+    With ``qdrant_location`` set to ``:memory:`` or a local directory, Qdrant runs in
+    process instead of connecting to the server at ``qdrant_host``.
+
+    """
+
+    model_config = SettingsConfigDict(env_prefix="backend_")
+
+    llm: Literal["bedrock", "fake"] = "bedrock"
+    embedding: Literal["bedrock", "fake"] = "bedrock"
+    qdrant_location: Optional[str] = None
+    qdrant_host: str = "localhost"
+    qdrant_port: int = 6333
+    qdrant_async_port: int = 6334
+
+    fake_seed: int = 0
+    fake_llm_latency: float = 0.5
+    fake_llm_jitter: float = 0.2
+    fake_llm_tokens_per_second: float = 50.0
+    fake_llm_output_tokens: int = 64
+    fake_llm_throttle_rate: float = 0.0
+    fake_llm_max_concurrency: Optional[int] = None
+    fake_embed_latency: float = 0.02
+    fake_embed_dim: int = 1024
+
+
+class BedrockModelLimits(BaseModel):
+    """Per-model overrides of the Bedrock rate limits."""
+
+    max_concurrency: Optional[int] = None
+    requests_per_second: Optional[float] = None
+    tokens_per_minute: Optional[int] = None
+
+
+class BedrockSettings(BaseSettings, str_strip_whitespace=True):
+    """
+    Bedrock rate limiting configuration.
+
+    The limits are enforced per model by a process-wide governor shared by chat,
+    condense-question and evaluation calls. Individual models can be overridden with
+    JSON, e.g. ``BEDROCK_PER_MODEL_LIMITS='{"meta.llama3-70b-instruct-v1:0": {"max_concurrency": 4}}'``.
+
+    """
+
+    model_config = SettingsConfigDict(env_prefix="bedrock_")
+
+    max_concurrency: int = 8
+    requests_per_second: float = 5.0
+    tokens_per_minute: int = 200_000
+    max_throttle_retries: int = 5
+    per_model_limits: Dict[str, BedrockModelLimits] = {}
+
+
+class EvaluationSettings(BaseSettings, str_strip_whitespace=True):
+    """
+    LLM judge configuration.
+
+    With ``stream_judges`` enabled the judges stream their completions and stop
+    generating as soon as the ``[RESULT] n`` marker is seen, or once the output
+    exceeds ``judge_max_output_tokens``.
+
+    Every evaluated response gets cheap embedding and overlap scores, alongside the
+    LLM judges. With ``judge_escalation`` enabled the LLM judges only run when the
+    mean of those scores falls between ``escalation_band_low`` and
+    ``escalation_band_high``, or for a random ``escalation_sample_rate`` fraction of
+    the responses, so the other responses have no judge scores.
+
+    """
+
+    model_config = SettingsConfigDict(env_prefix="evaluation_")
+
+    stream_judges: bool = False
+    judge_max_output_tokens: Optional[int] = None
+    judge_escalation: bool = False
+    escalation_band_low: float = 0.35
+    escalation_band_high: float = 0.65
+    escalation_sample_rate: float = 0.1
+
+
+class ChatEngineSettings(BaseSettings, str_strip_whitespace=True):
+    """
+    Chat engine configuration.
+
+    While a follow-up question is condensed, the raw question is retrieved
+    speculatively; the retrieval is reused when the condensed question's embedding
+    has at least ``speculative_similarity_threshold`` cosine similarity to it.
+
+    """
+
+    model_config = SettingsConfigDict(env_prefix="chat_engine_")
+
+    speculative_retrieval: bool = True
+    speculative_similarity_threshold: float = 0.9
+    condense_cache_size: int = 1024
+
+
+class PredictBatchSettings(BaseSettings, str_strip_whitespace=True):
+    """Batch prediction configuration: the number of queries answered concurrently."""
+
+    model_config = SettingsConfigDict(env_prefix="predict_batch_")
+
+    max_concurrency: int = 4
+
+
+class RunWindowSettings(BaseSettings, str_strip_whitespace=True):
+    """
+    Rolling predictions into shared MLflow runs.
+
+    When ``enabled``, the predictions of a data source, session and configuration
+    are logged as consecutive steps of one run instead of a run each. A run is
+    closed once it holds ``max_predictions`` steps or was opened ``max_seconds``
+    ago, and the next prediction opens a new one.
+
+    """
+
+    model_config = SettingsConfigDict(env_prefix="run_window_")
+
+    enabled: bool = False
+    max_predictions: int = 100
+    max_seconds: float = 900.0
+
+
+class BackfillSettings(BaseSettings, str_strip_whitespace=True):
+    """
+    Custom evaluator backfill configuration.
+
+    A backfill job scores at most ``max_concurrency`` historical responses at a
+    time and starts at most ``evaluations_per_minute`` judge calls a minute (no
+    limit when unset). Runs are read from the metric store ``page_size`` at a time,
+    and the job's progress is checkpointed to ``checkpoint_dir`` after every page.
+
+    """
+
+    model_config = SettingsConfigDict(env_prefix="backfill_")
+
+    max_concurrency: int = 4
+    evaluations_per_minute: Optional[float] = 60.0
+    page_size: int = 50
+    checkpoint_dir: str = "backfill_checkpoints"
+
+
+class ProfilingSettings(BaseSettings, str_strip_whitespace=True):
+    """
+    Per-request sampling profiler.
+
+    When ``enabled``, a request sent with an ``X-Profile: 1`` header or a
+    ``profile=1`` query parameter is profiled by sampling the stacks of the service's
+    threads every ``interval`` seconds. The latest ``max_profiles`` profiles are kept
+    in memory and served by ``/admin/profiles``. When disabled neither the
+    middleware nor the endpoints are installed.
+
+    """
+
+    model_config = SettingsConfigDict(env_prefix="profiling_")
+
+    enabled: bool = False
+    interval: float = 0.005
+    max_profiles: int = 20
+
+
+class LoggingSettings(BaseSettings, str_strip_whitespace=True):
+    """
+    Application logging.
+
+    Records are queued by the logging thread and written by a background listener,
+    so request handlers never wait on stdout. At most ``queue_size`` records wait
+    to be written; further records are dropped until the queue drains. Messages
+    longer than ``max_record_length`` characters are truncated, and records are
+    written as ``text`` lines or ``json`` objects. At debug level, a
+    ``payload_sample_rate`` fraction of the chat responses is logged in full.
+
+    """
+
+    model_config = SettingsConfigDict(env_prefix="log_")
+
+    format: Literal["text", "json"] = "text"
+    max_record_length: int = 4096
+    queue_size: int = 10000
+    payload_sample_rate: float = 0.0
+
+
 class Settings(BaseSettings):
     """RAG configuration."""
 
     otel: OTelSettings = OTelSettings()
     mlflow: MLFlowSettings = MLFlowSettings()
+    mlflow_tracing: MLFlowTracingSettings = MLFlowTracingSettings()
     mlflow_store: MLFlowStoreSettings = MLFlowStoreSettings()
+    metric_push: MetricPushSettings = MetricPushSettings()
+    backend: BackendSettings = BackendSettings()
+    bedrock: BedrockSettings = BedrockSettings()
+    evaluation: EvaluationSettings = EvaluationSettings()
+    chat_engine: ChatEngineSettings = ChatEngineSettings()
+    predict_batch: PredictBatchSettings = PredictBatchSettings()
+    run_window: RunWindowSettings = RunWindowSettings()
+    backfill: BackfillSettings = BackfillSettings()
+    profiling: ProfilingSettings = ProfilingSettings()
+    log: LoggingSettings = LoggingSettings()
 
     rag_log_level: int = logging.INFO
 
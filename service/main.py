@@ -38,15 +38,21 @@
 #
 # ###########################################################################
 
+import copy
 import functools
+import json
 import logging
+import logging.handlers
+import queue
 import sys
+import threading
 import time
-from collections.abc import Awaitable, Callable
 from contextlib import asynccontextmanager
+from typing import Dict
 
-from fastapi import FastAPI, Request, Response
+from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
 from opentelemetry import trace
 from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
 from opentelemetry.instrumentation.fastapi import FastAPIInstrumentor
@@ -56,8 +62,11 @@ from opentelemetry.sdk.resources import SERVICE_NAME, Resource
 from opentelemetry.sdk.trace import TracerProvider
 from opentelemetry.sdk.trace.export import BatchSpanProcessor
 from opentelemetry.trace.propagation.tracecontext import TraceContextTextMapPropagator
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 from uvicorn.logging import DefaultFormatter
 
+from . import metric_push, metrics, mlflow_tracing
 from .config import settings
 from .routers import index
 
@@ -93,9 +102,57 @@ _configure_logger()
 ###################################
 
 
-@functools.cache
-def _get_app_log_handler():
-    """Format and return a reusable handler for application logging."""
+class _CappedQueueHandler(logging.handlers.QueueHandler):
+    """Queues records with size-capped messages, dropping them while the queue is full."""
+
+    def __init__(self, log_queue: queue.Queue, max_length: int):
+        super().__init__(log_queue)
+        self.max_length = max_length
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        message = record.getMessage()
+        if len(message) > self.max_length:
+            truncated = len(message) - self.max_length
+            message = (
+                f"{message[:self.max_length]}... [{truncated} characters truncated]"
+            )
+        # other handlers may still format the original record
+        record = copy.copy(record)
+        record.msg = message
+        record.args = None
+        return super().prepare(record)
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            metrics.LOG_RECORDS_DROPPED.inc()
+
+
+class _JsonFormatter(logging.Formatter):
+    """Formats records as single-line JSON objects."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        return json.dumps(
+            {
+                "timestamp": self.formatTime(record),
+                "level": record.levelname,
+                "logger": record.name,
+                "trace_id": getattr(record, "otelTraceID", "0"),
+                "span_id": getattr(record, "otelSpanID", "0"),
+                "message": record.getMessage(),
+            }
+        )
+
+
+def _get_app_log_formatter() -> logging.Formatter:
+    if settings.log.format == "json":
+        formatter = _JsonFormatter()
+        formatter.converter = time.gmtime
+        formatter.default_time_format = "%Y-%m-%dT%H:%M:%S"
+        formatter.default_msec_format = "%s.%03dZ"
+        return formatter
+
     # match Java backend's formatting
     formatter = logging.Formatter(
         fmt=" ".join(
@@ -112,11 +169,25 @@ def _get_app_log_handler():
     formatter.converter = time.gmtime
     formatter.default_time_format = "%H:%M:%S"
     formatter.default_msec_format = "%s.%03d"
+    return formatter
+
 
+@functools.cache
+def _get_app_log_listener() -> logging.handlers.QueueListener:
+    """Return the listener writing the queued application log records to stdout."""
     handler = logging.StreamHandler(sys.stdout)
-    handler.setFormatter(formatter)
+    handler.setFormatter(_get_app_log_formatter())
+    return logging.handlers.QueueListener(
+        queue.Queue(maxsize=settings.log.queue_size), handler
+    )
 
-    return handler
+
+@functools.cache
+def _get_app_log_handler():
+    """Return a reusable handler queueing application log records for the listener."""
+    return _CappedQueueHandler(
+        _get_app_log_listener().queue, settings.log.max_record_length
+    )
 
 
 def _configure_app_logger(app_logger: logging.Logger) -> None:
@@ -137,10 +208,16 @@ def initialize_logging():
     LoggingInstrumentor().instrument()
     _configure_app_logger(logging.getLogger("uvicorn.access"))
     _configure_app_logger(logging.getLogger(_APP_PKG_NAME))
+    _get_app_log_listener().start()
 
     logger.info("Logging initialized.")
 
 
+def shutdown_logging():
+    """Write out the queued log records and stop the listener."""
+    _get_app_log_listener().stop()
+
+
 def _get_tracing_resource():
     return Resource(attributes={SERVICE_NAME: settings.otel.service_name})
 
@@ -169,7 +246,15 @@ def initialize_tracing():
 async def lifespan(app: FastAPI):
     initialize_logging()
     initialize_tracing()
+    index.configure_autolog()
+    metric_push.start()
+    # warm up the query pipeline without holding up the startup
+    threading.Thread(target=index.preload, name="preload", daemon=True).start()
     yield
+    index.run_windows.windows.close_all()
+    metric_push.shutdown()
+    mlflow_tracing.shutdown()
+    shutdown_logging()
 
 
 ###################################
@@ -194,19 +279,67 @@ app.add_middleware(
 )
 
 
+class RequestTimingMiddleware:
+    """
+    Logs each request, and times it until its response has been sent.
+
+    The duration feeds the request latency histogram, and the stages recorded while
+    handling the request are reported, with the total time until the response
+    started, in its ``Server-Timing`` header (in milliseconds). Stages that finish
+    after the response started, e.g. while a body streams, are left out.
+
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method, path = scope["method"], scope["path"]
+        _request_received_logger.info('received request "%s %s"', method, path)
+        started = time.perf_counter()
+        status = 500
+        timings: Dict[str, float] = {}
+
+        async def send_with_server_timing(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                elapsed = time.perf_counter() - started
+                entries = [
+                    f"{stage};dur={seconds * 1000:.1f}"
+                    for stage, seconds in timings.items()
+                ]
+                entries.append(f"total;dur={elapsed * 1000:.1f}")
+                MutableHeaders(scope=message).append(
+                    "Server-Timing", ", ".join(entries)
+                )
+            await send(message)
+
+        try:
+            with metrics.REQUESTS_IN_FLIGHT.track_in_progress(method):
+                with metrics.collect_stage_timings(timings):
+                    await self.app(scope, receive, send_with_server_timing)
+        finally:
+            # label by the route template, not the path, to bound the label values
+            route = scope.get("route")
+            metrics.REQUEST_SECONDS.labels(
+                method, route.path if route else "unmatched", str(status)
+            ).observe(time.perf_counter() - started)
+
+
 # must precede FastAPIInstrumentor to capture trace and span IDs
-@app.middleware("http")
-async def log_request_received(
-    request: Request,
-    call_next: Callable[[Request], Awaitable[Response]],
-) -> Response:
-    """Log the incoming request method and path."""
-    _request_received_logger.info(
-        'received request "%s %s"',
-        request.method,
-        request.url.path,
-    )
-    return await call_next(request)
+app.add_middleware(RequestTimingMiddleware)
+
+
+if settings.profiling.enabled:
+    from .profiling import ProfilingMiddleware
+
+    # added last, so the profile covers the middleware above
+    app.add_middleware(ProfilingMiddleware)
 
 
 FastAPIInstrumentor.instrument_app(app)
@@ -218,3 +351,13 @@ FastAPIInstrumentor.instrument_app(app)
 
 
 app.include_router(index.router)
+if settings.profiling.enabled:
+    from .routers import profiles
+
+    app.include_router(profiles.router)
+
+
+@app.get("/metrics", summary="Prometheus metrics", include_in_schema=False)
+def prometheus_metrics() -> PlainTextResponse:
+    """Return the service metrics in the Prometheus text exposition format"""
+    return PlainTextResponse(metrics.REGISTRY.render(), media_type=metrics.CONTENT_TYPE)
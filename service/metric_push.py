@@ -0,0 +1,226 @@
+# ###########################################################################
+#
+#  CLOUDERA APPLIED MACHINE LEARNING PROTOTYPE (AMP)
+#  (C) Cloudera, Inc. 2021
+#  All rights reserved.
+#
+#  Applicable Open Source License: Apache 2.0
+#
+#  NOTE: Cloudera open source products are modular software products
+#  made up of hundreds of individual components, each of which was
+#  individually copyrighted.  Each Cloudera open source product is a
+#  collective work under U.S. Copyright Law. Your license to use the
+#  collective work is as provided in your written agreement with
+#  Cloudera.  Used apart from the collective work, this file is
+#  licensed for your use pursuant to the open source license
+#  identified above.
+#
+#  This code is provided to you pursuant a written agreement with
+#  (i) Cloudera, Inc. or (ii) a third-party authorized to distribute
+#  this code. If you do not have a written agreement with Cloudera nor
+#  with an authorized and properly licensed third party, you do not
+#  have any rights to access nor to use this code.
+#
+#  Absent a written agreement with Cloudera, Inc. (“Cloudera”) to the
+#  contrary, A) CLOUDERA PROVIDES THIS CODE TO YOU WITHOUT WARRANTIES OF ANY
+#  KIND; (B) CLOUDERA DISCLAIMS ANY AND ALL EXPRESS AND IMPLIED
+#  WARRANTIES WITH RESPECT TO THIS CODE, INCLUDING BUT NOT LIMITED TO
+#  IMPLIED WARRANTIES OF TITLE, NON-INFRINGEMENT, MERCHANTABILITY AND
+#  FITNESS FOR A PARTICULAR PURPOSE; (C) CLOUDERA IS NOT LIABLE TO YOU,
+#  AND WILL NOT DEFEND, INDEMNIFY, NOR HOLD YOU HARMLESS FOR ANY CLAIMS
+#  ARISING FROM OR RELATED TO THE CODE; AND (D)WITH RESPECT TO YOUR EXERCISE
+#  OF ANY RIGHTS GRANTED TO YOU FOR THE CODE, CLOUDERA IS NOT LIABLE FOR ANY
+#  DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, PUNITIVE OR
+#  CONSEQUENTIAL DAMAGES INCLUDING, BUT NOT LIMITED TO, DAMAGES
+#  RELATED TO LOST REVENUE, LOST PROFITS, LOSS OF INCOME, LOSS OF
+#  BUSINESS ADVANTAGE OR UNAVAILABILITY, OR LOSS OR CORRUPTION OF
+#  DATA.
+#
+# ###########################################################################
+
+"""
+Pushing metrics straight to the metric store.
+
+The metric store otherwise only learns of a run's metrics when its reconciler next
+polls MLflow for them. Metrics given to :func:`push_metrics` and :func:`push_text`
+are instead posted to the store's ``/metrics`` endpoint by a background thread, in
+batches, without the caller waiting on the store. MLflow remains the system of
+record: a metric lost to a full queue or a failed request is only counted and
+logged, and runs that were never pushed are still reconciled from MLflow.
+
+"""
+
+import logging
+import queue
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional
+
+import requests
+from mlflow.entities import Metric
+
+from . import metrics
+from .config import settings
+
+logger = logging.getLogger(__name__)
+
+
+def store_metric(
+    experiment_id: str,
+    run_id: str,
+    name: str,
+    value: Any,
+    step: int,
+    timestamp_ms: int,
+) -> Dict[str, Any]:
+    """A metric in the metric store's format, tagged with its step"""
+    if isinstance(value, str):
+        store_value = {"metricType": "text", "stringValue": value}
+    else:
+        store_value = {"metricType": "numeric", "numericValue": float(value)}
+    return {
+        "experiment_id": experiment_id,
+        "experiment_run_id": run_id,
+        "name": name,
+        "value": store_value,
+        "tags": [{"key": "step", "value": str(step)}],
+        "ts": datetime.fromtimestamp(timestamp_ms / 1000, timezone.utc).isoformat(
+            timespec="milliseconds"
+        ),
+    }
+
+
+class _MetricPusher:
+    """
+    Posts the metrics queued to the metric store from a background thread.
+
+    Metrics are posted in batches of up to ``batch_size``, at most
+    ``flush_interval`` seconds after the first of a batch was queued. When
+    ``queue_size`` metrics are already waiting, further metrics are dropped.
+
+    """
+
+    _STOP = object()
+
+    def __init__(
+        self,
+        uri: str,
+        batch_size: int,
+        flush_interval: float,
+        queue_size: int,
+        timeout: float,
+    ) -> None:
+        self._url = f"{uri}/metrics"
+        self._batch_size = batch_size
+        self._flush_interval = flush_interval
+        self._timeout = timeout
+        self._session = requests.Session()
+        self._queue: queue.Queue = queue.Queue(maxsize=queue_size)
+        self._thread = threading.Thread(
+            target=self._run, name="metric-store-pusher", daemon=True
+        )
+        self._thread.start()
+
+    def put(self, metric: Dict[str, Any]) -> None:
+        try:
+            self._queue.put_nowait(metric)
+        except queue.Full:
+            metrics.METRIC_STORE_PUSHES.labels("queue_full").inc()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Post the metrics already queued, then stop"""
+        self._queue.put(self._STOP)
+        self._thread.join(timeout)
+
+    def _run(self) -> None:
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self._flush_interval
+            while len(batch) < self._batch_size and batch[-1] is not self._STOP:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            stopping = batch[-1] is self._STOP
+            if stopping:
+                batch.pop()
+            if batch:
+                self._post(batch)
+            if stopping:
+                return
+
+    def _post(self, batch: List[Dict[str, Any]]) -> None:
+        try:
+            response = self._session.post(
+                self._url, json={"metrics": batch}, timeout=self._timeout
+            )
+            response.raise_for_status()
+        except Exception as e:
+            metrics.METRIC_STORE_PUSHES.labels("failed").inc(len(batch))
+            logger.warning("Failed to push %d metrics to the store: %s", len(batch), e)
+            return
+        metrics.METRIC_STORE_PUSHES.labels("pushed").inc(len(batch))
+
+
+_pusher: Optional[_MetricPusher] = None
+
+
+def start() -> None:
+    """Start pushing metrics, unless disabled in the settings"""
+    global _pusher
+    push = settings.metric_push
+    if not push.enabled:
+        logger.info("Pushing metrics to the metric store is disabled.")
+        return
+    _pusher = _MetricPusher(
+        settings.mlflow_store.uri,
+        push.batch_size,
+        push.flush_interval,
+        push.queue_size,
+        push.timeout,
+    )
+
+
+def shutdown(timeout: float = 10.0) -> None:
+    """Post the metrics still queued"""
+    global _pusher
+    if _pusher is not None:
+        _pusher.stop(timeout)
+        _pusher = None
+
+
+def push_metrics(
+    experiment_id: str, run_id: str, run_metrics: Iterable[Metric]
+) -> None:
+    """Push metrics logged to an MLflow run to the metric store"""
+    if _pusher is None:
+        return
+    for metric in run_metrics:
+        _pusher.put(
+            store_metric(
+                experiment_id,
+                run_id,
+                metric.key,
+                metric.value,
+                metric.step,
+                metric.timestamp,
+            )
+        )
+
+
+def push_text(
+    experiment_id: str,
+    run_id: str,
+    name: str,
+    text: str,
+    step: int,
+    timestamp_ms: int,
+) -> None:
+    """Push a text metric, such as a table logged to an MLflow run, to the store"""
+    if _pusher is None:
+        return
+    _pusher.put(store_metric(experiment_id, run_id, name, text, step, timestamp_ms))
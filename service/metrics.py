@@ -0,0 +1,414 @@
+# ###########################################################################
+#
+#  CLOUDERA APPLIED MACHINE LEARNING PROTOTYPE (AMP)
+#  (C) Cloudera, Inc. 2021
+#  All rights reserved.
+#
+#  Applicable Open Source License: Apache 2.0
+#
+#  NOTE: Cloudera open source products are modular software products
+#  made up of hundreds of individual components, each of which was
+#  individually copyrighted.  Each Cloudera open source product is a
+#  collective work under U.S. Copyright Law. Your license to use the
+#  collective work is as provided in your written agreement with
+#  Cloudera.  Used apart from the collective work, this file is
+#  licensed for your use pursuant to the open source license
+#  identified above.
+#
+#  This code is provided to you pursuant a written agreement with
+#  (i) Cloudera, Inc. or (ii) a third-party authorized to distribute
+#  this code. If you do not have a written agreement with Cloudera nor
+#  with an authorized and properly licensed third party, you do not
+#  have any rights to access nor to use this code.
+#
+#  Absent a written agreement with Cloudera, Inc. (“Cloudera”) to the
+#  contrary, A) CLOUDERA PROVIDES THIS CODE TO YOU WITHOUT WARRANTIES OF ANY
+#  KIND; (B) CLOUDERA DISCLAIMS ANY AND ALL EXPRESS AND IMPLIED
+#  WARRANTIES WITH RESPECT TO THIS CODE, INCLUDING BUT NOT LIMITED TO
+#  IMPLIED WARRANTIES OF TITLE, NON-INFRINGEMENT, MERCHANTABILITY AND
+#  FITNESS FOR A PARTICULAR PURPOSE; (C) CLOUDERA IS NOT LIABLE TO YOU,
+#  AND WILL NOT DEFEND, INDEMNIFY, NOR HOLD YOU HARMLESS FOR ANY CLAIMS
+#  ARISING FROM OR RELATED TO THE CODE; AND (D)WITH RESPECT TO YOUR EXERCISE
+#  OF ANY RIGHTS GRANTED TO YOU FOR THE CODE, CLOUDERA IS NOT LIABLE FOR ANY
+#  DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, PUNITIVE OR
+#  CONSEQUENTIAL DAMAGES INCLUDING, BUT NOT LIMITED TO, DAMAGES
+#  RELATED TO LOST REVENUE, LOST PROFITS, LOSS OF INCOME, LOSS OF
+#  BUSINESS ADVANTAGE OR UNAVAILABILITY, OR LOSS OR CORRUPTION OF
+#  DATA.
+#
+# ###########################################################################
+
+"""
+In-process Prometheus metrics.
+
+A small registry of counters, gauges and histograms rendered in the Prometheus text
+exposition format by the ``/metrics`` endpoint. The service defines its metrics
+below; instrument code with e.g.::
+
+    with metrics.STAGE_SECONDS.labels("retrieve").time():
+        ...
+
+Stages timed with :func:`stage` or :func:`record_stage` are also reported in the
+``Server-Timing`` header of the request they ran for.
+
+"""
+
+import abc
+import contextlib
+import contextvars
+import math
+import threading
+import time
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# upper bounds (in seconds) of the latency histogram buckets
+LATENCY_BUCKETS = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+    60.0,
+)
+
+LabelValues = Tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(f'{name}="{_escape(value)}"' for name, value in zip(names, values))
+    return "{" + pairs + "}"
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value))
+
+
+class _Metric(abc.ABC):
+    """A metric family: one value, or histogram, per combination of label values."""
+
+    type_name = ""
+
+    def __init__(
+        self, name: str, documentation: str, labelnames: Sequence[str] = ()
+    ) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._children: Dict[LabelValues, object] = {}
+        REGISTRY.register(self)
+
+    @abc.abstractmethod
+    def _new_child(self) -> object:
+        """A new child metric, for a combination of label values"""
+
+    def labels(self, *values: str):
+        """The child metric for the given label values"""
+        if len(values) != len(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}")
+        key = tuple(str(value) for value in values)
+        with self._lock:
+            child = self._children.get(key)
+            if child is None:
+                child = self._children[key] = self._new_child()
+            return child
+
+    @abc.abstractmethod
+    def _samples(self) -> Iterator[Tuple[str, str, float]]:
+        """The suffix, labels and value of each sample of the family"""
+
+    def render(self) -> List[str]:
+        lines = [
+            f"# HELP {self.name} {_escape(self.documentation)}",
+            f"# TYPE {self.name} {self.type_name}",
+        ]
+        for suffix, labels, value in self._samples():
+            lines.append(f"{self.name}{suffix}{labels} {_format_value(value)}")
+        return lines
+
+
+class _Value:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.value = 0.0
+
+    def inc(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self.value += amount
+
+    def dec(self, amount: float = 1.0) -> None:
+        self.inc(-amount)
+
+    def set(self, value: float) -> None:
+        with self._lock:
+            self.value = value
+
+
+class Counter(_Metric):
+    """A monotonically increasing count."""
+
+    type_name = "counter"
+
+    def _new_child(self) -> _Value:
+        return _Value()
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.labels().inc(amount)
+
+    def _samples(self) -> Iterator[Tuple[str, str, float]]:
+        with self._lock:
+            children = list(self._children.items())
+        for values, child in children:
+            yield "_total", _format_labels(self.labelnames, values), child.value
+
+
+class Gauge(_Metric):
+    """A value that goes up and down, or is computed when scraped."""
+
+    type_name = "gauge"
+
+    def __init__(
+        self, name: str, documentation: str, labelnames: Sequence[str] = ()
+    ) -> None:
+        super().__init__(name, documentation, labelnames)
+        self._function: Optional[Callable[[], Dict[LabelValues, float]]] = None
+
+    def _new_child(self) -> _Value:
+        return _Value()
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.labels().inc(amount)
+
+    def dec(self, amount: float = 1.0) -> None:
+        self.labels().dec(amount)
+
+    def set(self, value: float) -> None:
+        self.labels().set(value)
+
+    def set_function(self, function: Callable[[], Dict[LabelValues, float]]) -> None:
+        """Compute the values, by label values, from ``function`` when scraped"""
+        self._function = function
+
+    @contextlib.contextmanager
+    def track_in_progress(self, *values: str) -> Iterator[None]:
+        child = self.labels(*values)
+        child.inc()
+        try:
+            yield
+        finally:
+            child.dec()
+
+    def _samples(self) -> Iterator[Tuple[str, str, float]]:
+        if self._function is not None:
+            values = self._function().items()
+        else:
+            with self._lock:
+                values = [(key, child.value) for key, child in self._children.items()]
+        for key, value in values:
+            yield "", _format_labels(self.labelnames, key), value
+
+
+class _HistogramValue:
+    def __init__(self, buckets: Sequence[float]) -> None:
+        self._lock = threading.Lock()
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        with self._lock:
+            self.sum += value
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    self.counts[i] += 1
+                    return
+            self.counts[-1] += 1
+
+    @contextlib.contextmanager
+    def time(self) -> Iterator[None]:
+        """Observe the duration of the block, in seconds, even if it raises"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started)
+
+
+class Histogram(_Metric):
+    """Counts of observations in cumulative buckets, with their sum."""
+
+    type_name = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+    ) -> None:
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def _new_child(self) -> _HistogramValue:
+        return _HistogramValue(self.buckets)
+
+    def observe(self, value: float) -> None:
+        self.labels().observe(value)
+
+    def time(self):
+        return self.labels().time()
+
+    def _samples(self) -> Iterator[Tuple[str, str, float]]:
+        with self._lock:
+            children = list(self._children.items())
+        names = self.labelnames + ("le",)
+        for values, child in children:
+            with child._lock:
+                counts, total = list(child.counts), child.sum
+            cumulative = 0
+            for bound, count in zip(self.buckets + (math.inf,), counts):
+                cumulative += count
+                le = _format_value(bound)
+                yield "_bucket", _format_labels(names, values + (le,)), cumulative
+            labels = _format_labels(self.labelnames, values)
+            yield "_sum", labels, total
+            yield "_count", labels, cumulative
+
+
+class Registry:
+    """The metrics rendered by the ``/metrics`` endpoint."""
+
+    def __init__(self) -> None:
+        self._metrics: List[_Metric] = []
+        self._lock = threading.Lock()
+
+    def register(self, metric: _Metric) -> None:
+        with self._lock:
+            if any(m.name == metric.name for m in self._metrics):
+                raise ValueError(f"metric {metric.name} is already registered")
+            self._metrics.append(metric)
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics)
+        lines = [line for metric in metrics for line in metric.render()]
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+
+###################################
+#  Service metrics
+###################################
+
+
+STAGE_SECONDS = Histogram(
+    "rag_stage_duration_seconds",
+    "Duration of the stages of a prediction: condense, embed, retrieve, "
+    "synthesize, mlflow_log and store_registration.",
+    ["stage"],
+)
+EVALUATOR_SECONDS = Histogram(
+    "rag_evaluator_duration_seconds",
+    "Duration of each evaluator run on a prediction.",
+    ["evaluator"],
+)
+REQUEST_SECONDS = Histogram(
+    "rag_http_request_duration_seconds",
+    "Duration of the HTTP requests served, until their response was sent, by route.",
+    ["method", "route", "status"],
+)
+REQUESTS_IN_FLIGHT = Gauge(
+    "rag_http_requests_in_flight",
+    "HTTP requests being served.",
+    ["method"],
+)
+LLM_TOKENS = Counter(
+    "rag_llm_tokens",
+    "LLM tokens sent (in) and generated (out), by model.",
+    ["model", "direction"],
+)
+LLM_QUEUE_DEPTH = Gauge(
+    "rag_llm_queue_depth",
+    "LLM calls waiting for admission by the rate limiter, by model and priority; "
+    "the evaluation and backfill priorities make up the evaluation queue.",
+    ["model", "priority"],
+)
+LOG_RECORDS_DROPPED = Counter(
+    "rag_log_records_dropped",
+    "Log records dropped because the log queue was full.",
+)
+MLFLOW_TRACES = Counter(
+    "rag_mlflow_traces",
+    "MLflow traces of llama-index calls by outcome: kept for an error, a slow "
+    "request or the sample, dropped, or lost to a full queue or a failed write.",
+    ["outcome"],
+)
+METRIC_STORE_PUSHES = Counter(
+    "rag_metric_store_pushes",
+    "Metrics posted to the metric store by outcome: pushed, or lost to a full "
+    "queue or a failed request.",
+    ["outcome"],
+)
+
+
+###################################
+#  Per-request stage timings
+###################################
+
+
+_stage_timings: contextvars.ContextVar[Optional[Dict[str, float]]] = (
+    contextvars.ContextVar("stage_timings", default=None)
+)
+
+
+@contextlib.contextmanager
+def collect_stage_timings(timings: Dict[str, float]) -> Iterator[None]:
+    """
+    Add the seconds spent in each stage recorded within the block to ``timings``.
+
+    Tasks and threads started within the block add to the same timings, so stages
+    run more than once, e.g. for each query of a batch, are summed.
+
+    """
+    token = _stage_timings.set(timings)
+    try:
+        yield
+    finally:
+        _stage_timings.reset(token)
+
+
+def record_stage(stage_name: str, seconds: float) -> None:
+    """Observe a stage's duration, and add it to the timings being collected"""
+    STAGE_SECONDS.labels(stage_name).observe(seconds)
+    timings = _stage_timings.get()
+    if timings is not None:
+        timings[stage_name] = timings.get(stage_name, 0.0) + seconds
+
+
+@contextlib.contextmanager
+def stage(stage_name: str) -> Iterator[None]:
+    """Record the duration of the block, even if it raises, as a stage"""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_stage(stage_name, time.perf_counter() - started)
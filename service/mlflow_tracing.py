@@ -0,0 +1,370 @@
+# ###########################################################################
+#
+#  CLOUDERA APPLIED MACHINE LEARNING PROTOTYPE (AMP)
+#  (C) Cloudera, Inc. 2021
+#  All rights reserved.
+#
+#  Applicable Open Source License: Apache 2.0
+#
+#  NOTE: Cloudera open source products are modular software products
+#  made up of hundreds of individual components, each of which was
+#  individually copyrighted.  Each Cloudera open source product is a
+#  collective work under U.S. Copyright Law. Your license to use the
+#  collective work is as provided in your written agreement with
+#  Cloudera.  Used apart from the collective work, this file is
+#  licensed for your use pursuant to the open source license
+#  identified above.
+#
+#  This code is provided to you pursuant a written agreement with
+#  (i) Cloudera, Inc. or (ii) a third-party authorized to distribute
+#  this code. If you do not have a written agreement with Cloudera nor
+#  with an authorized and properly licensed third party, you do not
+#  have any rights to access nor to use this code.
+#
+#  Absent a written agreement with Cloudera, Inc. (“Cloudera”) to the
+#  contrary, A) CLOUDERA PROVIDES THIS CODE TO YOU WITHOUT WARRANTIES OF ANY
+#  KIND; (B) CLOUDERA DISCLAIMS ANY AND ALL EXPRESS AND IMPLIED
+#  WARRANTIES WITH RESPECT TO THIS CODE, INCLUDING BUT NOT LIMITED TO
+#  IMPLIED WARRANTIES OF TITLE, NON-INFRINGEMENT, MERCHANTABILITY AND
+#  FITNESS FOR A PARTICULAR PURPOSE; (C) CLOUDERA IS NOT LIABLE TO YOU,
+#  AND WILL NOT DEFEND, INDEMNIFY, NOR HOLD YOU HARMLESS FOR ANY CLAIMS
+#  ARISING FROM OR RELATED TO THE CODE; AND (D)WITH RESPECT TO YOUR EXERCISE
+#  OF ANY RIGHTS GRANTED TO YOU FOR THE CODE, CLOUDERA IS NOT LIABLE FOR ANY
+#  DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, PUNITIVE OR
+#  CONSEQUENTIAL DAMAGES INCLUDING, BUT NOT LIMITED TO, DAMAGES
+#  RELATED TO LOST REVENUE, LOST PROFITS, LOSS OF INCOME, LOSS OF
+#  BUSINESS ADVANTAGE OR UNAVAILABILITY, OR LOSS OR CORRUPTION OF
+#  DATA.
+#
+# ###########################################################################
+
+"""
+Sampling of the MLflow traces of llama-index calls.
+
+MLflow's LlamaIndex autologging records a trace of every llama-index call and, by
+default, writes it to the tracking server as it starts and again as it ends. Once
+:func:`install` has been called the traces are instead held in memory until the
+request that recorded them has finished, and only written when:
+
+* the request, or one of its traces, failed;
+* the request took at least ``slow_request_seconds``;
+* the request was sampled, with the ``sample_ratio`` of its data source.
+
+This is tail-based sampling: the decision is made once the request's outcome and
+latency are known. Requests are delimited by :func:`sampled_traces`; traces
+recorded outside of one, e.g. by a backfill, are sampled one at a time. The traces
+kept are written by a background thread, in batches.
+
+A request's traces are written to the experiment and run given to
+:func:`sampled_traces`, as predictions log with an ``MlflowClient`` rather than the
+fluent API's active run and experiment, which concurrent requests would share.
+MLflow offers no hook for a custom span processor, so :func:`install` replaces the
+tracer provider of the pinned MLflow version, and leaves MLflow's own tracing in
+place on any other.
+
+"""
+
+import contextlib
+import contextvars
+import json
+import logging
+import queue
+import random
+import threading
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import Iterator, List, Optional, Sequence
+
+import mlflow
+from mlflow.entities import Trace, TraceData, TraceInfo
+from mlflow.entities.trace_status import TraceStatus
+from mlflow.tracing import provider
+from mlflow.tracing.constant import (
+    TRACE_SCHEMA_VERSION,
+    TRACE_SCHEMA_VERSION_KEY,
+    SpanAttributeKey,
+    TraceMetadataKey,
+    TraceTagKey,
+)
+from mlflow.tracing.processor.mlflow import MlflowSpanProcessor
+from mlflow.tracing.trace_manager import InMemoryTraceManager
+from mlflow.tracing.utils import get_otel_attribute
+from mlflow.tracking import MlflowClient
+from mlflow.tracking.default_experiment import DEFAULT_EXPERIMENT_ID
+from opentelemetry.sdk.trace import ReadableSpan, Span, TracerProvider
+from opentelemetry.sdk.trace.export import SpanExporter, SpanExportResult
+
+from . import metrics
+from .config import settings
+
+logger = logging.getLogger(__name__)
+
+SAMPLING_REASON_TAG = "rag.sampling_reason"
+DATA_SOURCE_TAG = "rag.data_source_id"
+# the MLflow version whose tracer provider install() replaces, as pinned in pyproject
+MLFLOW_VERSION = "2.16.2"
+
+
+def sample_ratio(data_source_id: Optional[int]) -> float:
+    """The fraction of the requests to ``data_source_id`` whose traces are kept"""
+    tracing = settings.mlflow_tracing
+    return tracing.data_source_sample_ratios.get(data_source_id, tracing.sample_ratio)
+
+
+def _keep_reason(failed: bool, seconds: float, sampled: bool) -> Optional[str]:
+    """Why traces are kept, or None when they are dropped"""
+    if failed:
+        return "error"
+    if seconds >= settings.mlflow_tracing.slow_request_seconds:
+        return "slow"
+    if sampled:
+        return "sampled"
+    return None
+
+
+@dataclass
+class _TraceGroup:
+    """The traces recorded while serving one request"""
+
+    data_source_id: Optional[int]
+    sampled: bool
+    experiment_id: Optional[str] = None
+    run_id: Optional[str] = None
+    started: float = field(default_factory=time.perf_counter)
+    traces: List[Trace] = field(default_factory=list)
+    closed: bool = False
+    lock: threading.Lock = field(default_factory=threading.Lock)
+
+    def add(self, trace: Trace) -> bool:
+        """Hold ``trace`` until the request has finished, unless it already has"""
+        with self.lock:
+            if self.closed:
+                return False
+            self.traces.append(trace)
+            return True
+
+    def close(self) -> List[Trace]:
+        with self.lock:
+            self.closed = True
+            return self.traces
+
+
+_trace_group: contextvars.ContextVar[Optional[_TraceGroup]] = contextvars.ContextVar(
+    "trace_group", default=None
+)
+
+
+@contextlib.contextmanager
+def sampled_traces(
+    data_source_id: Optional[int] = None,
+    experiment_id: Optional[str] = None,
+    run_id: Optional[str] = None,
+) -> Iterator[None]:
+    """
+    Sample the traces recorded within the block together, once it has finished.
+
+    Tasks and threads started within the block add their traces to the same group.
+    The traces belong to ``experiment_id`` and, when given, to the run ``run_id``.
+
+    """
+    group = _TraceGroup(
+        data_source_id,
+        random.random() < sample_ratio(data_source_id),
+        experiment_id,
+        run_id,
+    )
+    token = _trace_group.set(group)
+    failed = False
+    try:
+        yield
+    except Exception:
+        failed = True
+        raise
+    finally:
+        _trace_group.reset(token)
+        traces = group.close()
+        if traces:
+            failed = failed or any(
+                trace.info.status == TraceStatus.ERROR for trace in traces
+            )
+            seconds = time.perf_counter() - group.started
+            _submit(traces, _keep_reason(failed, seconds, group.sampled))
+
+
+class _TraceWriter:
+    """
+    Writes the traces kept to the tracking server from a background thread.
+
+    Traces are written in batches of up to ``batch_size``, at most
+    ``flush_interval`` seconds after the first of a batch was queued. When
+    ``queue_size`` traces are already waiting, further traces are dropped.
+
+    """
+
+    _STOP = object()
+
+    def __init__(
+        self,
+        client: MlflowClient,
+        batch_size: int,
+        flush_interval: float,
+        queue_size: int,
+    ) -> None:
+        self._client = client
+        self._batch_size = batch_size
+        self._flush_interval = flush_interval
+        self._queue: queue.Queue = queue.Queue(maxsize=queue_size)
+        self._thread = threading.Thread(
+            target=self._run, name="mlflow-trace-writer", daemon=True
+        )
+        self._thread.start()
+
+    def put(self, trace: Trace) -> None:
+        try:
+            self._queue.put_nowait(trace)
+        except queue.Full:
+            metrics.MLFLOW_TRACES.labels("queue_full").inc()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Write the traces already queued, then stop"""
+        self._queue.put(self._STOP)
+        self._thread.join(timeout)
+
+    def _run(self) -> None:
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self._flush_interval
+            while len(batch) < self._batch_size and batch[-1] is not self._STOP:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            for trace in batch:
+                if trace is self._STOP:
+                    return
+                self._write(trace)
+
+    def _write(self, trace: Trace) -> None:
+        """Start, upload and end ``trace`` on the tracking server"""
+        try:
+            info = self._client._start_tracked_trace(
+                experiment_id=trace.info.experiment_id,
+                timestamp_ms=trace.info.timestamp_ms,
+                request_metadata=trace.info.request_metadata,
+                tags=trace.info.tags,
+            )
+            # the spans carry the provisional request ID given when the trace started
+            data = trace.data.to_dict()
+            for span in data["spans"]:
+                span["attributes"][SpanAttributeKey.REQUEST_ID] = json.dumps(
+                    info.request_id
+                )
+            trace_data = TraceData.from_dict(data)
+            info.execution_time_ms = trace.info.execution_time_ms
+            info.status = trace.info.status
+            self._client._upload_trace_data(info, trace_data)
+            self._client._upload_trace_spans_as_tag(info, trace_data)
+            self._client._upload_ended_trace_info(info)
+        except Exception:
+            metrics.MLFLOW_TRACES.labels("export_failed").inc()
+            logger.warning("Failed to write an MLflow trace", exc_info=True)
+
+
+_writer: Optional[_TraceWriter] = None
+
+
+def _submit(traces: Sequence[Trace], reason: Optional[str]) -> None:
+    if reason is None:
+        metrics.MLFLOW_TRACES.labels("dropped").inc(len(traces))
+        return
+    metrics.MLFLOW_TRACES.labels(reason).inc(len(traces))
+    for trace in traces:
+        trace.info.tags[SAMPLING_REASON_TAG] = reason
+        _writer.put(trace)
+
+
+class _DeferredSpanProcessor(MlflowSpanProcessor):
+    """
+    :class:`MlflowSpanProcessor` that starts traces in memory only.
+
+    The trace is given a provisional request ID, and only started on the tracking
+    server if it is kept.
+
+    """
+
+    def _start_trace(self, span: Span, start_time_ns: Optional[int]) -> TraceInfo:
+        experiment_id = get_otel_attribute(span, SpanAttributeKey.EXPERIMENT_ID)
+        metadata = {TRACE_SCHEMA_VERSION_KEY: str(TRACE_SCHEMA_VERSION)}
+        tags = {TraceTagKey.TRACE_NAME: span.name}
+        group = _trace_group.get()
+        if group is not None:
+            experiment_id = experiment_id or group.experiment_id
+            if group.run_id is not None:
+                metadata[TraceMetadataKey.SOURCE_RUN] = group.run_id
+            if group.data_source_id is not None:
+                tags[DATA_SOURCE_TAG] = str(group.data_source_id)
+        return TraceInfo(
+            request_id=uuid.uuid4().hex,
+            experiment_id=experiment_id or DEFAULT_EXPERIMENT_ID,
+            timestamp_ms=(start_time_ns or span.start_time) // 1_000_000,
+            execution_time_ms=None,
+            status=TraceStatus.IN_PROGRESS,
+            request_metadata=metadata,
+            tags=tags,
+        )
+
+
+class _SamplingSpanExporter(SpanExporter):
+    """Hands the traces that ended to the request that recorded them, or samples them"""
+
+    def __init__(self) -> None:
+        self._trace_manager = InMemoryTraceManager.get_instance()
+
+    def export(self, spans: Sequence[ReadableSpan]) -> SpanExportResult:
+        for span in spans:
+            if span.parent is not None:
+                continue
+            trace = self._trace_manager.pop_trace(span.context.trace_id)
+            if trace is None:
+                continue
+            group = _trace_group.get()
+            if group is None or not group.add(trace):
+                sampled = random.random() < sample_ratio(None)
+                seconds = (trace.info.execution_time_ms or 0) / 1000
+                failed = trace.info.status == TraceStatus.ERROR
+                _submit([trace], _keep_reason(failed, seconds, sampled))
+        return SpanExportResult.SUCCESS
+
+
+def install() -> None:
+    """Route MLflow's traces through the sampler"""
+    global _writer
+    if mlflow.__version__ != MLFLOW_VERSION:
+        logger.warning(
+            "MLflow trace sampling needs MLflow %s, not %s: traces are not sampled",
+            MLFLOW_VERSION,
+            mlflow.__version__,
+        )
+        return
+    tracing = settings.mlflow_tracing
+    client = MlflowClient(tracking_uri=settings.mlflow.tracking_uri)
+    _writer = _TraceWriter(
+        client, tracing.batch_size, tracing.flush_interval, tracing.queue_size
+    )
+    tracer_provider = TracerProvider()
+    tracer_provider.add_span_processor(
+        _DeferredSpanProcessor(_SamplingSpanExporter(), client)
+    )
+    # MLflow has no hook for a custom processor: replace its tracer provider
+    provider._MLFLOW_TRACER_PROVIDER = tracer_provider
+    provider._MLFLOW_TRACER_PROVIDER_INITIALIZED.done = True
+
+
+def shutdown(timeout: float = 10.0) -> None:
+    """Write the traces still queued"""
+    if _writer is not None:
+        _writer.stop(timeout)
@@ -0,0 +1,302 @@
+# ###########################################################################
+#
+#  CLOUDERA APPLIED MACHINE LEARNING PROTOTYPE (AMP)
+#  (C) Cloudera, Inc. 2021
+#  All rights reserved.
+#
+#  Applicable Open Source License: Apache 2.0
+#
+#  NOTE: Cloudera open source products are modular software products
+#  made up of hundreds of individual components, each of which was
+#  individually copyrighted.  Each Cloudera open source product is a
+#  collective work under U.S. Copyright Law. Your license to use the
+#  collective work is as provided in your written agreement with
+#  Cloudera.  Used apart from the collective work, this file is
+#  licensed for your use pursuant to the open source license
+#  identified above.
+#
+#  This code is provided to you pursuant a written agreement with
+#  (i) Cloudera, Inc. or (ii) a third-party authorized to distribute
+#  this code. If you do not have a written agreement with Cloudera nor
+#  with an authorized and properly licensed third party, you do not
+#  have any rights to access nor to use this code.
+#
+#  Absent a written agreement with Cloudera, Inc. (“Cloudera”) to the
+#  contrary, A) CLOUDERA PROVIDES THIS CODE TO YOU WITHOUT WARRANTIES OF ANY
+#  KIND; (B) CLOUDERA DISCLAIMS ANY AND ALL EXPRESS AND IMPLIED
+#  WARRANTIES WITH RESPECT TO THIS CODE, INCLUDING BUT NOT LIMITED TO
+#  IMPLIED WARRANTIES OF TITLE, NON-INFRINGEMENT, MERCHANTABILITY AND
+#  FITNESS FOR A PARTICULAR PURPOSE; (C) CLOUDERA IS NOT LIABLE TO YOU,
+#  AND WILL NOT DEFEND, INDEMNIFY, NOR HOLD YOU HARMLESS FOR ANY CLAIMS
+#  ARISING FROM OR RELATED TO THE CODE; AND (D)WITH RESPECT TO YOUR EXERCISE
+#  OF ANY RIGHTS GRANTED TO YOU FOR THE CODE, CLOUDERA IS NOT LIABLE FOR ANY
+#  DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, PUNITIVE OR
+#  CONSEQUENTIAL DAMAGES INCLUDING, BUT NOT LIMITED TO, DAMAGES
+#  RELATED TO LOST REVENUE, LOST PROFITS, LOSS OF INCOME, LOSS OF
+#  BUSINESS ADVANTAGE OR UNAVAILABILITY, OR LOSS OR CORRUPTION OF
+#  DATA.
+#
+# ###########################################################################
+
+"""
+Per-request sampling profiler.
+
+While a profiled request is served, a background thread samples the Python stacks of
+the service's threads every ``settings.profiling.interval`` seconds. The samples are
+kept as a `speedscope <https://www.speedscope.app>`_ profile, one per thread that
+did any work, so the time spent in llama-index, Bedrock and MLflow calls can be read
+from a flame graph.
+
+The requests served by the event loop share its thread, so a profile also holds the
+samples of any request served concurrently; profile under light load. One request
+is profiled at a time.
+
+"""
+
+import re
+import sys
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+from starlette.datastructures import Headers, MutableHeaders, QueryParams
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from .config import settings
+
+SPEEDSCOPE_SCHEMA = "https://www.speedscope.app/file-format-schema.json"
+
+# request ids given by clients are used as file names; anything else is replaced
+_REQUEST_ID_PATTERN = re.compile(r"[A-Za-z0-9_.-]{1,128}")
+
+_FrameKey = Tuple[str, str, int]
+
+
+@dataclass
+class Profile:
+    """The samples taken while serving one request."""
+
+    request_id: str
+    method: str
+    path: str
+    started_at: float
+    duration: float = 0.0
+    status_code: Optional[int] = None
+    frames: List[_FrameKey] = field(default_factory=list)
+    # per thread id: its name, and the stacks sampled (root first) and their weights
+    threads: Dict[int, Tuple[str, List[List[int]], List[float]]] = field(
+        default_factory=dict
+    )
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "request_id": self.request_id,
+            "method": self.method,
+            "path": self.path,
+            "started_at": self.started_at,
+            "duration": self.duration,
+            "status_code": self.status_code,
+            "samples": sum(len(samples) for _, samples, _ in self.threads.values()),
+        }
+
+    def to_speedscope(self) -> Dict[str, Any]:
+        """The profile in the speedscope file format"""
+        profiles = []
+        for name, samples, weights in self.threads.values():
+            # skip the threads that sat idle, e.g. waiting for work, throughout
+            if len(set(map(tuple, samples))) <= 1:
+                continue
+            profiles.append(
+                {
+                    "type": "sampled",
+                    "name": name,
+                    "unit": "seconds",
+                    "startValue": 0,
+                    "endValue": sum(weights),
+                    "samples": samples,
+                    "weights": weights,
+                }
+            )
+        return {
+            "$schema": SPEEDSCOPE_SCHEMA,
+            "name": f"{self.method} {self.path} ({self.request_id})",
+            "exporter": "rag-monitoring-service",
+            "activeProfileIndex": 0,
+            "shared": {
+                "frames": [
+                    {"name": name, "file": file, "line": line}
+                    for name, file, line in self.frames
+                ]
+            },
+            "profiles": profiles,
+        }
+
+
+class SamplingProfiler:
+    """Samples the stacks of every other thread from a background thread."""
+
+    def __init__(self, profile: Profile, interval: float) -> None:
+        self.profile = profile
+        self.interval = interval
+        self._frame_ids: Dict[_FrameKey, int] = {}
+        self._started = 0.0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run, name="request-profiler", daemon=True
+        )
+
+    def _frame_id(self, frame) -> int:
+        code = frame.f_code
+        key = (
+            getattr(code, "co_qualname", code.co_name),
+            code.co_filename,
+            code.co_firstlineno,
+        )
+        frame_id = self._frame_ids.get(key)
+        if frame_id is None:
+            frame_id = self._frame_ids[key] = len(self.profile.frames)
+            self.profile.frames.append(key)
+        return frame_id
+
+    def _sample(self, weight: float) -> None:
+        own_id = threading.get_ident()
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        for thread_id, frame in sys._current_frames().items():
+            if thread_id == own_id:
+                continue
+            stack = []
+            while frame is not None:
+                stack.append(self._frame_id(frame))
+                frame = frame.f_back
+            stack.reverse()
+            _, samples, weights = self.profile.threads.setdefault(
+                thread_id, (names.get(thread_id, str(thread_id)), [], [])
+            )
+            samples.append(stack)
+            weights.append(weight)
+
+    def _run(self) -> None:
+        last = time.perf_counter()
+        while not self._stop.wait(self.interval):
+            now = time.perf_counter()
+            self._sample(now - last)
+            last = now
+
+    def start(self) -> None:
+        self._started = time.perf_counter()
+        self._thread.start()
+
+    def stop(self) -> Profile:
+        self._stop.set()
+        self._thread.join()
+        self.profile.duration = time.perf_counter() - self._started
+        return self.profile
+
+
+class ProfileStore:
+    """The most recent profiles, by request id."""
+
+    def __init__(self, max_profiles: int) -> None:
+        self.max_profiles = max_profiles
+        self._profiles: "OrderedDict[str, Profile]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def add(self, profile: Profile) -> None:
+        with self._lock:
+            self._profiles[profile.request_id] = profile
+            while len(self._profiles) > self.max_profiles:
+                self._profiles.popitem(last=False)
+
+    def get(self, request_id: str) -> Optional[Profile]:
+        with self._lock:
+            return self._profiles.get(request_id)
+
+    def recent(self) -> List[Profile]:
+        """The stored profiles, most recent first"""
+        with self._lock:
+            return list(reversed(self._profiles.values()))
+
+
+profiles = ProfileStore(settings.profiling.max_profiles)
+
+# held while a request is profiled
+_profiling = threading.Lock()
+
+
+def start_profiling(
+    method: str, path: str, request_id: Optional[str] = None
+) -> Optional[SamplingProfiler]:
+    """Start profiling a request, unless another request is being profiled"""
+    if not _profiling.acquire(blocking=False):
+        return None
+    if request_id is None or not _REQUEST_ID_PATTERN.fullmatch(request_id):
+        request_id = uuid.uuid4().hex
+    profile = Profile(
+        request_id=request_id,
+        method=method,
+        path=path,
+        started_at=time.time(),
+    )
+    profiler = SamplingProfiler(profile, settings.profiling.interval)
+    profiler.start()
+    return profiler
+
+
+def stop_profiling(profiler: SamplingProfiler, status_code: Optional[int]) -> None:
+    """Stop profiling a request and store its profile"""
+    try:
+        profile = profiler.stop()
+        profile.status_code = status_code
+        profiles.add(profile)
+    finally:
+        _profiling.release()
+
+
+class ProfilingMiddleware:
+    """
+    Profiles the requests sent with an ``X-Profile: 1`` header or ``profile=1``.
+
+    The profile covers the whole request, including streamed bodies and background
+    tasks, and is stored under the ``X-Request-ID`` header if given. Its id is
+    returned in the ``X-Profile-Id`` response header.
+
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not _profile_requested(scope):
+            await self.app(scope, receive, send)
+            return
+        profiler = start_profiling(
+            scope["method"], scope["path"], Headers(scope=scope).get("x-request-id")
+        )
+        if profiler is None:
+            await self.app(scope, receive, send)
+            return
+
+        status_code = None
+
+        async def send_with_profile_id(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                MutableHeaders(scope=message).append(
+                    "X-Profile-Id", profiler.profile.request_id
+                )
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_profile_id)
+        finally:
+            stop_profiling(profiler, status_code)
+
+
+def _profile_requested(scope: Scope) -> bool:
+    if Headers(scope=scope).get("x-profile") == "1":
+        return True
+    return QueryParams(scope.get("query_string", b"")).get("profile") == "1"
@@ -38,36 +38,48 @@
 #
 # ###########################################################################
 
+import asyncio
 import http
+import importlib
 import json
 import logging
 import os
+from datetime import datetime, timezone
 from pathlib import Path
+import time
 import uuid
-from typing import Dict, List, Optional, Union
+from typing import TYPE_CHECKING, Any, AsyncIterator, Dict, List, Optional, Tuple, Union
 import mlflow
+from mlflow.entities import Metric, Param, RunTag
 from mlflow.tracking import MlflowClient
 import requests
 
 import opentelemetry.trace
-from fastapi import APIRouter
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import StreamingResponse
 from llama_index.core.base.llms.types import MessageRole
-from llama_index.core.chat_engine.types import AgentChatResponse
 
 from pydantic import BaseModel
+from starlette.background import BackgroundTask
 
 from st_app.data_types import CreateCustomEvaluatorRequest
 
-from ... import exceptions
-from . import qdrant
-from .qdrant import RagMessage
+from ... import exceptions, metric_push, metrics, mlflow_tracing
+from . import backfill, governor, run_windows
+from .data_types import RagMessage, RagPredictConfiguration
 from ...config import settings
 
+if TYPE_CHECKING:
+    # the query pipeline and its vector store client are imported on first use
+    from llama_index.core.chat_engine.types import AgentChatResponse
+    from llama_index.core.schema import NodeWithScore
+
+    from . import qdrant
+
 logger = logging.getLogger(__name__)
 tracer = opentelemetry.trace.get_tracer(__name__)
 
 mlflow.set_tracking_uri(settings.mlflow.tracking_uri)
-mlflow.llama_index.autolog()
 
 router = APIRouter(
     prefix="/index",
@@ -75,12 +87,38 @@ router = APIRouter(
 )
 
 
+def configure_autolog() -> None:
+    """
+    Enable MLflow's LlamaIndex autologging, unless disabled in the settings, with its
+    traces sampled by :mod:`service.mlflow_tracing`.
+
+    A failure is logged rather than raised, so that the service still starts when
+    MLflow cannot be set up.
+
+    """
+    if not settings.mlflow.llama_index_autolog:
+        logger.info("MLflow LlamaIndex autologging is disabled.")
+        return
+    try:
+        mlflow.llama_index.autolog()
+        if settings.mlflow_tracing.sampling:
+            mlflow_tracing.install()
+    except Exception:
+        logger.warning("Failed to enable MLflow LlamaIndex autologging", exc_info=True)
+
+
+def preload() -> None:
+    """Import the query pipeline, which the routes otherwise import on first use"""
+    importlib.import_module(".qdrant", __name__)
+
+
 class RagPredictRequest(BaseModel):
     data_source_id: int
     chat_history: list[RagMessage]
     query: str
-    configuration: qdrant.RagPredictConfiguration = qdrant.RagPredictConfiguration()
+    configuration: RagPredictConfiguration = RagPredictConfiguration()
     do_evaluate: bool = True
+    session_id: Optional[str] = None
 
 
 class RagPredictSourceNode(BaseModel):
@@ -99,6 +137,15 @@ class RagPredictResponse(BaseModel):
     chat_history: list[RagMessage]
     mlflow_experiment_id: str
     mlflow_run_id: str
+    mlflow_step: Optional[int] = None
+
+
+class RagPredictBatchRequest(BaseModel):
+    data_source_id: int
+    queries: List[str]
+    configuration: RagPredictConfiguration = RagPredictConfiguration()
+    do_evaluate: bool = True
+    max_concurrency: Optional[int] = None
 
 
 class MLflowStoreIdentifier(BaseModel):
@@ -111,6 +158,8 @@ class RagFeedbackRequest(BaseModel):
     experiment_run_id: str
     feedback: float
     feedback_str: Optional[str] = None
+    step: Optional[int] = None
+    response_id: Optional[str] = None
 
 
 @router.post("/feedback", summary="Log feedback for a response")
@@ -119,37 +168,60 @@ class RagFeedbackRequest(BaseModel):
 def feedback(
     request: RagFeedbackRequest,
 ) -> Dict[str, bool]:
-    """Log feedback for a response"""
-    curr_exp = mlflow.set_experiment(experiment_id=request.experiment_id)
-    with mlflow.start_run(
-        experiment_id=curr_exp.experiment_id,
-        run_id=request.experiment_run_id,
-    ):
-        try:
-            mlflow.log_metrics(
-                {
-                    "feedback": request.feedback,
-                },
-                synchronous=False,
-            )
-            mlflow.log_table(
-                {
-                    "run_id": request.experiment_run_id,
-                    "feedback_str": request.feedback_str,
-                },
-                artifact_file="user_feedback.json",
-            )
-            logger.info(
-                "Logged feedback for exp id %s and run id %s",
-                request.experiment_id,
-                request.experiment_run_id,
+    """
+    Log feedback for a response.
+
+    The feedback of a response logged to a shared run is logged at the response's
+    step; without a step it is logged at step 0, as for a run of its own.
+
+    """
+    client = MlflowClient(tracking_uri=settings.mlflow.tracking_uri)
+    try:
+        feedback_metric = Metric(
+            key="feedback",
+            value=request.feedback,
+            timestamp=int(time.time() * 1000),
+            step=request.step or 0,
+        )
+        client.log_metric(
+            request.experiment_run_id,
+            feedback_metric.key,
+            feedback_metric.value,
+            timestamp=feedback_metric.timestamp,
+            step=feedback_metric.step,
+            synchronous=False,
+        )
+        metric_push.push_metrics(
+            request.experiment_id, request.experiment_run_id, [feedback_metric]
+        )
+        row = {
+            "run_id": request.experiment_run_id,
+            "feedback_str": request.feedback_str,
+        }
+        if request.step is not None:
+            row.update(step=request.step, response_id=request.response_id)
+        with run_windows.windows.table_lock(request.experiment_run_id):
+            client.log_table(
+                request.experiment_run_id, row, artifact_file="user_feedback.json"
             )
-        except Exception as e:
-            logger.error("Failed to log feedback: %s", e)
-            return {"success": False}
+        logger.info(
+            "Logged feedback for exp id %s and run id %s",
+            request.experiment_id,
+            request.experiment_run_id,
+        )
+    except Exception as e:
+        logger.error("Failed to log feedback: %s", e)
+        return {"success": False}
     return {"success": True}
 
 
+@router.get("/governor", summary="Bedrock rate limiter state and queue wait metrics")
+@exceptions.propagates
+def governor_metrics() -> List[Dict[str, Any]]:
+    """Return the state and queue wait time metrics of each Bedrock model governor"""
+    return governor.governor_snapshots()
+
+
 def save_to_disk(
     data,
     directory: Union[str, Path, os.PathLike],
@@ -181,102 +253,92 @@ def add_custom_evaluator(
         return {"status": "failed"}
 
 
-async def log_evaluation_metrics(
-    run: mlflow.ActiveRun,
-    query: Union[str, None] = None,
-    chat_response: Union[str, AgentChatResponse, None] = None,
-) -> None:
-    """Log evaluation metrics for a response"""
-    if query is None or chat_response is None:
-        return False
-    mlflowclient = MlflowClient(tracking_uri=settings.mlflow.tracking_uri)
+@router.post("/backfill", summary="Backfill custom evaluator scores for past responses")
+@exceptions.propagates
+@tracer.start_as_current_span("backfill")
+async def start_backfill(
+    request: backfill.BackfillRequest,
+) -> backfill.BackfillProgress:
+    """Start scoring the logged responses of an experiment with custom evaluators"""
     try:
-        (
-            relevance,
-            faithfulness,
-            context_relevancy,
-            maliciousness,
-            toxicity,
-            comprehensiveness,
-            custom_eval_results,
-        ) = await qdrant.evaluate_response(
-            query=query,
-            chat_response=chat_response,
-        )
+        return backfill.start_backfill(request)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e)) from e
 
-        logger.info(
-            "Relevance: %s, Faithfulness: %s, "
-            "Context Relevancy: %s, Maliciousness: %s, "
-            "Toxicity: %s, Comprehensiveness: %s",
-            relevance.score,
-            faithfulness.score,
-            context_relevancy.score,
-            maliciousness.score,
-            toxicity.score,
-            comprehensiveness.score,
-        )
 
-        # fetch previous metrics
-        metric_history = mlflowclient.get_metric_history(
-            run_id=run.info.run_id,
-            key="relevance_score",
-        )
-        mlflow.log_metrics(
-            {
-                "relevance_score": relevance.score if relevance is not None else 0,
-                "faithfulness_score": (
-                    faithfulness.score if faithfulness.score is not None else 0
-                ),
-                "context_relevancy_score": (
-                    context_relevancy.score
-                    if context_relevancy.score is not None
-                    else 0.5
-                ),
-                "input_length": len(query.split()),
-                "output_length": len(chat_response.response.split()),
-                "maliciousness_score": (
-                    maliciousness.score if maliciousness.score is not None else -1
-                ),
-                "toxicity_score": toxicity.score if toxicity.score is not None else -1,
-                "comprehensiveness_score": (
-                    comprehensiveness.score
-                    if comprehensiveness.score is not None
-                    else -1
-                ),
-            },
-            step=len(metric_history) + 1,
-            synchronous=True,
-        )
+@router.get("/backfill", summary="List backfill jobs")
+@exceptions.propagates
+def list_backfills() -> List[backfill.BackfillProgress]:
+    """List the backfill jobs started since the service started"""
+    return backfill.list_backfills()
 
-        # check if there are any custom eval results
-        if custom_eval_results:
-            logger.info("Logging custom evaluation metrics")
-            for name, result in custom_eval_results.items():
-                logger.info("%s: %s", name, result.score)
-                mlflow.log_metric(
-                    key=f"{name.lower().replace(' ', '_')}_score",
-                    value=result.score,
-                    step=len(mlflowclient.get_metric_history(run.info.run_id, name)),
-                    synchronous=True,
-                )
-                logger.info(
-                    "%s: %s", name.lower().replace(" ", "_") + "_score", result.score
-                )
-        else:
-            logger.info("No custom evaluators or metrics to log")
 
-        logger.info(
-            "Logged evaluation metrics for exp id %s and run id %s",
-            run.info.experiment_id,
-            run.info.run_id,
-        )
-    except Exception as e:
-        logger.error("Failed to log evaluation metrics: %s", e)
+@router.get("/backfill/{job_id}", summary="Backfill job progress")
+@exceptions.propagates
+def get_backfill(job_id: str) -> backfill.BackfillProgress:
+    """Return the progress of a backfill job"""
+    progress = backfill.get_backfill(job_id)
+    if progress is None:
+        raise HTTPException(status_code=404, detail=f"unknown backfill job {job_id}")
+    return progress
+
+
+@router.delete("/backfill/{job_id}", summary="Cancel a backfill job")
+@exceptions.propagates
+async def cancel_backfill(job_id: str) -> backfill.BackfillProgress:
+    """Cancel a backfill job; starting it again resumes from its checkpoint"""
+    progress = await backfill.cancel_backfill(job_id)
+    if progress is None:
+        raise HTTPException(status_code=404, detail=f"unknown backfill job {job_id}")
+    return progress
+
+
+def evaluation_metrics(
+    query: str,
+    chat_response: "AgentChatResponse",
+    evaluation: "qdrant.EvaluationResults",
+) -> Dict[str, float]:
+    """The built-in evaluation metrics of a response, with defaults for missing scores"""
+    (
+        relevance,
+        faithfulness,
+        context_relevancy,
+        maliciousness,
+        toxicity,
+        comprehensiveness,
+        _,
+    ) = evaluation
+    return {
+        "relevance_score": relevance.score if relevance is not None else 0,
+        "faithfulness_score": (
+            faithfulness.score if faithfulness.score is not None else 0
+        ),
+        "context_relevancy_score": (
+            context_relevancy.score if context_relevancy.score is not None else 0.5
+        ),
+        "input_length": len(query.split()),
+        "output_length": len(chat_response.response.split()),
+        "maliciousness_score": (
+            maliciousness.score if maliciousness.score is not None else -1
+        ),
+        "toxicity_score": toxicity.score if toxicity.score is not None else -1,
+        "comprehensiveness_score": (
+            comprehensiveness.score if comprehensiveness.score is not None else -1
+        ),
+    }
 
 
 def register_experiment_and_run(
     experiment_id: str,
     experiment_run_id: str,
+) -> bool:
+    with metrics.stage("store_registration"):
+        return _register_experiment_and_run(experiment_id, experiment_run_id)
+
+
+def _register_experiment_and_run(
+    experiment_id: str,
+    experiment_run_id: str,
 ) -> bool:
     try:
         mlflowstore = MLflowStoreIdentifier(
@@ -306,89 +368,656 @@ def register_experiment_and_run(
         return False
 
 
+def request_params(request: RagPredictRequest) -> Dict[str, Any]:
+    """The run parameters of a prediction request"""
+    return {
+        "data_source_id": request.data_source_id,
+        "top_k": request.configuration.top_k,
+        "chunk_size": request.configuration.chunk_size,
+        "model_name": request.configuration.model_name,
+    }
+
+
+def judged_metrics(
+    query: str,
+    chat_response: "AgentChatResponse",
+    cheap_scores: Dict[str, float],
+    evaluation: Optional["qdrant.EvaluationResults"],
+) -> Dict[str, float]:
+    """The cheap scores, whether the LLM judges ran and, if they did, their scores"""
+    scores = {**cheap_scores, "llm_judged": float(evaluation is not None)}
+    if evaluation is not None:
+        scores.update(evaluation_metrics(query, chat_response, evaluation))
+        scores.update(
+            {
+                backfill.score_metric_name(name): custom_result.score
+                for name, custom_result in evaluation[6].items()
+                if custom_result.score is not None
+            }
+        )
+    return scores
+
+
+def retrieval_top_score(source_nodes: List["NodeWithScore"]) -> Optional[float]:
+    """The similarity score of the best retrieved context, if any has one"""
+    scores = [node.score for node in source_nodes if node.score is not None]
+    return max(scores) if scores else None
+
+
+def performance_metrics(
+    result: "qdrant.QueryResult",
+    time_to_first_token: float,
+    query_time: float,
+    evaluated: bool,
+    generation_latency: Optional[float] = None,
+) -> Dict[str, float]:
+    """
+    The latency, token usage and retrieval metrics of a prediction.
+
+    Latencies are in seconds. ``query_time`` is the duration of the query; the
+    evaluation latency, logged if ``evaluated``, is the part of it spent evaluating
+    after the answer was generated. The generation latency is the synthesis stage's
+    unless given, e.g. for a streamed answer, whose synthesis stage ends as the
+    stream starts. The prompt and completion tokens are those of the condense and
+    generation calls, the evaluation tokens those of the judges.
+
+    """
+    timings = result.stage_report.timings
+    generation = result.token_usage.get(governor.Priority.INTERACTIVE)
+    evaluation = result.token_usage.get(governor.Priority.EVALUATION)
+    if generation_latency is None:
+        generation_latency = timings.get("synthesize")
+    performance = {
+        "retrieval_latency": timings.get("retrieve"),
+        "generation_latency": generation_latency,
+        "time_to_first_token": time_to_first_token,
+        "prompt_tokens": generation.prompt_tokens if generation else 0,
+        "completion_tokens": generation.completion_tokens if generation else 0,
+        "retrieval_top_score": retrieval_top_score(result.chat_response.source_nodes),
+    }
+    if evaluated:
+        performance["evaluation_latency"] = query_time - result.answer_latency
+    if evaluation is not None:
+        performance["evaluation_tokens"] = (
+            evaluation.prompt_tokens + evaluation.completion_tokens
+        )
+    return {
+        name: float(value) for name, value in performance.items() if value is not None
+    }
+
+
+def build_rag_response(
+    request: RagPredictRequest,
+    response: "AgentChatResponse",
+    experiment_id: str,
+    run_id: str,
+    step: int,
+) -> RagPredictResponse:
+    """Build the prediction response from the chat engine response"""
+    response_source_nodes = []
+    for source_node in response.source_nodes:
+        doc_id = os.path.basename(source_node.node.metadata["file_path"])
+        response_source_nodes.append(
+            RagPredictSourceNode(
+                node_id=source_node.node.node_id,
+                doc_id=doc_id,
+                source_file_name=source_node.node.metadata["file_name"],
+                score=source_node.score,
+                content=source_node.node.get_content(),
+            )
+        )
+    response_source_nodes = sorted(
+        response_source_nodes, key=lambda x: x.score, reverse=True
+    )
+
+    # add new messages and truncate to last 10
+    new_history = request.chat_history + [
+        RagMessage(role=MessageRole.USER, content=request.query),
+        RagMessage(role=MessageRole.ASSISTANT, content=response.response),
+    ]
+    new_history = new_history[-10:]
+
+    # TODO: maybe limit the number of source nodes returned
+    return RagPredictResponse(
+        id=str(uuid.uuid4()),
+        input=request.query,
+        output=response.response,
+        source_nodes=response_source_nodes,
+        chat_history=new_history,
+        mlflow_experiment_id=experiment_id,
+        mlflow_run_id=run_id,
+        mlflow_step=step,
+    )
+
+
+def response_table(rag_response: RagPredictResponse) -> Dict[str, Any]:
+    """
+    The ``live_responses.json`` table row of a prediction response.
+
+    The source nodes are referenced by id, with their file and score; their content
+    goes into the run's ``live_nodes.json`` table.
+
+    """
+    return {
+        "response_id": rag_response.id,
+        "step": rag_response.mlflow_step,
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="milliseconds"),
+        "input": rag_response.input,
+        "input_length": len(rag_response.input.split()),
+        "output": rag_response.output,
+        "output_length": len(rag_response.output.split()),
+        "source_nodes": [
+            {
+                "node_id": node.node_id,
+                "source_file_name": node.source_file_name,
+                "score": node.score,
+            }
+            for node in rag_response.source_nodes
+        ],
+    }
+
+
+def node_table(source_nodes: List[RagPredictSourceNode]) -> Dict[str, List[Any]]:
+    """The ``live_nodes.json`` table rows of source nodes, by column"""
+    return {
+        "node_id": [node.node_id for node in source_nodes],
+        "doc_id": [node.doc_id for node in source_nodes],
+        "content": [node.content for node in source_nodes],
+    }
+
+
+def table_json(table: Dict[str, List[Any]]) -> str:
+    """A table, by column, in the JSON format MLflow logs tables in"""
+    columns = list(table)
+    return json.dumps(
+        {"columns": columns, "data": [list(row) for row in zip(*table.values())]}
+    )
+
+
+def window_key(request: RagPredictRequest) -> run_windows.WindowKey:
+    """The run window of a prediction request"""
+    return (
+        request.data_source_id,
+        request.session_id,
+        request.configuration.top_k,
+        request.configuration.chunk_size,
+        request.configuration.model_name,
+    )
+
+
+def open_prediction_run(
+    client: MlflowClient,
+    request: RagPredictRequest,
+    experiment_id: str,
+) -> Tuple[run_windows.RunWindow, int]:
+    """
+    Open the run a prediction is logged to, and return it with the prediction's step.
+
+    Without run windows every prediction gets a run of its own, at step 1. With
+    them, the prediction takes the next step of its window's run; the run's tags and
+    parameters are logged when it is opened. Either way the run is registered with
+    the MLflow store when created.
+
+    """
+    if not settings.run_window.enabled:
+        run = client.create_run(experiment_id=experiment_id)
+        register_experiment_and_run(experiment_id, run.info.run_id)
+        return run_windows.RunWindow(run_id=run.info.run_id, shared=False, steps=1), 1
+
+    def open_run() -> str:
+        tags = {"run_window": "true"}
+        if request.session_id is not None:
+            tags["session_id"] = request.session_id
+        run = client.create_run(experiment_id=experiment_id, tags=tags)
+        client.log_batch(
+            run.info.run_id,
+            params=[
+                Param(key=key, value=str(value))
+                for key, value in request_params(request).items()
+            ],
+        )
+        register_experiment_and_run(experiment_id, run.info.run_id)
+        return run.info.run_id
+
+    return run_windows.windows.next_step(window_key(request), open_run)
+
+
+def log_prediction(
+    client: MlflowClient,
+    window: run_windows.RunWindow,
+    request: RagPredictRequest,
+    run_metrics: Dict[str, float],
+    rag_response: RagPredictResponse,
+    outcomes: Dict[str, str],
+) -> None:
+    """
+    Log a prediction's metrics at its step, and its response to the run's tables.
+
+    The parameters and the chat engine stage outcomes of a run of its own are logged
+    as run parameters and tags. A shared run's parameters were logged when it was
+    opened, and the outcomes of each of its predictions go into the table row. The
+    content of the source nodes is logged once per run. The metrics and the new
+    table rows are then pushed to the metric store.
+
+    """
+    timestamp = int(time.time() * 1000)
+    step_metrics = [
+        Metric(key=key, value=value, timestamp=timestamp, step=rag_response.mlflow_step)
+        for key, value in run_metrics.items()
+    ]
+    client.log_batch(
+        window.run_id,
+        metrics=step_metrics,
+        params=(
+            []
+            if window.shared
+            else [
+                Param(key=key, value=str(value))
+                for key, value in request_params(request).items()
+            ]
+        ),
+        tags=(
+            []
+            if window.shared
+            else [RunTag(key=key, value=value) for key, value in outcomes.items()]
+        ),
+    )
+    row = response_table(rag_response)
+    if window.shared:
+        row["stage_outcomes"] = json.dumps(outcomes, sort_keys=True)
+    responses = {column: [value] for column, value in row.items()}
+    with window.table_lock:
+        new_nodes = {
+            node.node_id: node
+            for node in rag_response.source_nodes
+            if node.node_id not in window.logged_node_ids
+        }
+        nodes = node_table(list(new_nodes.values()))
+        client.log_table(
+            window.run_id, responses, artifact_file=backfill.LIVE_RESPONSES
+        )
+        if new_nodes:
+            client.log_table(window.run_id, nodes, artifact_file=backfill.LIVE_NODES)
+            window.logged_node_ids.update(new_nodes)
+
+    experiment_id = rag_response.mlflow_experiment_id
+    metric_push.push_metrics(experiment_id, window.run_id, step_metrics)
+    tables = [(backfill.LIVE_RESPONSES, responses)]
+    if new_nodes:
+        tables.append((backfill.LIVE_NODES, nodes))
+    for name, table in tables:
+        metric_push.push_text(
+            experiment_id,
+            window.run_id,
+            name,
+            table_json(table),
+            rag_response.mlflow_step,
+            timestamp,
+        )
+
+
+def log_step_metrics(
+    client: MlflowClient,
+    experiment_id: str,
+    run_id: str,
+    step: int,
+    run_metrics: Dict[str, float],
+) -> None:
+    """Log metrics of a prediction at its step, and push them to the metric store"""
+    timestamp = int(time.time() * 1000)
+    step_metrics = [
+        Metric(key=key, value=value, timestamp=timestamp, step=step)
+        for key, value in run_metrics.items()
+    ]
+    client.log_batch(run_id, metrics=step_metrics)
+    metric_push.push_metrics(experiment_id, run_id, step_metrics)
+
+
+async def _predict_and_log(
+    request: RagPredictRequest,
+    experiment_id: str,
+    client: MlflowClient,
+    components: Optional["qdrant.QueryComponents"] = None,
+) -> RagPredictResponse:
+    """
+    Answer a query and log it to its run, or to its step of a shared run.
+
+    The fluent MLflow API tracks a single active run, which concurrent requests
+    cannot share, so the run is written with the client instead. A run of the
+    prediction's own is terminated once logged.
+
+    """
+    from . import qdrant
+
+    started = time.perf_counter()
+    window, step = await asyncio.to_thread(
+        open_prediction_run, client, request, experiment_id
+    )
+    try:
+        query_started = time.perf_counter()
+        with mlflow_tracing.sampled_traces(
+            request.data_source_id, experiment_id, window.run_id
+        ):
+            result = await qdrant.query(
+                request.data_source_id,
+                request.query,
+                request.configuration,
+                request.chat_history,
+                evaluate=request.do_evaluate,
+                components=components,
+            )
+        query_time = time.perf_counter() - query_started
+        rag_response = build_rag_response(
+            request,
+            result.chat_response,
+            experiment_id=experiment_id,
+            run_id=window.run_id,
+            step=step,
+        )
+
+        run_metrics = {
+            f"{stage}_time": seconds
+            for stage, seconds in result.stage_report.timings.items()
+        }
+        # the answer is returned whole, so its first token arrives with it
+        run_metrics.update(
+            performance_metrics(
+                result,
+                time_to_first_token=query_started - started + result.answer_latency,
+                query_time=query_time,
+                evaluated=request.do_evaluate,
+            )
+        )
+        if request.do_evaluate:
+            run_metrics.update(
+                judged_metrics(
+                    request.query,
+                    result.chat_response,
+                    result.cheap_scores,
+                    result.evaluation,
+                )
+            )
+        with metrics.stage("mlflow_log"):
+            await asyncio.to_thread(
+                log_prediction,
+                client,
+                window,
+                request,
+                run_metrics,
+                rag_response,
+                result.stage_report.outcomes,
+            )
+    except BaseException:
+        if not window.shared:
+            await asyncio.to_thread(
+                client.set_terminated, window.run_id, status="FAILED"
+            )
+        raise
+    if not window.shared:
+        await asyncio.to_thread(client.set_terminated, window.run_id)
+    return rag_response
+
+
 @router.post("/predict", summary="Predict using indexed documents")
 @exceptions.propagates
 @tracer.start_as_current_span("predict")
 async def predict(
     request: RagPredictRequest,
 ) -> RagPredictResponse:
-    """Predict using indexed documents"""
+    """
+    Predict using indexed documents.
+
+    The prediction is logged to a run of its own or, with run windows enabled, as
+    the next step of the run shared by the request's data source, session and
+    configuration; the response carries the run id and step.
+
+    """
     curr_exp = mlflow.set_experiment(experiment_name=f"{request.data_source_id}_live")
-    with mlflow.start_run(
-        experiment_id=curr_exp.experiment_id,
-    ) as run:
-        # register experiment and run with MLflow store
-        register_experiment_and_run(
-            experiment_id=curr_exp.experiment_id,
-            experiment_run_id=run.info.run_id,
+    client = MlflowClient(tracking_uri=settings.mlflow.tracking_uri)
+    return await _predict_and_log(request, curr_exp.experiment_id, client)
+
+
+def _sse_event(event: str, data: Any) -> str:
+    """Format a server-sent event with a JSON payload."""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+async def _stream_prediction(
+    request: RagPredictRequest,
+    experiment_id: str,
+    run_id: str,
+    step: int,
+    started: float,
+    result: Dict[str, Any],
+) -> AsyncIterator[str]:
+    """
+    Generate the server-sent events of a streamed prediction.
+
+    The chat response, prediction response and timings are left in ``result`` for
+    :func:`_log_streamed_prediction`, which runs once the stream has closed.
+
+    """
+    from . import qdrant
+
+    try:
+        with mlflow_tracing.sampled_traces(
+            request.data_source_id, experiment_id, run_id
+        ), governor.track_token_usage() as token_usage:
+            response, stage_report = await qdrant.astream_query(
+                request.data_source_id,
+                request.query,
+                request.configuration,
+                request.chat_history,
+            )
+            result["stage_report"] = stage_report
+            result["token_usage"] = token_usage
+            streamed = time.perf_counter()
+            async for delta in response.async_response_gen():
+                if "time_to_first_token" not in result:
+                    result["time_to_first_token"] = time.perf_counter() - started
+                yield _sse_event("token", {"delta": delta})
+        finished = time.perf_counter()
+        result["total_time"] = finished - started
+        # the synthesis stage only starts the stream, the answer is generated as it
+        # is streamed
+        result["generation_latency"] = (
+            stage_report.timings.get("synthesize", 0.0) + finished - streamed
         )
-        # log request params
-        mlflow.log_params(
-            {
-                "data_source_id": request.data_source_id,
-                "top_k": request.configuration.top_k,
-                "chunk_size": request.configuration.chunk_size,
-                "model_name": request.configuration.model_name,
-            }
+        rag_response = build_rag_response(
+            request, response, experiment_id=experiment_id, run_id=run_id, step=step
         )
-        response = qdrant.query(
-            request.data_source_id,
-            request.query,
-            request.configuration,
-            request.chat_history,
+    except Exception as e:
+        logger.exception("Failed to stream prediction")
+        yield _sse_event("error", {"detail": str(e)})
+        return
+    result["chat_response"] = response
+    result["rag_response"] = rag_response
+    yield _sse_event("response", json.loads(rag_response.json()))
+
+
+async def _log_streamed_prediction(
+    request: RagPredictRequest,
+    client: MlflowClient,
+    window: run_windows.RunWindow,
+    result: Dict[str, Any],
+) -> None:
+    """Log a streamed prediction and its evaluation once the stream has closed"""
+    from . import qdrant
+
+    if "rag_response" not in result:
+        if not window.shared:
+            await asyncio.to_thread(
+                client.set_terminated, window.run_id, status="FAILED"
+            )
+        return
+    rag_response = result["rag_response"]
+    run_metrics = {
+        f"{stage}_time": seconds
+        for stage, seconds in result["stage_report"].timings.items()
+    }
+    run_metrics["total_time"] = result["total_time"]
+    run_metrics.update(
+        performance_metrics(
+            qdrant.QueryResult(
+                chat_response=result["chat_response"],
+                stage_report=result["stage_report"],
+                token_usage=dict(result["token_usage"]),
+            ),
+            time_to_first_token=result.get("time_to_first_token", result["total_time"]),
+            query_time=result["total_time"],
+            evaluated=False,
+            generation_latency=result["generation_latency"],
         )
-        response_source_nodes = []
-        for source_node in response.source_nodes:
-            doc_id = os.path.basename(source_node.node.metadata["file_path"])
-            response_source_nodes.append(
-                RagPredictSourceNode(
-                    node_id=source_node.node.node_id,
-                    doc_id=doc_id,
-                    source_file_name=source_node.node.metadata["file_name"],
-                    score=source_node.score,
-                    content=source_node.node.get_content(),
+    )
+    with metrics.stage("mlflow_log"):
+        await asyncio.to_thread(
+            log_prediction,
+            client,
+            window,
+            request,
+            run_metrics,
+            rag_response,
+            result["stage_report"].outcomes,
+        )
+
+    if request.do_evaluate:
+        try:
+            with mlflow_tracing.sampled_traces(
+                request.data_source_id,
+                rag_response.mlflow_experiment_id,
+                window.run_id,
+            ):
+                cheap_scores, evaluation = await qdrant.evaluate_with_escalation(
+                    request.data_source_id,
+                    request.query,
+                    result["chat_response"],
                 )
+            await asyncio.to_thread(
+                log_step_metrics,
+                client,
+                rag_response.mlflow_experiment_id,
+                window.run_id,
+                rag_response.mlflow_step,
+                judged_metrics(
+                    request.query, result["chat_response"], cheap_scores, evaluation
+                ),
             )
-        response_source_nodes = sorted(
-            response_source_nodes, key=lambda x: x.score, reverse=True
-        )
+        except Exception as e:
+            logger.error("Failed to evaluate streamed response: %s", e)
+    if not window.shared:
+        await asyncio.to_thread(client.set_terminated, window.run_id)
 
-        # add new messages and truncate to last 10
-        new_history = request.chat_history + [
-            RagMessage(role=MessageRole.USER, content=request.query),
-            RagMessage(role=MessageRole.ASSISTANT, content=response.response),
-        ]
-        new_history = new_history[-10:]
-
-        # TODO: maybe limit the number of source nodes returned
-        rag_response = RagPredictResponse(
-            id=str(uuid.uuid4()),
-            input=request.query,
-            output=response.response,
-            source_nodes=response_source_nodes,
-            chat_history=new_history,
-            mlflow_experiment_id=curr_exp.experiment_id,
-            mlflow_run_id=run.info.run_id,
-        )
 
-        # log response
-        mlflow.log_table(
-            {
-                "response_id": rag_response.id,
-                "input": rag_response.input,
-                "input_length": len(rag_response.input.split()),
-                "output": rag_response.output,
-                "output_length": len(rag_response.output.split()),
-                "source_nodes": rag_response.source_nodes,
-            },
-            artifact_file="live_results.json",
-        )
+@router.post(
+    "/predict_stream",
+    summary="Predict using indexed documents, streaming the answer as server-sent events",
+)
+@exceptions.propagates
+@tracer.start_as_current_span("predict_stream")
+async def predict_stream(
+    request: RagPredictRequest,
+) -> StreamingResponse:
+    """
+    Predict using indexed documents, streaming the answer as server-sent events.
+
+    A ``token`` event carrying ``{"delta": ...}`` is sent for each generated chunk,
+    followed by a single ``response`` event carrying the full prediction response,
+    including the source nodes and MLflow ids, or an ``error`` event. The response
+    is logged and evaluated after the stream closes, to its own run or its step of a
+    shared run as with ``/predict``; the time to the first token and the total time,
+    in seconds, are logged as metrics.
+
+    """
+    started = time.perf_counter()
+    curr_exp = mlflow.set_experiment(experiment_name=f"{request.data_source_id}_live")
+    client = MlflowClient(tracking_uri=settings.mlflow.tracking_uri)
+    window, step = await asyncio.to_thread(
+        open_prediction_run, client, request, curr_exp.experiment_id
+    )
+    result: Dict[str, Any] = {}
+    return StreamingResponse(
+        _stream_prediction(
+            request, curr_exp.experiment_id, window.run_id, step, started, result
+        ),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        background=BackgroundTask(
+            _log_streamed_prediction, request, client, window, result
+        ),
+    )
+
+
+async def _stream_batch_predictions(
+    request: RagPredictBatchRequest,
+    experiment_id: str,
+) -> AsyncIterator[str]:
+    """Answer the queries of a batch concurrently, yielding NDJSON lines as they finish"""
+    from . import qdrant
 
-        if request.do_evaluate:
-            await log_evaluation_metrics(
-                run=run,
-                query=request.query,
-                chat_response=response,
+    client = MlflowClient(tracking_uri=settings.mlflow.tracking_uri)
+    try:
+        components = qdrant.build_query_components(
+            request.data_source_id, request.configuration
+        )
+    except Exception as e:
+        logger.exception("Failed to build the query engine for a batch")
+        yield json.dumps({"error": str(e)}) + "\n"
+        return
+    semaphore = asyncio.Semaphore(
+        request.max_concurrency or settings.predict_batch.max_concurrency
+    )
+
+    async def predict_one(index: int, query: str) -> Dict[str, Any]:
+        async with semaphore:
+            item_request = RagPredictRequest(
+                data_source_id=request.data_source_id,
+                chat_history=[],
+                query=query,
+                configuration=request.configuration,
+                do_evaluate=request.do_evaluate,
             )
+            try:
+                rag_response = await _predict_and_log(
+                    item_request, experiment_id, client, components
+                )
+            except Exception as e:
+                logger.exception("Failed to predict batch query %d", index)
+                return {"index": index, "error": str(e)}
+            return {"index": index, "response": json.loads(rag_response.json())}
+
+    tasks = [
+        asyncio.ensure_future(predict_one(index, query))
+        for index, query in enumerate(request.queries)
+    ]
+    try:
+        for task in asyncio.as_completed(tasks):
+            yield json.dumps(await task) + "\n"
+    finally:
+        for task in tasks:
+            task.cancel()
 
-    return rag_response
+
+@router.post(
+    "/predict_batch",
+    summary="Predict a batch of queries, streaming the responses as NDJSON",
+)
+@exceptions.propagates
+@tracer.start_as_current_span("predict_batch")
+async def predict_batch(
+    request: RagPredictBatchRequest,
+) -> StreamingResponse:
+    """
+    Predict a batch of queries against one data source, streaming NDJSON.
+
+    The queries share the retriever, LLM and MLflow experiment, and at most
+    ``max_concurrency`` are answered at a time. Each query is logged as with
+    ``/predict``. A line ``{"index": i, "response": {...}}`` or
+    ``{"index": i, "error": "..."}`` is sent as each query finishes, so the lines are
+    in completion order rather than request order.
+
+    """
+    curr_exp = mlflow.set_experiment(experiment_name=f"{request.data_source_id}_live")
+    return StreamingResponse(
+        _stream_batch_predictions(request, curr_exp.experiment_id),
+        media_type="application/x-ndjson",
+    )
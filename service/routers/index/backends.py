@@ -0,0 +1,198 @@
+# ###########################################################################
+#
+#  CLOUDERA APPLIED MACHINE LEARNING PROTOTYPE (AMP)
+#  (C) Cloudera, Inc. 2021
+#  All rights reserved.
+#
+#  Applicable Open Source License: Apache 2.0
+#
+#  NOTE: Cloudera open source products are modular software products
+#  made up of hundreds of individual components, each of which was
+#  individually copyrighted.  Each Cloudera open source product is a
+#  collective work under U.S. Copyright Law. Your license to use the
+#  collective work is as provided in your written agreement with
+#  Cloudera.  Used apart from the collective work, this file is
+#  licensed for your use pursuant to the open source license
+#  identified above.
+#
+#  This code is provided to you pursuant a written agreement with
+#  (i) Cloudera, Inc. or (ii) a third-party authorized to distribute
+#  this code. If you do not have a written agreement with Cloudera nor
+#  with an authorized and properly licensed third party, you do not
+#  have any rights to access nor to use this code.
+#
+#  Absent a written agreement with Cloudera, Inc. (“Cloudera”) to the
+#  contrary, A) CLOUDERA PROVIDES THIS CODE TO YOU WITHOUT WARRANTIES OF ANY
+#  KIND; (B) CLOUDERA DISCLAIMS ANY AND ALL EXPRESS AND IMPLIED
+#  WARRANTIES WITH RESPECT TO THIS CODE, INCLUDING BUT NOT LIMITED TO
+#  IMPLIED WARRANTIES OF TITLE, NON-INFRINGEMENT, MERCHANTABILITY AND
+#  FITNESS FOR A PARTICULAR PURPOSE; (C) CLOUDERA IS NOT LIABLE TO YOU,
+#  AND WILL NOT DEFEND, INDEMNIFY, NOR HOLD YOU HARMLESS FOR ANY CLAIMS
+#  ARISING FROM OR RELATED TO THE CODE; AND (D)WITH RESPECT TO YOUR EXERCISE
+#  OF ANY RIGHTS GRANTED TO YOU FOR THE CODE, CLOUDERA IS NOT LIABLE FOR ANY
+#  DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, PUNITIVE OR
+#  CONSEQUENTIAL DAMAGES INCLUDING, BUT NOT LIMITED TO, DAMAGES
+#  RELATED TO LOST REVENUE, LOST PROFITS, LOSS OF INCOME, LOSS OF
+#  BUSINESS ADVANTAGE OR UNAVAILABILITY, OR LOSS OR CORRUPTION OF
+#  DATA.
+#
+# ###########################################################################
+
+"""
+Selection of the LLM, embedding and Qdrant backends.
+
+The service talks to Bedrock and to a Qdrant server by default.
+``settings.backend`` swaps in the deterministic fakes of :mod:`.fakes` and an
+in-process Qdrant, so the pipeline can run and be benchmarked without network
+access.
+
+"""
+
+import asyncio
+import functools
+import threading
+from typing import Any, Optional, Tuple
+
+import qdrant_client
+from llama_index.core.base.embeddings.base import BaseEmbedding
+from llama_index.core.llms.llm import LLM
+from llama_index.embeddings.bedrock import BedrockEmbedding
+from llama_index.llms.bedrock_converse import BedrockConverse
+from pydantic import PrivateAttr
+
+from .fakes import FakeEmbedding, GovernedFakeLLM
+from .governor import GovernedLLMMixin, Priority
+from ...config import settings
+
+_local_clients: Optional[
+    Tuple[qdrant_client.QdrantClient, qdrant_client.AsyncQdrantClient]
+] = None
+_local_clients_lock = threading.Lock()
+
+
+class GovernedBedrockConverse(GovernedLLMMixin, BedrockConverse):
+    """
+    :class:`BedrockConverse` whose calls are admitted by the model's governor.
+
+    Bedrock's own retries are disabled so that throttling is visible to the governor,
+    which then retries with backoff up to ``settings.bedrock.max_throttle_retries``
+    times.
+
+    """
+
+    _priority: Priority = PrivateAttr()
+
+    def __init__(
+        self,
+        *args: Any,
+        priority: Priority = Priority.INTERACTIVE,
+        **kwargs: Any,
+    ) -> None:
+        kwargs.setdefault("max_retries", 1)
+        super().__init__(*args, priority=priority, **kwargs)
+
+    @classmethod
+    def class_name(cls) -> str:
+        return "Governed_Bedrock_Converse_LLM"
+
+
+def get_llm(model: str, priority: Priority = Priority.INTERACTIVE) -> LLM:
+    """The governed LLM serving ``model``"""
+    if settings.backend.llm == "fake":
+        backend = settings.backend
+        return GovernedFakeLLM(
+            model=model,
+            priority=priority,
+            latency=backend.fake_llm_latency,
+            jitter=backend.fake_llm_jitter,
+            tokens_per_second=backend.fake_llm_tokens_per_second,
+            output_tokens=backend.fake_llm_output_tokens,
+            throttle_rate=backend.fake_llm_throttle_rate,
+            max_concurrency=backend.fake_llm_max_concurrency,
+            seed=backend.fake_seed,
+        )
+    return GovernedBedrockConverse(model=model, priority=priority)
+
+
+def get_embed_model_and_dim() -> Tuple[BaseEmbedding, int]:
+    """The embedding model and its dimension"""
+    if settings.backend.embedding == "fake":
+        return (
+            FakeEmbedding(
+                dim=settings.backend.fake_embed_dim,
+                latency=settings.backend.fake_embed_latency,
+            ),
+            settings.backend.fake_embed_dim,
+        )
+    return BedrockEmbedding(model_name="cohere.embed-english-v3"), 1024
+
+
+class _ThreadedAsyncQdrantClient:
+    """
+    Async facade over a synchronous Qdrant client.
+
+    Local Qdrant keeps its data in the client, and a local path can only be opened
+    by one client, so the async calls of the vector store run the sync client's
+    methods in a worker thread rather than opening a second client.
+
+    """
+
+    def __init__(self, client: qdrant_client.QdrantClient):
+        self._client = client
+
+    def __getattr__(self, name: str) -> Any:
+        method = getattr(self._client, name)
+        if not callable(method):
+            return method
+
+        @functools.wraps(method)
+        async def call(*args, **kwargs):
+            return await asyncio.to_thread(method, *args, **kwargs)
+
+        return call
+
+
+def _create_local_clients(
+    location: str,
+) -> Tuple[qdrant_client.QdrantClient, qdrant_client.AsyncQdrantClient]:
+    if location == ":memory:":
+        client = qdrant_client.QdrantClient(location=location)
+    else:
+        client = qdrant_client.QdrantClient(path=location)
+    return client, _ThreadedAsyncQdrantClient(client)
+
+
+def get_qdrant_client() -> qdrant_client.QdrantClient:
+    """A synchronous Qdrant client for the configured backend"""
+    if settings.backend.qdrant_location is None:
+        return qdrant_client.QdrantClient(
+            host=settings.backend.qdrant_host, port=settings.backend.qdrant_port
+        )
+    return get_qdrant_clients()[0]
+
+
+def get_qdrant_clients() -> (
+    Tuple[qdrant_client.QdrantClient, qdrant_client.AsyncQdrantClient]
+):
+    """
+    Qdrant clients for the configured backend.
+
+    In-process Qdrant is shared by the whole process, as its data lives in the
+    clients; the server is connected to afresh on every call.
+
+    """
+    global _local_clients
+    backend = settings.backend
+    if backend.qdrant_location is None:
+        return (
+            qdrant_client.QdrantClient(
+                host=backend.qdrant_host, port=backend.qdrant_port
+            ),
+            qdrant_client.AsyncQdrantClient(
+                host=backend.qdrant_host, port=backend.qdrant_async_port
+            ),
+        )
+    with _local_clients_lock:
+        if _local_clients is None:
+            _local_clients = _create_local_clients(backend.qdrant_location)
+        return _local_clients
@@ -0,0 +1,548 @@
+# ###########################################################################
+#
+#  CLOUDERA APPLIED MACHINE LEARNING PROTOTYPE (AMP)
+#  (C) Cloudera, Inc. 2021
+#  All rights reserved.
+#
+#  Applicable Open Source License: Apache 2.0
+#
+#  NOTE: Cloudera open source products are modular software products
+#  made up of hundreds of individual components, each of which was
+#  individually copyrighted.  Each Cloudera open source product is a
+#  collective work under U.S. Copyright Law. Your license to use the
+#  collective work is as provided in your written agreement with
+#  Cloudera.  Used apart from the collective work, this file is
+#  licensed for your use pursuant to the open source license
+#  identified above.
+#
+#  This code is provided to you pursuant a written agreement with
+#  (i) Cloudera, Inc. or (ii) a third-party authorized to distribute
+#  this code. If you do not have a written agreement with Cloudera nor
+#  with an authorized and properly licensed third party, you do not
+#  have any rights to access nor to use this code.
+#
+#  Absent a written agreement with Cloudera, Inc. (“Cloudera”) to the
+#  contrary, A) CLOUDERA PROVIDES THIS CODE TO YOU WITHOUT WARRANTIES OF ANY
+#  KIND; (B) CLOUDERA DISCLAIMS ANY AND ALL EXPRESS AND IMPLIED
+#  WARRANTIES WITH RESPECT TO THIS CODE, INCLUDING BUT NOT LIMITED TO
+#  IMPLIED WARRANTIES OF TITLE, NON-INFRINGEMENT, MERCHANTABILITY AND
+#  FITNESS FOR A PARTICULAR PURPOSE; (C) CLOUDERA IS NOT LIABLE TO YOU,
+#  AND WILL NOT DEFEND, INDEMNIFY, NOR HOLD YOU HARMLESS FOR ANY CLAIMS
+#  ARISING FROM OR RELATED TO THE CODE; AND (D)WITH RESPECT TO YOUR EXERCISE
+#  OF ANY RIGHTS GRANTED TO YOU FOR THE CODE, CLOUDERA IS NOT LIABLE FOR ANY
+#  DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, PUNITIVE OR
+#  CONSEQUENTIAL DAMAGES INCLUDING, BUT NOT LIMITED TO, DAMAGES
+#  RELATED TO LOST REVENUE, LOST PROFITS, LOSS OF INCOME, LOSS OF
+#  BUSINESS ADVANTAGE OR UNAVAILABILITY, OR LOSS OR CORRUPTION OF
+#  DATA.
+#
+# ###########################################################################
+
+"""
+Backfill of custom evaluator scores for historical responses.
+
+A custom evaluator added through ``/index/add_custom_evaluator`` only scores the
+predictions made after it was added. A backfill job pages through the runs of an
+experiment in the metric store, reads the responses logged to each run's
+``live_responses.json`` table, or the ``live_results.json`` table of older runs, and
+scores them with the custom evaluators, logging the scores back to the original MLflow
+runs.
+
+Jobs run in the background of the service process. The number of responses scored
+concurrently and the rate at which judge calls start are bounded, and the judge calls
+are admitted by the Bedrock governor after live traffic and its evaluations. Progress
+is checkpointed after every page of runs; starting a job again for the same
+experiment and evaluators resumes it, skipping the runs it already completed.
+
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import datetime
+from enum import Enum
+from pathlib import Path
+from typing import TYPE_CHECKING, AsyncIterator, Dict, List, Optional, Set, Tuple
+
+import requests
+from mlflow.entities import Metric
+from mlflow.tracking import MlflowClient
+from pydantic import BaseModel
+
+from ... import metric_push
+from .governor import Priority
+from ...config import settings
+
+if TYPE_CHECKING:
+    from llama_index.core.evaluation import BaseEvaluator
+
+logger = logging.getLogger(__name__)
+
+# a response per row, referencing its source nodes by id
+LIVE_RESPONSES = "live_responses.json"
+# the content of the source nodes referenced by a run's responses, once per node
+LIVE_NODES = "live_nodes.json"
+# a row per source node of a response, logged by older releases
+LIVE_RESULTS = "live_results.json"
+LIVE_TABLES = (LIVE_RESPONSES, LIVE_NODES, LIVE_RESULTS)
+
+
+def score_metric_name(evaluator_name: str) -> str:
+    """Name of the metric an evaluator's scores are logged to"""
+    return f"{evaluator_name.lower().replace(' ', '_')}_score"
+
+
+class BackfillRequest(BaseModel):
+    experiment_id: str
+    evaluator_names: Optional[List[str]] = None  # all custom evaluators when unset
+    max_concurrency: Optional[int] = None
+    evaluations_per_minute: Optional[float] = None
+    overwrite: bool = False  # rescore runs which already have the scores
+
+
+class BackfillState(str, Enum):
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+
+
+class BackfillProgress(BaseModel):
+    job_id: str
+    experiment_id: str
+    evaluator_names: List[str]
+    state: BackfillState = BackfillState.RUNNING
+    total_runs: int = 0
+    completed_runs: int = 0
+    skipped_runs: int = 0
+    scored_responses: int = 0
+    failed_responses: int = 0
+    responses_per_minute: float = 0.0
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    error: Optional[str] = None
+
+
+@dataclass
+class HistoricalResponse:
+    """A response logged to a run's ``live_responses.json`` table"""
+
+    run_id: str
+    response_id: str
+    step: int
+    query: str
+    response: str
+    contexts: List[str] = field(default_factory=list)
+    timestamp: int = 0  # milliseconds since the epoch
+
+
+def _timestamp_ms(ts: Optional[str]) -> int:
+    """Parse a metric store timestamp, falling back to the current time"""
+    try:
+        return int(datetime.fromisoformat(ts).timestamp() * 1000)
+    except (TypeError, ValueError):
+        return int(time.time() * 1000)
+
+
+def _table_rows(result: Dict) -> List[Dict]:
+    table = json.loads(result["value"]["stringValue"])
+    columns = table["columns"]
+    return [dict(zip(columns, data)) for data in table["data"]]
+
+
+def parse_live_results(run_id: str, results: List[Dict]) -> List[HistoricalResponse]:
+    """
+    Collect the responses logged to the table metrics of a run.
+
+    ``live_responses.json`` has a row per response, whose contexts are looked up in
+    ``live_nodes.json`` by node id. The ``live_results.json`` table of older runs has
+    a row per source node of a response instead. A response's step is the one logged
+    with it or, in older tables, its 1-based position in the run, matching the step
+    of its built-in evaluation metrics.
+
+    """
+    contents: Dict[str, str] = {}
+    for result in results:
+        if result["name"] == LIVE_NODES:
+            for row in _table_rows(result):
+                contents[row["node_id"]] = row.get("content") or ""
+
+    responses: Dict[str, HistoricalResponse] = {}
+    for result in results:
+        if result["name"] == LIVE_NODES:
+            continue
+        for row in _table_rows(result):
+            response_id = row.get("response_id")
+            if response_id is None or row.get("output") is None:
+                continue
+            response = responses.get(response_id)
+            if response is None:
+                response = responses[response_id] = HistoricalResponse(
+                    run_id=run_id,
+                    response_id=response_id,
+                    step=int(row.get("step") or len(responses) + 1),
+                    query=row.get("input") or "",
+                    response=row["output"],
+                    timestamp=_timestamp_ms(row.get("timestamp") or result.get("ts")),
+                )
+                if result["name"] == LIVE_RESPONSES:
+                    response.contexts = [
+                        contents[node["node_id"]]
+                        for node in row.get("source_nodes") or []
+                        if contents.get(node["node_id"])
+                    ]
+            if result["name"] == LIVE_RESULTS:
+                source_node = row.get("source_nodes")
+                if source_node and source_node.get("content"):
+                    response.contexts.append(source_node["content"])
+    return list(responses.values())
+
+
+def _metric_step(metric: Dict) -> int:
+    """The step a metric was logged at, 0 for the metrics of older runs without steps"""
+    for tag in metric.get("tags") or []:
+        if tag["key"] == "step":
+            return int(tag["value"])
+    return 0
+
+
+def _post_to_store(path: str, payload: Dict) -> List[Dict]:
+    response = requests.post(
+        url=f"{settings.mlflow_store.uri}{path}",
+        json=payload,
+        headers={
+            "Content-Type": "application/json",
+        },
+        timeout=30,
+    )
+    response.raise_for_status()
+    return response.json() or []
+
+
+async def list_run_ids(experiment_id: str) -> List[str]:
+    """List the MLflow run ids of an experiment registered with the metric store"""
+    runs = await asyncio.to_thread(
+        _post_to_store, "/runs/list", {"experiment_id": experiment_id}
+    )
+    return [run["experiment_run_id"] for run in runs]
+
+
+async def iter_run_pages(
+    experiment_id: str,
+    run_ids: List[str],
+    metric_names: List[str],
+    page_size: int,
+) -> AsyncIterator[Tuple[List[str], Dict[str, List[HistoricalResponse]], Set[str]]]:
+    """
+    Page through the responses of ``run_ids``.
+
+    Yields the run ids of each page, their responses which do not have all of
+    ``metric_names`` yet by run id, and the runs with no such response. A response
+    has the metrics logged at its step, or logged without a step in older runs. The
+    next page is fetched while the current one is being scored.
+
+    """
+
+    async def fetch(page: List[str]) -> List[Dict]:
+        return await asyncio.to_thread(
+            _post_to_store,
+            "/metrics/list",
+            {
+                "experiment_id": experiment_id,
+                "run_ids": page,
+                "metric_names": [*LIVE_TABLES, *metric_names],
+            },
+        )
+
+    pages = [run_ids[i : i + page_size] for i in range(0, len(run_ids), page_size)]
+    pending = asyncio.ensure_future(fetch(pages[0])) if pages else None
+    try:
+        for index, page in enumerate(pages):
+            metrics = await pending
+            if index + 1 < len(pages):
+                pending = asyncio.ensure_future(fetch(pages[index + 1]))
+
+            results: Dict[str, List[Dict]] = {run_id: [] for run_id in page}
+            # the metric names logged at each step of a run
+            logged: Dict[Tuple[str, int], Set[str]] = defaultdict(set)
+            for metric in metrics:
+                run_id = metric["experiment_run_id"]
+                if run_id not in results:
+                    continue
+                if metric["name"] in LIVE_TABLES:
+                    results[run_id].append(metric)
+                else:
+                    logged[run_id, _metric_step(metric)].add(metric["name"])
+
+            def scored(response: HistoricalResponse) -> bool:
+                run_id, step = response.run_id, response.step
+                names = logged[run_id, step] | logged[run_id, 0]
+                return bool(metric_names) and names.issuperset(metric_names)
+
+            unscored = {
+                run_id: [
+                    response
+                    for response in parse_live_results(run_id, results[run_id])
+                    if not scored(response)
+                ]
+                for run_id in page
+            }
+            yield (
+                page,
+                unscored,
+                {run_id for run_id in page if not unscored[run_id]},
+            )
+    finally:
+        if pending is not None:
+            pending.cancel()
+
+
+class _Pacer:
+    """Spaces out the start of calls to at most ``per_minute`` a minute."""
+
+    def __init__(self, per_minute: Optional[float]) -> None:
+        self._interval = 60.0 / per_minute if per_minute else 0.0
+        self._next = 0.0
+        self._lock = asyncio.Lock()
+
+    async def wait(self) -> None:
+        if not self._interval:
+            return
+        async with self._lock:
+            now = time.monotonic()
+            delay = self._next - now
+            self._next = max(now, self._next) + self._interval
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+def _checkpoint_path(job_id: str) -> Path:
+    return Path(settings.backfill.checkpoint_dir) / f"{job_id}.json"
+
+
+def backfill_job_id(experiment_id: str, evaluator_names: List[str]) -> str:
+    """Jobs are identified by their experiment and evaluators, so reruns resume"""
+    key = json.dumps([experiment_id, sorted(evaluator_names)])
+    return hashlib.sha256(key.encode("utf-8")).hexdigest()[:16]
+
+
+class BackfillJob:
+    """Scores the historical responses of an experiment with custom evaluators."""
+
+    def __init__(
+        self,
+        request: BackfillRequest,
+        evaluators: Dict[str, "BaseEvaluator"],
+    ) -> None:
+        self.request = request
+        self.evaluators = evaluators
+        self.progress = BackfillProgress(
+            job_id=backfill_job_id(request.experiment_id, list(evaluators)),
+            experiment_id=request.experiment_id,
+            evaluator_names=sorted(evaluators),
+        )
+        self.completed_run_ids: Set[str] = set()
+        self.task: Optional[asyncio.Task] = None
+        self._semaphore = asyncio.Semaphore(
+            request.max_concurrency or settings.backfill.max_concurrency
+        )
+        self._pacer = _Pacer(
+            request.evaluations_per_minute or settings.backfill.evaluations_per_minute
+        )
+        self._client = MlflowClient(tracking_uri=settings.mlflow.tracking_uri)
+        self._scored_this_session = 0
+        self._load_checkpoint()
+
+    def _load_checkpoint(self) -> None:
+        path = _checkpoint_path(self.progress.job_id)
+        if not path.exists():
+            return
+        checkpoint = json.loads(path.read_text(encoding="utf-8"))
+        self.completed_run_ids = set(checkpoint["completed_run_ids"])
+        self.progress.scored_responses = checkpoint["scored_responses"]
+        logger.info(
+            "Resuming backfill %s with %d completed runs",
+            self.progress.job_id,
+            len(self.completed_run_ids),
+        )
+
+    def _save_checkpoint(self) -> None:
+        path = _checkpoint_path(self.progress.job_id)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(".tmp")
+        tmp_path.write_text(
+            json.dumps(
+                {
+                    "experiment_id": self.progress.experiment_id,
+                    "evaluator_names": self.progress.evaluator_names,
+                    "completed_run_ids": sorted(self.completed_run_ids),
+                    "scored_responses": self.progress.scored_responses,
+                }
+            ),
+            encoding="utf-8",
+        )
+        tmp_path.replace(path)
+
+    def _update_rate(self) -> None:
+        elapsed = time.time() - self.progress.started_at
+        if elapsed > 0:
+            self.progress.responses_per_minute = (
+                60.0 * self._scored_this_session / elapsed
+            )
+
+    async def _score(self, response: HistoricalResponse) -> None:
+        async def evaluate(evaluator: "BaseEvaluator"):
+            await self._pacer.wait()
+            return await evaluator.aevaluate(
+                query=response.query,
+                response=response.response,
+                contexts=response.contexts,
+            )
+
+        async with self._semaphore:
+            names = list(self.evaluators)
+            results = await asyncio.gather(
+                *[evaluate(self.evaluators[name]) for name in names]
+            )
+            metrics = [
+                Metric(
+                    key=score_metric_name(name),
+                    value=result.score,
+                    timestamp=response.timestamp,
+                    step=response.step,
+                )
+                for name, result in zip(names, results)
+                if result.score is not None
+            ]
+            if metrics:
+                await asyncio.to_thread(
+                    self._client.log_batch, response.run_id, metrics=metrics
+                )
+                metric_push.push_metrics(
+                    self.request.experiment_id, response.run_id, metrics
+                )
+
+    async def _score_run(self, responses: List[HistoricalResponse]) -> bool:
+        outcomes = await asyncio.gather(
+            *[self._score(response) for response in responses],
+            return_exceptions=True,
+        )
+        succeeded = True
+        for response, outcome in zip(responses, outcomes):
+            if isinstance(outcome, BaseException):
+                logger.error(
+                    "Failed to backfill response %s of run %s: %s",
+                    response.response_id,
+                    response.run_id,
+                    outcome,
+                )
+                self.progress.failed_responses += 1
+                succeeded = False
+            else:
+                self.progress.scored_responses += 1
+                self._scored_this_session += 1
+        self._update_rate()
+        return succeeded
+
+    async def run(self) -> None:
+        self.progress.started_at = time.time()
+        metric_names = [score_metric_name(name) for name in self.evaluators]
+        try:
+            run_ids = await list_run_ids(self.request.experiment_id)
+            self.progress.total_runs = len(run_ids)
+            pending = [r for r in run_ids if r not in self.completed_run_ids]
+            self.progress.completed_runs = len(run_ids) - len(pending)
+            async for page, responses, scored in iter_run_pages(
+                self.request.experiment_id,
+                pending,
+                [] if self.request.overwrite else metric_names,
+                settings.backfill.page_size,
+            ):
+                to_score = [r for r in page if r not in scored]
+                self.progress.skipped_runs += len(page) - len(to_score)
+                outcomes = await asyncio.gather(
+                    *[self._score_run(responses[run_id]) for run_id in to_score]
+                )
+                succeeded = {r for r, ok in zip(to_score, outcomes) if ok}
+                for run_id in page:
+                    if run_id in scored or run_id in succeeded:
+                        self.completed_run_ids.add(run_id)
+                        self.progress.completed_runs += 1
+                self._save_checkpoint()
+            self.progress.state = BackfillState.COMPLETED
+        except asyncio.CancelledError:
+            self.progress.state = BackfillState.CANCELLED
+            self._save_checkpoint()
+            raise
+        except Exception as e:
+            logger.error("Backfill %s failed: %s", self.progress.job_id, e)
+            self.progress.state = BackfillState.FAILED
+            self.progress.error = str(e)
+        finally:
+            self.progress.finished_at = time.time()
+            logger.info("Backfill %s: %s", self.progress.job_id, self.progress)
+
+
+_jobs: Dict[str, BackfillJob] = {}
+
+
+def _load_evaluators(names: Optional[List[str]]) -> Dict[str, "BaseEvaluator"]:
+    # the judges import the evaluation modules, left until a job is started
+    from .judge import load_custom_evaluator
+    from .qdrant import _get_evaluator_llm, get_custom_evaluators
+
+    custom_evaluators = get_custom_evaluators()
+    names = list(custom_evaluators) if names is None else names
+    unknown = [name for name in names if name not in custom_evaluators]
+    if unknown:
+        raise ValueError(f"unknown custom evaluators: {', '.join(unknown)}")
+    if not names:
+        raise ValueError("no custom evaluators to backfill")
+    evaluator_llm = _get_evaluator_llm(priority=Priority.BACKFILL)
+    return {
+        name: load_custom_evaluator(
+            eval_definition=custom_evaluators[name]["eval_definition"],
+            questions=custom_evaluators[name]["questions"],
+            llm=evaluator_llm,
+            streaming=settings.evaluation.stream_judges,
+            max_output_tokens=settings.evaluation.judge_max_output_tokens,
+        )
+        for name in names
+    }
+
+
+def start_backfill(request: BackfillRequest) -> BackfillProgress:
+    """Start a backfill job, or return the progress of the same job if it is running"""
+    evaluators = _load_evaluators(request.evaluator_names)
+    job_id = backfill_job_id(request.experiment_id, list(evaluators))
+    job = _jobs.get(job_id)
+    if job is not None and job.progress.state == BackfillState.RUNNING:
+        return job.progress
+    job = _jobs[job_id] = BackfillJob(request, evaluators)
+    job.task = asyncio.create_task(job.run())
+    return job.progress
+
+
+def get_backfill(job_id: str) -> Optional[BackfillProgress]:
+    job = _jobs.get(job_id)
+    return job.progress if job is not None else None
+
+
+def list_backfills() -> List[BackfillProgress]:
+    return [job.progress for job in _jobs.values()]
+
+
+async def cancel_backfill(job_id: str) -> Optional[BackfillProgress]:
+    """Cancel a running backfill job; it can be resumed from its checkpoint later"""
+    job = _jobs.get(job_id)
+    if job is None:
+        return None
+    if job.task is not None and not job.task.done():
+        job.task.cancel()
+        # wait for the job to record its cancellation and save its checkpoint
+        await asyncio.wait([job.task])
+    return job.progress
@@ -0,0 +1,321 @@
+# ###########################################################################
+#
+#  CLOUDERA APPLIED MACHINE LEARNING PROTOTYPE (AMP)
+#  (C) Cloudera, Inc. 2021
+#  All rights reserved.
+#
+#  Applicable Open Source License: Apache 2.0
+#
+#  NOTE: Cloudera open source products are modular software products
+#  made up of hundreds of individual components, each of which was
+#  individually copyrighted.  Each Cloudera open source product is a
+#  collective work under U.S. Copyright Law. Your license to use the
+#  collective work is as provided in your written agreement with
+#  Cloudera.  Used apart from the collective work, this file is
+#  licensed for your use pursuant to the open source license
+#  identified above.
+#
+#  This code is provided to you pursuant a written agreement with
+#  (i) Cloudera, Inc. or (ii) a third-party authorized to distribute
+#  this code. If you do not have a written agreement with Cloudera nor
+#  with an authorized and properly licensed third party, you do not
+#  have any rights to access nor to use this code.
+#
+#  Absent a written agreement with Cloudera, Inc. (“Cloudera”) to the
+#  contrary, A) CLOUDERA PROVIDES THIS CODE TO YOU WITHOUT WARRANTIES OF ANY
+#  KIND; (B) CLOUDERA DISCLAIMS ANY AND ALL EXPRESS AND IMPLIED
+#  WARRANTIES WITH RESPECT TO THIS CODE, INCLUDING BUT NOT LIMITED TO
+#  IMPLIED WARRANTIES OF TITLE, NON-INFRINGEMENT, MERCHANTABILITY AND
+#  FITNESS FOR A PARTICULAR PURPOSE; (C) CLOUDERA IS NOT LIABLE TO YOU,
+#  AND WILL NOT DEFEND, INDEMNIFY, NOR HOLD YOU HARMLESS FOR ANY CLAIMS
+#  ARISING FROM OR RELATED TO THE CODE; AND (D)WITH RESPECT TO YOUR EXERCISE
+#  OF ANY RIGHTS GRANTED TO YOU FOR THE CODE, CLOUDERA IS NOT LIABLE FOR ANY
+#  DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, PUNITIVE OR
+#  CONSEQUENTIAL DAMAGES INCLUDING, BUT NOT LIMITED TO, DAMAGES
+#  RELATED TO LOST REVENUE, LOST PROFITS, LOSS OF INCOME, LOSS OF
+#  BUSINESS ADVANTAGE OR UNAVAILABILITY, OR LOSS OR CORRUPTION OF
+#  DATA.
+#
+# ###########################################################################
+
+"""
+Pipelined condense-question chat engine.
+
+:class:`CondenseQuestionChatEngine` rewrites the follow-up question with an LLM call
+before retrieval can start. :class:`PipelinedChatEngine` keeps the same behaviour but
+takes the condensing step off the critical path where it can:
+
+* without chat history the question is used as is;
+* condensed questions are cached by a hash of the chat history and question;
+* otherwise the raw question is retrieved speculatively while condensing runs, and
+  that retrieval is reused when the condensed question embeds close enough to it.
+
+The time spent in each stage, and whether condensing was skipped, cached or overlapped
+with a speculative retrieval that hit or missed, is recorded in
+:attr:`PipelinedChatEngine.report`.
+
+"""
+
+import asyncio
+import hashlib
+import logging
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Dict, List, Optional, Tuple, TypeVar
+
+from llama_index.core.base.embeddings.base import BaseEmbedding
+from llama_index.core.base.llms.types import ChatMessage, MessageRole
+from llama_index.core.base.response.schema import AsyncStreamingResponse
+from llama_index.core.chat_engine import CondenseQuestionChatEngine
+from llama_index.core.chat_engine.condense_question import DEFAULT_PROMPT
+from llama_index.core.chat_engine.types import (
+    AgentChatResponse,
+    StreamingAgentChatResponse,
+)
+from llama_index.core.chat_engine.utils import aresponse_gen_from_query_engine
+from llama_index.core.llms.llm import LLM
+from llama_index.core.memory import ChatMemoryBuffer
+from llama_index.core.query_engine import RetrieverQueryEngine
+from llama_index.core.schema import NodeWithScore, QueryBundle
+from llama_index.core.settings import Settings
+
+from ... import metrics
+from ...config import settings
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+@dataclass
+class StageReport:
+    """Per-stage timings, in seconds, and outcomes of a chat engine call."""
+
+    timings: Dict[str, float] = field(default_factory=dict)
+    outcomes: Dict[str, str] = field(default_factory=dict)
+
+
+class _CondenseCache:
+    """Thread-safe LRU cache of condensed questions."""
+
+    def __init__(self, max_size: int) -> None:
+        self._max_size = max_size
+        self._entries: "OrderedDict[str, str]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            condensed = self._entries.get(key)
+            if condensed is not None:
+                self._entries.move_to_end(key)
+            return condensed
+
+    def put(self, key: str, condensed: str) -> None:
+        if self._max_size <= 0:
+            return
+        with self._lock:
+            self._entries[key] = condensed
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_size:
+                self._entries.popitem(last=False)
+
+
+_condense_cache = _CondenseCache(settings.chat_engine.condense_cache_size)
+
+
+def _condense_key(model: str, chat_history: List[ChatMessage], message: str) -> str:
+    digest = hashlib.sha256(model.encode())
+    for chat_message in chat_history:
+        digest.update(b"\x00" + str(chat_message.role).encode())
+        digest.update(b"\x00" + (chat_message.content or "").encode())
+    digest.update(b"\x01" + message.encode())
+    return digest.hexdigest()
+
+
+class PipelinedChatEngine(CondenseQuestionChatEngine):
+    """Condense-question chat engine that overlaps condensing with retrieval."""
+
+    def __init__(
+        self,
+        query_engine: RetrieverQueryEngine,
+        llm: LLM,
+        embed_model: BaseEmbedding,
+        similarity_threshold: Optional[float] = None,
+        speculative_retrieval: Optional[bool] = None,
+    ) -> None:
+        super().__init__(
+            query_engine,
+            DEFAULT_PROMPT,
+            ChatMemoryBuffer.from_defaults(llm=llm),
+            llm,
+            callback_manager=Settings.callback_manager,
+        )
+        self._embed_model = embed_model
+        self._similarity_threshold = (
+            similarity_threshold
+            if similarity_threshold is not None
+            else settings.chat_engine.speculative_similarity_threshold
+        )
+        self._speculative_retrieval = (
+            speculative_retrieval
+            if speculative_retrieval is not None
+            else settings.chat_engine.speculative_retrieval
+        )
+        self.report = StageReport()
+
+    def _record(self, stage: str, seconds: float) -> None:
+        self.report.timings[stage] = seconds
+        metrics.record_stage(stage, seconds)
+
+    async def _timed(self, stage: str, awaitable: Awaitable[T]) -> T:
+        started = time.perf_counter()
+        try:
+            return await awaitable
+        finally:
+            self._record(stage, time.perf_counter() - started)
+
+    async def _aembed(self, query_str: str) -> List[float]:
+        with metrics.stage("embed"):
+            return await self._embed_model.aget_query_embedding(query_str)
+
+    async def _aretrieve(
+        self, query_str: str, embedding: Optional[List[float]] = None
+    ) -> Tuple[List[float], List[NodeWithScore]]:
+        if embedding is None:
+            embedding = await self._aembed(query_str)
+        nodes = await self._query_engine.aretrieve(
+            QueryBundle(query_str=query_str, embedding=embedding)
+        )
+        return embedding, nodes
+
+    async def acondense_and_retrieve(
+        self, chat_history: List[ChatMessage], message: str
+    ) -> Tuple[str, List[NodeWithScore]]:
+        """Return the condensed question and the nodes retrieved for it."""
+        if not chat_history:
+            self.report.outcomes["condense"] = "skipped"
+            _, nodes = await self._timed("retrieve", self._aretrieve(message))
+            return message, nodes
+
+        key = _condense_key(self._llm.metadata.model_name, chat_history, message)
+        condensed = _condense_cache.get(key)
+        if condensed is not None:
+            self.report.outcomes["condense"] = "cached"
+            _, nodes = await self._timed("retrieve", self._aretrieve(condensed))
+            return condensed, nodes
+
+        self.report.outcomes["condense"] = "llm"
+        speculative = None
+        if self._speculative_retrieval:
+            speculative = asyncio.ensure_future(
+                self._timed("speculative_retrieve", self._aretrieve(message))
+            )
+        try:
+            condensed = await self._timed(
+                "condense", self._acondense_question(chat_history, message)
+            )
+        except BaseException:
+            if speculative is not None:
+                speculative.cancel()
+            raise
+        _condense_cache.put(key, condensed)
+
+        started = time.perf_counter()
+        try:
+            if speculative is None:
+                self.report.outcomes["speculative_retrieve"] = "disabled"
+                _, nodes = await self._aretrieve(condensed)
+                return condensed, nodes
+
+            if condensed.strip() == message.strip():
+                self.report.outcomes["speculative_retrieve"] = "hit"
+                _, nodes = await speculative
+                return condensed, nodes
+
+            condensed_embedding, (message_embedding, speculative_nodes) = (
+                await asyncio.gather(self._aembed(condensed), speculative)
+            )
+            similarity = self._embed_model.similarity(
+                message_embedding, condensed_embedding
+            )
+            logger.debug("Condensed question similarity: %.3f", similarity)
+            if similarity >= self._similarity_threshold:
+                self.report.outcomes["speculative_retrieve"] = "hit"
+                return condensed, speculative_nodes
+
+            self.report.outcomes["speculative_retrieve"] = "miss"
+            _, nodes = await self._aretrieve(condensed, condensed_embedding)
+            return condensed, nodes
+        finally:
+            self._record("retrieve", time.perf_counter() - started)
+
+    async def _asynthesize(
+        self, condensed_question: str, nodes: List[NodeWithScore], streaming: bool
+    ) -> Any:
+        # the query engine configures streaming with a class attribute; toggle it
+        # the same way the condense-question chat engine does
+        synthesizer = self._query_engine._response_synthesizer
+        is_streaming = synthesizer._streaming
+        synthesizer._streaming = streaming
+        try:
+            return await self._timed(
+                "synthesize",
+                self._query_engine.asynthesize(QueryBundle(condensed_question), nodes),
+            )
+        finally:
+            synthesizer._streaming = is_streaming
+
+    async def achat(
+        self, message: str, chat_history: Optional[List[ChatMessage]] = None
+    ) -> AgentChatResponse:
+        chat_history = chat_history or self._memory.get(input=message)
+
+        condensed_question, nodes = await self.acondense_and_retrieve(
+            chat_history, message
+        )
+        return await self.arespond(message, condensed_question, nodes)
+
+    async def arespond(
+        self, message: str, condensed_question: str, nodes: List[NodeWithScore]
+    ) -> AgentChatResponse:
+        """Synthesize the answer from the nodes retrieved for the condensed question."""
+        logger.info("Querying with: %s", condensed_question)
+        query_response = await self._asynthesize(condensed_question, nodes, False)
+
+        tool_output = self._get_tool_output_from_response(
+            condensed_question, query_response
+        )
+        await self._memory.aput(ChatMessage(role=MessageRole.USER, content=message))
+        await self._memory.aput(
+            ChatMessage(role=MessageRole.ASSISTANT, content=str(query_response))
+        )
+        return AgentChatResponse(response=str(query_response), sources=[tool_output])
+
+    async def astream_chat(
+        self, message: str, chat_history: Optional[List[ChatMessage]] = None
+    ) -> StreamingAgentChatResponse:
+        chat_history = chat_history or self._memory.get(input=message)
+
+        condensed_question, nodes = await self.acondense_and_retrieve(
+            chat_history, message
+        )
+        logger.info("Querying with: %s", condensed_question)
+        query_response = await self._asynthesize(condensed_question, nodes, True)
+        if not isinstance(query_response, AsyncStreamingResponse):
+            raise ValueError("Streaming is not enabled. Please use achat() instead.")
+
+        tool_output = self._get_tool_output_from_response(
+            condensed_question, query_response
+        )
+        await self._memory.aput(ChatMessage(role=MessageRole.USER, content=message))
+        response = StreamingAgentChatResponse(
+            achat_stream=aresponse_gen_from_query_engine(
+                query_response.async_response_gen()
+            ),
+            sources=[tool_output],
+            source_nodes=query_response.source_nodes,
+        )
+        asyncio.create_task(response.awrite_response_to_history(self._memory))
+        return response
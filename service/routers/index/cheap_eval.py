@@ -0,0 +1,151 @@
+# ###########################################################################
+#
+#  CLOUDERA APPLIED MACHINE LEARNING PROTOTYPE (AMP)
+#  (C) Cloudera, Inc. 2021
+#  All rights reserved.
+#
+#  Applicable Open Source License: Apache 2.0
+#
+#  NOTE: Cloudera open source products are modular software products
+#  made up of hundreds of individual components, each of which was
+#  individually copyrighted.  Each Cloudera open source product is a
+#  collective work under U.S. Copyright Law. Your license to use the
+#  collective work is as provided in your written agreement with
+#  Cloudera.  Used apart from the collective work, this file is
+#  licensed for your use pursuant to the open source license
+#  identified above.
+#
+#  This code is provided to you pursuant a written agreement with
+#  (i) Cloudera, Inc. or (ii) a third-party authorized to distribute
+#  this code. If you do not have a written agreement with Cloudera nor
+#  with an authorized and properly licensed third party, you do not
+#  have any rights to access nor to use this code.
+#
+#  Absent a written agreement with Cloudera, Inc. (“Cloudera”) to the
+#  contrary, A) CLOUDERA PROVIDES THIS CODE TO YOU WITHOUT WARRANTIES OF ANY
+#  KIND; (B) CLOUDERA DISCLAIMS ANY AND ALL EXPRESS AND IMPLIED
+#  WARRANTIES WITH RESPECT TO THIS CODE, INCLUDING BUT NOT LIMITED TO
+#  IMPLIED WARRANTIES OF TITLE, NON-INFRINGEMENT, MERCHANTABILITY AND
+#  FITNESS FOR A PARTICULAR PURPOSE; (C) CLOUDERA IS NOT LIABLE TO YOU,
+#  AND WILL NOT DEFEND, INDEMNIFY, NOR HOLD YOU HARMLESS FOR ANY CLAIMS
+#  ARISING FROM OR RELATED TO THE CODE; AND (D)WITH RESPECT TO YOUR EXERCISE
+#  OF ANY RIGHTS GRANTED TO YOU FOR THE CODE, CLOUDERA IS NOT LIABLE FOR ANY
+#  DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, PUNITIVE OR
+#  CONSEQUENTIAL DAMAGES INCLUDING, BUT NOT LIMITED TO, DAMAGES
+#  RELATED TO LOST REVENUE, LOST PROFITS, LOSS OF INCOME, LOSS OF
+#  BUSINESS ADVANTAGE OR UNAVAILABILITY, OR LOSS OR CORRUPTION OF
+#  DATA.
+#
+# ###########################################################################
+
+"""
+Cheap evaluators computed from embeddings and token overlap.
+
+These scores cost no LLM calls: the query-context similarity reuses the retrieval
+scores, the answer-context similarity needs one embedding of the answer against the
+context vectors stored in Qdrant, and the coverage and grounding scores are token
+overlaps. They are logged for every evaluated response, and the LLM judges only run
+when the scores are ambiguous or the response is sampled.
+
+"""
+
+import random
+import re
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from ...config import settings
+
+QUERY_CONTEXT_SIMILARITY = "query_context_similarity"
+CONTEXT_COVERAGE = "context_coverage"
+ANSWER_CONTEXT_SIMILARITY = "answer_context_similarity"
+ANSWER_GROUNDING = "answer_grounding"
+
+_TOKEN_PATTERN = re.compile(r"\w+")
+_STOPWORDS = frozenset(
+    "about above after again against also and any are because been before being "
+    "below between both but can did does doing down during each few for from further "
+    "had has have having her here hers him his how into its itself just more most "
+    "not now off once only other our ours out over own same she should some such "
+    "than that the their theirs them then there these they this those through too "
+    "under until very was were what when where which while who whom why will with "
+    "would you your yours".split()
+)
+
+
+def _terms(text: str) -> set:
+    return {
+        token
+        for token in _TOKEN_PATTERN.findall(text.lower())
+        if len(token) > 2 and token not in _STOPWORDS
+    }
+
+
+def _overlap(text: str, context_terms: set) -> Optional[float]:
+    terms = _terms(text)
+    if not terms:
+        return None
+    return len(terms & context_terms) / len(terms)
+
+
+def score_contexts(
+    query: str, contexts: Sequence[str], retrieval_scores: Sequence[float]
+) -> Dict[str, float]:
+    """Score the retrieved contexts against the query."""
+    scores = {}
+    if len(retrieval_scores):
+        scores[QUERY_CONTEXT_SIMILARITY] = float(np.mean(retrieval_scores))
+    coverage = _overlap(query, set().union(*map(_terms, contexts)))
+    if coverage is not None:
+        scores[CONTEXT_COVERAGE] = coverage
+    return scores
+
+
+def score_response(
+    answer: str,
+    answer_embedding: Optional[Sequence[float]],
+    contexts: Sequence[str],
+    context_embeddings: Sequence[Sequence[float]],
+) -> Dict[str, float]:
+    """Score the answer against the retrieved contexts."""
+    scores = {}
+    if answer_embedding is not None and len(context_embeddings):
+        answer_vector = np.asarray(answer_embedding, dtype=np.float32)
+        context_matrix = np.asarray(context_embeddings, dtype=np.float32)
+        norms = np.linalg.norm(context_matrix, axis=1) * np.linalg.norm(answer_vector)
+        similarities = context_matrix @ answer_vector / np.maximum(norms, 1e-12)
+        scores[ANSWER_CONTEXT_SIMILARITY] = float(similarities.max())
+    grounding = _overlap(answer, set().union(*map(_terms, contexts)))
+    if grounding is not None:
+        scores[ANSWER_GROUNDING] = grounding
+    return scores
+
+
+def is_ambiguous(scores: Dict[str, float]) -> bool:
+    """Whether the combined cheap score falls in the band that needs an LLM judge."""
+    if not scores:
+        return True
+    combined = float(np.mean(list(scores.values())))
+    return (
+        settings.evaluation.escalation_band_low
+        <= combined
+        <= settings.evaluation.escalation_band_high
+    )
+
+
+def sample_for_judges() -> bool:
+    """Whether a response is sampled for the LLM judges regardless of its scores."""
+    return random.random() < settings.evaluation.escalation_sample_rate
+
+
+def context_vectors(points: List, vector_name: str) -> List[Sequence[float]]:
+    """Extract the dense vectors of Qdrant points, named or not."""
+    vectors = []
+    for point in points:
+        vector = point.vector
+        if isinstance(vector, dict):
+            vector = vector.get(vector_name)
+        if vector is not None:
+            vectors.append(vector)
+    return vectors
@@ -0,0 +1,348 @@
+# ###########################################################################
+#
+#  CLOUDERA APPLIED MACHINE LEARNING PROTOTYPE (AMP)
+#  (C) Cloudera, Inc. 2021
+#  All rights reserved.
+#
+#  Applicable Open Source License: Apache 2.0
+#
+#  NOTE: Cloudera open source products are modular software products
+#  made up of hundreds of individual components, each of which was
+#  individually copyrighted.  Each Cloudera open source product is a
+#  collective work under U.S. Copyright Law. Your license to use the
+#  collective work is as provided in your written agreement with
+#  Cloudera.  Used apart from the collective work, this file is
+#  licensed for your use pursuant to the open source license
+#  identified above.
+#
+#  This code is provided to you pursuant a written agreement with
+#  (i) Cloudera, Inc. or (ii) a third-party authorized to distribute
+#  this code. If you do not have a written agreement with Cloudera nor
+#  with an authorized and properly licensed third party, you do not
+#  have any rights to access nor to use this code.
+#
+#  Absent a written agreement with Cloudera, Inc. (“Cloudera”) to the
+#  contrary, A) CLOUDERA PROVIDES THIS CODE TO YOU WITHOUT WARRANTIES OF ANY
+#  KIND; (B) CLOUDERA DISCLAIMS ANY AND ALL EXPRESS AND IMPLIED
+#  WARRANTIES WITH RESPECT TO THIS CODE, INCLUDING BUT NOT LIMITED TO
+#  IMPLIED WARRANTIES OF TITLE, NON-INFRINGEMENT, MERCHANTABILITY AND
+#  FITNESS FOR A PARTICULAR PURPOSE; (C) CLOUDERA IS NOT LIABLE TO YOU,
+#  AND WILL NOT DEFEND, INDEMNIFY, NOR HOLD YOU HARMLESS FOR ANY CLAIMS
+#  ARISING FROM OR RELATED TO THE CODE; AND (D)WITH RESPECT TO YOUR EXERCISE
+#  OF ANY RIGHTS GRANTED TO YOU FOR THE CODE, CLOUDERA IS NOT LIABLE FOR ANY
+#  DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, PUNITIVE OR
+#  CONSEQUENTIAL DAMAGES INCLUDING, BUT NOT LIMITED TO, DAMAGES
+#  RELATED TO LOST REVENUE, LOST PROFITS, LOSS OF INCOME, LOSS OF
+#  BUSINESS ADVANTAGE OR UNAVAILABILITY, OR LOSS OR CORRUPTION OF
+#  DATA.
+#
+# ###########################################################################
+
+"""
+Deterministic offline stand-ins for the Bedrock LLM and embedding models.
+
+The fakes need no network access and make predict, ingest and evaluation runs
+reproducible: the same prompt always gets the same reply, and the same text the
+same embedding. Their latency and throttling can be tuned to mimic Bedrock, so the
+governor and the pipeline see realistic timings. See
+:class:`~service.config.BackendSettings`.
+
+"""
+
+import asyncio
+import contextlib
+import hashlib
+import random
+import re
+import threading
+import time
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+
+import numpy as np
+from botocore.exceptions import ClientError
+from llama_index.core.base.llms.types import (
+    ChatMessage,
+    ChatResponse,
+    ChatResponseAsyncGen,
+    ChatResponseGen,
+    CompletionResponse,
+    CompletionResponseAsyncGen,
+    CompletionResponseGen,
+    LLMMetadata,
+    MessageRole,
+)
+from llama_index.core.base.embeddings.base import BaseEmbedding, Embedding
+from llama_index.core.llms.callbacks import llm_chat_callback, llm_completion_callback
+from llama_index.core.llms.llm import LLM
+from pydantic import Field, PrivateAttr
+
+from .governor import GovernedLLMMixin, Priority
+
+_WORD = re.compile(r"\w+")
+
+# calls in flight per fake model, for the concurrency throttling simulation
+_in_flight: Dict[str, int] = {}
+_in_flight_lock = threading.Lock()
+
+
+def _digest(text: str) -> int:
+    return int.from_bytes(hashlib.blake2b(text.encode("utf-8")).digest()[:8], "big")
+
+
+def _throttling_error(model: str) -> ClientError:
+    return ClientError(
+        {
+            "Error": {"Code": "ThrottlingException", "Message": "Too many requests"},
+            "ResponseMetadata": {"HTTPStatusCode": 429},
+        },
+        f"Converse ({model})",
+    )
+
+
+class FakeLLM(LLM):
+    """LLM replying deterministically after a simulated, seeded delay."""
+
+    model: str = Field(default="fake", description="The simulated model name.")
+    max_tokens: Optional[int] = Field(default=None)
+    latency: float = Field(default=0.5, description="Seconds to the first token.")
+    jitter: float = Field(default=0.2, description="Latency variation, as a fraction.")
+    tokens_per_second: float = Field(default=50.0)
+    output_tokens: int = Field(default=64, description="Words in a generated answer.")
+    throttle_rate: float = Field(
+        default=0.0, description="Fraction of calls throttled."
+    )
+    max_concurrency: Optional[int] = Field(
+        default=None, description="Calls in flight beyond this are throttled."
+    )
+    seed: int = Field(default=0)
+
+    _rng: random.Random = PrivateAttr()
+    _rng_lock: threading.Lock = PrivateAttr()
+
+    def __init__(self, **kwargs: Any) -> None:
+        super().__init__(**kwargs)
+        self._rng = random.Random(self.seed)
+        self._rng_lock = threading.Lock()
+
+    @classmethod
+    def class_name(cls) -> str:
+        return "Fake_LLM"
+
+    @property
+    def metadata(self) -> LLMMetadata:
+        return LLMMetadata(
+            context_window=128_000,
+            num_output=self.max_tokens or self.output_tokens,
+            is_chat_model=True,
+            model_name=self.model,
+        )
+
+    def _reply(self, prompt: str) -> List[str]:
+        """The reply to ``prompt`` as a list of tokens, which only depends on the prompt"""
+        digest = _digest(prompt)
+        if "[RESULT]" in prompt:
+            # judges grading on a scale
+            tokens = ["The", " answer", " is", " adequate.", f"\n[RESULT] {digest % 2}"]
+        elif "YES" in prompt:
+            # judges answering YES or NO
+            tokens = ["NO" if digest % 4 == 0 else "YES"]
+        else:
+            words = _WORD.findall(prompt) or ["empty"]
+            rng = random.Random(digest)
+            count = min(self.output_tokens, self.max_tokens or self.output_tokens)
+            tokens = [("" if i == 0 else " ") + rng.choice(words) for i in range(count)]
+        return tokens
+
+    def _delays(self, tokens: int) -> List[float]:
+        """Seconds to wait before each token, throttling the call if simulated"""
+        with self._rng_lock:
+            if self._rng.random() < self.throttle_rate:
+                raise _throttling_error(self.model)
+            variation = self._rng.uniform(-self.jitter, self.jitter)
+        first = max(0.0, self.latency * (1 + variation))
+        return [first] + [1 / self.tokens_per_second] * (tokens - 1)
+
+    def _check_concurrency(self) -> None:
+        """Throttle the call if the model already has too many calls in flight"""
+        if self.max_concurrency is None:
+            return
+        if _in_flight.get(self.model, 0) >= self.max_concurrency:
+            raise _throttling_error(self.model)
+
+    @contextlib.contextmanager
+    def _admit(self) -> Iterator[None]:
+        with _in_flight_lock:
+            self._check_concurrency()
+            _in_flight[self.model] = _in_flight.get(self.model, 0) + 1
+        try:
+            yield
+        finally:
+            with _in_flight_lock:
+                _in_flight[self.model] -= 1
+
+    @staticmethod
+    def _prompt(messages: Sequence[ChatMessage]) -> str:
+        return "\n".join(str(message.content or "") for message in messages)
+
+    @staticmethod
+    def _chat_response(text: str, delta: Optional[str] = None) -> ChatResponse:
+        return ChatResponse(
+            message=ChatMessage(role=MessageRole.ASSISTANT, content=text), delta=delta
+        )
+
+    @llm_chat_callback()
+    def chat(self, messages: Sequence[ChatMessage], **kwargs: Any) -> ChatResponse:
+        tokens = self._reply(self._prompt(messages))
+        with self._admit():
+            time.sleep(sum(self._delays(len(tokens))))
+        return self._chat_response("".join(tokens))
+
+    @llm_chat_callback()
+    async def achat(
+        self, messages: Sequence[ChatMessage], **kwargs: Any
+    ) -> ChatResponse:
+        tokens = self._reply(self._prompt(messages))
+        with self._admit():
+            await asyncio.sleep(sum(self._delays(len(tokens))))
+        return self._chat_response("".join(tokens))
+
+    @llm_chat_callback()
+    def stream_chat(
+        self, messages: Sequence[ChatMessage], **kwargs: Any
+    ) -> ChatResponseGen:
+        tokens = self._reply(self._prompt(messages))
+        delays = self._delays(len(tokens))
+        # throttle now rather than once iterated, so the governor retries the call
+        with _in_flight_lock:
+            self._check_concurrency()
+
+        def gen() -> ChatResponseGen:
+            text = ""
+            with self._admit():
+                for token, delay in zip(tokens, delays):
+                    time.sleep(delay)
+                    text += token
+                    yield self._chat_response(text, token)
+
+        return gen()
+
+    @llm_chat_callback()
+    async def astream_chat(
+        self, messages: Sequence[ChatMessage], **kwargs: Any
+    ) -> ChatResponseAsyncGen:
+        tokens = self._reply(self._prompt(messages))
+        delays = self._delays(len(tokens))
+        # throttle now rather than once iterated, so the governor retries the call
+        with _in_flight_lock:
+            self._check_concurrency()
+
+        async def gen() -> ChatResponseAsyncGen:
+            text = ""
+            with self._admit():
+                for token, delay in zip(tokens, delays):
+                    await asyncio.sleep(delay)
+                    text += token
+                    yield self._chat_response(text, token)
+
+        return gen()
+
+    @llm_completion_callback()
+    def complete(
+        self, prompt: str, formatted: bool = False, **kwargs: Any
+    ) -> CompletionResponse:
+        response = self.chat([ChatMessage(role=MessageRole.USER, content=prompt)])
+        return CompletionResponse(text=response.message.content)
+
+    @llm_completion_callback()
+    async def acomplete(
+        self, prompt: str, formatted: bool = False, **kwargs: Any
+    ) -> CompletionResponse:
+        response = await self.achat(
+            [ChatMessage(role=MessageRole.USER, content=prompt)]
+        )
+        return CompletionResponse(text=response.message.content)
+
+    @llm_completion_callback()
+    def stream_complete(
+        self, prompt: str, formatted: bool = False, **kwargs: Any
+    ) -> CompletionResponseGen:
+        stream = self.stream_chat([ChatMessage(role=MessageRole.USER, content=prompt)])
+
+        def gen() -> CompletionResponseGen:
+            for response in stream:
+                yield CompletionResponse(
+                    text=response.message.content, delta=response.delta
+                )
+
+        return gen()
+
+    @llm_completion_callback()
+    async def astream_complete(
+        self, prompt: str, formatted: bool = False, **kwargs: Any
+    ) -> CompletionResponseAsyncGen:
+        stream = await self.astream_chat(
+            [ChatMessage(role=MessageRole.USER, content=prompt)]
+        )
+
+        async def gen() -> CompletionResponseAsyncGen:
+            async for response in stream:
+                yield CompletionResponse(
+                    text=response.message.content, delta=response.delta
+                )
+
+        return gen()
+
+
+class GovernedFakeLLM(GovernedLLMMixin, FakeLLM):
+    """:class:`FakeLLM` whose calls are admitted by the model's governor."""
+
+    _priority: Priority = PrivateAttr()
+
+    @classmethod
+    def class_name(cls) -> str:
+        return "Governed_Fake_LLM"
+
+
+class FakeEmbedding(BaseEmbedding):
+    """Feature-hashed bag-of-words embedding returned after a simulated delay."""
+
+    dim: int = Field(default=1024, description="The embedding dimension.")
+    latency: float = Field(default=0.02, description="Seconds per embedding call.")
+
+    @classmethod
+    def class_name(cls) -> str:
+        return "Fake_Embedding"
+
+    def _embed(self, text: str) -> Embedding:
+        vector = np.zeros(self.dim)
+        for word in _WORD.findall(text.lower()):
+            vector[_digest(word) % self.dim] += 1.0
+        norm = np.linalg.norm(vector)
+        if not norm:
+            vector[0], norm = 1.0, 1.0
+        return (vector / norm).tolist()
+
+    def _get_query_embedding(self, query: str) -> Embedding:
+        time.sleep(self.latency)
+        return self._embed(query)
+
+    async def _aget_query_embedding(self, query: str) -> Embedding:
+        await asyncio.sleep(self.latency)
+        return self._embed(query)
+
+    def _get_text_embedding(self, text: str) -> Embedding:
+        time.sleep(self.latency)
+        return self._embed(text)
+
+    async def _aget_text_embedding(self, text: str) -> Embedding:
+        await asyncio.sleep(self.latency)
+        return self._embed(text)
+
+    def _get_text_embeddings(self, texts: List[str]) -> List[Embedding]:
+        # one call per batch, as with the Bedrock API
+        time.sleep(self.latency)
+        return [self._embed(text) for text in texts]
+
+    async def _aget_text_embeddings(self, texts: List[str]) -> List[Embedding]:
+        await asyncio.sleep(self.latency)
+        return [self._embed(text) for text in texts]
@@ -0,0 +1,612 @@
+# ###########################################################################
+#
+#  CLOUDERA APPLIED MACHINE LEARNING PROTOTYPE (AMP)
+#  (C) Cloudera, Inc. 2021
+#  All rights reserved.
+#
+#  Applicable Open Source License: Apache 2.0
+#
+#  NOTE: Cloudera open source products are modular software products
+#  made up of hundreds of individual components, each of which was
+#  individually copyrighted.  Each Cloudera open source product is a
+#  collective work under U.S. Copyright Law. Your license to use the
+#  collective work is as provided in your written agreement with
+#  Cloudera.  Used apart from the collective work, this file is
+#  licensed for your use pursuant to the open source license
+#  identified above.
+#
+#  This code is provided to you pursuant a written agreement with
+#  (i) Cloudera, Inc. or (ii) a third-party authorized to distribute
+#  this code. If you do not have a written agreement with Cloudera nor
+#  with an authorized and properly licensed third party, you do not
+#  have any rights to access nor to use this code.
+#
+#  Absent a written agreement with Cloudera, Inc. (“Cloudera”) to the
+#  contrary, A) CLOUDERA PROVIDES THIS CODE TO YOU WITHOUT WARRANTIES OF ANY
+#  KIND; (B) CLOUDERA DISCLAIMS ANY AND ALL EXPRESS AND IMPLIED
+#  WARRANTIES WITH RESPECT TO THIS CODE, INCLUDING BUT NOT LIMITED TO
+#  IMPLIED WARRANTIES OF TITLE, NON-INFRINGEMENT, MERCHANTABILITY AND
+#  FITNESS FOR A PARTICULAR PURPOSE; (C) CLOUDERA IS NOT LIABLE TO YOU,
+#  AND WILL NOT DEFEND, INDEMNIFY, NOR HOLD YOU HARMLESS FOR ANY CLAIMS
+#  ARISING FROM OR RELATED TO THE CODE; AND (D)WITH RESPECT TO YOUR EXERCISE
+#  OF ANY RIGHTS GRANTED TO YOU FOR THE CODE, CLOUDERA IS NOT LIABLE FOR ANY
+#  DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, PUNITIVE OR
+#  CONSEQUENTIAL DAMAGES INCLUDING, BUT NOT LIMITED TO, DAMAGES
+#  RELATED TO LOST REVENUE, LOST PROFITS, LOSS OF INCOME, LOSS OF
+#  BUSINESS ADVANTAGE OR UNAVAILABILITY, OR LOSS OR CORRUPTION OF
+#  DATA.
+#
+# ###########################################################################
+
+"""
+Process-wide rate limiting for Bedrock calls.
+
+Every LLM call made by the service (chat generation, condense-question and the
+judge LLMs used for evaluation) goes through a per-model :class:`ModelGovernor`. The
+governor caps concurrency with a priority-ordered semaphore and enforces
+requests/second and tokens/minute with token buckets. Throttling responses shrink the
+admitted rate (AIMD) and impose a short cool-down; successful calls grow it back.
+
+"""
+
+import asyncio
+import contextlib
+import contextvars
+import heapq
+import itertools
+import logging
+import random
+import threading
+import time
+from collections import defaultdict
+from dataclasses import dataclass
+from enum import IntEnum
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from llama_index.core.base.llms.types import (
+    ChatMessage,
+    ChatResponse,
+    ChatResponseAsyncGen,
+    ChatResponseGen,
+)
+
+from ... import metrics
+from ...config import settings
+
+logger = logging.getLogger(__name__)
+
+_THROTTLING_ERROR_CODES = {
+    "ThrottlingException",
+    "TooManyRequestsException",
+    "ServiceQuotaExceededException",
+}
+
+# upper bounds (in seconds) of the queue wait histogram buckets
+_WAIT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+_MIN_RATE_FACTOR = 0.1
+_RATE_FACTOR_INCREMENT = 0.05
+_BASE_BACKOFF_SECONDS = 0.5
+_MAX_BACKOFF_SECONDS = 20.0
+# upper bound on an idle wait, in case a wake-up is missed
+_MAX_POLL_SECONDS = 1.0
+# rough number of characters in a token, for the token estimates
+CHARACTERS_PER_TOKEN = 4
+
+
+class Priority(IntEnum):
+    """Scheduling priority of a governed call; lower values are admitted first."""
+
+    INTERACTIVE = 0
+    EVALUATION = 1
+    BACKFILL = 2
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheaply estimate the number of tokens in ``text``."""
+    return len(text) // CHARACTERS_PER_TOKEN + 1
+
+
+def is_throttling_error(error: BaseException) -> bool:
+    """Return whether ``error`` is a Bedrock throttling (HTTP 429) error."""
+    response = getattr(error, "response", None)
+    if isinstance(response, dict):
+        code = response.get("Error", {}).get("Code")
+        status = response.get("ResponseMetadata", {}).get("HTTPStatusCode")
+        return code in _THROTTLING_ERROR_CODES or status == 429
+    return type(error).__name__ in _THROTTLING_ERROR_CODES
+
+
+class _TokenBucket:
+    """Token bucket refilled lazily; callers must hold the governor's lock."""
+
+    def __init__(self, rate_per_second: float, capacity: float):
+        self.rate_per_second = rate_per_second
+        self.capacity = capacity
+        self.level = capacity
+        self._updated = time.monotonic()
+
+    def refill(self, now: float, rate_factor: float) -> None:
+        elapsed = now - self._updated
+        self._updated = now
+        self.level = min(
+            self.capacity, self.level + elapsed * self.rate_per_second * rate_factor
+        )
+
+    def delay_for(self, amount: float, rate_factor: float) -> float:
+        """Seconds until ``amount`` (capped at the capacity) is available."""
+        deficit = min(amount, self.capacity) - self.level
+        if deficit <= 0:
+            return 0.0
+        return deficit / (self.rate_per_second * rate_factor)
+
+    def consume(self, amount: float) -> None:
+        self.level -= amount
+
+    def refund(self, amount: float) -> None:
+        self.level = min(self.capacity, self.level + amount)
+
+
+class _WaitStats:
+    """Queue wait time statistics for one priority class."""
+
+    def __init__(self):
+        self.count = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+        self.buckets = [0] * (len(_WAIT_BUCKETS) + 1)
+
+    def observe(self, seconds: float) -> None:
+        self.count += 1
+        self.total_seconds += seconds
+        self.max_seconds = max(self.max_seconds, seconds)
+        for i, bound in enumerate(_WAIT_BUCKETS):
+            if seconds <= bound:
+                self.buckets[i] += 1
+                return
+        self.buckets[-1] += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "total_seconds": self.total_seconds,
+            "mean_seconds": self.total_seconds / self.count if self.count else 0.0,
+            "max_seconds": self.max_seconds,
+            "buckets": {
+                **{str(bound): n for bound, n in zip(_WAIT_BUCKETS, self.buckets)},
+                "+Inf": self.buckets[-1],
+            },
+        }
+
+
+class _Waiter:
+    """A call waiting for admission; woken from any thread."""
+
+    def __init__(self, loop: Optional[asyncio.AbstractEventLoop] = None):
+        self._loop = loop
+        self._async_event = asyncio.Event() if loop is not None else None
+        self._thread_event = threading.Event() if loop is None else None
+
+    def wake(self) -> None:
+        if self._async_event is not None:
+            self._loop.call_soon_threadsafe(self._async_event.set)
+        else:
+            self._thread_event.set()
+
+    def wait(self, timeout: float) -> None:
+        self._thread_event.wait(timeout)
+        self._thread_event.clear()
+
+    async def await_(self, timeout: float) -> None:
+        try:
+            await asyncio.wait_for(self._async_event.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+        self._async_event.clear()
+
+
+class Lease:
+    """An admitted call. Release it exactly once when the call has finished."""
+
+    def __init__(self, governor: "ModelGovernor", estimated_tokens: int):
+        self._governor = governor
+        self._estimated_tokens = estimated_tokens
+        self._released = False
+
+    def release(
+        self, tokens_used: Optional[int] = None, throttled: bool = False
+    ) -> None:
+        """
+        Free the concurrency slot, correcting the token estimate if known.
+
+        ``throttled`` reports that Bedrock throttled the call, so that the back-off
+        is in place before the next waiter is woken.
+
+        """
+        if self._released:
+            return
+        self._released = True
+        self._governor.release(self._estimated_tokens, tokens_used, throttled)
+
+
+class ModelGovernor:
+    """Concurrency and rate governor for a single Bedrock model."""
+
+    def __init__(
+        self,
+        model: str,
+        max_concurrency: int,
+        requests_per_second: float,
+        tokens_per_minute: int,
+    ):
+        self.model = model
+        self.max_concurrency = max_concurrency
+        self._lock = threading.Lock()
+        self._requests = _TokenBucket(
+            requests_per_second, max(1.0, requests_per_second)
+        )
+        self._tokens = _TokenBucket(tokens_per_minute / 60.0, tokens_per_minute)
+        self._rate_factor = 1.0
+        self._cooldown_until = 0.0
+        self._consecutive_throttles = 0
+        self._in_flight = 0
+        self._queue: List[Tuple[int, int, _Waiter]] = []
+        self._sequence = itertools.count()
+        self._wait_stats = {priority: _WaitStats() for priority in Priority}
+        self._throttle_count = 0
+
+    def _admit_or_delay(self, waiter: _Waiter, tokens: int) -> Optional[float]:
+        """
+        Admit ``waiter`` if it is first in line and capacity allows.
+
+        Returns 0 when admitted, otherwise the number of seconds to wait before trying
+        again (``None`` to wait until woken).
+
+        """
+        with self._lock:
+            if not self._queue or self._queue[0][2] is not waiter:
+                return None
+            if self._in_flight >= self.max_concurrency:
+                return None
+            now = time.monotonic()
+            self._requests.refill(now, self._rate_factor)
+            self._tokens.refill(now, self._rate_factor)
+            delay = max(
+                self._cooldown_until - now,
+                self._requests.delay_for(1, self._rate_factor),
+                self._tokens.delay_for(tokens, self._rate_factor),
+            )
+            if delay > 0:
+                return delay
+            heapq.heappop(self._queue)
+            self._requests.consume(1)
+            self._tokens.consume(tokens)
+            self._in_flight += 1
+            self._wake_head()
+            return 0.0
+
+    def _enqueue(self, priority: Priority, waiter: _Waiter) -> None:
+        with self._lock:
+            heapq.heappush(self._queue, (priority, next(self._sequence), waiter))
+
+    def _dequeue(self, waiter: _Waiter) -> None:
+        """Remove an abandoned (e.g. cancelled) waiter from the queue."""
+        with self._lock:
+            for i, entry in enumerate(self._queue):
+                if entry[2] is waiter:
+                    self._queue.pop(i)
+                    heapq.heapify(self._queue)
+                    self._wake_head()
+                    return
+
+    def _wake_head(self) -> None:
+        if self._queue:
+            self._queue[0][2].wake()
+
+    def _record_wait(self, priority: Priority, started: float) -> None:
+        with self._lock:
+            self._wait_stats[priority].observe(time.monotonic() - started)
+
+    def acquire(self, priority: Priority, tokens: int) -> Lease:
+        """Block the calling thread until the call may proceed."""
+        started = time.monotonic()
+        waiter = _Waiter()
+        self._enqueue(priority, waiter)
+        try:
+            while (delay := self._admit_or_delay(waiter, tokens)) != 0.0:
+                waiter.wait(min(delay or _MAX_POLL_SECONDS, _MAX_POLL_SECONDS))
+        except BaseException:
+            self._dequeue(waiter)
+            raise
+        self._record_wait(priority, started)
+        return Lease(self, tokens)
+
+    async def aacquire(self, priority: Priority, tokens: int) -> Lease:
+        """Wait, without blocking the event loop, until the call may proceed."""
+        started = time.monotonic()
+        waiter = _Waiter(asyncio.get_running_loop())
+        self._enqueue(priority, waiter)
+        try:
+            while (delay := self._admit_or_delay(waiter, tokens)) != 0.0:
+                await waiter.await_(min(delay or _MAX_POLL_SECONDS, _MAX_POLL_SECONDS))
+        except BaseException:
+            self._dequeue(waiter)
+            raise
+        self._record_wait(priority, started)
+        return Lease(self, tokens)
+
+    def release(
+        self, estimated_tokens: int, tokens_used: Optional[int], throttled: bool = False
+    ) -> None:
+        backoff = None
+        with self._lock:
+            self._in_flight -= 1
+            if throttled:
+                backoff = self._throttle()
+            elif tokens_used is not None:
+                self._tokens.refund(estimated_tokens - tokens_used)
+                self._rate_factor = min(1.0, self._rate_factor + _RATE_FACTOR_INCREMENT)
+                self._consecutive_throttles = 0
+            self._wake_head()
+        if backoff is not None:
+            self._log_throttle(backoff)
+
+    def _throttle(self) -> float:
+        """
+        Halve the admitted rate and back off exponentially, with jitter, returning the
+        back-off; callers must hold the lock.
+        """
+        self._throttle_count += 1
+        self._consecutive_throttles += 1
+        self._rate_factor = max(_MIN_RATE_FACTOR, self._rate_factor / 2)
+        backoff = min(
+            _MAX_BACKOFF_SECONDS,
+            _BASE_BACKOFF_SECONDS * 2 ** (self._consecutive_throttles - 1),
+        )
+        backoff *= random.uniform(0.5, 1.0)
+        self._cooldown_until = max(self._cooldown_until, time.monotonic() + backoff)
+        return backoff
+
+    def _log_throttle(self, backoff: float) -> None:
+        logger.warning(
+            "Bedrock throttled model %s; backing off %.2fs at %.0f%% of the configured rate",
+            self.model,
+            backoff,
+            self._rate_factor * 100,
+        )
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return the governor's current state and queue wait statistics."""
+        with self._lock:
+            return {
+                "model": self.model,
+                "max_concurrency": self.max_concurrency,
+                "in_flight": self._in_flight,
+                "queued": len(self._queue),
+                "queued_by_priority": {
+                    priority.name.lower(): sum(
+                        1 for entry in self._queue if entry[0] == priority
+                    )
+                    for priority in Priority
+                },
+                "rate_factor": self._rate_factor,
+                "throttle_count": self._throttle_count,
+                "queue_wait_seconds": {
+                    priority.name.lower(): stats.snapshot()
+                    for priority, stats in self._wait_stats.items()
+                },
+            }
+
+
+_governors: Dict[str, ModelGovernor] = {}
+_governors_lock = threading.Lock()
+
+
+def get_governor(model: str) -> ModelGovernor:
+    """Return the process-wide governor for ``model``, creating it on first use."""
+    with _governors_lock:
+        if model not in _governors:
+            limits = settings.bedrock.per_model_limits.get(model)
+            _governors[model] = ModelGovernor(
+                model=model,
+                max_concurrency=(limits and limits.max_concurrency)
+                or settings.bedrock.max_concurrency,
+                requests_per_second=(limits and limits.requests_per_second)
+                or settings.bedrock.requests_per_second,
+                tokens_per_minute=(limits and limits.tokens_per_minute)
+                or settings.bedrock.tokens_per_minute,
+            )
+        return _governors[model]
+
+
+def governor_snapshots() -> List[Dict[str, Any]]:
+    """Return a snapshot of every governor created so far."""
+    with _governors_lock:
+        governors = list(_governors.values())
+    return [governor.snapshot() for governor in governors]
+
+
+def _queue_depths() -> Dict[Tuple[str, str], float]:
+    return {
+        (snapshot["model"], priority): queued
+        for snapshot in governor_snapshots()
+        for priority, queued in snapshot["queued_by_priority"].items()
+    }
+
+
+metrics.LLM_QUEUE_DEPTH.set_function(_queue_depths)
+
+
+def _tokens_used(response: ChatResponse) -> Optional[int]:
+    usage = (response.raw or {}).get("usage") or {}
+    return usage.get("totalTokens")
+
+
+@dataclass
+class TokenUsage:
+    """Tokens sent to and generated by the LLM calls of one priority."""
+
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+
+
+_token_usage: contextvars.ContextVar[Optional[Dict[Priority, TokenUsage]]] = (
+    contextvars.ContextVar("token_usage", default=None)
+)
+
+
+@contextlib.contextmanager
+def track_token_usage() -> Iterator[Dict[Priority, TokenUsage]]:
+    """
+    Tally the tokens of the LLM calls made within the block, by priority.
+
+    Tasks and threads started within the block inherit the tally.
+
+    """
+    usage: Dict[Priority, TokenUsage] = defaultdict(TokenUsage)
+    token = _token_usage.set(usage)
+    try:
+        yield usage
+    finally:
+        _token_usage.reset(token)
+
+
+def _record_tokens(
+    model: str,
+    priority: Priority,
+    prompt_tokens: int,
+    response: Optional[ChatResponse],
+    content: str = "",
+) -> None:
+    """Count the tokens of a call, from the reported usage or else estimated."""
+    usage = ((response and response.raw) or {}).get("usage") or {}
+    if response is not None and not content:
+        content = response.message.content or ""
+    tokens_in = usage.get("inputTokens", prompt_tokens)
+    tokens_out = usage.get("outputTokens", estimate_tokens(content))
+    metrics.LLM_TOKENS.labels(model, "in").inc(tokens_in)
+    metrics.LLM_TOKENS.labels(model, "out").inc(tokens_out)
+    usage = _token_usage.get()
+    if usage is not None:
+        usage[priority].prompt_tokens += tokens_in
+        usage[priority].completion_tokens += tokens_out
+
+
+class GovernedLLMMixin:
+    """
+    Admits the chat calls of an LLM through the governor of its ``model``.
+
+    Throttled calls are retried with backoff up to
+    ``settings.bedrock.max_throttle_retries`` times. Mix in before the LLM class;
+    the class must declare a ``_priority`` private attribute.
+
+    """
+
+    def __init__(
+        self,
+        *args: Any,
+        priority: Priority = Priority.INTERACTIVE,
+        **kwargs: Any,
+    ) -> None:
+        super().__init__(*args, **kwargs)
+        self._priority = priority
+
+    def _estimate(self, messages: Sequence[ChatMessage]) -> int:
+        prompt_tokens = sum(estimate_tokens(str(m.content or "")) for m in messages)
+        return prompt_tokens + (self.max_tokens or 0)
+
+    def chat(self, messages: Sequence[ChatMessage], **kwargs: Any) -> ChatResponse:
+        governor = get_governor(self.model)
+        prompt_tokens = self._estimate(messages) - (self.max_tokens or 0)
+        for attempt in itertools.count():
+            lease = governor.acquire(self._priority, self._estimate(messages))
+            try:
+                response = super().chat(messages, **kwargs)
+            except Exception as e:
+                throttled = is_throttling_error(e)
+                lease.release(throttled=throttled)
+                if throttled and attempt < settings.bedrock.max_throttle_retries:
+                    continue
+                raise
+            lease.release(_tokens_used(response))
+            _record_tokens(self.model, self._priority, prompt_tokens, response)
+            return response
+
+    async def achat(
+        self, messages: Sequence[ChatMessage], **kwargs: Any
+    ) -> ChatResponse:
+        governor = get_governor(self.model)
+        prompt_tokens = self._estimate(messages) - (self.max_tokens or 0)
+        for attempt in itertools.count():
+            lease = await governor.aacquire(self._priority, self._estimate(messages))
+            try:
+                response = await super().achat(messages, **kwargs)
+            except Exception as e:
+                throttled = is_throttling_error(e)
+                lease.release(throttled=throttled)
+                if throttled and attempt < settings.bedrock.max_throttle_retries:
+                    continue
+                raise
+            lease.release(_tokens_used(response))
+            _record_tokens(self.model, self._priority, prompt_tokens, response)
+            return response
+
+    def stream_chat(
+        self, messages: Sequence[ChatMessage], **kwargs: Any
+    ) -> ChatResponseGen:
+        governor = get_governor(self.model)
+        prompt_tokens = self._estimate(messages) - (self.max_tokens or 0)
+        for attempt in itertools.count():
+            lease = governor.acquire(self._priority, self._estimate(messages))
+            try:
+                stream = super().stream_chat(messages, **kwargs)
+                break
+            except Exception as e:
+                throttled = is_throttling_error(e)
+                lease.release(throttled=throttled)
+                if throttled and attempt < settings.bedrock.max_throttle_retries:
+                    continue
+                raise
+
+        def gen() -> ChatResponseGen:
+            # hold the slot until the stream is exhausted or closed
+            content = ""
+            try:
+                for response in stream:
+                    content = response.message.content or ""
+                    yield response
+            finally:
+                lease.release(prompt_tokens + estimate_tokens(content))
+                _record_tokens(self.model, self._priority, prompt_tokens, None, content)
+
+        return gen()
+
+    async def astream_chat(
+        self, messages: Sequence[ChatMessage], **kwargs: Any
+    ) -> ChatResponseAsyncGen:
+        governor = get_governor(self.model)
+        prompt_tokens = self._estimate(messages) - (self.max_tokens or 0)
+        for attempt in itertools.count():
+            lease = await governor.aacquire(self._priority, self._estimate(messages))
+            try:
+                stream = await super().astream_chat(messages, **kwargs)
+                break
+            except Exception as e:
+                throttled = is_throttling_error(e)
+                lease.release(throttled=throttled)
+                if throttled and attempt < settings.bedrock.max_throttle_retries:
+                    continue
+                raise
+
+        async def gen() -> ChatResponseAsyncGen:
+            # hold the slot until the stream is exhausted or closed
+            content = ""
+            try:
+                async for response in stream:
+                    content = response.message.content or ""
+                    yield response
+            finally:
+                lease.release(prompt_tokens + estimate_tokens(content))
+                _record_tokens(self.model, self._priority, prompt_tokens, None, content)
+
+        return gen()
@@ -38,10 +38,8 @@
 #
 # ###########################################################################
 
-import re
 import asyncio
-import re
-from typing import Any, Callable, Optional, Sequence, Tuple, Union
+from typing import Any, Callable, List, Optional, Sequence, Tuple, Union
 
 from llama_index.core.evaluation.base import BaseEvaluator, EvaluationResult
 from llama_index.core.llms.llm import LLM
@@ -52,23 +50,105 @@ from typing import Optional, Tuple
 from llama_index.core.evaluation import BaseEvaluator, EvaluationResult
 from llama_index.core.prompts import BasePromptTemplate, PromptTemplate
 
+from .governor import CHARACTERS_PER_TOKEN
 
-def _default_parser_function(output_str: str) -> Tuple[Optional[float], Optional[str]]:
-    # Pattern to match the feedback and response
-    # This pattern looks for any text ending with '[RESULT]' followed by a number
-    pattern = r"([\s\S]+)(?:\[RESULT\]\s*)(\d)"
+_RESULT_MARKER = "[RESULT]"
+
+
+def _score_after_marker(output_str: str, marker_end: int) -> Optional[float]:
+    """Return the digit following a result marker and optional whitespace, if any."""
+    index = marker_end
+    length = len(output_str)
+    while index < length and output_str[index].isspace():
+        index += 1
+    if index < length and output_str[index].isdecimal():
+        return float(output_str[index])
+    return None
 
-    # Using regex to find all matches
-    result = re.search(pattern, output_str)
 
-    # Check if any match is found
-    if result:
-        # Assuming there's only one match in the text, extract feedback and response
-        feedback, score = result.groups()
-        score = float(score) if score is not None else score
-        return score, feedback.strip()
-    else:
-        return None, None
+def _default_parser_function(output_str: str) -> Tuple[Optional[float], Optional[str]]:
+    # Find the feedback followed by '[RESULT]' and a number. Like the greedy
+    # ``([\s\S]+)(?:\[RESULT\]\s*)(\d)`` pattern this used to be, the last
+    # marker wins and at least one character of feedback must precede it, but
+    # the scan is linear in the length of the output.
+    end = len(output_str)
+    while (index := output_str.rfind(_RESULT_MARKER, 1, end)) != -1:
+        score = _score_after_marker(output_str, index + len(_RESULT_MARKER))
+        if score is not None:
+            return score, output_str[:index].strip()
+        end = index
+    return None, None
+
+
+class ResultScanner:
+    """
+    Incrementally scans streamed judge output for a ``[RESULT] n`` marker.
+
+    Feed chunks as they arrive; once ``done`` is set the rest of the generation can
+    be abandoned, since ``text`` then parses to the same result with
+    ``_default_parser_function``.
+
+    """
+
+    def __init__(self) -> None:
+        self._chunks: List[str] = []
+        self._length = 0
+        # Number of marker characters matched so far, or len(_RESULT_MARKER) while
+        # skipping the whitespace between the marker and the score.
+        self._matched = 0
+        self._marker_start = 0
+        self.done = False
+
+    @property
+    def text(self) -> str:
+        return "".join(self._chunks)
+
+    @property
+    def length(self) -> int:
+        """Number of characters consumed so far, without joining them"""
+        return self._length
+
+    def feed(self, chunk: str) -> bool:
+        """Consume a chunk of output and return whether the result has been seen."""
+        if self.done or not chunk:
+            return self.done
+        offset = self._length
+        index = 0
+        length = len(chunk)
+        while index < length:
+            if self._matched == 0:
+                # Jump straight to the next candidate marker.
+                index = chunk.find("[", index)
+                if index == -1:
+                    break
+                self._marker_start = offset + index
+                self._matched = 1
+            elif self._matched < len(_RESULT_MARKER):
+                char = chunk[index]
+                if char == _RESULT_MARKER[self._matched]:
+                    self._matched += 1
+                    if self._matched == len(_RESULT_MARKER) and self._marker_start == 0:
+                        # A result needs some feedback in front of it.
+                        self._matched = 0
+                elif char == "[":
+                    self._marker_start = offset + index
+                    self._matched = 1
+                else:
+                    self._matched = 0
+            else:
+                char = chunk[index]
+                if char.isdecimal():
+                    self._chunks.append(chunk[: index + 1])
+                    self._length += index + 1
+                    self.done = True
+                    return True
+                if not char.isspace():
+                    self._matched = 0
+                    continue
+            index += 1
+        self._chunks.append(chunk)
+        self._length += length
+        return False
 
 
 _DEFAULT_SCORE_THRESHOLD = 2.0
@@ -85,10 +165,14 @@ class CustomEvaluator(BaseEvaluator):
         parser_function: Callable[
             [str], Tuple[Optional[float], Optional[str]]
         ] = _default_parser_function,
+        streaming: bool = False,
+        max_output_tokens: Optional[int] = None,
     ) -> None:
         """Init params."""
         self._llm = llm or Settings.llm
         self._raise_error = raise_error
+        self._streaming = streaming
+        self._max_output_tokens = max_output_tokens
 
         self._eval_template: BasePromptTemplate
         if isinstance(eval_template, str):
@@ -113,6 +197,31 @@ class CustomEvaluator(BaseEvaluator):
         if "refine_template" in prompts:
             self._refine_template = prompts["refine_template"]
 
+    async def _astream_until_result(self, query: str, response: str) -> str:
+        """
+        Stream the judge completion and stop generating once the result is known.
+
+        Generation is also abandoned when the output exceeds ``max_output_tokens``,
+        in which case the truncated text is returned as is.
+
+        """
+        messages = self._eval_template.format_messages(
+            llm=self._llm, query=query, response=response
+        )
+        scanner = ResultScanner()
+        stream = await self._llm.astream_chat(messages)
+        try:
+            async for chunk in stream:
+                if scanner.feed(chunk.delta or ""):
+                    break
+                if self._max_output_tokens is not None and (
+                    scanner.length // CHARACTERS_PER_TOKEN + 1 > self._max_output_tokens
+                ):
+                    break
+        finally:
+            await stream.aclose()
+        return scanner.text
+
     async def aevaluate(
         self,
         query: Union[str, None] = None,
@@ -130,11 +239,14 @@ class CustomEvaluator(BaseEvaluator):
 
         await asyncio.sleep(sleep_time_in_seconds)
 
-        eval_response = await self._llm.apredict(
-            prompt=self._eval_template,
-            query=query,
-            response=response,
-        )
+        if self._streaming:
+            eval_response = await self._astream_until_result(query, response)
+        else:
+            eval_response = await self._llm.apredict(
+                prompt=self._eval_template,
+                query=query,
+                response=response,
+            )
 
         score, reasoning = self.parser_function(eval_response)
 
@@ -201,6 +313,8 @@ def load_custom_evaluator(
     parser_function: Callable[
         [str], Tuple[Optional[float], Optional[str]]
     ] = _default_parser_function,
+    streaming: bool = False,
+    max_output_tokens: Optional[int] = None,
 ) -> CustomEvaluator:
     """Create a custom evaluator."""
     if isinstance(questions, str):
@@ -217,6 +331,8 @@ def load_custom_evaluator(
         eval_template,
         score_threshold,
         parser_function,
+        streaming,
+        max_output_tokens,
     )
 
 
@@ -268,6 +384,8 @@ class MaliciousnessEvaluator(CustomEvaluator):
         parser_function: Callable[
             [str], Tuple[Optional[float], Optional[str]]
         ] = _default_parser_function,
+        streaming: bool = False,
+        max_output_tokens: Optional[int] = None,
     ) -> None:
         """Init params."""
         super().__init__(
@@ -276,6 +394,8 @@ class MaliciousnessEvaluator(CustomEvaluator):
             eval_template,
             score_threshold,
             parser_function,
+            streaming,
+            max_output_tokens,
         )
 
 
@@ -331,6 +451,8 @@ class ComprehensivenessEvaluator(CustomEvaluator):
         parser_function: Callable[
             [str], Tuple[Optional[float], Optional[str]]
         ] = _default_parser_function,
+        streaming: bool = False,
+        max_output_tokens: Optional[int] = None,
     ) -> None:
         """Init params."""
         super().__init__(
@@ -339,6 +461,8 @@ class ComprehensivenessEvaluator(CustomEvaluator):
             eval_template,
             score_threshold,
             parser_function,
+            streaming,
+            max_output_tokens,
         )
 
 
@@ -387,6 +511,8 @@ class ToxicityEvaluator(CustomEvaluator):
         parser_function: Callable[
             [str], Tuple[Optional[float], Optional[str]]
         ] = _default_parser_function,
+        streaming: bool = False,
+        max_output_tokens: Optional[int] = None,
     ) -> None:
         """Init params."""
         super().__init__(
@@ -395,4 +521,6 @@ class ToxicityEvaluator(CustomEvaluator):
             eval_template,
             score_threshold,
             parser_function,
+            streaming,
+            max_output_tokens,
         )
@@ -0,0 +1,164 @@
+# ###########################################################################
+#
+#  CLOUDERA APPLIED MACHINE LEARNING PROTOTYPE (AMP)
+#  (C) Cloudera, Inc. 2021
+#  All rights reserved.
+#
+#  Applicable Open Source License: Apache 2.0
+#
+#  NOTE: Cloudera open source products are modular software products
+#  made up of hundreds of individual components, each of which was
+#  individually copyrighted.  Each Cloudera open source product is a
+#  collective work under U.S. Copyright Law. Your license to use the
+#  collective work is as provided in your written agreement with
+#  Cloudera.  Used apart from the collective work, this file is
+#  licensed for your use pursuant to the open source license
+#  identified above.
+#
+#  This code is provided to you pursuant a written agreement with
+#  (i) Cloudera, Inc. or (ii) a third-party authorized to distribute
+#  this code. If you do not have a written agreement with Cloudera nor
+#  with an authorized and properly licensed third party, you do not
+#  have any rights to access nor to use this code.
+#
+#  Absent a written agreement with Cloudera, Inc. (“Cloudera”) to the
+#  contrary, A) CLOUDERA PROVIDES THIS CODE TO YOU WITHOUT WARRANTIES OF ANY
+#  KIND; (B) CLOUDERA DISCLAIMS ANY AND ALL EXPRESS AND IMPLIED
+#  WARRANTIES WITH RESPECT TO THIS CODE, INCLUDING BUT NOT LIMITED TO
+#  IMPLIED WARRANTIES OF TITLE, NON-INFRINGEMENT, MERCHANTABILITY AND
+#  FITNESS FOR A PARTICULAR PURPOSE; (C) CLOUDERA IS NOT LIABLE TO YOU,
+#  AND WILL NOT DEFEND, INDEMNIFY, NOR HOLD YOU HARMLESS FOR ANY CLAIMS
+#  ARISING FROM OR RELATED TO THE CODE; AND (D)WITH RESPECT TO YOUR EXERCISE
+#  OF ANY RIGHTS GRANTED TO YOU FOR THE CODE, CLOUDERA IS NOT LIABLE FOR ANY
+#  DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, PUNITIVE OR
+#  CONSEQUENTIAL DAMAGES INCLUDING, BUT NOT LIMITED TO, DAMAGES
+#  RELATED TO LOST REVENUE, LOST PROFITS, LOSS OF INCOME, LOSS OF
+#  BUSINESS ADVANTAGE OR UNAVAILABILITY, OR LOSS OR CORRUPTION OF
+#  DATA.
+#
+# ###########################################################################
+
+"""
+Minimal DAG scheduler for the predict pipeline.
+
+Steps are async callables that receive the results of the steps they depend on as
+positional arguments. Every step starts as soon as its dependencies have finished, so
+independent branches, e.g. synthesizing the answer and evaluating the retrieved
+contexts, run concurrently.
+
+"""
+
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class StepSkipped(Exception):
+    """Raised for a step whose optional dependency failed or was skipped."""
+
+
+# marks an optional step without a fallback, whose dependents are skipped if it fails
+_NO_FALLBACK = object()
+
+
+class DagScheduler:
+    """Runs async steps in dependency order, each as early as possible."""
+
+    def __init__(self) -> None:
+        self._steps: Dict[
+            str, Tuple[Callable[..., Awaitable[Any]], Tuple[str, ...], bool, Any]
+        ] = {}
+        self.timings: Dict[str, float] = {}
+        self.errors: Dict[str, BaseException] = {}
+
+    def add(
+        self,
+        name: str,
+        step: Callable[..., Awaitable[Any]],
+        after: Sequence[str] = (),
+        required: bool = True,
+        fallback: Any = _NO_FALLBACK,
+    ) -> None:
+        """
+        Add a step.
+
+        Dependencies must have been added before the step that depends on them,
+        which keeps the graph acyclic. A failing required step fails the run; a
+        failing optional step is logged, and its dependents receive its
+        ``fallback`` in place of its result, or are skipped if it has none.
+
+        """
+        if name in self._steps:
+            raise ValueError(f"Step {name} is already defined")
+        if required and fallback is not _NO_FALLBACK:
+            raise ValueError(f"Required step {name} cannot have a fallback")
+        for dependency in after:
+            if dependency not in self._steps:
+                raise ValueError(f"Step {name} depends on unknown step {dependency}")
+        self._steps[name] = (step, tuple(after), required, fallback)
+
+    async def _run_step(self, name: str, tasks: Dict[str, "asyncio.Task[Any]"]) -> Any:
+        step, after, required, _ = self._steps[name]
+        arguments = []
+        for dependency in after:
+            # shield the dependency so cancelling this step leaves it running for
+            # the other steps that depend on it
+            try:
+                arguments.append(await asyncio.shield(tasks[dependency]))
+            except Exception as e:
+                fallback = self._steps[dependency][3]
+                if fallback is not _NO_FALLBACK:
+                    arguments.append(fallback)
+                elif isinstance(e, StepSkipped):
+                    raise
+                else:
+                    raise StepSkipped(f"{dependency} failed") from e
+
+        started = time.perf_counter()
+        try:
+            return await step(*arguments)
+        except Exception as e:
+            self.errors[name] = e
+            if required:
+                raise
+            logger.exception("Optional pipeline step %s failed", name)
+            raise StepSkipped(f"{name} failed") from e
+        finally:
+            self.timings[name] = time.perf_counter() - started
+
+    async def run(self) -> Dict[str, Any]:
+        """
+        Run all steps and return the results of those that completed.
+
+        Raises the exception of the first required step that fails or is skipped,
+        after cancelling the remaining steps.
+
+        """
+        tasks: Dict[str, "asyncio.Task[Any]"] = {}
+        for name in self._steps:
+            tasks[name] = asyncio.ensure_future(self._run_step(name, tasks))
+        try:
+            pending = set(tasks.values())
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_EXCEPTION
+                )
+                for name, task in tasks.items():
+                    if (
+                        task in done
+                        and self._steps[name][2]
+                        and task.exception() is not None
+                    ):
+                        raise task.exception()
+        finally:
+            for task in tasks.values():
+                task.cancel()
+            await asyncio.gather(*tasks.values(), return_exceptions=True)
+        return {
+            name: task.result()
+            for name, task in tasks.items()
+            if task.exception() is None
+        }
@@ -41,14 +41,17 @@
 import json
 import logging
 import os
+import random
+import time
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Tuple, Dict
+from typing import Dict, List, Optional, Tuple
 
 import opentelemetry.trace
-import qdrant_client
 from fastapi import HTTPException
-from llama_index.core.base.llms.types import ChatMessage, MessageRole
-from llama_index.core.chat_engine import CondenseQuestionChatEngine
+from llama_index.core.base.embeddings.base import BaseEmbedding
+from llama_index.core.base.llms.types import ChatMessage
+from llama_index.core.llms.llm import LLM
 from llama_index.core.evaluation import (
     FaithfulnessEvaluator,
     RelevancyEvaluator,
@@ -56,53 +59,52 @@ from llama_index.core.evaluation import (
     EvaluationResult,
 )
 
-from llama_index.core.chat_engine.types import AgentChatResponse
+from llama_index.core.chat_engine.types import (
+    AgentChatResponse,
+    StreamingAgentChatResponse,
+)
 from llama_index.core.indices import VectorStoreIndex
 from llama_index.core.indices.vector_store import VectorIndexRetriever
 from llama_index.core.node_parser import SentenceSplitter
 from llama_index.core.query_engine import RetrieverQueryEngine
 from llama_index.core.readers import SimpleDirectoryReader
 from llama_index.core.response_synthesizers import get_response_synthesizer
+from llama_index.core.schema import NodeWithScore
 from llama_index.core.storage import StorageContext
-from llama_index.embeddings.bedrock import BedrockEmbedding
-from llama_index.llms.bedrock_converse import BedrockConverse
 from llama_index.vector_stores.qdrant import QdrantVectorStore
-from pydantic import BaseModel
+from llama_index.vector_stores.qdrant.base import DENSE_VECTOR_NAME
 
+from . import backends, cheap_eval
+from .data_types import (
+    RagIndexDocumentConfiguration,
+    RagMessage,
+    RagPredictConfiguration,
+)
+from .chat_engine import PipelinedChatEngine, StageReport
+from .governor import Priority, TokenUsage, track_token_usage
+from .pipeline import DagScheduler
 from .judge import (
     MaliciousnessEvaluator,
     ToxicityEvaluator,
     ComprehensivenessEvaluator,
     load_custom_evaluator,
 )
+from ... import metrics
 from ...config import settings
-from pprint import pprint
 import asyncio
 
 logger = logging.getLogger(__name__)
 tracer = opentelemetry.trace.get_tracer(__name__)
 
 
-# TODO: Embed Model Options - Refactor to config
 def get_embed_model_and_dim():
-    return BedrockEmbedding(model_name="cohere.embed-english-v3"), 1024
-
-
-class RagMessage(BaseModel):
-    role: MessageRole
-    content: str
+    return backends.get_embed_model_and_dim()
 
 
 def table_name_from(data_source_id: int):
     return f"index_{data_source_id}"
 
 
-class RagIndexDocumentConfiguration(BaseModel):
-    # TODO: Add more params
-    chunk_size: int = 512  # this is llama-index's default
-    chunk_overlap: int = 10  # percentage of tokens in a chunk (chunk_size)
-
-
 @tracer.start_as_current_span("qdrant upload")
 def upload(
     tmpdirname: str,
@@ -148,12 +150,6 @@ def upload(
     logger.info("indexed document")
 
 
-class RagPredictConfiguration(BaseModel):
-    top_k: int = 5
-    chunk_size: int = 512
-    model_name: str = "meta.llama3-70b-instruct-v1:0"
-
-
 def get_custom_evaluators():
     # check for json files in custom evaluators directory
     custom_eval_dir = Path(os.path.join(os.getcwd(), "custom_evaluators"))
@@ -169,11 +165,7 @@ def get_custom_evaluators():
     return custom_evaluators
 
 
-@tracer.start_as_current_span("Qdrant evaluate response")
-async def evaluate_response(
-    query: str,
-    chat_response: AgentChatResponse,
-) -> Tuple[
+EvaluationResults = Tuple[
     EvaluationResult,
     EvaluationResult,
     EvaluationResult,
@@ -181,39 +173,82 @@ async def evaluate_response(
     EvaluationResult,
     EvaluationResult,
     Dict[str, EvaluationResult],
-]:
-    evaluator_llm = BedrockConverse(
-        model="meta.llama3-70b-instruct-v1:0",
+]
+
+
+def _get_evaluator_llm(
+    priority: Priority = Priority.EVALUATION,
+) -> LLM:
+    return backends.get_llm("meta.llama3-70b-instruct-v1:0", priority=priority)
+
+
+async def _timed_evaluation(evaluator: str, awaitable):
+    with metrics.EVALUATOR_SECONDS.labels(evaluator).time():
+        return await awaitable
+
+
+@tracer.start_as_current_span("Qdrant evaluate contexts")
+async def evaluate_contexts(
+    query: str,
+    source_nodes: List[NodeWithScore],
+) -> EvaluationResult:
+    """Evaluate the relevancy of the retrieved contexts, which needs no response"""
+    context_relevancy_evaluator = ContextRelevancyEvaluator(llm=_get_evaluator_llm())
+    return await _timed_evaluation(
+        "context_relevancy",
+        context_relevancy_evaluator.aevaluate(
+            query=query,
+            contexts=[source_node.node.get_content() for source_node in source_nodes],
+        ),
     )
 
+
+@tracer.start_as_current_span("Qdrant evaluate response")
+async def evaluate_response(
+    query: str,
+    chat_response: AgentChatResponse,
+    context_relevancy: Optional[EvaluationResult] = None,
+) -> EvaluationResults:
+    evaluator_llm = _get_evaluator_llm()
+
     relevancy_evaluator = RelevancyEvaluator(llm=evaluator_llm)
     faithfulness_evaluator = FaithfulnessEvaluator(llm=evaluator_llm)
-    context_relevancy_evaluator = ContextRelevancyEvaluator(llm=evaluator_llm)
-    maliciousness_evaluator = MaliciousnessEvaluator(llm=evaluator_llm)
-    toxicity_evaluator = ToxicityEvaluator(llm=evaluator_llm)
-    comprehensiveness_evaluator = ComprehensivenessEvaluator(llm=evaluator_llm)
-
-    results = await asyncio.gather(
-        relevancy_evaluator.aevaluate_response(query=query, response=chat_response),
-        faithfulness_evaluator.aevaluate_response(query=query, response=chat_response),
-        context_relevancy_evaluator.aevaluate_response(
-            query=query, response=chat_response
-        ),
-        maliciousness_evaluator.aevaluate_response(query=query, response=chat_response),
-        toxicity_evaluator.aevaluate_response(query=query, response=chat_response),
-        comprehensiveness_evaluator.aevaluate_response(
-            query=query, response=chat_response
-        ),
+    judge_options = dict(
+        streaming=settings.evaluation.stream_judges,
+        max_output_tokens=settings.evaluation.judge_max_output_tokens,
+    )
+    maliciousness_evaluator = MaliciousnessEvaluator(llm=evaluator_llm, **judge_options)
+    toxicity_evaluator = ToxicityEvaluator(llm=evaluator_llm, **judge_options)
+    comprehensiveness_evaluator = ComprehensivenessEvaluator(
+        llm=evaluator_llm, **judge_options
     )
 
+    evaluations = [
+        _timed_evaluation(
+            name, evaluator.aevaluate_response(query=query, response=chat_response)
+        )
+        for name, evaluator in (
+            ("relevance", relevancy_evaluator),
+            ("faithfulness", faithfulness_evaluator),
+            ("maliciousness", maliciousness_evaluator),
+            ("toxicity", toxicity_evaluator),
+            ("comprehensiveness", comprehensiveness_evaluator),
+        )
+    ]
+    # the contexts may already have been evaluated while the response was generated
+    if context_relevancy is None:
+        evaluations.append(evaluate_contexts(query, chat_response.source_nodes))
+    results = await asyncio.gather(*evaluations)
+
     (
         relevance,
         faithfulness,
-        context_relevancy,
         maliciousness,
         toxicity,
         comprehensiveness,
-    ) = results
+    ) = results[:5]
+    if context_relevancy is None:
+        context_relevancy = results[5]
 
     # check custom evaluators directory for custom evaluators
     custom_evaluators = get_custom_evaluators()
@@ -224,6 +259,7 @@ async def evaluate_response(
             eval_definition=evaluator_params["eval_definition"],
             questions=evaluator_params["questions"],
             llm=evaluator_llm,
+            **judge_options,
         )
         loaded_custom_evals.append(evaluator)
 
@@ -231,8 +267,11 @@ async def evaluate_response(
     if loaded_custom_evals:
         custom_eval_results = await asyncio.gather(
             *[
-                evaluator.aevaluate_response(query=query, response=chat_response)
-                for evaluator in loaded_custom_evals
+                _timed_evaluation(
+                    name,
+                    evaluator.aevaluate_response(query=query, response=chat_response),
+                )
+                for name, evaluator in zip(custom_evaluators, loaded_custom_evals)
             ]
         )
 
@@ -251,14 +290,19 @@ async def evaluate_response(
     )
 
 
-@tracer.start_as_current_span("Qdrant query")
-def query(
+@dataclass
+class QueryComponents:
+    """The retriever-backed query engine and models shared by the queries of a batch"""
+
+    query_engine: RetrieverQueryEngine
+    llm: LLM
+    embed_model: BaseEmbedding
+
+
+def build_query_components(
     data_source_id: int,
-    query_str: str,
     configuration: RagPredictConfiguration,
-    chat_history: list[RagMessage],
-) -> AgentChatResponse:
-
+) -> QueryComponents:
     logger.info("fetching Qdrant index")
     try:
         vector_store = create_qdrant_vector_store(data_source_id)
@@ -279,34 +323,280 @@ def query(
         embed_model=embed_model,
     )
     # TODO: factor out LLM and chat engine into a separate function and create span
-    llm = BedrockConverse(
-        model=configuration.model_name,
-    )
+    llm = backends.get_llm(configuration.model_name, priority=Priority.INTERACTIVE)
 
     response_synthesizer = get_response_synthesizer(llm=llm)
     query_engine = RetrieverQueryEngine(
         retriever=retriever, response_synthesizer=response_synthesizer
     )
-    chat_engine = CondenseQuestionChatEngine.from_defaults(
+    return QueryComponents(
         query_engine=query_engine,
         llm=llm,
+        embed_model=embed_model,
     )
 
-    logger.info("querying chat engine")
-    chat_history = list(
+
+@tracer.start_as_current_span("Qdrant query")
+def _build_chat_engine(
+    data_source_id: int,
+    configuration: RagPredictConfiguration,
+    components: Optional[QueryComponents] = None,
+) -> PipelinedChatEngine:
+    """Build a chat engine, which keeps per-query state, over shared components"""
+    if components is None:
+        components = build_query_components(data_source_id, configuration)
+    return PipelinedChatEngine(
+        query_engine=components.query_engine,
+        llm=components.llm,
+        embed_model=components.embed_model,
+    )
+
+
+def _to_chat_messages(chat_history: list[RagMessage]) -> list[ChatMessage]:
+    return list(
         map(
             lambda message: ChatMessage(role=message.role, content=message.content),
             chat_history,
         )
     )
-    chat_response = chat_engine.chat(query_str, chat_history)
+
+
+def cheap_evaluate_contexts(
+    query: str, source_nodes: List[NodeWithScore]
+) -> Dict[str, float]:
+    """Score the retrieved contexts without an LLM, reusing the retrieval scores"""
+    return cheap_eval.score_contexts(
+        query,
+        [source_node.node.get_content() for source_node in source_nodes],
+        [
+            source_node.score
+            for source_node in source_nodes
+            if source_node.score is not None
+        ],
+    )
+
+
+async def _afetch_context_vectors(
+    data_source_id: int, source_nodes: List[NodeWithScore]
+) -> List[List[float]]:
+    if not source_nodes:
+        return []
+    client = backends.get_qdrant_client()
+    try:
+        points = await asyncio.to_thread(
+            client.retrieve,
+            table_name_from(data_source_id),
+            ids=[source_node.node.node_id for source_node in source_nodes],
+            with_payload=False,
+            with_vectors=True,
+        )
+    finally:
+        # in-process Qdrant keeps its data in the shared client
+        if settings.backend.qdrant_location is None:
+            client.close()
+    return cheap_eval.context_vectors(points, DENSE_VECTOR_NAME)
+
+
+@tracer.start_as_current_span("Qdrant cheap evaluate response")
+async def cheap_evaluate_response(
+    data_source_id: int, answer: str, source_nodes: List[NodeWithScore]
+) -> Dict[str, float]:
+    """Score the answer without an LLM, reusing the stored context vectors"""
+    embed_model, _ = get_embed_model_and_dim()
+    answer_embedding, context_embeddings = await asyncio.gather(
+        embed_model.aget_query_embedding(answer),
+        _afetch_context_vectors(data_source_id, source_nodes),
+    )
+    return cheap_eval.score_response(
+        answer,
+        answer_embedding,
+        [source_node.node.get_content() for source_node in source_nodes],
+        context_embeddings,
+    )
+
+
+def _escalate(scores: Dict[str, float], sampled: bool) -> bool:
+    return (
+        not settings.evaluation.judge_escalation
+        or sampled
+        or cheap_eval.is_ambiguous(scores)
+    )
+
+
+async def evaluate_with_escalation(
+    data_source_id: int,
+    query: str,
+    chat_response: AgentChatResponse,
+) -> Tuple[Dict[str, float], Optional[EvaluationResults]]:
+    """
+    Score the response cheaply and run the LLM judges only if escalated.
+
+    Returns the cheap scores and the judge results, or None if the judges were not
+    needed.
+
+    """
+    scores = cheap_evaluate_contexts(query, chat_response.source_nodes)
+    scores.update(
+        await cheap_evaluate_response(
+            data_source_id, chat_response.response, chat_response.source_nodes
+        )
+    )
+    if not _escalate(scores, cheap_eval.sample_for_judges()):
+        return scores, None
+    return scores, await evaluate_response(query, chat_response)
+
+
+@dataclass
+class QueryResult:
+    chat_response: AgentChatResponse
+    stage_report: StageReport
+    evaluation: Optional[EvaluationResults] = None
+    cheap_scores: Dict[str, float] = field(default_factory=dict)
+    # tokens of the LLM calls made for the query, by priority
+    token_usage: Dict[Priority, TokenUsage] = field(default_factory=dict)
+    # seconds from the start of the query until the answer was generated
+    answer_latency: float = 0.0
+
+
+async def query(
+    data_source_id: int,
+    query_str: str,
+    configuration: RagPredictConfiguration,
+    chat_history: list[RagMessage],
+    evaluate: bool = False,
+    components: Optional[QueryComponents] = None,
+) -> QueryResult:
+    """
+    Answer the query and, if requested, evaluate the answer.
+
+    The steps run as a DAG. The retrieved contexts are scored as soon as retrieval
+    returns, concurrently with synthesizing the answer, and the answer is scored
+    once generated. The cheap scores decide whether the LLM judges run: the context
+    judge starts right after retrieval if the context scores are ambiguous, the
+    response judges follow the answer if any score is. The evaluation is None if
+    not requested, not escalated or failed.
+
+    The retriever and models are built from ``configuration`` unless prebuilt
+    ``components`` are given, e.g. to share them across a batch of queries.
+
+    """
+    chat_engine = _build_chat_engine(data_source_id, configuration, components)
+    messages = _to_chat_messages(chat_history)
+
+    scheduler = DagScheduler()
+    scheduler.add(
+        "retrieve",
+        lambda: chat_engine.acondense_and_retrieve(messages, query_str),
+    )
+    answered_at = 0.0
+
+    async def respond(retrieved):
+        nonlocal answered_at
+        chat_response = await chat_engine.arespond(query_str, *retrieved)
+        answered_at = time.perf_counter()
+        return chat_response
+
+    scheduler.add("respond", respond, after=["retrieve"])
+    if evaluate:
+        sampled = cheap_eval.sample_for_judges()
+
+        async def score_contexts(retrieved):
+            return cheap_evaluate_contexts(query_str, retrieved[1])
+
+        async def judge_contexts(retrieved, context_scores):
+            if not _escalate(context_scores, sampled):
+                return None
+            return await evaluate_contexts(query_str, retrieved[1])
+
+        async def score_response(chat_response):
+            return await cheap_evaluate_response(
+                data_source_id, chat_response.response, chat_response.source_nodes
+            )
+
+        async def judge_response(
+            chat_response, context_scores, context_relevancy, response_scores
+        ):
+            if context_relevancy is None and not _escalate(
+                {**context_scores, **response_scores}, sampled
+            ):
+                return None
+            return await evaluate_response(query_str, chat_response, context_relevancy)
+
+        # a failing cheap score or context judge costs only its own result: the
+        # judges escalate without the scores, and the response judges then score the
+        # contexts themselves
+        scheduler.add(
+            "score_contexts",
+            score_contexts,
+            after=["retrieve"],
+            required=False,
+            fallback={},
+        )
+        scheduler.add(
+            "evaluate_contexts",
+            judge_contexts,
+            after=["retrieve", "score_contexts"],
+            required=False,
+            fallback=None,
+        )
+        scheduler.add(
+            "score_response",
+            score_response,
+            after=["respond"],
+            required=False,
+            fallback={},
+        )
+        scheduler.add(
+            "evaluate_response",
+            judge_response,
+            after=["respond", "score_contexts", "evaluate_contexts", "score_response"],
+            required=False,
+        )
+
+    logger.info("querying chat engine")
+    started = time.perf_counter()
+    with track_token_usage() as token_usage:
+        results = await scheduler.run()
+    chat_response = results["respond"]
     logger.info("query response received from chat engine")
-    pprint(chat_response)
-    return chat_response
+    if (
+        logger.isEnabledFor(logging.DEBUG)
+        and random.random() < settings.log.payload_sample_rate
+    ):
+        logger.debug("Chat response: %r", chat_response)
+
+    for step, seconds in scheduler.timings.items():
+        if step not in ("retrieve", "respond"):
+            chat_engine.report.timings[step] = seconds
+    return QueryResult(
+        chat_response=chat_response,
+        stage_report=chat_engine.report,
+        evaluation=results.get("evaluate_response"),
+        cheap_scores={
+            **results.get("score_contexts", {}),
+            **results.get("score_response", {}),
+        },
+        token_usage=dict(token_usage),
+        answer_latency=answered_at - started,
+    )
+
+
+async def astream_query(
+    data_source_id: int,
+    query_str: str,
+    configuration: RagPredictConfiguration,
+    chat_history: list[RagMessage],
+) -> Tuple[StreamingAgentChatResponse, StageReport]:
+    chat_engine = _build_chat_engine(data_source_id, configuration)
+
+    logger.info("streaming query from chat engine")
+    chat_response = await chat_engine.astream_chat(
+        query_str, _to_chat_messages(chat_history)
+    )
+    return chat_response, chat_engine.report
 
 
 def create_qdrant_vector_store(data_source_id):
-    client = qdrant_client.QdrantClient(host="localhost", port=6333)
-    aclient = qdrant_client.AsyncQdrantClient(host="localhost", port=6334)
+    client, aclient = backends.get_qdrant_clients()
     vector_store = QdrantVectorStore(table_name_from(data_source_id), client, aclient)
     return vector_store
@@ -0,0 +1,181 @@
+# ###########################################################################
+#
+#  CLOUDERA APPLIED MACHINE LEARNING PROTOTYPE (AMP)
+#  (C) Cloudera, Inc. 2021
+#  All rights reserved.
+#
+#  Applicable Open Source License: Apache 2.0
+#
+#  NOTE: Cloudera open source products are modular software products
+#  made up of hundreds of individual components, each of which was
+#  individually copyrighted.  Each Cloudera open source product is a
+#  collective work under U.S. Copyright Law. Your license to use the
+#  collective work is as provided in your written agreement with
+#  Cloudera.  Used apart from the collective work, this file is
+#  licensed for your use pursuant to the open source license
+#  identified above.
+#
+#  This code is provided to you pursuant a written agreement with
+#  (i) Cloudera, Inc. or (ii) a third-party authorized to distribute
+#  this code. If you do not have a written agreement with Cloudera nor
+#  with an authorized and properly licensed third party, you do not
+#  have any rights to access nor to use this code.
+#
+#  Absent a written agreement with Cloudera, Inc. (“Cloudera”) to the
+#  contrary, A) CLOUDERA PROVIDES THIS CODE TO YOU WITHOUT WARRANTIES OF ANY
+#  KIND; (B) CLOUDERA DISCLAIMS ANY AND ALL EXPRESS AND IMPLIED
+#  WARRANTIES WITH RESPECT TO THIS CODE, INCLUDING BUT NOT LIMITED TO
+#  IMPLIED WARRANTIES OF TITLE, NON-INFRINGEMENT, MERCHANTABILITY AND
+#  FITNESS FOR A PARTICULAR PURPOSE; (C) CLOUDERA IS NOT LIABLE TO YOU,
+#  AND WILL NOT DEFEND, INDEMNIFY, NOR HOLD YOU HARMLESS FOR ANY CLAIMS
+#  ARISING FROM OR RELATED TO THE CODE; AND (D)WITH RESPECT TO YOUR EXERCISE
+#  OF ANY RIGHTS GRANTED TO YOU FOR THE CODE, CLOUDERA IS NOT LIABLE FOR ANY
+#  DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, PUNITIVE OR
+#  CONSEQUENTIAL DAMAGES INCLUDING, BUT NOT LIMITED TO, DAMAGES
+#  RELATED TO LOST REVENUE, LOST PROFITS, LOSS OF INCOME, LOSS OF
+#  BUSINESS ADVANTAGE OR UNAVAILABILITY, OR LOSS OR CORRUPTION OF
+#  DATA.
+#
+# ###########################################################################
+
+"""
+Predictions rolled into shared MLflow runs.
+
+By default every prediction gets a run of its own. With run windows enabled, the
+predictions with the same :data:`WindowKey` (data source, chat session and
+configuration) are logged as consecutive steps of one run, and a prediction is
+identified by its run id and step. A window is closed, and its run terminated, once
+it is full or too old; the next prediction with its key opens a new run.
+
+"""
+
+import contextlib
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Callable, ContextManager, Dict, List, Optional, Set, Tuple
+
+from mlflow.tracking import MlflowClient
+
+from ...config import settings
+
+logger = logging.getLogger(__name__)
+
+# data source id, session id, top k, chunk size and model name
+WindowKey = Tuple[int, Optional[str], int, int, str]
+
+
+@dataclass
+class RunWindow:
+    """A run that predictions are logged to, one step each"""
+
+    run_id: str
+    shared: bool
+    opened: float = field(default_factory=time.monotonic)
+    steps: int = 0
+    # MLflow appends to a table by rewriting it, so the writes of concurrent
+    # predictions to the run's tables must not interleave
+    table_lock: threading.Lock = field(default_factory=threading.Lock)
+    # the source nodes whose content is already in the run's nodes table
+    logged_node_ids: Set[str] = field(default_factory=set)
+
+    def expired(self) -> bool:
+        return (
+            self.steps >= settings.run_window.max_predictions
+            or time.monotonic() - self.opened >= settings.run_window.max_seconds
+        )
+
+
+class RunWindows:
+    """The open run windows, by key"""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._windows: Dict[WindowKey, RunWindow] = {}
+        # set once the run of the window of a key being opened has been created
+        self._opening: Dict[WindowKey, threading.Event] = {}
+
+    def next_step(
+        self, key: WindowKey, open_run: Callable[[], str]
+    ) -> Tuple[RunWindow, int]:
+        """
+        Take the next step of the window of ``key``.
+
+        Expired windows are closed first; ``open_run`` creates the run of a new
+        window and returns its id. The run is created outside of the lock, so the
+        windows of other keys are not held up; other predictions with ``key`` wait
+        for it and then take the following steps.
+
+        """
+        closed: List[RunWindow] = []
+        try:
+            while True:
+                with self._lock:
+                    closed += self._pop_expired()
+                    window = self._windows.get(key)
+                    if window is not None:
+                        window.steps += 1
+                        return window, window.steps
+                    opening = self._opening.get(key)
+                    if opening is None:
+                        opening = self._opening[key] = threading.Event()
+                        break
+                opening.wait()
+            try:
+                run_id = open_run()
+            except BaseException:
+                with self._lock:
+                    del self._opening[key]
+                raise
+            else:
+                with self._lock:
+                    del self._opening[key]
+                    window = self._windows[key] = RunWindow(run_id=run_id, shared=True)
+                    window.steps += 1
+                    return window, window.steps
+            finally:
+                # the waiters take their steps, or one of them opens the run instead
+                opening.set()
+        finally:
+            self._terminate(closed)
+
+    def table_lock(self, run_id: str) -> ContextManager:
+        """The table lock of the open window of ``run_id``, if there is one"""
+        with self._lock:
+            for window in self._windows.values():
+                if window.run_id == run_id:
+                    return window.table_lock
+        return contextlib.nullcontext()
+
+    def close_all(self) -> None:
+        """Close every open window, terminating its run"""
+        with self._lock:
+            closed = list(self._windows.values())
+            self._windows.clear()
+        self._terminate(closed)
+
+    def _pop_expired(self) -> List[RunWindow]:
+        expired = [key for key, window in self._windows.items() if window.expired()]
+        return [self._windows.pop(key) for key in expired]
+
+    @staticmethod
+    def _terminate(closed: List[RunWindow]) -> None:
+        if not closed:
+            return
+        client = MlflowClient(tracking_uri=settings.mlflow.tracking_uri)
+        for window in closed:
+            try:
+                client.set_terminated(window.run_id)
+                logger.info(
+                    "Closed run window %s after %d predictions",
+                    window.run_id,
+                    window.steps,
+                )
+            except Exception:
+                logger.warning(
+                    "Failed to terminate run window %s", window.run_id, exc_info=True
+                )
+
+
+windows = RunWindows()
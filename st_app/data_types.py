@@ -78,12 +78,20 @@ class RagIndexDocumentConfiguration(BaseModel):
 
 
 class RagPredictRequest(BaseModel):
-    # session_id: str
     data_source_id: int
     chat_history: List[RagMessage]
     query: str
     configuration: RagPredictConfiguration = RagPredictConfiguration()
     do_evaluate: bool = True
+    session_id: Optional[str] = None
+
+
+class RagPredictBatchRequest(BaseModel):
+    data_source_id: int
+    queries: List[str]
+    configuration: RagPredictConfiguration = RagPredictConfiguration()
+    do_evaluate: bool = True
+    max_concurrency: Optional[int] = None
 
 
 class RagPredictResponse(BaseModel):
@@ -94,6 +102,7 @@ class RagPredictResponse(BaseModel):
     chat_history: List[RagMessage]
     mlflow_experiment_id: str
     mlflow_run_id: str
+    mlflow_step: Optional[int] = None
 
 
 class RagFeedbackRequest(BaseModel):
@@ -101,12 +110,15 @@ class RagFeedbackRequest(BaseModel):
     experiment_run_id: str
     feedback: float  # 0.0 or 1.0\
     feedback_str: Optional[str] = None
+    step: Optional[int] = None
+    response_id: Optional[str] = None
 
 
 class MLFlowStoreRequest(BaseModel):
     experiment_id: str
     run_ids: List[str] = []
     metric_names: List[str] = []
+    start_ts: Optional[str] = None
 
 
 class EvaluationExample(BaseModel):
@@ -0,0 +1,465 @@
+# ###########################################################################
+#
+#  CLOUDERA APPLIED MACHINE LEARNING PROTOTYPE (AMP)
+#  (C) Cloudera, Inc. 2021
+#  All rights reserved.
+#
+#  Applicable Open Source License: Apache 2.0
+#
+#  NOTE: Cloudera open source products are modular software products
+#  made up of hundreds of individual components, each of which was
+#  individually copyrighted.  Each Cloudera open source product is a
+#  collective work under U.S. Copyright Law. Your license to use the
+#  collective work is as provided in your written agreement with
+#  Cloudera.  Used apart from the collective work, this file is
+#  licensed for your use pursuant to the open source license
+#  identified above.
+#
+#  This code is provided to you pursuant a written agreement with
+#  (i) Cloudera, Inc. or (ii) a third-party authorized to distribute
+#  this code. If you do not have a written agreement with Cloudera nor
+#  with an authorized and properly licensed third party, you do not
+#  have any rights to access nor to use this code.
+#
+#  Absent a written agreement with Cloudera, Inc. (“Cloudera”) to the
+#  contrary, A) CLOUDERA PROVIDES THIS CODE TO YOU WITHOUT WARRANTIES OF ANY
+#  KIND; (B) CLOUDERA DISCLAIMS ANY AND ALL EXPRESS AND IMPLIED
+#  WARRANTIES WITH RESPECT TO THIS CODE, INCLUDING BUT NOT LIMITED TO
+#  IMPLIED WARRANTIES OF TITLE, NON-INFRINGEMENT, MERCHANTABILITY AND
+#  FITNESS FOR A PARTICULAR PURPOSE; (C) CLOUDERA IS NOT LIABLE TO YOU,
+#  AND WILL NOT DEFEND, INDEMNIFY, NOR HOLD YOU HARMLESS FOR ANY CLAIMS
+#  ARISING FROM OR RELATED TO THE CODE; AND (D)WITH RESPECT TO YOUR EXERCISE
+#  OF ANY RIGHTS GRANTED TO YOU FOR THE CODE, CLOUDERA IS NOT LIABLE FOR ANY
+#  DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, PUNITIVE OR
+#  CONSEQUENTIAL DAMAGES INCLUDING, BUT NOT LIMITED TO, DAMAGES
+#  RELATED TO LOST REVENUE, LOST PROFITS, LOSS OF INCOME, LOSS OF
+#  BUSINESS ADVANTAGE OR UNAVAILABILITY, OR LOSS OR CORRUPTION OF
+#  DATA.
+#
+# ###########################################################################
+
+"""
+DataFrame builders for the monitoring dashboard.
+
+Kept free of Streamlit so they can be imported and benchmarked on their own.
+
+"""
+
+import json
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import pandas as pd
+
+table_cols_to_show = [
+    "response_id",
+    "run_id",
+    "step",
+    "timestamp",
+    "input",
+    "output",
+    "contexts",
+    "input_length",
+    "output_length",
+    # "feedback_str"
+]
+
+
+CONTEXT_SEPARATOR = "\n===============================\n"
+
+
+def format_context(source_file_name: str, content: str, score: Any) -> str:
+    return (
+        "filename: "
+        + source_file_name
+        + CONTEXT_SEPARATOR
+        + content
+        + CONTEXT_SEPARATOR
+        + f"Score: {score}"
+        + CONTEXT_SEPARATOR
+    )
+
+
+def table_rows(result: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """The rows of a table logged as a text metric"""
+    table = json.loads(result["value"]["stringValue"])
+    columns = table["columns"]
+    return [dict(zip(columns, data)) for data in table["data"]]
+
+
+def legacy_rows(results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    The responses of ``live_results.json`` tables, which have a row per source node
+    of a response, each grouped into one row
+    """
+    responses: Dict[str, Dict[str, Any]] = {}
+    for result in results:
+        for row in table_rows(result):
+            if None in row.values():
+                continue
+            response = responses.get(row["response_id"])
+            if response is None:
+                response = responses[row["response_id"]] = dict(row, contexts=[])
+                response["run_id"] = result["experiment_run_id"]
+                # rows of runs shared by many predictions carry their own step and time
+                response.setdefault("step", None)
+                response.setdefault("timestamp", result["ts"])
+            source_node = row["source_nodes"]
+            response["contexts"].append(
+                format_context(
+                    source_node["source_file_name"],
+                    source_node["content"],
+                    source_node["score"],
+                )
+            )
+
+    ## TODO : Add feedback_str after logging is fixed
+    for response in responses.values():
+        response["contexts"] = CONTEXT_SEPARATOR.join(response["contexts"])
+    return list(responses.values())
+
+
+def parse_live_results(results: List[Dict[str, Any]]) -> pd.DataFrame:
+    """
+    A row per response from the ``live_responses.json`` and ``live_nodes.json``
+    table metrics of runs, and from the ``live_results.json`` tables of older runs.
+
+    A response row references its source nodes by id, and their content is looked up
+    in the nodes table of its run.
+
+    """
+    contents: Dict[Tuple[str, str], str] = {}
+    for result in results:
+        if result["name"] == "live_nodes.json":
+            run_id = result["experiment_run_id"]
+            for row in table_rows(result):
+                contents[(run_id, row["node_id"])] = row["content"]
+
+    responses: Dict[str, Dict[str, Any]] = {}
+    for result in results:
+        if result["name"] != "live_responses.json":
+            continue
+        run_id = result["experiment_run_id"]
+        for row in table_rows(result):
+            if row["response_id"] in responses:
+                continue
+            row["run_id"] = run_id
+            row["contexts"] = CONTEXT_SEPARATOR.join(
+                format_context(
+                    node["source_file_name"],
+                    contents.get((run_id, node["node_id"]), ""),
+                    node["score"],
+                )
+                for node in row["source_nodes"]
+            )
+            responses[row["response_id"]] = row
+
+    rows = list(responses.values()) + legacy_rows(
+        [result for result in results if result["name"] == "live_results.json"]
+    )
+    result_df = pd.DataFrame(rows, columns=table_cols_to_show)
+    result_df["step"] = pd.to_numeric(result_df["step"]).astype("float64")
+    result_df["timestamp"] = pd.to_datetime(
+        result_df["timestamp"], format="mixed", dayfirst=True
+    )
+    result_df = result_df.sort_values(by="timestamp", ascending=True)
+    return result_df
+
+
+response_cols_to_show = [
+    "response_id",
+    "run_id",
+    "step",
+    "timestamp",
+    "input",
+    "output",
+    "input_length",
+    "output_length",
+    "top_score",
+]
+
+
+def responses_frame(responses: List[Dict[str, Any]]) -> pd.DataFrame:
+    """
+    A row per response from the metric store responses table, oldest first.
+
+    Responses of older runs, each in a run of its own, are stored without a step and
+    get a missing one, so that their metrics are joined on their run id alone.
+
+    """
+    result_df = (
+        pd.DataFrame(responses)
+        .rename(columns={"experiment_run_id": "run_id", "ts": "timestamp"})
+        .reindex(columns=response_cols_to_show)
+    )
+    result_df["timestamp"] = pd.to_datetime(result_df["timestamp"], format="ISO8601")
+    # zero values are left out of the payload
+    result_df[["step", "input_length", "output_length"]] = (
+        result_df[["step", "input_length", "output_length"]].fillna(0).astype("int64")
+    )
+    result_df["step"] = result_df["step"].astype("float64").replace(0, float("nan"))
+    result_df["top_score"] = result_df["top_score"].astype("float64")
+    return result_df.sort_values(by="timestamp", ascending=True, ignore_index=True)
+
+
+def metric_step(metric: Dict[str, Any]) -> float:
+    """The step a metric store value was logged at, from its tags"""
+    for tag in metric.get("tags") or []:
+        if tag.get("key") == "step":
+            return float(tag["value"])
+    return float("nan")
+
+
+def metrics_frame(
+    metric_response: List[Dict[str, Any]],
+    columns: Dict[str, str],
+    excluded_values: Optional[Dict[str, float]] = None,
+) -> pd.DataFrame:
+    """
+    The values of many metrics, from one metric store response, pivoted into a wide
+    frame indexed by run id and step, with a float32 column per metric.
+
+    ``columns`` maps the metric names to their columns; metrics without any values get
+    an empty column. Values equal to a metric's ``excluded_values`` entry, the
+    placeholder logged when a judge gave no score, are dropped, and of the values
+    logged more than once at a step the last one is kept.
+
+    """
+    excluded_values = excluded_values or {}
+    run_ids, steps, names, values = [], [], [], []
+    for metric in metric_response:
+        name = metric["name"]
+        if name not in columns:
+            continue
+        value = metric["value"].get("numericValue", 0)
+        if excluded_values.get(name) == value:
+            continue
+        run_ids.append(metric["experiment_run_id"])
+        steps.append(metric_step(metric))
+        names.append(name)
+        values.append(value)
+    long_df = pd.DataFrame(
+        {
+            "run_id": pd.Categorical(run_ids),
+            "step": pd.array(steps, dtype="float64"),
+            "name": pd.Categorical(names, categories=list(columns)),
+            "value": pd.array(values, dtype="float32"),
+        }
+    )
+    wide_df = (
+        long_df.groupby(["run_id", "step", "name"], observed=True, dropna=False)[
+            "value"
+        ]
+        .last()
+        .unstack("name")
+        .reindex(columns=list(columns))
+        .rename(columns=columns)
+        .astype("float32")
+    )
+    wide_df.columns.name = None
+    return wide_df
+
+
+def join_metrics(live_results_df: pd.DataFrame, wide_df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Left-join a wide frame of metrics onto the live results.
+
+    Responses logged with a step, which runs shared by many predictions have, are
+    joined on their run id and step; older responses, each in a run of its own, on
+    their run id alone, taking the last value of each metric logged to their run.
+
+    """
+    stepped = live_results_df["step"].notna()
+    by_run = wide_df.groupby(level="run_id", observed=True).last()
+    return pd.concat(
+        [
+            live_results_df[stepped].join(wide_df, on=["run_id", "step"]),
+            live_results_df[~stepped].join(by_run, on="run_id"),
+        ],
+        ignore_index=True,
+    ).sort_values(by="timestamp", kind="stable", ignore_index=True)
+
+
+def percentile_bands(
+    live_results_df: pd.DataFrame,
+    column: str,
+    percentiles: Sequence[int] = (50, 95, 99),
+    freq: str = "h",
+) -> pd.DataFrame:
+    """
+    Percentiles of one metric per ``freq`` interval, one ``p<n>`` column each.
+
+    Responses without the metric are left out, and so are intervals without any.
+
+    """
+    values = live_results_df[live_results_df[column].notna()][[column, "timestamp"]]
+    values = values.astype({column: float})
+    grouped = values.groupby(pd.Grouper(key="timestamp", freq=freq))[column]
+    bands = pd.DataFrame(
+        {f"p{p}": grouped.quantile(p / 100) for p in percentiles}
+    ).dropna(how="all")
+    bands["count"] = grouped.count()
+    return bands
+
+
+class LiveResults:
+    """
+    The live results of some runs, joined with their metrics, kept up to date by
+    fetching only what the metric store got since the last refresh.
+
+    One instance is meant to be shared by every panel, and every session, showing the
+    runs: refreshes closer together than ``interval`` seconds reuse the last one, so the
+    store is queried at most once per interval however many are open. Values logged
+    with a timestamp older than the last one seen, less ``overlap`` seconds, are picked
+    up by the full refresh done every ``full_interval`` seconds.
+
+    ``fetch_responses`` and ``fetch_metrics`` take the earliest timestamp to fetch, all
+    when ``None``, and ``transform`` is applied to the frame once per change.
+
+    """
+
+    def __init__(
+        self,
+        fetch_responses: Callable[[Optional[str]], List[Dict[str, Any]]],
+        fetch_metrics: Callable[[Optional[str]], List[Dict[str, Any]]],
+        columns: Dict[str, str],
+        excluded_values: Optional[Dict[str, float]] = None,
+        transform: Optional[Callable[[pd.DataFrame], pd.DataFrame]] = None,
+        interval: float = 5.0,
+        overlap: float = 300.0,
+        full_interval: float = 600.0,
+    ):
+        self.fetch_responses = fetch_responses
+        self.fetch_metrics = fetch_metrics
+        self.columns = columns
+        self.excluded_values = excluded_values
+        self.transform = transform
+        self.interval = interval
+        self.overlap = overlap
+        self.full_interval = full_interval
+        self.frame = responses_frame([])
+        self.version = 0
+        self._responses: Dict[str, Dict[str, Any]] = {}
+        self._metrics: Dict[Any, Dict[str, Any]] = {}
+        self._latest_ts: Optional[pd.Timestamp] = None
+        # the version each column, and the rows, last changed at
+        self._changed: Dict[str, int] = {}
+        self._refreshed_at = float("-inf")
+        self._full_refreshed_at = float("-inf")
+        self._lock = threading.Lock()
+
+    def refresh(self, force: bool = False) -> bool:
+        """
+        Fetch what changed since the last refresh, unless it was less than
+        ``interval`` seconds ago, or everything when ``force`` is set, and tell
+        whether anything did change.
+
+        """
+        with self._lock:
+            now = time.monotonic()
+            if not force and now - self._refreshed_at < self.interval:
+                return False
+            full = (
+                force
+                or self._latest_ts is None
+                or now - self._full_refreshed_at >= self.full_interval
+            )
+            start_ts = None
+            if not full:
+                start_ts = (
+                    self._latest_ts - pd.Timedelta(seconds=self.overlap)
+                ).isoformat()
+            responses = self.fetch_responses(start_ts)
+            metrics = self.fetch_metrics(start_ts)
+            self._refreshed_at = now
+            if full:
+                self._full_refreshed_at = now
+            changed = self._merge(responses, metrics, replace=full)
+            if changed:
+                self._rebuild()
+                self.version += 1
+                self._changed.update({column: self.version for column in changed})
+            return bool(changed)
+
+    def snapshot(self, columns: Sequence[str]) -> Tuple[int, pd.DataFrame]:
+        """
+        The version the rows, or any of the columns, last changed at, and the frame.
+
+        A refresh bumps the versions only once the frame is rebuilt, and the version
+        is read first, so the frame is never older than the version it comes with.
+
+        """
+        version = max(
+            [self._changed.get(column, 0) for column in columns]
+            + [self._changed.get("", 0)]
+        )
+        return version, self.frame
+
+    def _merge(
+        self,
+        responses: List[Dict[str, Any]],
+        metrics: List[Dict[str, Any]],
+        replace: bool,
+    ) -> List[str]:
+        """
+        Store the fetched responses and metrics, in place of all the stored ones when
+        ``replace`` is set, and return the columns they changed, ``""`` standing for
+        the rows.
+
+        """
+        fetched_responses = {
+            response["response_id"]: response for response in responses
+        }
+        fetched_metrics = {
+            self._metric_key(metric): metric
+            for metric in metrics
+            if metric["name"] in self.columns
+        }
+        changed = set()
+        if any(
+            self._responses.get(response_id) != response
+            for response_id, response in fetched_responses.items()
+        ):
+            changed.add("")
+        for key, metric in fetched_metrics.items():
+            if self._metrics.get(key) != metric:
+                changed.add(self.columns[metric["name"]])
+        if replace:
+            if self._responses.keys() - fetched_responses.keys():
+                changed.add("")
+            for key in self._metrics.keys() - fetched_metrics.keys():
+                changed.add(self.columns[self._metrics[key]["name"]])
+            self._responses, self._metrics = fetched_responses, fetched_metrics
+            self._latest_ts = None
+        else:
+            self._responses.update(fetched_responses)
+            self._metrics.update(fetched_metrics)
+        for item in [*responses, *metrics]:
+            if item.get("ts"):
+                ts = pd.Timestamp(item["ts"])
+                if self._latest_ts is None or ts > self._latest_ts:
+                    self._latest_ts = ts
+        return sorted(changed)
+
+    @staticmethod
+    def _metric_key(metric: Dict[str, Any]) -> Any:
+        """The stored metric a fetched one replaces, its id in the metric store"""
+        return metric.get("id") or (
+            metric["experiment_run_id"],
+            metric["name"],
+            metric_step(metric),
+            metric.get("ts"),
+        )
+
+    def _rebuild(self):
+        """Build the frame from the stored responses and metrics again"""
+        frame = join_metrics(
+            responses_frame(list(self._responses.values())),
+            metrics_frame(
+                list(self._metrics.values()), self.columns, self.excluded_values
+            ),
+        )
+        if self.transform is not None:
+            frame = self.transform(frame)
+        self.frame = frame
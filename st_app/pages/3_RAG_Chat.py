@@ -166,6 +166,51 @@ def get_response(request: RagPredictRequest) -> RagPredictResponse:
     return RagPredictResponse(**response.json())
 
 
+# Function to stream a response from the backend
+def stream_response(request: RagPredictRequest, result: dict):
+    """
+    Stream a response from the backend.
+
+    Yields the answer tokens as they arrive over server-sent events and stores the
+    final response in ``result["response"]``.
+
+    Args:
+        request (RagPredictRequest): The request.
+        result (dict): Receives the final RagPredictResponse.
+    Yields:
+        str: The answer tokens.
+    """
+    fastapi_port = os.environ["FASTAPI_PORT"]
+    if fastapi_port is None:
+        fastapi_port = 8000
+
+    with requests.post(
+        url=f"http://localhost:{fastapi_port}/index/predict_stream",
+        data=request.json(),
+        headers={
+            "Content-Type": "application/json",
+            "Accept": "text/event-stream",
+        },
+        stream=True,
+        timeout=60,
+    ) as response:
+        if response.status_code != 200:
+            raise ValueError(f"Failed to get response: {response.text}")
+
+        event = None
+        for line in response.iter_lines(decode_unicode=True):
+            if line.startswith("event:"):
+                event = line[len("event:") :].strip()
+            elif line.startswith("data:"):
+                data = json.loads(line[len("data:") :])
+                if event == "token":
+                    yield data["delta"]
+                elif event == "response":
+                    result["response"] = RagPredictResponse(**data)
+                elif event == "error":
+                    raise ValueError(f"Failed to get response: {data['detail']}")
+
+
 # Function to log feedback
 def log_feedback(request: RagFeedbackRequest):
     """
@@ -205,6 +250,8 @@ def show_feedback_component():
             feedback_request = RagFeedbackRequest(
                 experiment_id=last_response.mlflow_experiment_id,
                 experiment_run_id=last_response.mlflow_run_id,
+                step=last_response.mlflow_step,
+                response_id=last_response.id,
                 feedback=1.0,
             )
             log_feedback(feedback_request)
@@ -216,6 +263,8 @@ def show_feedback_component():
             feedback_request = RagFeedbackRequest(
                 experiment_id=last_response.mlflow_experiment_id,
                 experiment_run_id=last_response.mlflow_run_id,
+                step=last_response.mlflow_step,
+                response_id=last_response.id,
                 feedback=0.0,
             )
             log_feedback(feedback_request)
@@ -240,6 +289,8 @@ def show_text_feedback_modal():
             feedback_request = RagFeedbackRequest(
                 experiment_id=last_response.mlflow_experiment_id,
                 experiment_run_id=last_response.mlflow_run_id,
+                step=last_response.mlflow_step,
+                response_id=last_response.id,
                 feedback=1.0 if thumb == ":material/thumb_up:" else 0.0,
                 feedback_str=feedback_text,
             )
@@ -316,26 +367,37 @@ with prompt_col:
         st.session_state.messages.append(RagMessage(role="user", content=prompt))
         st.chat_message("user", avatar=":material/person:").markdown(prompt)
         with st.chat_message("assistant", avatar=":material/smart_toy:"):
-            with st.spinner("Thinking..."):
-                if st.session_state.messages[-1].role != "assistant":
-                    chat_history = [
-                        RagMessage(role=message.role, content=message.content)
-                        for message in st.session_state.messages[:-1]
-                    ]
-                else:
-                    chat_history = []
-                request = RagPredictRequest(
-                    data_source_id=selected_collection["id"],
-                    chat_history=chat_history,
-                    query=prompt,
-                    configuration=RagPredictConfiguration(),
-                )
-                response = get_response(request=request)
-            # st.markdown(response.output)
-            st.session_state.messages = response.chat_history
-            st.session_state.responses.append(response)
-            st.session_state.feedback_store.append(False)
-            st.rerun()
+            if st.session_state.messages[-1].role != "assistant":
+                chat_history = [
+                    RagMessage(role=message.role, content=message.content)
+                    for message in st.session_state.messages[:-1]
+                ]
+            else:
+                chat_history = []
+            request = RagPredictRequest(
+                data_source_id=selected_collection["id"],
+                chat_history=chat_history,
+                query=prompt,
+                configuration=RagPredictConfiguration(),
+                session_id=str(st.session_state.session_id),
+            )
+            result = {}
+            error = "Failed to get a response, please try again."
+            try:
+                st.write_stream(stream_response(request=request, result=result))
+            except ValueError as e:
+                error = str(e)
+            if "response" not in result:
+                # the stream failed or ended without a final response, e.g. a dropped
+                # connection: drop the unanswered question from the chat
+                st.session_state.messages.pop()
+                st.error(error)
+            else:
+                response = result["response"]
+                st.session_state.messages = response.chat_history
+                st.session_state.responses.append(response)
+                st.session_state.feedback_store.append(False)
+                st.rerun()
 
 # Reset chat button
 with reset_col:
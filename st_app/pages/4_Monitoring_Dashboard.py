@@ -38,8 +38,7 @@
 #
 # ###########################################################################
 
-from typing import List  # to simulate a real time data, time loop
-import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
 import os
 from pathlib import Path
 import logging
@@ -53,6 +52,7 @@ import requests  # to pull data from metric store
 
 from qdrant_client import QdrantClient
 from data_types import MLFlowStoreRequest
+from metrics_frames import LiveResults, percentile_bands
 
 warnings.filterwarnings("ignore")
 
@@ -60,20 +60,22 @@ warnings.filterwarnings("ignore")
 file_path = Path(os.path.realpath(__file__))
 st_app_dir = file_path.parents[1]
 COLLECTIONS_JSON = os.path.join(st_app_dir, "collections.json")
+# responses pulled from the metric store per request, and shown per page of the logs
+RESPONSES_PAGE_SIZE = 1000
+LOGS_PAGE_SIZE = 50
+# seconds between the refreshes of each panel in live mode, and the seconds the
+# responses and metrics fetched for one are reused by the others
+LIVE_PANEL_INTERVALS = {
+    "overview": 10,
+    "judges": 30,
+    "custom_metrics": 30,
+    "cheap_metrics": 30,
+    "performance": 10,
+    "logs": 10,
+}
+LIVE_FETCH_INTERVAL = 5
 custom_evals_dir = Path(os.path.join(os.getcwd(), "custom_evaluators"))
 
-table_cols_to_show = [
-    "response_id",
-    "run_id",
-    "timestamp",
-    "input",
-    "output",
-    "contexts",
-    "input_length",
-    "output_length",
-    # "feedback_str"
-]
-
 
 def get_custom_evaluators():
     custom_evaluators = []
@@ -141,65 +143,6 @@ def get_runs(experiment_id: str):
     return response_json
 
 
-def parse_live_results(results):
-    rows = []
-    for result in results:
-        result_dict = json.loads(result["value"]["stringValue"])
-        run_id = result["experiment_run_id"]
-        columns = result_dict["columns"]
-        for data in result_dict["data"]:
-            if None in data:
-                continue
-            row = {col: val for col, val in zip(columns, data)}
-            if row["source_nodes"] is not None:
-                row["source_nodes"] = (
-                    "filename: "
-                    + row["source_nodes"]["source_file_name"]
-                    + "\n===============================\n"
-                    + row["source_nodes"]["content"]
-                    + "\n===============================\n"
-                    + f"Score: {row['source_nodes']['score']}"
-                    + "\n===============================\n"
-                )
-            row["run_id"] = run_id
-            row["timestamp"] = result["ts"]
-            rows.append(row)
-    result_df = pd.DataFrame(rows)
-    response_ids = result_df["response_id"].unique().tolist()
-    new_rows = []
-    for response_id in response_ids:
-        row = result_df[result_df["response_id"] == response_id].iloc[0]
-        source_nodes = result_df[result_df["response_id"] == response_id][
-            "source_nodes"
-        ].tolist()
-        new_source_nodes_col = "\n===============================\n".join(source_nodes)
-        row["contexts"] = new_source_nodes_col
-
-        ## TODO : Add feedback_str after logging is fixed
-
-        # if "feedback_str" in row:
-        #     new_feedback_col = [
-        #         x for x in result_df[result_df["run_id"] == run_id]["feedback_str"]
-        #     ]
-        #     new_feedback_col = list(
-        #         map(str, filter(lambda x: not math.isnan(x), new_feedback_col))
-        #     )
-        #     new_feedback_str = " ".join(new_feedback_col)
-        #     row["feedback_str"] = new_feedback_str
-        # else:
-        #     row["feedback_str"] = ""
-
-        new_rows.append(row)
-
-    new_df = pd.DataFrame(new_rows)
-    result_df = new_df[table_cols_to_show]
-    result_df["timestamp"] = pd.to_datetime(
-        result_df["timestamp"], format="mixed", dayfirst=True
-    )
-    result_df = result_df.sort_values(by="timestamp", ascending=True)
-    return result_df
-
-
 # pull data from metric store
 def get_metrics(
     request: MLFlowStoreRequest,
@@ -207,7 +150,7 @@ def get_metrics(
     uri = "http://localhost:3000/metrics/list"
     response = requests.post(
         url=uri,
-        data=request.json(),
+        data=request.json(exclude_none=True),
         headers={
             "Content-Type": "application/json",
         },
@@ -219,18 +162,132 @@ def get_metrics(
     return response.json()
 
 
-title_col, refresh_col = st.columns([12, 1])
+def get_responses(
+    experiment_id: str,
+    run_ids: List[str],
+    limit: int,
+    offset: int = 0,
+    search: str = "",
+    start_ts: Optional[str] = None,
+):
+    """A page of the responses of runs, newest first, and their number"""
+    uri = "http://localhost:3000/responses/list"
+    request = {
+        "experiment_id": experiment_id,
+        "run_ids": run_ids,
+        "limit": limit,
+        "offset": offset,
+        "search": search,
+    }
+    if start_ts:
+        request["start_ts"] = start_ts
+    response = requests.post(
+        url=uri,
+        json=request,
+        headers={
+            "Content-Type": "application/json",
+        },
+        timeout=10,
+    )
+    if not response.ok:
+        return {"responses": [], "total": 0}
+    response_json = response.json()
+    return {
+        "responses": response_json.get("responses") or [],
+        "total": response_json.get("total", 0),
+    }
+
+
+def get_response_contexts(experiment_id: str, response_id: str):
+    """The source nodes retrieved for a response, with their text"""
+    uri = "http://localhost:3000/responses/contexts"
+    response = requests.get(
+        url=uri,
+        params={"experiment_id": experiment_id, "response_id": response_id},
+        timeout=10,
+    )
+    if not response.ok:
+        return []
+    return response.json() or []
+
+
+def get_all_responses(
+    experiment_id: str, run_ids: List[str], start_ts: Optional[str] = None
+):
+    """The responses of runs, logged since start_ts if set, pulled a page at a time"""
+    responses = []
+    while True:
+        page = get_responses(
+            experiment_id,
+            run_ids,
+            RESPONSES_PAGE_SIZE,
+            offset=len(responses),
+            start_ts=start_ts,
+        )
+        responses.extend(page["responses"])
+        if not page["responses"] or len(responses) >= page["total"]:
+            return responses
+
+
+@st.cache_resource(max_entries=32, show_spinner=False)
+def get_live_results(
+    experiment_id: str,
+    metric_columns: Dict[str, str],
+    excluded_values: Dict[str, float],
+    _transform: Callable[[pd.DataFrame], pd.DataFrame],
+) -> LiveResults:
+    """
+    The live results of an experiment, shared by every panel and session showing it.
+
+    The results of every run of the experiment are fetched, without a run filter, so
+    that the runs opened after the page was loaded are shown as the panels refresh.
+    """
+    return LiveResults(
+        lambda start_ts: get_all_responses(experiment_id, [], start_ts),
+        lambda start_ts: get_metrics(
+            MLFlowStoreRequest(
+                experiment_id=experiment_id,
+                metric_names=list(metric_columns),
+                start_ts=start_ts,
+            )
+        ),
+        metric_columns,
+        excluded_values,
+        transform=_transform,
+        interval=LIVE_FETCH_INTERVAL,
+    )
+
+
+def panel_cache(key: str, version: Tuple, build: Callable[[], Any]) -> Any:
+    """
+    A value a panel builds from the live results, such as a figure, built again only
+    when the data it is built from changed
+    """
+    cache = st.session_state.setdefault("dashboard_panel_cache", {})
+    if key not in cache or cache[key][0] != version:
+        cache[key] = (version, build())
+    return cache[key][1]
+
+
+title_col, live_col, refresh_col = st.columns([10, 2, 1])
 # dashboard title
 with title_col:
     st.title(":material/monitoring: Monitoring Dashboard")
 
+with live_col:
+    live_mode = st.toggle(
+        ":material/update: Live",
+        help="Refresh each panel on its own as new responses and metrics are logged",
+    )
+
 with refresh_col:
-    if st.button(
+    # reloads all the responses and metrics, rather than those logged since the last
+    # refresh
+    sync = st.button(
         ":material/sync:",
         use_container_width=True,
         help="Refresh the dashboard for updated metrics",
-    ):
-        st.rerun()
+    )
 
 # top-level filters
 # select experiment
@@ -269,378 +326,141 @@ if experiment_ids:
         mock_precision_scores = np.random.random(len(run_ids))
         mock_recall_scores = np.random.random(len(run_ids))
 
-        # creating a single-element container
-
-        faithfulness_request = MLFlowStoreRequest(
-            experiment_id=str(selected_experiment),
-            run_ids=run_ids,
-            metric_names=["faithfulness_score"],
-        )
-
-        relevancy_request = MLFlowStoreRequest(
-            experiment_id=str(selected_experiment),
-            run_ids=run_ids,
-            metric_names=["relevance_score"],
-        )
-
-        context_relevancy_request = MLFlowStoreRequest(
-            experiment_id=str(selected_experiment),
-            run_ids=run_ids,
-            metric_names=["context_relevancy_score"],
-        )
-
-        input_lengths_request = MLFlowStoreRequest(
-            experiment_id=str(selected_experiment),
-            run_ids=run_ids,
-            metric_names=["input_length"],
-        )
-
-        output_lengths_request = MLFlowStoreRequest(
-            experiment_id=str(selected_experiment),
-            run_ids=run_ids,
-            metric_names=["output_length"],
-        )
-
-        maliciousness_request = MLFlowStoreRequest(
-            experiment_id=str(selected_experiment),
-            run_ids=run_ids,
-            metric_names=["maliciousness_score"],
-        )
-
-        toxicity_request = MLFlowStoreRequest(
-            experiment_id=str(selected_experiment),
-            run_ids=run_ids,
-            metric_names=["toxicity_score"],
-        )
-
-        comprehensiveness_request = MLFlowStoreRequest(
-            experiment_id=str(selected_experiment),
-            run_ids=run_ids,
-            metric_names=["comprehensiveness_score"],
-        )
-
-        precision_request = MLFlowStoreRequest(
-            experiment_id=str(selected_experiment),
-            run_ids=run_ids,
-            metric_names=["precision"],
-        )
-
-        recall_request = MLFlowStoreRequest(
-            experiment_id=str(selected_experiment),
-            run_ids=run_ids,
-            metric_names=["recall"],
-        )
-
-        thumbs_up_request = MLFlowStoreRequest(
-            experiment_id=str(selected_experiment),
-            run_ids=run_ids,
-            metric_names=["feedback"],
-        )
-
-        table_request = MLFlowStoreRequest(
-            experiment_id=str(selected_experiment),
-            run_ids=run_ids,
-            metric_names=["live_results.json"],
-        )
-
-        # custom metrics requests
-        custom_metrics_requests = {}
-        for custom_eval in custom_evals:
-            custom_metric_request = MLFlowStoreRequest(
-                experiment_id=str(selected_experiment),
-                run_ids=run_ids,
-                metric_names=[f"{custom_eval['name'].lower().replace(' ', '_')}_score"],
-            )
-            custom_metrics_requests[
-                f"{custom_eval['name'].lower().replace(' ', '_')}_score"
-            ] = custom_metric_request
-
-        placeholder = st.empty()
-
-        # near real-time / live feed simulation
-        update_timestamp = time.strftime("%Y-%m-%d %H:%M:%S")
-
-        # get live results logs
-        live_results_response = get_metrics(table_request)
-
-        if live_results_response == []:
-            st.write("No Metrics Logged Yet")
-        else:
-            live_results_df = parse_live_results(live_results_response)
-
-            # get remaining metrics
-            faithfulness_response = get_metrics(faithfulness_request)
-            relevance_response = get_metrics(relevancy_request)
-            context_relevancy_response = get_metrics(context_relevancy_request)
-            input_lengths_response = get_metrics(input_lengths_request)
-            output_lengths_response = get_metrics(output_lengths_request)
-            maliciousness_response = get_metrics(maliciousness_request)
-            toxicity_response = get_metrics(toxicity_request)
-            comprehensiveness_response = get_metrics(comprehensiveness_request)
-            precision_response = get_metrics(precision_request)
-            recall_response = get_metrics(recall_request)
-            thumbs_up_response = get_metrics(thumbs_up_request)
-
-            # get custom metrics
-            custom_metrics_responses = {}
-            for (
-                custom_metric_name,
-                custom_metric_request,
-            ) in custom_metrics_requests.items():
-                custom_metrics_responses[custom_metric_name] = get_metrics(
-                    custom_metric_request
-                )
-
-            # initilize empty lists for all the scores
-            faithfulness_scores = []
-            relevance_scores = []
-            context_relevancy_scores = []
-            maliciousness_scores = []
-            toxicity_scores = []
-            comprehensiveness_scores = []
-            thumbs_up_scores = []
-            retrieval_precision_scores = []
-            retrieval_recall_scores = []
-
-            if thumbs_up_response != []:
-                thumbs_up_response_ids = [
-                    x["experiment_run_id"] for x in thumbs_up_response
-                ]
-                thumbs_up_scores = [
-                    x["value"]["numericValue"] if "numericValue" in x["value"] else 0
-                    for x in thumbs_up_response
-                ]
-                thumbs_up_df = pd.DataFrame(
-                    {
-                        "run_id": thumbs_up_response_ids,
-                        "thumbs_up": thumbs_up_scores,
-                    }
-                )
-            else:
-                thumbs_up_df = pd.DataFrame(
-                    {
-                        "run_id": run_ids,
-                        "thumbs_up": None,
-                    }
-                )
-            live_results_df = live_results_df.merge(
-                thumbs_up_df,
-                on="run_id",
-                how="left",
-            )
-
-            if faithfulness_response != []:
-                faithfulness_response_ids = [
-                    x["experiment_run_id"] for x in faithfulness_response
-                ]
-                faithfulness_scores = [
-                    x["value"]["numericValue"] if "numericValue" in x["value"] else 0
-                    for x in faithfulness_response
-                ]
-                faithfulness_df = pd.DataFrame(
-                    {
-                        "run_id": faithfulness_response_ids,
-                        "faithfulness_score": faithfulness_scores,
-                    }
-                )
-            else:
-                faithfulness_df = pd.DataFrame(
-                    {
-                        "run_id": run_ids,
-                        "faithfulness_score": pd.NA,
-                    }
-                )
-            live_results_df = live_results_df.merge(
-                faithfulness_df,
-                on="run_id",
-                how="left",
-            )
-
-            if relevance_response != []:
-                relevance_response_ids = [
-                    x["experiment_run_id"] for x in relevance_response
-                ]
-                relevance_scores = [
-                    x["value"]["numericValue"] if "numericValue" in x["value"] else 0
-                    for x in relevance_response
-                ]
-                relevance_df = pd.DataFrame(
-                    {
-                        "run_id": relevance_response_ids,
-                        "relevance_score": relevance_scores,
-                    }
-                )
-            else:
-                relevance_df = pd.DataFrame(
-                    {
-                        "run_id": run_ids,
-                        "relevance_score": pd.NA,
-                    }
-                )
-            live_results_df = live_results_df.merge(
-                relevance_df,
-                on="run_id",
-                how="left",
-            )
-
-            if context_relevancy_response != []:
-                context_relevancy_response_ids = [
-                    x["experiment_run_id"] for x in context_relevancy_response
-                ]
-                context_relevancy_scores = [
-                    x["value"]["numericValue"] if "numericValue" in x["value"] else 0
-                    for x in context_relevancy_response
-                ]
-                context_relevancy_df = pd.DataFrame(
-                    {
-                        "run_id": context_relevancy_response_ids,
-                        "context_relevancy_score": context_relevancy_scores,
-                    }
-                )
-            else:
-                context_relevancy_df = pd.DataFrame(
-                    {
-                        "run_id": run_ids,
-                        "context_relevancy_score": pd.NA,
-                    }
-                )
-            live_results_df = live_results_df.merge(
-                context_relevancy_df,
-                on="run_id",
-                how="left",
-            )
-
-            if maliciousness_response != []:
-                maliciousness_response_ids = [
-                    x["experiment_run_id"] for x in maliciousness_response
-                ]
-                maliciousness_scores = [
-                    x["value"]["numericValue"] if "numericValue" in x["value"] else 0
-                    for x in maliciousness_response
-                ]
-                maliciousness_df = pd.DataFrame(
-                    {
-                        "run_id": maliciousness_response_ids,
-                        "maliciousness_score": maliciousness_scores,
-                    }
-                )
-                maliciousness_df = maliciousness_df[
-                    maliciousness_df["maliciousness_score"] != -1
-                ]
-            else:
-                maliciousness_df = pd.DataFrame(
-                    {
-                        "run_id": run_ids,
-                        "maliciousness_score": pd.NA,
-                    }
-                )
-            live_results_df = live_results_df.merge(
-                maliciousness_df,
-                on="run_id",
-                how="left",
-            )
+        # judge scores and feedback, by metric name, and the columns they are read into
+        judge_metrics = {
+            "feedback": "thumbs_up",
+            "faithfulness_score": "faithfulness_score",
+            "relevance_score": "relevance_score",
+            "context_relevancy_score": "context_relevancy_score",
+            "maliciousness_score": "maliciousness_score",
+            "toxicity_score": "toxicity_score",
+            "comprehensiveness_score": "comprehensiveness_score",
+        }
+        # placeholder logged when a judge gave no score
+        excluded_values = {
+            "maliciousness_score": -1,
+            "toxicity_score": -1,
+            "comprehensiveness_score": -1,
+        }
+
+        # custom metrics
+        custom_metric_names = [
+            f"{custom_eval['name'].lower().replace(' ', '_')}_score"
+            for custom_eval in custom_evals
+        ]
+
+        # cheap evaluation scores, logged for every evaluated response
+        cheap_metrics = {
+            "query_context_similarity": (
+                "Query-Context Similarity",
+                "Mean similarity of the retrieved contexts to the query.",
+            ),
+            "context_coverage": (
+                "Context Coverage",
+                "Share of the query terms found in the retrieved contexts.",
+            ),
+            "answer_context_similarity": (
+                "Answer-Context Similarity",
+                "Similarity of the answer to the closest retrieved context.",
+            ),
+            "answer_grounding": (
+                "Answer Grounding",
+                "Share of the answer terms found in the retrieved contexts.",
+            ),
+            "llm_judged": (
+                "LLM Judged",
+                "Share of the responses escalated to the LLM judges.",
+            ),
+        }
+        # latency, in seconds, and token usage, logged for every response
+        latency_metrics = {
+            "time_to_first_token": (
+                "Time to First Token",
+                "Seconds until the first token of the answer was returned.",
+            ),
+            "retrieval_latency": (
+                "Retrieval Latency",
+                "Seconds spent retrieving the contexts.",
+            ),
+            "generation_latency": (
+                "Generation Latency",
+                "Seconds spent generating the answer from the contexts.",
+            ),
+            "evaluation_latency": (
+                "Evaluation Latency",
+                "Seconds the evaluation ran after the answer was generated.",
+            ),
+        }
+        token_metrics = {
+            "prompt_tokens": "Prompt Tokens",
+            "completion_tokens": "Completion Tokens",
+            "evaluation_tokens": "Evaluation Tokens",
+        }
+        performance_metric_names = [
+            *latency_metrics,
+            *token_metrics,
+            "retrieval_top_score",
+        ]
+
+        # every metric is pulled in a single request
+        metric_columns = {
+            **judge_metrics,
+            **{name: name for name in custom_metric_names},
+            **{name: name for name in cheap_metrics},
+            **{name: name for name in performance_metric_names},
+        }
+
+        def prepare_live_results(live_results_df: pd.DataFrame) -> pd.DataFrame:
+            """Fill in the judge scores never logged, and drop the metrics never logged"""
             if live_results_df["maliciousness_score"].isnull().all():
                 live_results_df["maliciousness_score"] = 0.0
-
-            if toxicity_response != []:
-                toxicity_response_ids = [
-                    x["experiment_run_id"] for x in toxicity_response
-                ]
-                toxicity_scores = [
-                    x["value"]["numericValue"] if "numericValue" in x["value"] else 0
-                    for x in toxicity_response
-                ]
-                toxicity_df = pd.DataFrame(
-                    {
-                        "run_id": toxicity_response_ids,
-                        "toxicity_score": toxicity_scores,
-                    }
-                )
-                toxicity_df = toxicity_df[toxicity_df["toxicity_score"] != -1]
-            else:
-                toxicity_df = pd.DataFrame(
-                    {
-                        "run_id": run_ids,
-                        "toxicity_score": pd.NA,
-                    }
-                )
-            live_results_df = live_results_df.merge(
-                toxicity_df,
-                on="run_id",
-                how="left",
-            )
             if live_results_df["toxicity_score"].isnull().all():
                 live_results_df["toxicity_score"] = 0.0
-
-            if comprehensiveness_response != []:
-                comprehensiveness_response_ids = [
-                    x["experiment_run_id"] for x in comprehensiveness_response
-                ]
-                comprehensiveness_scores = [
-                    x["value"]["numericValue"] if "numericValue" in x["value"] else 0
-                    for x in comprehensiveness_response
-                ]
-                comprehensiveness_df = pd.DataFrame(
-                    {
-                        "run_id": comprehensiveness_response_ids,
-                        "comprehensiveness_score": comprehensiveness_scores,
-                    }
-                )
-                comprehensiveness_df = comprehensiveness_df[
-                    comprehensiveness_df["comprehensiveness_score"] != -1
-                ]
-            else:
-                comprehensiveness_df = pd.DataFrame(
-                    {
-                        "run_id": run_ids,
-                        "comprehensiveness_score": pd.NA,
-                    }
-                )
-            live_results_df = live_results_df.merge(
-                comprehensiveness_df,
-                on="run_id",
-                how="left",
-            )
             if live_results_df["comprehensiveness_score"].isnull().all():
                 live_results_df["comprehensiveness_score"] = 0.5
+            # panels of the metrics of older clients, which do not log them, are hidden
+            return live_results_df.drop(
+                columns=[
+                    name
+                    for name in [*cheap_metrics, *performance_metric_names]
+                    if live_results_df[name].isnull().all()
+                ]
+            )
 
-            # merge custom metrics
-            for (
-                custom_metric_name,
-                custom_metric_response,
-            ) in custom_metrics_responses.items():
-                if custom_metric_response != []:
-                    custom_metric_response_ids = [
-                        x["experiment_run_id"] for x in custom_metric_response
-                    ]
-                    custom_metric_scores = [
-                        (
-                            x["value"]["numericValue"]
-                            if "numericValue" in x["value"]
-                            else 0
-                        )
-                        for x in custom_metric_response
-                    ]
-                    custom_metric_df = pd.DataFrame(
-                        {
-                            "run_id": custom_metric_response_ids,
-                            f"{custom_metric_name}": custom_metric_scores,
-                        }
-                    )
-                else:
-                    custom_metric_df = pd.DataFrame(
-                        {
-                            "run_id": run_ids,
-                            f"{custom_metric_name}": pd.NA,
-                        }
-                    )
-                live_results_df = live_results_df.merge(
-                    custom_metric_df,
-                    on="run_id",
-                    how="left",
+        # the responses indexed by the metric store, with a column per metric, shared
+        # by the panels and the other sessions showing the same experiment
+        live_results = get_live_results(
+            str(selected_experiment),
+            metric_columns,
+            excluded_values,
+            prepare_live_results,
+        )
+        live_results.refresh(force=sync)
+
+        if live_results.frame.empty:
+            st.write("No Metrics Logged Yet")
+        else:
+
+            def live_panel(name: str):
+                """Make a panel a fragment, rerun on its own interval in live mode"""
+                return st.fragment(
+                    run_every=LIVE_PANEL_INTERVALS[name] if live_mode else None
                 )
 
-            with placeholder.container():
+            def panel_data(columns: List[str]) -> Tuple[pd.DataFrame, Tuple]:
+                """
+                The live results, refreshed when due, and the version of the columns
+                a panel shows, which its cached figures are built from
+                """
+                live_results.refresh()
+                version, live_results_df = live_results.snapshot(columns)
+                return live_results_df, (id(live_results), version)
+
+            @live_panel("overview")
+            def overview_panel():
+                live_results_df, version = panel_data(
+                    ["input_length", "output_length", "thumbs_up"]
+                )
 
                 kpi9, kpi10, kpi11, kpi12, kpi13 = st.columns([3, 3, 1, 1, 1])
 
@@ -688,76 +508,92 @@ if experiment_ids:
                     ):
                         fig_col4, fig_col5 = st.columns(2)
 
-                        input_lengths_df = live_results_df[
-                            ["input_length", "timestamp"]
-                        ]
-                        agg_input_df = input_lengths_df.groupby(
-                            pd.Grouper(key="timestamp", freq="h")  # group by hour
-                        )["input_length"].agg(["mean", "max", "min"])
                         with fig_col4:
                             st.markdown(
                                 "### Input Length",
                                 help="The average number of words in the input.",
                             )
-                            fig = go.Figure(
-                                data=go.Scatter(
-                                    x=agg_input_df.index,
-                                    y=agg_input_df["mean"],
-                                    mode="markers",
-                                    marker=dict(size=5),
-                                    fill="tozeroy",
-                                    customdata=agg_input_df[["max", "min"]],
-                                    hovertemplate="Mean: <b>%{y:.2f}</b> Max: <b>%{customdata[0]:.2f}"
-                                    "</b><br>Min: <b>%{customdata[1]:.2f}</b><br>Date: %{x|%b %d, %Y}"
-                                    "<br>Time: %{x|%H:%M}<extra></extra>",
+
+                            def input_length_figure():
+                                input_lengths_df = live_results_df[
+                                    ["input_length", "timestamp"]
+                                ]
+                                # group by hour
+                                agg_input_df = input_lengths_df.groupby(
+                                    pd.Grouper(key="timestamp", freq="h")
+                                )["input_length"].agg(["mean", "max", "min"])
+                                fig = go.Figure(
+                                    data=go.Scatter(
+                                        x=agg_input_df.index,
+                                        y=agg_input_df["mean"],
+                                        mode="markers",
+                                        marker=dict(size=5),
+                                        fill="tozeroy",
+                                        customdata=agg_input_df[["max", "min"]],
+                                        hovertemplate="Mean: <b>%{y:.2f}</b> Max: <b>%{customdata[0]:.2f}"
+                                        "</b><br>Min: <b>%{customdata[1]:.2f}</b><br>Date: %{x|%b %d, %Y}"
+                                        "<br>Time: %{x|%H:%M}<extra></extra>",
+                                    )
                                 )
-                            )
-                            fig.update_layout(
-                                xaxis_title="Date",
-                                yaxis_title="Mean Input Length (in words)",
-                                xaxis={
-                                    "tickformat": "%b %d, %Y",
-                                    "tickmode": "array",
-                                },
-                            )
+                                fig.update_layout(
+                                    xaxis_title="Date",
+                                    yaxis_title="Mean Input Length (in words)",
+                                    xaxis={
+                                        "tickformat": "%b %d, %Y",
+                                        "tickmode": "array",
+                                    },
+                                )
+                                return fig
+
                             st.plotly_chart(
-                                fig, key=f"input_length_fig_{update_timestamp}"
+                                panel_cache(
+                                    "input_length_fig", version, input_length_figure
+                                ),
+                                key="input_length_fig",
                             )
 
-                        output_lengths_df = live_results_df[
-                            ["output_length", "timestamp"]
-                        ]
-                        agg_output_df = output_lengths_df.groupby(
-                            pd.Grouper(key="timestamp", freq="h")  # group by hour
-                        )["output_length"].agg(["mean", "max", "min"])
                         with fig_col5:
                             st.markdown(
                                 "### Output Length",
                                 help="The average number of words in the output.",
                             )
-                            fig = go.Figure(
-                                data=go.Scatter(
-                                    x=agg_output_df.index,
-                                    y=agg_output_df["mean"],
-                                    mode="markers",
-                                    marker=dict(size=5),
-                                    fill="tozeroy",
-                                    customdata=agg_output_df[["max", "min"]],
-                                    hovertemplate="Mean: <b>%{y:.2f}</b> Max: <b>%{customdata[0]:.2f}"
-                                    "</b><br>Min: <b>%{customdata[1]:.2f}</b><br>Date: %{x|%b %d, %Y}"
-                                    "<br>Time: %{x|%H:%M}<extra></extra>",
+
+                            def output_length_figure():
+                                output_lengths_df = live_results_df[
+                                    ["output_length", "timestamp"]
+                                ]
+                                # group by hour
+                                agg_output_df = output_lengths_df.groupby(
+                                    pd.Grouper(key="timestamp", freq="h")
+                                )["output_length"].agg(["mean", "max", "min"])
+                                fig = go.Figure(
+                                    data=go.Scatter(
+                                        x=agg_output_df.index,
+                                        y=agg_output_df["mean"],
+                                        mode="markers",
+                                        marker=dict(size=5),
+                                        fill="tozeroy",
+                                        customdata=agg_output_df[["max", "min"]],
+                                        hovertemplate="Mean: <b>%{y:.2f}</b> Max: <b>%{customdata[0]:.2f}"
+                                        "</b><br>Min: <b>%{customdata[1]:.2f}</b><br>Date: %{x|%b %d, %Y}"
+                                        "<br>Time: %{x|%H:%M}<extra></extra>",
+                                    )
                                 )
-                            )
-                            fig.update_layout(
-                                xaxis_title="Date",
-                                yaxis_title="Mean Output Length (in words)",
-                                xaxis={
-                                    "tickformat": "%b %d, %Y",
-                                    "tickmode": "array",
-                                },
-                            )
+                                fig.update_layout(
+                                    xaxis_title="Date",
+                                    yaxis_title="Mean Output Length (in words)",
+                                    xaxis={
+                                        "tickformat": "%b %d, %Y",
+                                        "tickmode": "array",
+                                    },
+                                )
+                                return fig
+
                             st.plotly_chart(
-                                fig, key=f"output_length_fig_{update_timestamp}"
+                                panel_cache(
+                                    "output_length_fig", version, output_length_figure
+                                ),
+                                key="output_length_fig",
                             )
 
                 # Show thumbs up count, thumbs down count, no feedback count
@@ -791,19 +627,32 @@ if experiment_ids:
                             "### Feedback Received",
                             help="Feedback received from users.",
                         )
-                        fig = go.Figure(
-                            data=go.Pie(
-                                labels=["Thumbs Up", "Thumbs Down", "No Feedback"],
-                                values=[
-                                    thumbs_up_count,
-                                    thumbs_down_count,
-                                    no_feedback_count,
-                                ],
-                                hole=0.5,
-                                hovertemplate="%{label}: <b>%{value}</b><extra></extra>",
+
+                        def feedback_figure():
+                            fig = go.Figure(
+                                data=go.Pie(
+                                    labels=["Thumbs Up", "Thumbs Down", "No Feedback"],
+                                    values=[
+                                        thumbs_up_count,
+                                        thumbs_down_count,
+                                        no_feedback_count,
+                                    ],
+                                    hole=0.5,
+                                    hovertemplate="%{label}: <b>%{value}</b><extra></extra>",
+                                )
                             )
+                            return fig
+
+                        st.plotly_chart(
+                            panel_cache("feedback_fig", version, feedback_figure),
+                            key="feedback_fig",
                         )
-                        st.plotly_chart(fig, key=f"feedback_fig_{update_timestamp}")
+
+            overview_panel()
+
+            @live_panel("judges")
+            def judges_panel():
+                live_results_df, version = panel_data(list(judge_metrics.values()))
 
                 # metric columns
                 kpi1, kpi2, kpi3, kpi4, kpi5, kpi6, kpi7 = st.columns(
@@ -962,193 +811,249 @@ if experiment_ids:
                             "### Faithfulness",
                             help="Faithfulness of the answer received.",
                         )
-                        fig = go.Figure(
-                            data=go.Pie(
-                                labels=["Faithful", "Not Faithful", "No Records"],
-                                values=[
-                                    live_results_df["faithfulness_score"]
-                                    .to_list()
-                                    .count(1),
-                                    live_results_df["faithfulness_score"]
-                                    .to_list()
-                                    .count(0),
-                                    live_results_df["faithfulness_score"].isna().sum(),
-                                ],
-                                hole=0.5,
-                                hovertemplate="%{label}: <b>%{value}</b><extra></extra>",
+
+                        def faithfulness_figure():
+                            fig = go.Figure(
+                                data=go.Pie(
+                                    labels=["Faithful", "Not Faithful", "No Records"],
+                                    values=[
+                                        live_results_df["faithfulness_score"]
+                                        .to_list()
+                                        .count(1),
+                                        live_results_df["faithfulness_score"]
+                                        .to_list()
+                                        .count(0),
+                                        live_results_df["faithfulness_score"]
+                                        .isna()
+                                        .sum(),
+                                    ],
+                                    hole=0.5,
+                                    hovertemplate="%{label}: <b>%{value}</b><extra></extra>",
+                                )
                             )
+                            return fig
+
+                        st.plotly_chart(
+                            panel_cache(
+                                "faithfulness_fig", version, faithfulness_figure
+                            ),
+                            key="faithfulness_fig",
                         )
-                        st.plotly_chart(fig, key=f"faithfulness_fig_{update_timestamp}")
 
                     with fig_col2:
                         st.markdown(
                             "### Relevance", help="Relevance of the answer received."
                         )
-                        fig = go.Figure(
-                            data=go.Pie(
-                                labels=["Relevant", "Not Relevant", "No Records"],
-                                values=[
-                                    live_results_df["relevance_score"]
-                                    .to_list()
-                                    .count(1),
-                                    live_results_df["relevance_score"]
-                                    .to_list()
-                                    .count(0),
-                                    live_results_df["relevance_score"].isna().sum(),
-                                ],
-                                hole=0.5,
-                                hovertemplate="%{label}: <b>%{value}</b><extra></extra>",
+
+                        def relevance_figure():
+                            fig = go.Figure(
+                                data=go.Pie(
+                                    labels=["Relevant", "Not Relevant", "No Records"],
+                                    values=[
+                                        live_results_df["relevance_score"]
+                                        .to_list()
+                                        .count(1),
+                                        live_results_df["relevance_score"]
+                                        .to_list()
+                                        .count(0),
+                                        live_results_df["relevance_score"].isna().sum(),
+                                    ],
+                                    hole=0.5,
+                                    hovertemplate="%{label}: <b>%{value}</b><extra></extra>",
+                                )
                             )
+                            return fig
+
+                        st.plotly_chart(
+                            panel_cache("relevance_fig", version, relevance_figure),
+                            key="relevance_fig",
                         )
-                        st.plotly_chart(fig, key=f"relevance_fig_{update_timestamp}")
 
                     with fig_col3:
-                        context_relevancy_df = live_results_df[
-                            live_results_df["context_relevancy_score"].notnull()
-                        ][["context_relevancy_score", "timestamp"]]
-                        agg_context_relevancy_df = context_relevancy_df.groupby(
-                            pd.Grouper(key="timestamp", freq="h")  # group by hour
-                        )["context_relevancy_score"].agg(["mean", "max", "min"])
                         st.markdown(
                             "### Context Relevance Score",
                             help="Relevance of the contexts received.",
                         )
-                        fig = go.Figure(
-                            data=go.Scatter(
-                                x=agg_context_relevancy_df.index,
-                                y=agg_context_relevancy_df["mean"],
-                                mode="markers",
-                                marker=dict(size=5),
-                                fill="tozeroy",
-                                customdata=agg_context_relevancy_df[["max", "min"]],
-                                hovertemplate="Mean: <b>%{y:.2f}</b> Max: <b>%{customdata[0]:.2f}"
-                                "</b><br>Min: <b>%{customdata[1]:.2f}</b><br>Date: %{x|%b %d, %Y}"
-                                "<br>Time: %{x|%H:%M}<extra></extra>",
+
+                        def context_relevance_figure():
+                            context_relevancy_df = live_results_df[
+                                live_results_df["context_relevancy_score"].notnull()
+                            ][["context_relevancy_score", "timestamp"]]
+                            agg_context_relevancy_df = context_relevancy_df.groupby(
+                                pd.Grouper(key="timestamp", freq="h")  # group by hour
+                            )["context_relevancy_score"].agg(["mean", "max", "min"])
+                            fig = go.Figure(
+                                data=go.Scatter(
+                                    x=agg_context_relevancy_df.index,
+                                    y=agg_context_relevancy_df["mean"],
+                                    mode="markers",
+                                    marker=dict(size=5),
+                                    fill="tozeroy",
+                                    customdata=agg_context_relevancy_df[["max", "min"]],
+                                    hovertemplate="Mean: <b>%{y:.2f}</b> Max: <b>%{customdata[0]:.2f}"
+                                    "</b><br>Min: <b>%{customdata[1]:.2f}</b><br>Date: %{x|%b %d, %Y}"
+                                    "<br>Time: %{x|%H:%M}<extra></extra>",
+                                )
                             )
-                        )
-                        fig.update_layout(
-                            xaxis_title="Date",
-                            yaxis_title="Mean Context Relevance Score (0-1)",
-                            yaxis=dict(range=[0, 1]),
-                            xaxis={
-                                "tickformat": "%b %d, %Y",
-                                "tickmode": "array",
-                            },
-                        )
+                            fig.update_layout(
+                                xaxis_title="Date",
+                                yaxis_title="Mean Context Relevance Score (0-1)",
+                                yaxis=dict(range=[0, 1]),
+                                xaxis={
+                                    "tickformat": "%b %d, %Y",
+                                    "tickmode": "array",
+                                },
+                            )
+                            return fig
+
                         st.plotly_chart(
-                            fig, key=f"context_relevance_fig_{update_timestamp}"
+                            panel_cache(
+                                "context_relevance_fig",
+                                version,
+                                context_relevance_figure,
+                            ),
+                            key="context_relevance_fig",
                         )
 
                     fig_col4, fig_col5, fig_col6 = st.columns(3)
 
                     with fig_col4:
-                        maliciousness_df = live_results_df[
-                            live_results_df["maliciousness_score"].notnull()
-                        ][["maliciousness_score", "timestamp"]]
-                        agg_maliciousness_df = maliciousness_df.groupby(
-                            pd.Grouper(key="timestamp", freq="h")  # group by hour
-                        )["maliciousness_score"].agg(["mean", "max", "min"])
                         st.markdown(
                             "### Maliciousness",
                             help="Maliciousness of the answer received.",
                         )
-                        fig = go.Figure(
-                            data=go.Scatter(
-                                x=agg_maliciousness_df.index,
-                                y=agg_maliciousness_df["mean"],
-                                mode="markers",
-                                marker=dict(size=5),
-                                fill="tozeroy",
-                                customdata=agg_maliciousness_df[["max", "min"]],
-                                hovertemplate="Mean: <b>%{y:.2f}</b> Max: <b>%{customdata[0]:.2f}"
-                                "</b><br>Min: <b>%{customdata[1]:.2f}</b><br>Date: %{x|%b %d, %Y}"
-                                "<br>Time: %{x|%H:%M}<extra></extra>",
+
+                        def maliciousness_figure():
+                            maliciousness_df = live_results_df[
+                                live_results_df["maliciousness_score"].notnull()
+                            ][["maliciousness_score", "timestamp"]]
+                            agg_maliciousness_df = maliciousness_df.groupby(
+                                pd.Grouper(key="timestamp", freq="h")  # group by hour
+                            )["maliciousness_score"].agg(["mean", "max", "min"])
+                            fig = go.Figure(
+                                data=go.Scatter(
+                                    x=agg_maliciousness_df.index,
+                                    y=agg_maliciousness_df["mean"],
+                                    mode="markers",
+                                    marker=dict(size=5),
+                                    fill="tozeroy",
+                                    customdata=agg_maliciousness_df[["max", "min"]],
+                                    hovertemplate="Mean: <b>%{y:.2f}</b> Max: <b>%{customdata[0]:.2f}"
+                                    "</b><br>Min: <b>%{customdata[1]:.2f}</b><br>Date: %{x|%b %d, %Y}"
+                                    "<br>Time: %{x|%H:%M}<extra></extra>",
+                                )
                             )
-                        )
-                        fig.update_layout(
-                            xaxis_title="Date",
-                            yaxis_title="Mean Maliciousness Score (0-1)",
-                            yaxis=dict(range=[0, 1]),
-                            xaxis={
-                                "tickformat": "%b %d, %Y",
-                                "tickmode": "array",
-                            },
-                        )
+                            fig.update_layout(
+                                xaxis_title="Date",
+                                yaxis_title="Mean Maliciousness Score (0-1)",
+                                yaxis=dict(range=[0, 1]),
+                                xaxis={
+                                    "tickformat": "%b %d, %Y",
+                                    "tickmode": "array",
+                                },
+                            )
+                            return fig
+
                         st.plotly_chart(
-                            fig, key=f"maliciousness_fig_{update_timestamp}"
+                            panel_cache(
+                                "maliciousness_fig", version, maliciousness_figure
+                            ),
+                            key="maliciousness_fig",
                         )
 
                     with fig_col5:
-                        toxicity_df = live_results_df[
-                            live_results_df["toxicity_score"].notnull()
-                        ][["toxicity_score", "timestamp"]]
-                        agg_toxicity_df = toxicity_df.groupby(
-                            pd.Grouper(key="timestamp", freq="h")  # group by hour
-                        )["toxicity_score"].agg(["mean", "max", "min"])
                         st.markdown(
                             "### Toxicity", help="Toxicity of the answer received."
                         )
-                        fig = go.Figure(
-                            data=go.Scatter(
-                                x=agg_toxicity_df.index,
-                                y=agg_toxicity_df["mean"],
-                                mode="markers",
-                                marker=dict(size=5),
-                                fill="tozeroy",
-                                customdata=agg_toxicity_df[["max", "min"]],
-                                hovertemplate="Mean: <b>%{y:.2f}</b> Max: <b>%{customdata[0]:.2f}"
-                                "</b><br>Min: <b>%{customdata[1]:.2f}</b><br>Date:%{x|%b %d, %Y}"
-                                "<br>Time: %{x|%H:%M}<extra></extra>",
+
+                        def toxicity_figure():
+                            toxicity_df = live_results_df[
+                                live_results_df["toxicity_score"].notnull()
+                            ][["toxicity_score", "timestamp"]]
+                            agg_toxicity_df = toxicity_df.groupby(
+                                pd.Grouper(key="timestamp", freq="h")  # group by hour
+                            )["toxicity_score"].agg(["mean", "max", "min"])
+                            fig = go.Figure(
+                                data=go.Scatter(
+                                    x=agg_toxicity_df.index,
+                                    y=agg_toxicity_df["mean"],
+                                    mode="markers",
+                                    marker=dict(size=5),
+                                    fill="tozeroy",
+                                    customdata=agg_toxicity_df[["max", "min"]],
+                                    hovertemplate="Mean: <b>%{y:.2f}</b> Max: <b>%{customdata[0]:.2f}"
+                                    "</b><br>Min: <b>%{customdata[1]:.2f}</b><br>Date:%{x|%b %d, %Y}"
+                                    "<br>Time: %{x|%H:%M}<extra></extra>",
+                                )
                             )
+                            fig.update_layout(
+                                xaxis_title="Date",
+                                yaxis_title="Mean Toxicity Score (0-1)",
+                                yaxis=dict(range=[0, 1]),
+                                xaxis={
+                                    "tickformat": "%b %d, %Y",
+                                    "tickmode": "array",
+                                },
+                            )
+                            return fig
+
+                        st.plotly_chart(
+                            panel_cache("toxicity_fig", version, toxicity_figure),
+                            key="toxicity_fig",
                         )
-                        fig.update_layout(
-                            xaxis_title="Date",
-                            yaxis_title="Mean Toxicity Score (0-1)",
-                            yaxis=dict(range=[0, 1]),
-                            xaxis={
-                                "tickformat": "%b %d, %Y",
-                                "tickmode": "array",
-                            },
-                        )
-                        st.plotly_chart(fig, key=f"toxicity_fig_{update_timestamp}")
 
                     with fig_col6:
-                        comprehensiveness_df = live_results_df[
-                            live_results_df["comprehensiveness_score"].notnull()
-                        ]
-                        agg_comprehensiveness_df = comprehensiveness_df.groupby(
-                            pd.Grouper(key="timestamp", freq="h")  # group by hour
-                        )["comprehensiveness_score"].agg(["mean", "min", "max"])
                         st.markdown(
                             "### Comprehensiveness",
                             help="Comprehensiveness of the answer.",
                         )
-                        fig = go.Figure(
-                            data=go.Scatter(
-                                x=agg_comprehensiveness_df.index,
-                                y=agg_comprehensiveness_df["mean"],
-                                mode="markers",
-                                marker=dict(size=5),
-                                fill="tozeroy",
-                                customdata=agg_comprehensiveness_df[["max", "min"]],
-                                hovertemplate="Mean: <b>%{y:.2f}</b> Max: <b>%{customdata[0]:.2f}"
-                                "</b><br>Min: <b>%{customdata[1]:.2f}</b><br>Date:%{x|%b %d, %Y}"
-                                "<br>Time: %{x|%H:%M}<extra></extra>",
+
+                        def comprehensiveness_figure():
+                            comprehensiveness_df = live_results_df[
+                                live_results_df["comprehensiveness_score"].notnull()
+                            ]
+                            agg_comprehensiveness_df = comprehensiveness_df.groupby(
+                                pd.Grouper(key="timestamp", freq="h")  # group by hour
+                            )["comprehensiveness_score"].agg(["mean", "min", "max"])
+                            fig = go.Figure(
+                                data=go.Scatter(
+                                    x=agg_comprehensiveness_df.index,
+                                    y=agg_comprehensiveness_df["mean"],
+                                    mode="markers",
+                                    marker=dict(size=5),
+                                    fill="tozeroy",
+                                    customdata=agg_comprehensiveness_df[["max", "min"]],
+                                    hovertemplate="Mean: <b>%{y:.2f}</b> Max: <b>%{customdata[0]:.2f}"
+                                    "</b><br>Min: <b>%{customdata[1]:.2f}</b><br>Date:%{x|%b %d, %Y}"
+                                    "<br>Time: %{x|%H:%M}<extra></extra>",
+                                )
                             )
-                        )
-                        fig.update_layout(
-                            xaxis_title="Date",
-                            yaxis_title="Mean Comprehensiveness Score (0-1)",
-                            yaxis=dict(range=[0, 1]),
-                            xaxis={
-                                "tickformat": "%b %d, %Y",
-                                "tickmode": "array",
-                            },
-                        )
+                            fig.update_layout(
+                                xaxis_title="Date",
+                                yaxis_title="Mean Comprehensiveness Score (0-1)",
+                                yaxis=dict(range=[0, 1]),
+                                xaxis={
+                                    "tickformat": "%b %d, %Y",
+                                    "tickmode": "array",
+                                },
+                            )
+                            return fig
+
                         st.plotly_chart(
-                            fig, key=f"comprehensiveness_fig_{update_timestamp}"
+                            panel_cache(
+                                "comprehensiveness_fig",
+                                version,
+                                comprehensiveness_figure,
+                            ),
+                            key="comprehensiveness_fig",
                         )
 
+            judges_panel()
+
+            @live_panel("custom_metrics")
+            def custom_metrics_panel():
+                live_results_df, version = panel_data(custom_metric_names)
+
                 # display custom metrics
                 if custom_evals:
                     custom_metric_rows = [
@@ -1187,24 +1092,111 @@ if experiment_ids:
                                 ),
                             )
                             custom_metric_fig = custom_metric_fig_rows[i // 3][i % 3]
-                            custom_metric_df = live_results_df[
-                                live_results_df[f"{custom_metric_name}_score"].notnull()
-                            ][[f"{custom_metric_name}_score", "timestamp"]]
-                            agg_custom_metric_df = custom_metric_df.groupby(
-                                pd.Grouper(key="timestamp", freq="h")  # group by hour
-                            )[f"{custom_metric_name}_score"].agg(["mean", "max", "min"])
                             custom_metric_fig.markdown(
                                 f"### {custom_eval['name'].title().replace('_', ' ')}",
                                 help=custom_eval["eval_definition"],
                             )
+
+                            def custom_metric_figure():
+                                custom_metric_df = live_results_df[
+                                    live_results_df[
+                                        f"{custom_metric_name}_score"
+                                    ].notnull()
+                                ][[f"{custom_metric_name}_score", "timestamp"]]
+                                # group by hour
+                                agg_custom_metric_df = custom_metric_df.groupby(
+                                    pd.Grouper(key="timestamp", freq="h")
+                                )[f"{custom_metric_name}_score"].agg(
+                                    ["mean", "max", "min"]
+                                )
+                                fig = go.Figure(
+                                    data=go.Scatter(
+                                        x=agg_custom_metric_df.index,
+                                        y=agg_custom_metric_df["mean"],
+                                        mode="markers",
+                                        marker=dict(size=5),
+                                        fill="tozeroy",
+                                        customdata=agg_custom_metric_df[["max", "min"]],
+                                        hovertemplate="Mean: <b>%{y:.2f}</b> Max: <b>%{customdata[0]:.2f}"
+                                        "</b><br>Min: <b>%{customdata[1]:.2f}</b><br>Date:%{x|%b %d, %Y}"
+                                        "<br>Time: %{x|%H:%M}<extra></extra>",
+                                    )
+                                )
+                                fig.update_layout(
+                                    xaxis_title="Date",
+                                    yaxis_title=f"Mean {custom_eval['name']} Score (0-1)",
+                                    yaxis=dict(range=[0, 1]),
+                                    xaxis={
+                                        "tickformat": "%b %d, %Y",
+                                        "tickmode": "array",
+                                    },
+                                )
+                                return fig
+
+                            custom_metric_fig.plotly_chart(
+                                panel_cache(
+                                    f"{custom_metric_name}_fig",
+                                    version,
+                                    custom_metric_figure,
+                                ),
+                                key=f"{custom_metric_name}_fig",
+                            )
+
+            custom_metrics_panel()
+
+            @live_panel("cheap_metrics")
+            def cheap_metrics_panel():
+                live_results_df, version = panel_data(list(cheap_metrics))
+
+                # display cheap evaluation metrics
+                available_cheap_metrics = [
+                    cheap_metric_name
+                    for cheap_metric_name in cheap_metrics
+                    if cheap_metric_name in live_results_df.columns
+                ]
+                if available_cheap_metrics:
+                    cheap_metric_kpis = st.columns(len(available_cheap_metrics))
+                    with st.expander(
+                        ":material/bolt: **Embedding Signals Overview**",
+                        expanded=True,
+                    ):
+                        cheap_metric_figs = st.columns(len(available_cheap_metrics))
+                    for i, cheap_metric_name in enumerate(available_cheap_metrics):
+                        label, help_text = cheap_metrics[cheap_metric_name]
+                        cheap_metric_scores = live_results_df[
+                            live_results_df[cheap_metric_name].notna()
+                        ][cheap_metric_name].to_list()
+                        avg_cheap_metric = np.mean(cheap_metric_scores)
+                        cheap_metric_kpis[i].metric(
+                            label=label,
+                            help=help_text,
+                            value=round(avg_cheap_metric, 2),
+                            delta=round(
+                                (
+                                    avg_cheap_metric - np.mean(cheap_metric_scores[:-1])
+                                    if len(cheap_metric_scores) > 1
+                                    else 0
+                                ),
+                                2,
+                            ),
+                        )
+                        cheap_metric_figs[i].markdown(f"### {label}", help=help_text)
+
+                        def cheap_metric_figure():
+                            cheap_metric_df = live_results_df[
+                                live_results_df[cheap_metric_name].notnull()
+                            ][[cheap_metric_name, "timestamp"]]
+                            agg_cheap_metric_df = cheap_metric_df.groupby(
+                                pd.Grouper(key="timestamp", freq="h")  # group by hour
+                            )[cheap_metric_name].agg(["mean", "max", "min"])
                             fig = go.Figure(
                                 data=go.Scatter(
-                                    x=agg_custom_metric_df.index,
-                                    y=agg_custom_metric_df["mean"],
+                                    x=agg_cheap_metric_df.index,
+                                    y=agg_cheap_metric_df["mean"],
                                     mode="markers",
                                     marker=dict(size=5),
                                     fill="tozeroy",
-                                    customdata=agg_custom_metric_df[["max", "min"]],
+                                    customdata=agg_cheap_metric_df[["max", "min"]],
                                     hovertemplate="Mean: <b>%{y:.2f}</b> Max: <b>%{customdata[0]:.2f}"
                                     "</b><br>Min: <b>%{customdata[1]:.2f}</b><br>Date:%{x|%b %d, %Y}"
                                     "<br>Time: %{x|%H:%M}<extra></extra>",
@@ -1212,31 +1204,328 @@ if experiment_ids:
                             )
                             fig.update_layout(
                                 xaxis_title="Date",
-                                yaxis_title=f"Mean {custom_eval['name']} Score (0-1)",
+                                yaxis_title=f"Mean {label} (0-1)",
                                 yaxis=dict(range=[0, 1]),
                                 xaxis={
                                     "tickformat": "%b %d, %Y",
                                     "tickmode": "array",
                                 },
                             )
-                            custom_metric_fig.plotly_chart(
-                                fig, key=f"{custom_metric_name}_fig_{update_timestamp}"
+                            return fig
+
+                        cheap_metric_figs[i].plotly_chart(
+                            panel_cache(
+                                f"{cheap_metric_name}_fig", version, cheap_metric_figure
+                            ),
+                            key=f"{cheap_metric_name}_fig",
+                        )
+
+            cheap_metrics_panel()
+
+            @live_panel("performance")
+            def performance_panel():
+                live_results_df, version = panel_data(performance_metric_names)
+
+                # display latency and cost metrics
+                available_latency_metrics = [
+                    latency_metric_name
+                    for latency_metric_name in latency_metrics
+                    if latency_metric_name in live_results_df.columns
+                ]
+                available_token_metrics = [
+                    token_metric_name
+                    for token_metric_name in token_metrics
+                    if token_metric_name in live_results_df.columns
+                ]
+                if available_latency_metrics:
+                    latency_kpis = st.columns(len(available_latency_metrics) + 1)
+                    for i, latency_metric_name in enumerate(available_latency_metrics):
+                        label, help_text = latency_metrics[latency_metric_name]
+                        latencies = live_results_df[latency_metric_name].dropna()
+                        latency_kpis[i].metric(
+                            label=f"{label} p95 :material/timer:",
+                            help=f"{help_text} The 95th percentile, with the median below.",
+                            value=f"{np.percentile(latencies, 95):.2f}s",
+                            delta=f"p50 {np.percentile(latencies, 50):.2f}s",
+                            delta_color="off",
+                        )
+                    if "prompt_tokens" in live_results_df.columns:
+                        tokens = live_results_df[available_token_metrics].sum(
+                            axis=1, min_count=1
+                        )
+                        latency_kpis[-1].metric(
+                            label="Tokens per Response :material/toll:",
+                            help="The average number of LLM tokens used per response, "
+                            "including those of the evaluation.",
+                            value=round(tokens.mean(), 1),
+                        )
+
+                    with st.expander(
+                        ":material/speed: **Latency & Cost Overview**",
+                        expanded=True,
+                    ):
+                        latency_figs = st.columns(2)
+                        for i, latency_metric_name in enumerate(
+                            available_latency_metrics
+                        ):
+                            label, help_text = latency_metrics[latency_metric_name]
+                            latency_fig = latency_figs[i % 2]
+                            latency_fig.markdown(f"### {label}", help=help_text)
+
+                            def latency_figure():
+                                bands_df = percentile_bands(
+                                    live_results_df, latency_metric_name
+                                )
+                                # shade the p50-p95 band, with the p99 dotted above it
+                                fig = go.Figure(
+                                    data=[
+                                        go.Scatter(
+                                            x=bands_df.index,
+                                            y=bands_df["p50"],
+                                            name="p50",
+                                            mode="lines+markers",
+                                            marker=dict(size=5),
+                                            customdata=bands_df[["count"]],
+                                            hovertemplate="p50: <b>%{y:.2f}s</b> Responses: "
+                                            "<b>%{customdata[0]}</b><br>Date: %{x|%b %d, %Y}"
+                                            "<br>Time: %{x|%H:%M}<extra></extra>",
+                                        ),
+                                        go.Scatter(
+                                            x=bands_df.index,
+                                            y=bands_df["p95"],
+                                            name="p95",
+                                            mode="lines",
+                                            fill="tonexty",
+                                            hovertemplate="p95: <b>%{y:.2f}s</b><extra></extra>",
+                                        ),
+                                        go.Scatter(
+                                            x=bands_df.index,
+                                            y=bands_df["p99"],
+                                            name="p99",
+                                            mode="lines",
+                                            line=dict(dash="dot"),
+                                            hovertemplate="p99: <b>%{y:.2f}s</b><extra></extra>",
+                                        ),
+                                    ]
+                                )
+                                fig.update_layout(
+                                    xaxis_title="Date",
+                                    yaxis_title=f"{label} (in seconds)",
+                                    xaxis={
+                                        "tickformat": "%b %d, %Y",
+                                        "tickmode": "array",
+                                    },
+                                )
+                                return fig
+
+                            latency_fig.plotly_chart(
+                                panel_cache(
+                                    f"{latency_metric_name}_fig",
+                                    version,
+                                    latency_figure,
+                                ),
+                                key=f"{latency_metric_name}_fig",
                             )
 
+                        if available_token_metrics:
+                            tokens_col, top_score_col = st.columns(2)
+                            with tokens_col:
+                                st.markdown(
+                                    "### Token Usage",
+                                    help="The LLM tokens used per hour, a proxy for "
+                                    "the cost of the responses and their evaluation.",
+                                )
+
+                                def token_usage_figure():
+                                    tokens_df = live_results_df[
+                                        [*available_token_metrics, "timestamp"]
+                                    ]
+                                    agg_tokens_df = tokens_df.groupby(
+                                        pd.Grouper(key="timestamp", freq="h")
+                                    )[available_token_metrics].sum()
+                                    fig = go.Figure(
+                                        data=[
+                                            go.Bar(
+                                                x=agg_tokens_df.index,
+                                                y=agg_tokens_df[token_metric_name],
+                                                name=token_metrics[token_metric_name],
+                                                hovertemplate="%{y:,.0f} tokens<br>Date: "
+                                                "%{x|%b %d, %Y}<br>Time: %{x|%H:%M}<extra></extra>",
+                                            )
+                                            for token_metric_name in available_token_metrics
+                                        ]
+                                    )
+                                    fig.update_layout(
+                                        barmode="stack",
+                                        xaxis_title="Date",
+                                        yaxis_title="Tokens",
+                                        xaxis={
+                                            "tickformat": "%b %d, %Y",
+                                            "tickmode": "array",
+                                        },
+                                    )
+                                    return fig
+
+                                st.plotly_chart(
+                                    panel_cache(
+                                        "token_usage_fig", version, token_usage_figure
+                                    ),
+                                    key="token_usage_fig",
+                                )
+                            if "retrieval_top_score" in live_results_df.columns:
+                                with top_score_col:
+                                    st.markdown(
+                                        "### Retrieval Top Score",
+                                        help="The similarity of the best retrieved "
+                                        "context to the query.",
+                                    )
+
+                                    def retrieval_top_score_figure():
+                                        bands_df = percentile_bands(
+                                            live_results_df,
+                                            "retrieval_top_score",
+                                            percentiles=(5, 50, 95),
+                                        )
+                                        fig = go.Figure(
+                                            data=[
+                                                go.Scatter(
+                                                    x=bands_df.index,
+                                                    y=bands_df["p5"],
+                                                    name="p5",
+                                                    mode="lines",
+                                                    line=dict(width=0),
+                                                    hovertemplate="p5: <b>%{y:.2f}</b><extra></extra>",
+                                                ),
+                                                go.Scatter(
+                                                    x=bands_df.index,
+                                                    y=bands_df["p95"],
+                                                    name="p5-p95",
+                                                    mode="lines",
+                                                    line=dict(width=0),
+                                                    fill="tonexty",
+                                                    hovertemplate="p95: <b>%{y:.2f}</b><extra></extra>",
+                                                ),
+                                                go.Scatter(
+                                                    x=bands_df.index,
+                                                    y=bands_df["p50"],
+                                                    name="p50",
+                                                    mode="lines+markers",
+                                                    marker=dict(size=5),
+                                                    hovertemplate="p50: <b>%{y:.2f}</b><br>Date: "
+                                                    "%{x|%b %d, %Y}<br>Time: %{x|%H:%M}<extra></extra>",
+                                                ),
+                                            ]
+                                        )
+                                        fig.update_layout(
+                                            xaxis_title="Date",
+                                            yaxis_title="Top Score",
+                                            xaxis={
+                                                "tickformat": "%b %d, %Y",
+                                                "tickmode": "array",
+                                            },
+                                        )
+                                        return fig
+
+                                    st.plotly_chart(
+                                        panel_cache(
+                                            "retrieval_top_score_fig",
+                                            version,
+                                            retrieval_top_score_figure,
+                                        ),
+                                        key="retrieval_top_score_fig",
+                                    )
+
+            performance_panel()
+
+            @live_panel("logs")
+            def logs_panel():
+                # the page of responses is fetched again only when the responses change,
+                # the scores shown with them are read from the live results
+                live_results_df, version = panel_data([])
+
                 with st.expander("**Detailed Logs**", expanded=True):
-                    live_results_df["thumbs_up"] = live_results_df["thumbs_up"].apply(
+                    search_col, page_col = st.columns([5, 1])
+                    with search_col:
+                        logs_search = st.text_input(
+                            "Search",
+                            placeholder="Text in the query or the response",
+                            key="detailed_logs_search",
+                            # a new search starts from its first page
+                            on_change=lambda: st.session_state.update(
+                                detailed_logs_page=1
+                            ),
+                        )
+                    with page_col:
+                        logs_page = st.number_input(
+                            "Page", min_value=1, step=1, key="detailed_logs_page"
+                        )
+                    logs_response = panel_cache(
+                        "logs_response",
+                        (*version, logs_search, logs_page),
+                        lambda: get_responses(
+                            str(selected_experiment),
+                            [],
+                            LOGS_PAGE_SIZE,
+                            offset=(logs_page - 1) * LOGS_PAGE_SIZE,
+                            search=logs_search,
+                        ),
+                    )
+                    st.caption(
+                        f"{logs_response['total']} responses, page {logs_page} of "
+                        f"{max(1, -(-logs_response['total'] // LOGS_PAGE_SIZE))}"
+                    )
+                    # the scores of the responses of the page
+                    logs_df = pd.DataFrame(
+                        {
+                            "response_id": [
+                                response["response_id"]
+                                for response in logs_response["responses"]
+                            ]
+                        },
+                        dtype="object",
+                    ).merge(live_results_df, on="response_id", how="left")
+                    logs_df["thumbs_up"] = logs_df["thumbs_up"].apply(
                         lambda x: "👍" if x == 1 else "👎" if x == 0 else "🤷‍♂️"
                     )
-                    live_results_df = live_results_df.rename(
+                    logs_df = logs_df.rename(
                         {
                             # "feedback_str": "user_feedback",
                             "thumbs_up": "feedback"
                         },
                         axis=1,
                     )
-                    live_results_df = live_results_df.drop(
-                        columns=["response_id", "run_id"]
+                    logs_df = logs_df.sort_values(
+                        by="timestamp", ascending=False, ignore_index=True
                     )
-                    st.dataframe(
-                        live_results_df.sort_values(by="timestamp", ascending=False)
+                    logs_response_ids = logs_df["response_id"].to_list()
+                    logs_df = logs_df.drop(columns=["response_id", "run_id", "step"])
+                    logs_event = st.dataframe(
+                        logs_df,
+                        on_select="rerun",
+                        selection_mode="single-row",
+                        key="detailed_logs_table",
                     )
+                    # the contexts are only fetched for the selected response
+                    if logs_event.selection.rows:
+                        response_id = logs_response_ids[logs_event.selection.rows[0]]
+                        response_contexts = panel_cache(
+                            "logs_response_contexts",
+                            (selected_experiment, response_id),
+                            lambda: get_response_contexts(
+                                str(selected_experiment), response_id
+                            ),
+                        )
+                        st.markdown("**Contexts**")
+                        if not response_contexts:
+                            st.caption("No contexts logged for this response.")
+                        for response_context in response_contexts:
+                            with st.container(border=True):
+                                st.caption(
+                                    f"{response_context.get('source_file_name', '')}"
+                                    f" · Score: {response_context.get('score', 0.0):.3f}"
+                                )
+                                st.text(response_context.get("content", ""))
+                    else:
+                        st.caption("Select a response to see its contexts.")
+
+            logs_panel()